@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import argparse
 from dataclasses import dataclass, field
-from typing import Dict
+from pathlib import Path
+from typing import ContextManager, Dict
 
 from src.config.loader import ConfigLoader, LoadedConfig
+from src.core.profiling import StageProfiler, profile_stage
 from src.processors import batimento as batimento_proc
 from src.processors import baixa as baixa_proc
 from src.processors import contact_enrichment as enrichment_proc
@@ -21,6 +24,7 @@ class Pipeline:
     """High-level access point for extraction and processing workflows."""
 
     loader: ConfigLoader = field(default_factory=ConfigLoader)
+    profiler: StageProfiler | None = None
     _config: LoadedConfig | None = field(default=None, init=False, repr=False)
 
     def _get_config(self) -> LoadedConfig:
@@ -28,12 +32,16 @@ class Pipeline:
             self._config = self.loader.load()
         return self._config
 
+    def _stage(self, name: str) -> ContextManager[None]:
+        return profile_stage(self.profiler, name)
+
     # ---- Extraction layer -------------------------------------------------
 
     def extract_emccamp(self) -> None:
         config = self._get_config()
         inicio = time()
-        zip_path, records = baixar_emccamp(config)
+        with self._stage("extract_emccamp"):
+            zip_path, records = baixar_emccamp(config)
         duracao = time() - inicio
         
         format_extraction_output(
@@ -50,15 +58,18 @@ class Pipeline:
         )
 
     def extract_max(self) -> None:
-        extrair_basemax.main()
+        with self._stage("extract_max"):
+            extrair_basemax.main()
 
     def extract_judicial(self) -> None:
-        extrair_judicial.main()
+        with self._stage("extract_judicial"):
+            extrair_judicial.main()
 
     def extract_baixa(self) -> None:
         config = self._get_config()
         inicio = time()
-        zip_path, records = baixar_baixas_emccamp(config)
+        with self._stage("extract_baixa"):
+            zip_path, records = baixar_baixas_emccamp(config)
         duracao = time() - inicio
         
         format_extraction_output(
@@ -76,7 +87,8 @@ class Pipeline:
         )
 
     def extract_doublecheck(self) -> None:
-        extrair_doublecheck_acordo.main()
+        with self._stage("extract_doublecheck"):
+            extrair_doublecheck_acordo.main()
 
     def extract_all(self) -> None:
         self.extract_emccamp()
@@ -88,10 +100,12 @@ class Pipeline:
     # ---- Treatment / processing -------------------------------------------
 
     def treat_emccamp(self) -> emccamp_proc.ProcessorStats:
-        return emccamp_proc.run(self.loader)
+        with self._stage("treat_emccamp"):
+            return emccamp_proc.run(self.loader)
 
     def treat_max(self) -> max_proc.MaxStats:
-        return max_proc.run(self.loader)
+        with self._stage("treat_max"):
+            return max_proc.run(self.loader)
 
     def treat_all(self) -> Dict[str, object]:
         return {
@@ -100,14 +114,82 @@ class Pipeline:
         }
 
     def batimento(self):
-        return batimento_proc.run(self.loader)
+        with self._stage("batimento"):
+            return batimento_proc.run(self.loader)
 
     def baixa(self) -> None:
-        baixa_proc.run(self.loader)
+        with self._stage("baixa"):
+            baixa_proc.run(self.loader)
 
     def devolucao(self):
         """Executa processamento de devolução MAX - EMCCAMP."""
-        return devolucao_proc.run(self.loader)
+        with self._stage("devolucao"):
+            return devolucao_proc.run(self.loader)
+
+    def enriquecimento(self, dataset: str | None = None, full: bool = False):
+        """Enriquecimento de contato; ``full`` reenvia todos os contatos, ignorando o historico."""
+        with self._stage("enriquecimento"):
+            return enrichment_proc.run(dataset, self.loader, full=full)
+
+    def run_all(self, full: bool = False) -> None:
+        """Extração, tratamento, batimento, baixa, devolução e enriquecimento em sequência."""
+        self.extract_all()
+        self.treat_all()
+        self.batimento()
+        self.baixa()
+        self.devolucao()
+        self.enriquecimento(full=full)
+
+
+COMMANDS = {
+    "extract": Pipeline.extract_all,
+    "treat": Pipeline.treat_all,
+    "batimento": Pipeline.batimento,
+    "baixa": Pipeline.baixa,
+    "devolucao": Pipeline.devolucao,
+    "enriquecimento": Pipeline.enriquecimento,
+    "all": Pipeline.run_all,
+}
+# Etapas que aceitam --full (reenvio completo do enriquecimento)
+FULL_COMMANDS = ("enriquecimento", "all")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pipeline EMCCAMP")
+    parser.add_argument("command", choices=sorted(COMMANDS), help="Etapa a executar")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Enriquecimento reenvia todos os contatos, ignorando o historico (enriquecimento/all)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        default=None,
+        choices=["cprofile", "sampling"],
+        help="Gera perfil por etapa (.prof e resumo) em <output>/profile/ (padrao: cprofile)",
+    )
+    parser.add_argument("--profile-top", type=int, default=20, help="Funcoes listadas por etapa no resumo")
+    parser.add_argument("--profile-memory", action="store_true", help="Snapshot de alocacoes por etapa (tracemalloc)")
+    parser.add_argument("--output-dir", type=Path, default=Path("data/output"), help="Diretorio de saida do perfil")
+    args = parser.parse_args()
+    if args.full and args.command not in FULL_COMMANDS:
+        parser.error(f"--full so se aplica a: {', '.join(FULL_COMMANDS)}")
+
+    pipeline = Pipeline()
+    if args.profile:
+        pipeline.profiler = StageProfiler.for_run(
+            args.output_dir, mode=args.profile, top=args.profile_top, memory=args.profile_memory
+        )
+    COMMANDS[args.command](pipeline, **({"full": True} if args.full else {}))
+
+    if pipeline.profiler is not None:
+        summary = pipeline.profiler.write_summary()
+        if summary:
+            print(f"[OK] Perfil por etapa: {summary}")
+
+
+if __name__ == "__main__":
+    main()
 
-    def enriquecimento(self, dataset: str | None = None):
-        return enrichment_proc.run(dataset, self.loader)
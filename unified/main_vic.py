@@ -6,12 +6,12 @@ com modo de comparação automática para validação de resultados.
 """
 
 import argparse
+import json
 import os
 import sys
 import re
 import subprocess
 import shutil
-import zipfile
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
@@ -29,12 +29,16 @@ except Exception:
     pass
 
 from src.config.loader import ConfigLoader
+from src.core.checkpoint import CHECKPOINT_DIRNAME, CheckpointStore, collect_files, stage_key
+from src.core.profiling import StageProfiler, profile_stage
 from src.processors.vic.tratamento_vic import VicProcessor
 from src.processors.vic.enriquecimento_vic import EnriquecimentoVicProcessor
 from src.processors.shared.tratamento_max import MaxProcessor
 from src.processors.shared.batimento import BatimentoProcessor
 from src.processors.shared.baixa import BaixaProcessor
 from src.processors.shared.devolucao import DevolucaoProcessor
+from src.utils.catalog import resolver_mais_recente
+from src.utils.dataset_diff import colunas_dataset, comparar_datasets, contar_registros
 from src.utils.logger import get_logger
 from src.utils.validator import ValidadorConsistencia
 
@@ -148,6 +152,25 @@ class PipelineOrchestrator:
 
         # Metadados compartilhados entre etapas
         self._ultima_data_base_vic: Optional[str] = None
+
+        # Checkpoints por etapa: gravados com --resume ou global.checkpoints: true
+        output_base = Path(self.paths_config.get('output', {}).get('base', 'data/output'))
+        self.checkpoints = CheckpointStore(
+            output_base / CHECKPOINT_DIRNAME,
+            enabled=bool(self.config_loader.get_nested_value(self.config, 'global.checkpoints', False)),
+        )
+
+    def _resolver_entrada(self, tipo: str) -> Optional[Path]:
+        """Retorna o arquivo de input mais recente do tipo informado (zip; csv se não houver zip)."""
+        base = Path(self.config.get('paths', {}).get('input', {}).get(tipo, ''))
+        if not base.exists():
+            return None
+        for padrao in ('*.zip', '*.csv'):
+            try:
+                return resolver_mais_recente(base, padrao)
+            except FileNotFoundError:
+                continue
+        return None
         
     def processar_max(self, entrada: Optional[Path] = None, saida: Optional[Path] = None) -> Dict[str, Any]:
         """Processa dados MAX.
@@ -163,15 +186,9 @@ class PipelineOrchestrator:
             self.logger.info("Iniciando processamento MAX...")
             # Preferir arquivo mais recente em data/input/max se 'entrada' não fornecida
             if entrada is None:
-                try:
-                    base = Path(self.config.get('paths', {}).get('input', {}).get('max', ''))
-                    files = list(base.glob('*.zip')) + list(base.glob('*.csv')) if base.exists() else []
-                    if files:
-                        files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-                        entrada = files[0]
-                        self.logger.info(f"Usando arquivo de input MAX: {entrada}")
-                except Exception:
-                    pass
+                entrada = self._resolver_entrada('max')
+                if entrada is not None:
+                    self.logger.info(f"Usando arquivo de input MAX: {entrada}")
             resultado = self.max_processor.processar(entrada, saida)
             self.logger.info("Processamento MAX concluído com sucesso")
             return resultado
@@ -194,15 +211,9 @@ class PipelineOrchestrator:
             self.logger.info("Iniciando processamento VIC...")
             # Preferir arquivo mais recente em data/input/vic se 'entrada' não fornecida
             if entrada is None:
-                try:
-                    base = Path(self.config.get('paths', {}).get('input', {}).get('vic', ''))
-                    files = list(base.glob('*.zip')) + list(base.glob('*.csv')) if base.exists() else []
-                    if files:
-                        files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-                        entrada = files[0]
-                        self.logger.info(f"Usando arquivo de input VIC: {entrada}")
-                except Exception:
-                    pass
+                entrada = self._resolver_entrada('vic')
+                if entrada is not None:
+                    self.logger.info(f"Usando arquivo de input VIC: {entrada}")
             resultado = self.vic_processor.processar(
                 entrada=entrada,
                 saida=saida,
@@ -379,13 +390,21 @@ class PipelineOrchestrator:
                 self.logger.error("Pipeline interrompido. Verifique as configurações de conexão.")
                 raise
             
-    def pipeline_completo(self, saida: Optional[Path] = None, comparar_com_atual: bool = False, skip_extraction: bool = False) -> Dict[str, Any]:
+    def pipeline_completo(
+        self,
+        saida: Optional[Path] = None,
+        comparar_com_atual: bool = False,
+        skip_extraction: bool = False,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
         """Executa pipeline completo: Extração → Tratamento VIC → Tratamento MAX → Inclusão → Baixa → Devolução.
         
         Args:
             saida: Diretório de saída (se None, usa config)
             comparar_com_atual: Se True, compara resultados com sistema atual
             skip_extraction: Se True, pula a etapa de extração das bases
+            resume: Se True, reaproveita etapas cujo checkpoint (hash das
+                entradas) não mudou desde a última execução
             
         Returns:
             Estatísticas consolidadas do processamento
@@ -399,7 +418,13 @@ class PipelineOrchestrator:
             self.logger.info("=" * 60)
 
             # Limpar diretórios de saída antes de nova execução
-            self._limpar_outputs()
+            # (na retomada os outputs das etapas concluídas são reaproveitados)
+            if resume:
+                self.logger.info("♻️  Retomando execução a partir dos checkpoints (--resume)")
+            else:
+                self._limpar_outputs()
+
+            config_hash = json.dumps(self.config, sort_keys=True, default=str)
 
             # Executar extração das bases por padrão (a menos que skip_extraction seja True)
             if not skip_extraction:
@@ -410,7 +435,9 @@ class PipelineOrchestrator:
                 self.logger.info("="*60)
                 
                 try:
-                    resultado_extracao = self.extrair_bases()
+                    # Fora da retomada: e-mail e bancos mudam sem alterar nenhum arquivo local
+                    with profile_stage(self.checkpoints.profiler, 'extracao'):
+                        resultado_extracao = self.extrair_bases()
                     self.logger.info("✅ Extração automática concluída com sucesso!")
                     self.logger.info("Continuando com o pipeline completo...")
                     self.logger.info("="*60)
@@ -427,21 +454,36 @@ class PipelineOrchestrator:
 
             # 1. Tratamento VIC
             self.logger.info("\n[1/6] Tratamento VIC...")
-            resultado_vic = self.processar_vic(saida=saida)
+            entrada_vic = self._resolver_entrada('vic')
+            resultado_vic = self.checkpoints.run(
+                'tratamento_vic',
+                stage_key([entrada_vic], saida=saida, data_base=self._ultima_data_base_vic, config=config_hash),
+                lambda: self.processar_vic(entrada=entrada_vic, saida=saida),
+                resume,
+            )
             resultados['vic'] = resultado_vic
             vic_path = resultado_vic.get('arquivo_gerado')
 
             # 2. Tratamento MAX
             self.logger.info("\n[2/6] Tratamento MAX...")
-            resultado_max = self.processar_max(saida=saida)
+            entrada_max = self._resolver_entrada('max')
+            resultado_max = self.checkpoints.run(
+                'tratamento_max',
+                stage_key([entrada_max], saida=saida, config=config_hash),
+                lambda: self.processar_max(entrada=entrada_max, saida=saida),
+                resume,
+            )
             resultados['max'] = resultado_max
             max_path = resultado_max.get('arquivo_gerado')
 
             if vic_path and max_path:
                 # 3. Batimento
                 self.logger.info("\n[3/6] Batimento VIC×MAX...")
-                resultado_batimento = self.processar_batimento(
-                    Path(vic_path), Path(max_path), saida
+                resultado_batimento = self.checkpoints.run(
+                    'batimento',
+                    stage_key([vic_path, max_path], saida=saida, config=config_hash),
+                    lambda: self.processar_batimento(Path(vic_path), Path(max_path), saida),
+                    resume,
                 )
                 resultados['batimento'] = resultado_batimento
 
@@ -449,8 +491,13 @@ class PipelineOrchestrator:
                 if batimento_path:
                     # 4. Enriquecimento
                     self.logger.info("   ↳ [4/6] Enriquecimento de Contato...")
-                    resultado_enriquecimento = self.processar_enriquecimento(
-                        Path(vic_path), Path(batimento_path)
+                    resultado_enriquecimento = self.checkpoints.run(
+                        'enriquecimento',
+                        stage_key([vic_path, batimento_path], config=config_hash),
+                        lambda: self.processar_enriquecimento(
+                            Path(vic_path), Path(batimento_path)
+                        ),
+                        resume,
                     )
                     resultados['enriquecimento'] = resultado_enriquecimento
                 else:
@@ -460,13 +507,26 @@ class PipelineOrchestrator:
 
                 # 5. Baixa
                 self.logger.info("\n[5/6] Baixa — VIC baixado × MAX em aberto...")
-                resultado_baixa = self.processar_baixa(Path(vic_path), Path(max_path))
+                resultado_baixa = self.checkpoints.run(
+                    'baixa',
+                    stage_key([vic_path, max_path], config=config_hash),
+                    lambda: self.processar_baixa(Path(vic_path), Path(max_path)),
+                    resume,
+                )
                 resultados['baixa'] = resultado_baixa
 
                 # 6. Devolução
                 self.logger.info("\n[6/6] Devolução — MAX→VIC...")
-                resultado_devolucao = self.processar_devolucao(
-                    Path(vic_path), Path(max_path), resultado_baixa
+                resultado_devolucao = self.checkpoints.run(
+                    'devolucao',
+                    stage_key(
+                        [vic_path, max_path, *self._arquivos_resultado(resultado_baixa)],
+                        config=config_hash,
+                    ),
+                    lambda: self.processar_devolucao(
+                        Path(vic_path), Path(max_path), resultado_baixa
+                    ),
+                    resume,
                 )
                 resultados['devolucao'] = resultado_devolucao
             else:
@@ -496,18 +556,18 @@ class PipelineOrchestrator:
             self.logger.error(f"Erro no pipeline completo: {e}")
             raise
             
-    def _carregar_primeiro_csv(self, zip_path: Path) -> pd.DataFrame:
-        if not zip_path.exists():
-            raise FileNotFoundError(f'Referência não encontrada: {zip_path}')
-        with zipfile.ZipFile(zip_path) as zf:
-            csv_names = [n for n in zf.namelist() if n.lower().endswith('.csv')]
-            if not csv_names:
-                raise ValueError(f'Nenhum CSV encontrado em {zip_path}')
-            with zf.open(csv_names[0]) as fh:
-                return pd.read_csv(fh, sep=';', encoding='utf-8-sig')
+    @staticmethod
+    def _arquivos_resultado(resultado: Optional[Dict[str, Any]]) -> list[Path]:
+        """Arquivos referenciados em um resultado de etapa (ordem estável)."""
+        return sorted(collect_files(resultado or {}))
 
     def _comparar_com_atual(self, resultados: Dict[str, Any]) -> Dict[str, Any]:
-        """Compara resultados com sistema atual usando ValidadorConsistencia.
+        """Compara resultados com a última saída do sistema legado.
+        
+        Cada par (legado, atual) é comparado em streaming por
+        ``comparar_datasets``: contagens, chaves só de um lado, chaves com
+        valores alterados e alterações por coluna, com uma amostra das
+        diferenças gravada ao lado do resumo.
         
         Args:
             resultados: Resultados do pipeline refatorado
@@ -526,16 +586,17 @@ class PipelineOrchestrator:
 
         comparacao_dir = Path(self.paths_config.get('output', {}).get('base', 'data/output')) / 'comparacoes'
         comparacao_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
         patterns = {
-            'vic': ('vic', 'vic_tratada_*.zip'),
-            'max': ('max', 'max_tratada_*.zip'),
-            'devolucao': ('devolucao', 'vic_devolucao_*.zip'),
-            'batimento': ('batimento', 'vic_batimento_*.zip'),
+            'vic': ('vic', 'vic_tratada_*.zip', 'CHAVE'),
+            'max': ('max', 'max_tratada_*.zip', 'PARCELA'),
+            'devolucao': ('devolucao', 'vic_devolucao_*.zip', 'PARCELA'),
+            'batimento': ('batimento', 'vic_batimento_*.zip', 'CHAVE'),
         }
 
         resumo = []
-        for chave, (subdir, pattern) in patterns.items():
+        for chave, (subdir, pattern, chave_col) in patterns.items():
             entry = {'dataset': chave}
             atual_info = resultados.get(chave, {})
             atual_path = atual_info.get('arquivo_gerado')
@@ -543,39 +604,56 @@ class PipelineOrchestrator:
                 entry.update({'status': 'sem_arquivo_atual'})
                 resumo.append(entry)
                 continue
-            atual_df = self._carregar_primeiro_csv(Path(atual_path))
-            entry['atual_arquivo'] = Path(atual_path).name
-            entry['atual_registros'] = len(atual_df)
+            atual_path = Path(atual_path)
+            if not atual_path.exists():
+                raise FileNotFoundError(f'Referência não encontrada: {atual_path}')
+            entry['atual_arquivo'] = atual_path.name
 
             legacy_subdir = legacy_base / subdir
             legacy_files = sorted(legacy_subdir.glob(pattern)) if legacy_subdir.exists() else []
             if not legacy_files:
-                entry.update({'status': 'sem_legacy', 'legacy_registros': 0, 'diferenca': len(atual_df)})
+                atual_registros = contar_registros(atual_path)
+                entry.update({
+                    'status': 'sem_legacy',
+                    'atual_registros': atual_registros,
+                    'legacy_registros': 0,
+                    'diferenca': atual_registros,
+                })
                 resumo.append(entry)
                 continue
 
             legacy_latest = legacy_files[-1]
-            legacy_df = self._carregar_primeiro_csv(legacy_latest)
             entry['legacy_arquivo'] = legacy_latest.name
-            entry['legacy_registros'] = len(legacy_df)
-            entry['diferenca'] = len(atual_df) - len(legacy_df)
-
-            chave_col = 'CHAVE' if chave in ('vic', 'batimento') else 'PARCELA'
-            if chave == 'max':
-                chave_col = 'PARCELA'
-            if chave == 'devolucao':
-                chave_col = 'PARCELA' if 'PARCELA' in atual_df.columns else None
-            if chave_col and chave_col in atual_df.columns and chave_col in legacy_df.columns:
-                atual_keys = set(atual_df[chave_col].astype(str).str.strip())
-                legacy_keys = set(legacy_df[chave_col].astype(str).str.strip())
-                entry['intersecao'] = len(atual_keys & legacy_keys)
-                entry['apenas_atual'] = len(atual_keys - legacy_keys)
-                entry['apenas_legacy'] = len(legacy_keys - atual_keys)
+
+            tem_chave = chave_col in colunas_dataset(atual_path) and chave_col in colunas_dataset(legacy_latest)
+            if tem_chave:
+                diff = comparar_datasets(
+                    legacy_latest,
+                    atual_path,
+                    [chave_col],
+                    saida_amostra=comparacao_dir / f'diff_{chave}_{timestamp}.csv',
+                )
+                entry.update({
+                    'atual_registros': diff['registros_direita'],
+                    'legacy_registros': diff['registros_esquerda'],
+                    'intersecao': diff['iguais'] + diff['alteradas'],
+                    'apenas_atual': diff['adicionadas'],
+                    'apenas_legacy': diff['removidas'],
+                    'alterados': diff['alteradas'],
+                    'colunas_alteradas': ', '.join(
+                        f'{coluna}={n}' for coluna, n in diff['alteracoes_por_coluna'].items()
+                    ),
+                })
+                if diff.get('arquivo_amostra'):
+                    entry['amostra'] = diff['arquivo_amostra']
+            else:
+                entry['atual_registros'] = contar_registros(atual_path)
+                entry['legacy_registros'] = contar_registros(legacy_latest)
+            entry['diferenca'] = entry['atual_registros'] - entry['legacy_registros']
             entry['status'] = 'ok'
             resumo.append(entry)
 
         resumo_df = pd.DataFrame(resumo)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         arquivo = comparacao_dir / f'comparacao_{timestamp}.csv'
         resumo_df.to_csv(arquivo, index=False, encoding='utf-8-sig')
         return {'status': 'ok', 'arquivo': str(arquivo), 'resumo': resumo}
@@ -719,6 +797,8 @@ Exemplos de uso:
   python main.py --extrair-bases                       # Extrai bases: VIC (Gmail), MAX (SQL Server), Judicial (SQL Server)
                                                         # Mostra arquivos gerados, estatísticas e tempo de execução
   python main.py --pipeline-completo --comparar        # Pipeline completo com comparação de resultados
+  python main.py --pipeline-completo --profile         # Perfil por etapa (.prof + resumo) em <saida>/profile/
+  python main.py --pipeline-completo --aguardar-email 120  # Aguarda o email VIC do dia (IMAP IDLE) e segue direto
 
 Funcionalidades de extração:
   --extrair-bases: Executa scripts de extração que geram arquivos em data/input/
@@ -754,50 +834,84 @@ Funcionalidades de extração:
                        help='Não adicionar timestamp aos arquivos de saída')
     parser.add_argument('--skip-extraction', action='store_true',
                        help='Pula extração automática no pipeline completo (requer arquivos já existentes)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Retoma o pipeline completo reaproveitando etapas com entradas inalteradas')
+    parser.add_argument('--aguardar-email', type=float, metavar='MIN', default=None,
+                       help='Na extração, aguarda o email VIC do dia via IMAP IDLE por até MIN minutos')
+    parser.add_argument('--profile', nargs='?', const='cprofile', default=None,
+                       choices=['cprofile', 'sampling'],
+                       help='Gera perfil por etapa (.prof e resumo) em <saida>/profile/ (padrão: cprofile)')
+    parser.add_argument('--profile-top', type=int, default=20,
+                       help='Funções mais custosas listadas por etapa no resumo do perfil')
+    parser.add_argument('--profile-memory', action='store_true',
+                       help='Inclui snapshot de alocações por etapa (tracemalloc) no perfil')
     
     args = parser.parse_args()
+    if args.aguardar_email:
+        # Repassado ao script de extração (subprocesso) via ambiente
+        os.environ['VIC_EMAIL_AGUARDAR_MIN'] = str(args.aguardar_email)
     
     try:
         # Inicializar orquestrador
         orchestrator = PipelineOrchestrator()
+
+        # Perfil por etapa: as etapas do pipeline completo passam pelo CheckpointStore
+        perfilador = None
+        if args.profile:
+            saida_base = args.output or Path(orchestrator.paths_config.get('output', {}).get('base', 'data/output'))
+            perfilador = StageProfiler.for_run(
+                saida_base, mode=args.profile, top=args.profile_top, memory=args.profile_memory
+            )
+            orchestrator.checkpoints.profiler = perfilador
         
         # Executar operação solicitada
         if args.pipeline_completo:
             resultado = orchestrator.pipeline_completo(
                 saida=args.output,
                 comparar_com_atual=args.comparar,
-                skip_extraction=args.skip_extraction
+                skip_extraction=args.skip_extraction,
+                resume=args.resume,
             )
             
         elif args.max:
-            resultado = orchestrator.processar_max(
-                entrada=args.entrada,
-                saida=args.output
-            )
+            with profile_stage(perfilador, 'tratamento_max'):
+                resultado = orchestrator.processar_max(
+                    entrada=args.entrada,
+                    saida=args.output
+                )
             
         elif args.vic:
-            resultado = orchestrator.processar_vic(
-                entrada=args.entrada,
-                saida=args.output
-            )
+            with profile_stage(perfilador, 'tratamento_vic'):
+                resultado = orchestrator.processar_vic(
+                    entrada=args.entrada,
+                    saida=args.output
+                )
             
         elif args.devolucao:
             vic_file, max_file = args.devolucao
-            resultado = orchestrator.processar_devolucao(
-                vic_path=Path(vic_file),
-                max_path=Path(max_file)
-            )
+            with profile_stage(perfilador, 'devolucao'):
+                resultado = orchestrator.processar_devolucao(
+                    vic_path=Path(vic_file),
+                    max_path=Path(max_file)
+                )
             
         elif args.batimento:
             vic_file, max_file = args.batimento
-            resultado = orchestrator.processar_batimento(
-                vic_path=Path(vic_file),
-                max_path=Path(max_file),
-                saida=args.output
-            )
+            with profile_stage(perfilador, 'batimento'):
+                resultado = orchestrator.processar_batimento(
+                    vic_path=Path(vic_file),
+                    max_path=Path(max_file),
+                    saida=args.output
+                )
             
         elif args.extrair_bases:
-            resultado = orchestrator.extrair_bases()
+            with profile_stage(perfilador, 'extracao'):
+                resultado = orchestrator.extrair_bases()
+
+        if perfilador is not None:
+            resumo_perfil = perfilador.write_summary()
+            if resumo_perfil:
+                print(f"\n📈 Perfil por etapa salvo em: {resumo_perfil}")
             
 
     except KeyboardInterrupt:
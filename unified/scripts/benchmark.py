@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - loaders, chaves, validadores e processadores sobre bases sintéticas.
+Grava o resultado em JSON e, com --referencia, falha (código 1) se algum caso
+ficar mais lento que a referência além do limite.
+
+Exemplos:
+    python scripts/benchmark.py --linhas 100k
+    python scripts/benchmark.py --linhas 100k 1M --casos validador chave
+    python scripts/benchmark.py --referencia data/benchmarks/benchmark_20250101_120000.json
+    python scripts/benchmark.py --gerar vic --linhas 1M --saida data/input/sintetico
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Setup path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.utils.benchmark import (
+    LIMITE_PADRAO,
+    SAIDA_PADRAO,
+    TAMANHOS_PADRAO,
+    carregar_relatorio,
+    comparar_com_referencia,
+    executar_benchmark,
+    filtrar_casos,
+    montar_casos,
+    salvar_relatorio,
+)
+from src.utils.dados_sinteticos import GERADORES, gerar_dataset, salvar_dataset
+
+
+def parse_linhas(valor: str) -> int:
+    """Aceita 100000, 100k, 1M, 5m."""
+    texto = valor.strip().lower().replace("_", "")
+    multiplicador = {"k": 1_000, "m": 1_000_000}.get(texto[-1:], 1)
+    try:
+        return int(float(texto.rstrip("km")) * multiplicador)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"quantidade de linhas inválida: {valor}") from None
+
+
+def imprimir_resultados(relatorio: dict) -> None:
+    print(f"\n{'CASO':<45} {'LINHAS':>10} {'SEGUNDOS':>10} {'LINHAS/S':>12}  STATUS")
+    print("-" * 90)
+    for r in relatorio["resultados"]:
+        segundos = f"{r['segundos']:.3f}" if r["segundos"] is not None else "-"
+        taxa = f"{r['linhas_por_segundo']:,}" if r["linhas_por_segundo"] else "-"
+        status = r["status"] if r["status"] == "ok" else f"{r['status']}: {r['detalhe']}"
+        print(f"{r['caso']:<45} {r['linhas']:>10,} {segundos:>10} {taxa:>12}  {status}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dos componentes do pipeline com dados sintéticos")
+    parser.add_argument("--linhas", nargs="+", type=parse_linhas, default=list(TAMANHOS_PADRAO),
+                        help="Escalas a medir (padrão: 100k 1M 5M)")
+    parser.add_argument("--casos", nargs="+", default=None,
+                        help="Mede só casos cujo nome contém algum destes trechos")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Execuções por caso (vale o menor tempo)")
+    parser.add_argument("--semente", type=int, default=0, help="Semente das bases sintéticas")
+    parser.add_argument("--saida", type=Path, default=SAIDA_PADRAO, help="Diretório do JSON de resultados")
+    parser.add_argument("--referencia", type=Path, default=None, help="JSON de uma execução anterior")
+    parser.add_argument("--limite", type=float, default=LIMITE_PADRAO,
+                        help="Regressão tolerada sobre a referência (0.2 = 20%%)")
+    parser.add_argument("--listar", action="store_true", help="Lista os casos e sai")
+    parser.add_argument("--gerar", choices=sorted(GERADORES), nargs="+", default=None,
+                        help="Só gera as bases sintéticas (ZIP) em --saida, sem medir")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level), format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.gerar:
+        for nome in args.gerar:
+            for linhas in args.linhas:
+                destino = salvar_dataset(
+                    gerar_dataset(nome, linhas, semente=args.semente),
+                    args.saida / f"{nome}_{linhas}.zip",
+                )
+                print(f"[OK] {destino}")
+        return 0
+
+    casos = filtrar_casos(montar_casos(), args.casos)
+    if args.listar:
+        for caso in casos:
+            print(f"{caso.grupo:<12} {caso.nome}")
+        return 0
+    if not casos:
+        print("[ERRO] Nenhum caso corresponde ao filtro informado")
+        return 2
+
+    relatorio = executar_benchmark(args.linhas, casos, repeticoes=args.repeticoes, semente=args.semente)
+    imprimir_resultados(relatorio)
+
+    destino = salvar_relatorio(relatorio, args.saida)
+    print(f"\n[OK] Resultados salvos em: {destino}")
+
+    if args.referencia:
+        regressoes = comparar_com_referencia(relatorio, carregar_relatorio(args.referencia), args.limite)
+        if regressoes:
+            print(f"\n[FALHA] {len(regressoes)} regressão(ões) acima de {args.limite:.0%}:")
+            for r in regressoes:
+                print(f"  {r['caso']} ({r['linhas']:,} linhas): "
+                      f"{r['referencia']:.3f}s -> {r['atual']:.3f}s (+{r['variacao']:.0%})")
+            return 1
+        print(f"\n[OK] Sem regressões acima de {args.limite:.0%} em relação a {args.referencia}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
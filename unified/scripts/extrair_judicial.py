@@ -7,7 +7,6 @@ Extrai dados judiciais de dois bancos diferentes e combina em um único arquivo.
 import os
 import sys
 import time
-import zipfile
 from datetime import datetime
 from pathlib import Path
 
@@ -21,6 +20,8 @@ sys.path.insert(0, str(ROOT))
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
 
+from src.utils.io import write_csv_to_zip
+
 
 # Query AUTOJUR - Banco Candiotto/Autojur
 SQL_AUTOJUR = """
@@ -144,9 +145,7 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     csv_name = f"ClientesJudiciais_{timestamp}.csv"
     
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        csv_content = unicos.to_csv(index=False, sep=';', encoding='utf-8-sig')
-        zf.writestr(csv_name, csv_content)
+    write_csv_to_zip({csv_name: unicos}, output_file, sep=';', encoding='utf-8', decimal='.')
     
     tempo = time.time() - inicio
     
@@ -4,7 +4,6 @@
 
 import os
 import sys
-import zipfile
 import csv
 import imaplib
 import email
@@ -28,16 +27,20 @@ sys.path.insert(0, str(ROOT))
 # Carregar variáveis de ambiente
 load_dotenv(ROOT / ".env")
 
-# Logger simples
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%H:%M:%S'
+from src.utils.log_estruturado import iniciar_logging, preguicoso
+
+# Logger simples (via fila; grava também no .jsonl do fluxo, se houver)
+iniciar_logging(
+    None,
+    logging.INFO,
+    formato_console=logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S'),
 )
 logger = logging.getLogger(__name__)
 
 # Import do módulo de extração 7-Zip
 from src.utils.archives import ensure_7zip_ready, extract_with_7zip
+from src.utils.imap_idle import CriterioEmail, EsperaEmail
+from src.utils.io import write_csv_to_zip
 
 # Diretórios
 PROJECT_ROOT = ROOT
@@ -358,8 +361,19 @@ class EmailDownloader:
         # Retornar o primeiro arquivo salvo (compatibilidade com cdigo existente)
         return arquivos_salvos[0] if arquivos_salvos else None
     
-    def baixar_emails_tabelionato(self, dias: int = 7) -> List[Tuple[str, str]]:
-        """Baixa emails do Tabelionato dos ltimos N dias."""
+    def aguardar_email(self, minutos: float) -> bool:
+        """Aguarda (IMAP IDLE) o email do dia com remetente e palavras do assunto esperados."""
+        espera = EsperaEmail(
+            conectar=self.conectar_imap,
+            criterio=CriterioEmail(remetente=self.email_sender, tokens_assunto=self.subject_tokens),
+        )
+        return espera.aguardar(minutos * 60) is not None
+
+    def baixar_emails_tabelionato(self, dias: int = 7, aguardar_minutos: float = 0) -> List[Tuple[str, str]]:
+        """Baixa emails do Tabelionato dos ltimos N dias.
+
+        Com ``aguardar_minutos``, espera o email do dia chegar (IMAP IDLE) antes de baixar.
+        """
         logger.info("=" * 60)
         logger.info("   DOWNLOAD AUTOMTICO DE EMAILS - TABELIONATO")
         logger.info("=" * 60)
@@ -367,6 +381,10 @@ class EmailDownloader:
         arquivos_baixados = []
         
         try:
+            if aguardar_minutos > 0 and not self.aguardar_email(aguardar_minutos):
+                logger.warning("Email do dia nao chegou em %.0f min", aguardar_minutos)
+                return arquivos_baixados
+
             # Conectar ao IMAP
             mail = self.conectar_imap()
             
@@ -481,7 +499,7 @@ def processar_arquivo_custas(txt_path: Path, data_hora_email: str, debug: bool =
                         resultado = Decimal(valor_str) if valor_str else Decimal('0.00')
                         return resultado
                     except InvalidOperation as e:
-                        logger.warning(f"Erro ao converter valor '{valor_str}': {e}")
+                        logger.warning("Erro ao converter valor '%s': %s", valor_str, e)
                         return Decimal('0.00')
                 
                 return serie.apply(limpar_valor)
@@ -489,7 +507,7 @@ def processar_arquivo_custas(txt_path: Path, data_hora_email: str, debug: bool =
             df['Valor Total Pago'] = converter_valor(df[custas_col]) + converter_valor(df[cancelamento_col])
             logger.info(f"Coluna 'Valor Total Pago' criada: {custas_col} + {cancelamento_col}")
         else:
-            logger.warning(f"Colunas de valores no encontradas. Disponveis: {list(df.columns)}")
+            logger.warning("Colunas de valores no encontradas. Disponveis: %s", preguicoso(list, df.columns))
         
         # Adicionar data de extracao como coluna e logar
         if not data_hora_email:
@@ -503,19 +521,11 @@ def processar_arquivo_custas(txt_path: Path, data_hora_email: str, debug: bool =
         output_filename = f"RecebimentoCustas_{timestamp}.zip"
         output_path = INPUT_DIR_CUSTAS / output_filename
         
-        # Salvar como CSV temporrio
-        temp_csv = INPUT_DIR_CUSTAS / f"RecebimentoCustas_{timestamp}.csv"
-        df.to_csv(temp_csv, index=False, encoding='utf-8-sig', sep=';')
-        
-        # Criar arquivo ZIP
-        import zipfile
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.write(temp_csv, temp_csv.name)
-        
-        # Remover CSV temporrio imediatamente aps a gerao do ZIP
-        # (o CSV permanece apenas dentro do arquivo compactado)
-        temp_csv.unlink(missing_ok=True)
-        
+        # CSV gravado direto no membro do ZIP (sem CSV temporario em disco)
+        write_csv_to_zip(
+            {f"RecebimentoCustas_{timestamp}.csv": df}, output_path, sep=';', decimal='.'
+        )
+
         tamanho_mb = output_path.stat().st_size / (1024 * 1024)
         logger.info(f"Arquivo de custas processado e salvo como: {output_path}")
         logger.info(f"Tamanho do arquivo: {tamanho_mb:.2f} MB")
@@ -828,13 +838,7 @@ def processar_arquivo_txt(txt_path: Path, data_hora_email: str, debug: bool = Fa
         zip_name = 'Tabelionato.zip'
         zip_path = INPUT_DIR / zip_name
         INPUT_DIR.mkdir(parents=True, exist_ok=True)
-        temp_csv = INPUT_DIR / csv_name
-        df.to_csv(temp_csv, index=False, sep=';', encoding='utf-8-sig')
-
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.write(temp_csv, csv_name)
-
-        temp_csv.unlink(missing_ok=True)
+        write_csv_to_zip({csv_name: df}, zip_path, sep=';', decimal='.')
 
         if debug and inconsistencias:
             inc_df = pd.DataFrame(inconsistencias)
@@ -1094,6 +1098,19 @@ def processar_custas(
 
 
 
+def _minutos_aguardar(argv: List[str]) -> float:
+    """``--aguardar MIN`` (ou TABELIONATO_EMAIL_AGUARDAR_MIN): espera pelo email do dia."""
+    valor = os.getenv('TABELIONATO_EMAIL_AGUARDAR_MIN', '0')
+    if '--aguardar' in argv:
+        posicao = argv.index('--aguardar') + 1
+        valor = argv[posicao] if posicao < len(argv) else '60'
+    try:
+        return float(valor or 0)
+    except ValueError:
+        logger.warning("Valor invalido para --aguardar: %s", valor)
+        return 0.0
+
+
 def main() -> None:
     """Funcao principal."""
 
@@ -1115,7 +1132,9 @@ def main() -> None:
     try:
         logger.info("Tentando baixar emails automaticamente...")
         downloader = EmailDownloader()
-        arquivos_baixados = downloader.baixar_emails_tabelionato(dias=7)
+        arquivos_baixados = downloader.baixar_emails_tabelionato(
+            dias=7, aguardar_minutos=_minutos_aguardar(sys.argv[1:])
+        )
 
         if arquivos_baixados:
             resumo.anexos_baixados = [Path(arquivo).name for arquivo, _ in arquivos_baixados]
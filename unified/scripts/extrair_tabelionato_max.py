@@ -7,7 +7,6 @@ Extrai a base MAX do SQL Server específica para Tabelionato.
 import os
 import sys
 import time
-import zipfile
 from datetime import datetime
 from pathlib import Path
 
@@ -20,6 +19,7 @@ load_dotenv(ROOT / ".env")
 
 from src.loaders.sql_loader import SQLLoader
 from src.core.schemas import LoaderConfig, LoaderType
+from src.utils.io import write_csv_to_zip
 
 # Query SQL para extração Tabelionato MAX
 # MoClientesID = 2746 (Tabelionato)
@@ -112,9 +112,7 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     csv_name = f"MaxSmart_Tabelionato_{timestamp}.csv"
     
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-        csv_content = result.data.to_csv(index=False, sep=';', encoding='utf-8-sig')
-        zf.writestr(csv_name, csv_content)
+    write_csv_to_zip({csv_name: result.data}, output_file, sep=';', encoding='utf-8', decimal='.')
     
     tempo = time.time() - inicio
     
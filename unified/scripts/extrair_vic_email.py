@@ -4,6 +4,7 @@
 Extração VIC - Email
 Extrai a base VIC do anexo de email (candiotto.zip).
 """
+import argparse
 import os
 import sys
 import time
@@ -23,6 +24,14 @@ from src.core.schemas import LoaderConfig, LoaderType
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Extração VIC - Email")
+    parser.add_argument(
+        "--aguardar", type=float, metavar="MIN",
+        default=float(os.getenv("VIC_EMAIL_AGUARDAR_MIN", "0") or 0),
+        help="Aguarda o email do dia via IMAP IDLE por até MIN minutos (padrão: VIC_EMAIL_AGUARDAR_MIN ou 0)",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("  EXTRAÇÃO VIC - BASE CLIENTE (EMAIL)")
     print("=" * 60)
@@ -56,6 +65,8 @@ def main():
     print(f"  Remetente: {sender}")
     print(f"  Assunto: {subject}")
     print(f"  Anexo: {attachment}")
+    if args.aguardar > 0:
+        print(f"  Aguardar: até {args.aguardar:g} min (IMAP IDLE)")
     print()
     
     # Usar EmailLoader
@@ -69,6 +80,7 @@ def main():
             "subject_filter": subject,
             "attachment_pattern": attachment,
             "days_back": 30,
+            "wait_minutes": args.aguardar,
             "encoding": "utf-8-sig",
             "separator": ";",
         }
@@ -19,13 +19,21 @@ Usage:
 from .core import (
     ClientConfig,
     ConfigLoader,
-    PipelineEngine,
-    PipelineResult,
     ProcessorType,
     ValidatorType,
     SplitterType,
     LoaderType,
 )
+from .core.registry import lazy_attributes
+
+# The engine (and pandas) is only imported when used
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "PipelineEngine": ".core.engine:PipelineEngine",
+        "PipelineResult": ".core.engine:PipelineResult",
+    },
+)
 
 __version__ = "1.0.0"
 __all__ = [
@@ -7,22 +7,16 @@ from __future__ import annotations
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from flask import Flask, jsonify, request
 
-from ..core import (
-    ConfigLoader,
-    PipelineEngine,
-    ProcessorType,
-)
-from ..processors import (
-    TratamentoProcessor,
-    BatimentoProcessor,
-    BaixaProcessor,
-    DevolucaoProcessor,
-    EnriquecimentoProcessor,
-)
+from ..core import ConfigLoader
+
+if TYPE_CHECKING:
+    from ..core import PipelineEngine
+    from ..core.daemon import PipelineDaemon
 
 
 # Initialize Flask app
@@ -35,25 +29,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global configuration
+# Global configuration (parsed client configs are cached process-wide by
+# core.config.CONFIG_REGISTRY and re-read only when a file changes)
 CONFIG_DIR = Path("./configs/clients")
 OUTPUT_DIR = Path("./output")
 
 
-def get_engine() -> PipelineEngine:
-    """Create and configure a pipeline engine."""
-    engine = PipelineEngine(config_dir=CONFIG_DIR, output_dir=OUTPUT_DIR)
+@lru_cache(maxsize=None)
+def get_engine() -> "PipelineEngine":
+    """Pipeline engine shared by the requests (built on first use).
 
-    # Register processors
-    engine.register_processor(ProcessorType.TRATAMENTO, TratamentoProcessor)
-    engine.register_processor(ProcessorType.BATIMENTO, BatimentoProcessor)
-    engine.register_processor(ProcessorType.BAIXA, BaixaProcessor)
-    engine.register_processor(ProcessorType.DEVOLUCAO, DevolucaoProcessor)
-    engine.register_processor(ProcessorType.ENRIQUECIMENTO, EnriquecimentoProcessor)
+    The engine and pandas are imported here, not at module import, so the
+    health check and client listing respond without loading them.
+    """
+    from ..core import PipelineEngine
 
+    engine = PipelineEngine(config_dir=CONFIG_DIR, output_dir=OUTPUT_DIR)
+    engine.register_standard_processors()
     return engine
 
 
+@lru_cache(maxsize=None)
+def get_daemon() -> "PipelineDaemon":
+    """Worker pool running async jobs on the shared engine."""
+    from ..core.daemon import PipelineDaemon
+
+    return PipelineDaemon(CONFIG_DIR, OUTPUT_DIR, engine=get_engine())
+
+
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint."""
@@ -142,6 +145,7 @@ def run_pipeline(client_name: str):
     {
         "processors": ["tratamento", "batimento"],  // optional: specific processors
         "output_format": "zip",  // optional: output format
+        "resume": true,  // optional: reuse checkpointed stages
     }
     """
     try:
@@ -152,7 +156,7 @@ def run_pipeline(client_name: str):
 
         # Create engine and run
         engine = get_engine()
-        result = engine.run(client_name)
+        result = engine.run(client_name, resume=bool(params.get("resume", False)))
 
         # Build response
         response = {
@@ -185,25 +189,24 @@ def run_pipeline_async(client_name: str):
     Start pipeline execution asynchronously.
     Returns a job ID that can be used to check status.
 
-    Note: This is a placeholder for async execution.
-    In production, use Celery or similar task queue.
+    Jobs run in the API process's worker pool (warm engine, see
+    core.daemon.PipelineDaemon).
     """
     try:
-        # For now, just validate the client exists
-        loader = ConfigLoader(CONFIG_DIR)
-        config = loader.load(client_name)
+        params = request.get_json(silent=True) or {}
 
-        # Generate job ID
-        job_id = f"{client_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Validate the client exists before queueing
+        loader = ConfigLoader(CONFIG_DIR)
+        loader.load(client_name)
 
-        # TODO: In production, queue the job with Celery/RQ
-        logger.info(f"Async job created: {job_id}")
+        job = get_daemon().submit(client_name, resume=bool(params.get("resume", False)))
+        logger.info(f"Async job created: {job.job_id}")
 
         return jsonify({
             "success": True,
-            "job_id": job_id,
+            "job_id": job.job_id,
             "client": client_name,
-            "status": "queued",
+            "status": job.status,
             "message": "Pipeline execution queued. Use /jobs/{job_id} to check status.",
         }), 202
 
@@ -217,16 +220,16 @@ def run_pipeline_async(client_name: str):
 
 @app.route("/jobs/<job_id>", methods=["GET"])
 def get_job_status(job_id: str):
-    """
-    Get status of an async job.
+    """Get status of an async job."""
+    job = get_daemon().get(job_id)
+    if job is None:
+        return jsonify({
+            "success": False,
+            "job_id": job_id,
+            "error": "Unknown job",
+        }), 404
 
-    Note: Placeholder for job status tracking.
-    """
-    return jsonify({
-        "job_id": job_id,
-        "status": "not_implemented",
-        "message": "Async job tracking not yet implemented",
-    }), 501
+    return jsonify({"success": True, **job.to_dict()})
 
 
 @app.route("/validate/<client_name>", methods=["POST"])
@@ -303,6 +306,8 @@ def create_app(config_dir: str = None, output_dir: str = None) -> Flask:
         CONFIG_DIR = Path(config_dir)
     if output_dir:
         OUTPUT_DIR = Path(output_dir)
+    get_engine.cache_clear()
+    get_daemon.cache_clear()
 
     return app
 
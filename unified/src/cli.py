@@ -1,56 +1,54 @@
 """
 CLI interface for the Unified Pipeline System.
 Provides command-line access to run pipelines for clients.
+
+The engine, processors and pandas are only imported by the commands that
+need them, so ``list``, ``validate`` and ``--help`` start instantly.
 """
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .core import (
-    ConfigLoader,
-    PipelineEngine,
-    ProcessorType,
-)
-from .processors import (
-    TratamentoProcessor,
-    BatimentoProcessor,
-    BaixaProcessor,
-    DevolucaoProcessor,
-    EnriquecimentoProcessor,
-)
-
+from .core import ConfigLoader
+from .core.daemon import DEFAULT_SOCKET
+from .utils.log_estruturado import iniciar_logging
 
-def setup_logging(level: str = "INFO", log_file: Path | None = None) -> None:
-    """Configure logging for the CLI."""
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+if TYPE_CHECKING:
+    from .core import PipelineEngine
 
-    if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
 
-    logging.basicConfig(
-        level=getattr(logging, level.upper(), logging.INFO),
-        format=log_format,
-        handlers=handlers,
+def setup_logging(level: str = "INFO", log_file: Path | None = None) -> None:
+    """Configure logging for the CLI.
+
+    Records are written by a queue listener thread; ``--log-file`` also
+    produces a JSON-lines log next to it (``<log file>.jsonl``).
+    """
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    iniciar_logging(
+        None,
+        getattr(logging, level.upper(), logging.INFO),
+        formato_console=formatter,
+        arquivo_texto=log_file,
+        formato_arquivo=formatter,
+        arquivo_jsonl=log_file.with_suffix(".jsonl") if log_file else None,
     )
 
 
-def register_processors(engine: PipelineEngine) -> None:
-    """Register all standard processors with the engine."""
-    engine.register_processor(ProcessorType.TRATAMENTO, TratamentoProcessor)
-    engine.register_processor(ProcessorType.BATIMENTO, BatimentoProcessor)
-    engine.register_processor(ProcessorType.BAIXA, BaixaProcessor)
-    engine.register_processor(ProcessorType.DEVOLUCAO, DevolucaoProcessor)
-    engine.register_processor(ProcessorType.ENRIQUECIMENTO, EnriquecimentoProcessor)
+def register_processors(engine: "PipelineEngine") -> None:
+    """Register all standard processors with the engine (imported on first use)."""
+    engine.register_standard_processors()
 
 
 def cmd_run(args: argparse.Namespace) -> int:
     """Run pipeline for a client."""
+    from .core import PipelineEngine, StageProfiler
+
     config_dir = Path(args.config_dir)
     output_dir = Path(args.output_dir)
 
@@ -61,14 +59,30 @@ def cmd_run(args: argparse.Namespace) -> int:
     setup_logging(args.log_level, log_file)
 
     logger = logging.getLogger(__name__)
-    logger.info(f"Starting pipeline for client: {args.client}")
+    logger.info("Starting pipeline for client: %s", args.client)
+
+    # Optional per-stage profiler, written under the client's output directory
+    profiler = None
+    if args.profile:
+        profiler = StageProfiler.for_run(
+            output_dir / args.client,
+            mode=args.profile,
+            top=args.profile_top,
+            memory=args.profile_memory,
+        )
 
     # Initialize engine
-    engine = PipelineEngine(config_dir=config_dir, output_dir=output_dir)
+    engine = PipelineEngine(
+        config_dir=config_dir,
+        output_dir=output_dir,
+        profiler=profiler,
+        memory_budget=args.memory_budget,
+    )
     register_processors(engine)
 
     # Run pipeline
-    result = engine.run(args.client)
+    result = engine.run(args.client, resume=args.resume, full=args.full)
+    profile_summary = profiler.write_summary() if profiler else None
 
     # Print results
     print("\n" + "=" * 60)
@@ -79,6 +93,16 @@ def cmd_run(args: argparse.Namespace) -> int:
     print(f"Client records: {result.summary.get('client_records', 0)}")
     print(f"MAX records: {result.summary.get('max_records', 0)}")
     print(f"Errors: {result.summary.get('errors', 0)}")
+    resumed = result.context.metadata.get("resumed_stages")
+    if resumed:
+        print(f"Resumed stages: {', '.join(resumed)}")
+    memory = result.summary.get("memory")
+    if memory:
+        print(
+            f"Memory budget: {memory['budget_bytes'] / 1e6:.0f} MB "
+            f"(peak {memory['peak_live_bytes'] / 1e6:.0f} MB, {memory['spills']} spills, "
+            f"{memory['chunked_passes']} out-of-core passes)"
+        )
 
     if result.context.outputs:
         print("\nOutput files:")
@@ -90,6 +114,9 @@ def cmd_run(args: argparse.Namespace) -> int:
         for error in result.context.errors:
             print(f"  - {error}")
 
+    if profile_summary:
+        print(f"\nProfile: {profile_summary}")
+
     print("=" * 60)
 
     return 0 if result.success else 1
@@ -165,6 +192,145 @@ def cmd_validate(args: argparse.Namespace) -> int:
         return 1
 
 
+def cmd_diff(args: argparse.Namespace) -> int:
+    """Compare two datasets by key (streaming, bounded memory)."""
+    from .utils.dataset_diff import comparar_datasets
+
+    setup_logging(args.log_level)
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    result = comparar_datasets(
+        Path(args.left),
+        Path(args.right),
+        args.key,
+        colunas=args.columns,
+        sep=args.sep,
+        encoding=args.encoding,
+        particoes=args.partitions,
+        amostra=args.sample,
+        saida_amostra=output_dir / f"diff_{stamp}_amostra.csv",
+    )
+    result["esquerda"] = str(args.left)
+    result["direita"] = str(args.right)
+    report = output_dir / f"diff_{stamp}.json"
+    report.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    missing_keys = result["chaves_ausentes"]
+    differences = result["adicionadas"] + result["removidas"] + result["alteradas"]
+    differences += len(missing_keys["esquerda"]) + len(missing_keys["direita"])
+    print("\n" + "=" * 60)
+    print(f"Diff: {args.left} -> {args.right}")
+    print("=" * 60)
+    print(f"Key: {', '.join(args.key)}")
+    for side, columns in (("left", missing_keys["esquerda"]), ("right", missing_keys["direita"])):
+        if columns:
+            print(f"Key columns missing on {side}: {', '.join(columns)}")
+    print(f"Left records: {result['registros_esquerda']:,}")
+    print(f"Right records: {result['registros_direita']:,}")
+    print(f"Added keys: {result['adicionadas']:,}")
+    print(f"Removed keys: {result['removidas']:,}")
+    print(f"Changed keys: {result['alteradas']:,}")
+    print(f"Unchanged keys: {result['iguais']:,}")
+    if result["duplicadas_esquerda"] or result["duplicadas_direita"]:
+        print(
+            f"Duplicate keys (first occurrence compared): "
+            f"left={result['duplicadas_esquerda']:,} right={result['duplicadas_direita']:,}"
+        )
+    if result["alteracoes_por_coluna"]:
+        print("\nChanges per column:")
+        for column, count in sorted(result["alteracoes_por_coluna"].items(), key=lambda kv: -kv[1]):
+            print(f"  - {column}: {count:,}")
+    for side, columns in (("left", result["colunas_apenas_esquerda"]), ("right", result["colunas_apenas_direita"])):
+        if columns:
+            print(f"Columns only on {side}: {', '.join(columns)}")
+    print(f"\nReport: {report}")
+    if result.get("arquivo_amostra"):
+        print(f"Sample: {result['arquivo_amostra']}")
+    print("=" * 60)
+
+    return 1 if args.fail_on_diff and differences else 0
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """Keep a warm engine resident and serve run requests on a Unix socket."""
+    from .core.daemon import serve
+
+    setup_logging(args.log_level, Path(args.log_file) if args.log_file else None)
+    serve(args.config_dir, args.output_dir, socket_path=args.socket, workers=args.workers)
+    return 0
+
+
+def cmd_submit(args: argparse.Namespace) -> int:
+    """Submit a run (or a control request) to a running daemon."""
+    from .core.daemon import request_daemon
+
+    if args.client in ("ping", "jobs", "shutdown"):
+        payload = {"action": args.client}
+    else:
+        payload = {"action": "run", "client": args.client, "resume": args.resume, "wait": args.wait}
+    try:
+        response = request_daemon(payload, args.socket)
+    except OSError as e:
+        print(f"Daemon not reachable at {args.socket}: {e}")
+        return 2
+
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+    job = response.get("job") or {}
+    if args.wait and job:
+        return 0 if job.get("status") == "success" else 1
+    return 0 if response.get("success") else 1
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    """Run client pipelines as soon as their input files land."""
+    from .core.watcher import FileWatcher, parse_rule, rules_from_configs
+
+    setup_logging(args.log_level, Path(args.log_file) if args.log_file else None)
+    logger = logging.getLogger(__name__)
+
+    rules = [parse_rule(spec) for spec in args.map] if args.map else rules_from_configs(args.config_dir)
+    if args.client:
+        rules = [rule for rule in rules if rule.client in args.client]
+    if not rules:
+        print("No input directories to watch.")
+        return 1
+    for rule in rules:
+        logger.info("Watching %s/%s -> %s", rule.directory, rule.pattern, rule.client)
+
+    if args.socket:
+        from .core.daemon import request_daemon
+
+        def trigger(client: str, _paths: list[Path]) -> None:
+            response = request_daemon(
+                {"action": "run", "client": client, "resume": True, "coalesce": True}, args.socket
+            )
+            logger.info("Submitted %s to daemon: %s", client, response.get("job", response).get("job_id"))
+    else:
+        from .core.daemon import PipelineDaemon
+
+        daemon = PipelineDaemon(args.config_dir, args.output_dir, workers=args.workers)
+        daemon.warm()
+
+        def trigger(client: str, _paths: list[Path]) -> None:
+            job = daemon.submit(client, resume=True, coalesce=True)
+            logger.info("Queued %s (%s)", client, job.job_id)
+
+    watcher = FileWatcher(
+        rules,
+        trigger,
+        settle_seconds=args.settle,
+        require_marker=args.require_marker,
+        polling=args.poll,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
 def main() -> int:
     """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(
@@ -183,6 +349,20 @@ Examples:
 
   # Validate a client configuration
   python -m unified.src.cli validate vic
+
+  # Profile each stage (cProfile .prof files + hot-function summary)
+  python -m unified.src.cli run vic --profile --profile-memory
+
+  # Compare a release output with the previous one by key
+  python -m unified.src.cli diff old/vic_tratada.zip new/vic_tratada.zip --key CHAVE
+
+  # Warm worker: start once, then submit runs without interpreter cold start
+  python -m unified.src.cli daemon --workers 2 &
+  python -m unified.src.cli submit vic --wait
+
+  # Start pipelines as soon as their inputs land (resume: only changed stages run)
+  python -m unified.src.cli watch --settle 10
+  python -m unified.src.cli watch --map "data/input/vic/*.zip=vic" --require-marker
         """,
     )
 
@@ -217,6 +397,41 @@ Examples:
         default=None,
         help="Log file path (optional)",
     )
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse checkpointed stages whose inputs are unchanged",
+    )
+    run_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Enrichment re-emits every contact, ignoring the sent-contacts history",
+    )
+    run_parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        default=None,
+        choices=["cprofile", "sampling"],
+        help="Profile each stage into <output-dir>/<client>/profile/ (default: cprofile)",
+    )
+    run_parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Hot functions listed per stage in the profile summary",
+    )
+    run_parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Also snapshot allocations per stage with tracemalloc",
+    )
+    run_parser.add_argument(
+        "--memory-budget",
+        type=str,
+        default=None,
+        help="Max memory for pipeline frames, e.g. 2GB; colder frames spill to disk (env PIPELINE_MEMORY_BUDGET)",
+    )
     run_parser.set_defaults(func=cmd_run)
 
     # List command
@@ -228,6 +443,163 @@ Examples:
     validate_parser.add_argument("client", type=str, help="Client name to validate")
     validate_parser.set_defaults(func=cmd_validate)
 
+    # Diff command
+    diff_parser = subparsers.add_parser("diff", help="Compare two datasets by key")
+    diff_parser.add_argument("left", type=str, help="Reference dataset (ZIP, CSV or Parquet)")
+    diff_parser.add_argument("right", type=str, help="Dataset to compare (ZIP, CSV or Parquet)")
+    diff_parser.add_argument(
+        "--key",
+        action="append",
+        required=True,
+        help="Key column (repeat for composite keys)",
+    )
+    diff_parser.add_argument(
+        "--columns",
+        nargs="+",
+        default=None,
+        help="Columns to compare (default: all common non-key columns)",
+    )
+    diff_parser.add_argument("--sep", type=str, default=";", help="CSV separator")
+    diff_parser.add_argument("--encoding", type=str, default="utf-8-sig", help="CSV encoding")
+    diff_parser.add_argument(
+        "--sample",
+        type=int,
+        default=100,
+        help="Keys per difference type written to the sample CSV",
+    )
+    diff_parser.add_argument(
+        "--partitions",
+        type=int,
+        default=16,
+        help="On-disk hash partitions (more partitions, less memory)",
+    )
+    diff_parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="./output/diff",
+        help="Directory for the JSON report and the sample CSV",
+    )
+    diff_parser.add_argument(
+        "--fail-on-diff",
+        action="store_true",
+        help="Exit with status 1 when any key was added, removed or changed",
+    )
+    diff_parser.add_argument(
+        "--log-level",
+        type=str,
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level",
+    )
+    diff_parser.set_defaults(func=cmd_diff)
+
+    # Daemon command
+    daemon_parser = subparsers.add_parser("daemon", help="Run a warm pipeline worker on a Unix socket")
+    daemon_parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="./output",
+        help="Output directory for results",
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        type=str,
+        default=str(DEFAULT_SOCKET),
+        help="Unix socket path",
+    )
+    daemon_parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Concurrent pipeline runs (runs of the same client are serialized)",
+    )
+    daemon_parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level",
+    )
+    daemon_parser.add_argument(
+        "--log-file",
+        type=str,
+        default=None,
+        help="Log file path (optional)",
+    )
+    daemon_parser.set_defaults(func=cmd_daemon)
+
+    # Submit command
+    submit_parser = subparsers.add_parser("submit", help="Send a run request to a running daemon")
+    submit_parser.add_argument("client", type=str, help="Client name, or ping/jobs/shutdown")
+    submit_parser.add_argument(
+        "--socket",
+        type=str,
+        default=str(DEFAULT_SOCKET),
+        help="Unix socket path",
+    )
+    submit_parser.add_argument("--resume", action="store_true", help="Reuse unchanged checkpointed stages")
+    submit_parser.add_argument("--wait", action="store_true", help="Block until the run finishes")
+    submit_parser.set_defaults(func=cmd_submit)
+
+    # Watch command
+    watch_parser = subparsers.add_parser("watch", help="Trigger pipelines when input files land")
+    watch_parser.add_argument(
+        "--map",
+        action="append",
+        default=None,
+        help="DIR=CLIENT or DIR/PATTERN=CLIENT (repeatable; default: input paths of every client config)",
+    )
+    watch_parser.add_argument(
+        "--client",
+        action="append",
+        default=None,
+        help="Only watch inputs of this client (repeatable)",
+    )
+    watch_parser.add_argument(
+        "--settle",
+        type=float,
+        default=5.0,
+        help="Seconds a file's size/mtime must stay unchanged before it is considered complete",
+    )
+    watch_parser.add_argument(
+        "--require-marker",
+        action="store_true",
+        help="Only a <file>.done marker completes a file",
+    )
+    watch_parser.add_argument("--poll", action="store_true", help="Use polling instead of inotify")
+    watch_parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Submit to a running daemon on this socket instead of running jobs in-process",
+    )
+    watch_parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="./output",
+        help="Output directory for results (in-process jobs)",
+    )
+    watch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Concurrent pipeline runs (in-process jobs)",
+    )
+    watch_parser.add_argument(
+        "--log-level",
+        type=str,
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging level",
+    )
+    watch_parser.add_argument(
+        "--log-file",
+        type=str,
+        default=None,
+        help="Log file path (optional)",
+    )
+    watch_parser.set_defaults(func=cmd_watch)
+
     args = parser.parse_args()
 
     if not args.command:
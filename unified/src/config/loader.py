@@ -7,18 +7,51 @@ Fornece uma API consistente para carregar o `config.yaml` com
 expansão de variáveis de ambiente e defaults seguros, além de
 helpers para acesso a chaves aninhadas. Mantém compatibilidade
 com o helper antigo `load_cfg()`.
+
+O resultado (YAML lido, defaults mesclados e ``${ENV}`` expandidas) fica
+em cache no processo e só é recalculado quando o arquivo muda (mtime ou
+tamanho) ou quando alguma variável de ambiente referenciada muda. Cada
+chamada recebe uma cópia, que pode ser alterada livremente.
 """
 
 from __future__ import annotations
 
 import os
 import re
+import threading
 from copy import deepcopy
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 
 import yaml
 
+_PADRAO_ENV = re.compile(r"\$\{([^}]+)\}")
+
+
+@dataclass
+class _ConfigEmCache:
+    assinatura: Optional[Tuple[int, int]]
+    variaveis: Tuple[str, ...]
+    valores: Tuple[Optional[str], ...]
+    config: Dict[str, Any]
+
+
+_cache_config: Dict[Tuple[str, bool], _ConfigEmCache] = {}
+_trava_cache = threading.Lock()
+
+
+def _assinatura(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _valores_env(variaveis: Tuple[str, ...]) -> Tuple[Optional[str], ...]:
+    return tuple(os.environ.get(var) for var in variaveis)
+
 
 class ConfigLoader:
     """Loader de configuração com API de classe e instância.
@@ -89,6 +122,20 @@ class ConfigLoader:
         'comparacao': {
             'legacy_dir': ''
         },
+        # Extração MAX/VIC: 'udf' (consulta original) ou 'dimensoes' (cache local)
+        'extracao': {
+            'modo': 'udf',
+            'cache_dimensoes': 'data/cache/dimensoes',
+            'validade_horas': 24,
+        },
+        'execution': {
+            'backend': 'pandas',
+            'memory_limit': None,
+            'threads': None,
+            'temp_dir': None,
+            'workers': 0,
+            'min_rows': 100000,
+        },
         'logging': {
             'level': 'INFO',
             'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -122,19 +169,44 @@ class ConfigLoader:
 
     # -------- API de Instância --------
     def load_config(self) -> Dict[str, Any]:
-        """Carrega o arquivo YAML aplicando defaults e expansão opcional."""
+        """Carrega o arquivo YAML aplicando defaults e expansão opcional.
+
+        Reaproveita o cache do processo enquanto arquivo e variáveis de
+        ambiente referenciadas não mudarem.
+        """
+        chave = (str(self.config_path.resolve()), self.expand_env)
+        assinatura = _assinatura(self.config_path)
+        with _trava_cache:
+            item = _cache_config.get(chave)
+        if item is None or item.assinatura != assinatura or item.valores != _valores_env(item.variaveis):
+            cfg, variaveis = self._compilar()
+            item = _ConfigEmCache(assinatura, variaveis, _valores_env(variaveis), cfg)
+            with _trava_cache:
+                _cache_config[chave] = item
+        self._config = deepcopy(item.config)
+        return self._config
+
+    def _compilar(self) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+        """YAML + defaults + ``${ENV}``; retorna também as variáveis referenciadas."""
         raw = self._read_yaml(self.config_path)
         if raw is None:
             raw = {}
         cfg = self._merge_defaults(raw)
+        variaveis: Tuple[str, ...] = ()
         if self.expand_env:
+            variaveis = tuple(sorted(self._env_referenciadas(cfg)))
             cfg = self._expand_env_in_dict(cfg)
         # Duplicar flags de timestamp para compatibilidade entre nomes
         add_ts = cfg.get('global', {}).get('add_timestamp_to_files', True)
         cfg['global']['add_timestamp_to_files'] = bool(add_ts)
         cfg['global']['add_timestamp'] = bool(add_ts)
-        self._config = cfg
-        return cfg
+        return cfg, variaveis
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Descarta as configurações em cache (força releitura)."""
+        with _trava_cache:
+            _cache_config.clear()
 
     # Alias amigável às chamadas existentes no código
     def get_config(self) -> Dict[str, Any]:
@@ -193,17 +265,29 @@ class ConfigLoader:
 
         return merge(cls.DEFAULTS, raw or {})
 
+    @staticmethod
+    def _env_referenciadas(data: Any) -> Set[str]:
+        """Nomes das variáveis ``${VAR}`` usadas em ``data``."""
+        if isinstance(data, str):
+            return set(_PADRAO_ENV.findall(data))
+        if isinstance(data, dict):
+            data = data.values()
+        elif not isinstance(data, list):
+            return set()
+        nomes: Set[str] = set()
+        for valor in data:
+            nomes |= ConfigLoader._env_referenciadas(valor)
+        return nomes
+
     @classmethod
     def _expand_env_in_dict(cls, data: Dict[str, Any]) -> Dict[str, Any]:
         """Expande padrões ${VAR} em todas as strings do dicionário."""
-        pattern = re.compile(r"\$\{([^}]+)\}")
-
         def expand(value: Any) -> Any:
             if isinstance(value, str):
                 def repl(m: re.Match[str]) -> str:
                     var = m.group(1)
                     return os.environ.get(var, m.group(0))
-                return pattern.sub(repl, value)
+                return _PADRAO_ENV.sub(repl, value)
             if isinstance(value, dict):
                 return {k: expand(v) for k, v in value.items()}
             if isinstance(value, list):
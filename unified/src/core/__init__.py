@@ -19,40 +19,66 @@ from .schemas import (
     ValidatorType,
 )
 
-from .base import (
-    BaseValidator,
-    BaseSplitter,
-    BaseLoader,
-    BaseProcessor,
-    BaseKeyGenerator,
-    BaseClientExtension,
-    ValidationResult,
-    SplitResult,
-    LoaderResult,
-    ProcessorResult,
-)
-
 from .config import (
+    CONFIG_REGISTRY,
+    CompiledConfig,
     ConfigLoader,
     ConfigError,
+    ConfigRegistry,
     load_client_config,
 )
 
-from .keys import (
-    CompositeKeyGenerator,
-    ColumnKeyGenerator,
-    CustomKeyGenerator,
-    create_key_generator,
-    register_key_generator,
+from .registry import (
+    LazyRegistry,
+    lazy_attributes,
 )
 
-from .engine import (
-    PipelineEngine,
-    PipelineContext,
-    PipelineResult,
+# Everything below needs pandas (or the loaders/validators behind the
+# engine) and is imported on first access, keeping ``list``/``validate``
+# and the API health check fast.
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        # Base classes
+        "BaseValidator": ".base:BaseValidator",
+        "BaseSplitter": ".base:BaseSplitter",
+        "BaseLoader": ".base:BaseLoader",
+        "BaseProcessor": ".base:BaseProcessor",
+        "BaseKeyGenerator": ".base:BaseKeyGenerator",
+        "BaseClientExtension": ".base:BaseClientExtension",
+        "ValidationResult": ".base:ValidationResult",
+        "CountedMessage": ".base:CountedMessage",
+        "SplitResult": ".base:SplitResult",
+        "LoaderResult": ".base:LoaderResult",
+        "ProcessorResult": ".base:ProcessorResult",
+        # Keys
+        "CompositeKeyGenerator": ".keys:CompositeKeyGenerator",
+        "ColumnKeyGenerator": ".keys:ColumnKeyGenerator",
+        "CustomKeyGenerator": ".keys:CustomKeyGenerator",
+        "create_key_generator": ".keys:create_key_generator",
+        "register_key_generator": ".keys:register_key_generator",
+        # Checkpoints
+        "Checkpoint": ".checkpoint:Checkpoint",
+        "CheckpointStore": ".checkpoint:CheckpointStore",
+        "stage_key": ".checkpoint:stage_key",
+        # Profiling
+        "StageProfiler": ".profiling:StageProfiler",
+        "profile_stage": ".profiling:profile_stage",
+        # Memory budget
+        "FrameStore": ".memory:FrameStore",
+        "parse_size": ".memory:parse_size",
+        # Projection
+        "ColumnProjection": ".projection:ColumnProjection",
+        "referenced_columns": ".projection:referenced_columns",
+        # Matching
+        "PatternMatcher": ".matching:PatternMatcher",
+        # Engine
+        "PipelineEngine": ".engine:PipelineEngine",
+        "PipelineContext": ".engine:PipelineContext",
+        "PipelineResult": ".engine:PipelineResult",
+    },
 )
 
-
 __all__ = [
     # Schemas
     "ClientConfig",
@@ -81,15 +107,36 @@ __all__ = [
     "LoaderResult",
     "ProcessorResult",
     # Config
+    "CONFIG_REGISTRY",
+    "CompiledConfig",
     "ConfigLoader",
     "ConfigError",
+    "ConfigRegistry",
     "load_client_config",
+    # Registries
+    "LazyRegistry",
+    "lazy_attributes",
     # Keys
     "CompositeKeyGenerator",
     "ColumnKeyGenerator",
     "CustomKeyGenerator",
     "create_key_generator",
     "register_key_generator",
+    # Checkpoints
+    "Checkpoint",
+    "CheckpointStore",
+    "stage_key",
+    # Profiling
+    "StageProfiler",
+    "profile_stage",
+    # Memory budget
+    "FrameStore",
+    "parse_size",
+    # Projection
+    "ColumnProjection",
+    "referenced_columns",
+    # Matching
+    "PatternMatcher",
     # Engine
     "PipelineEngine",
     "PipelineContext",
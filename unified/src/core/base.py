@@ -7,17 +7,42 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterator, Mapping
 
+import numpy as np
 import pandas as pd
 
 if TYPE_CHECKING:
+    from .projection import ColumnProjection
     from .schemas import ClientConfig, ValidatorConfig, SplitterConfig, LoaderConfig
 
 
+class CountedMessage(str):
+    """
+    Validator message that carries its record count.
+
+    The string value is ``template`` with ``{count}`` replaced, so
+    ``ValidationResult.errors`` stays a list of plain-looking strings; the
+    engine sums ``count`` per ``template`` when it validates in slices.
+    """
+
+    template: str
+    count: int
+
+    def __new__(cls, template: str, count: int) -> CountedMessage:
+        count = int(count)
+        message = super().__new__(cls, template.replace("{count}", str(count)))
+        message.template = template
+        message.count = count
+        return message
+
+    def __getnewargs__(self) -> tuple[str, int]:
+        return self.template, self.count
+
+
 @dataclass
 class ValidationResult:
-    """Result of a validation operation."""
+    """Result of a validation operation; count-bearing errors are ``CountedMessage``."""
     valid: pd.DataFrame
     invalid: pd.DataFrame
     errors: list[str]
@@ -31,17 +56,97 @@ class ValidationResult:
         return len(self.invalid)
 
 
-@dataclass
 class SplitResult:
-    """Result of a split operation."""
-    splits: dict[str, pd.DataFrame]
+    """
+    Result of a split operation.
+
+    Groups built with ``from_positions``/``from_masks`` are row positions
+    into the parent frame; a group's frame is only materialized when it is
+    requested (``splits[name]``, ``get``) and is not cached. ``iter_chunks``
+    yields a group in row slices so exporters can stream it without ever
+    holding the whole group. Frames passed directly (``SplitResult(splits=
+    {...})``) are kept as given.
+    """
+
+    def __init__(self, splits: Mapping[str, pd.DataFrame] | None = None):
+        self._source: pd.DataFrame | None = None
+        self._groups: dict[str, pd.DataFrame | np.ndarray] = dict(splits or {})
+
+    @classmethod
+    def from_positions(
+        cls, source: pd.DataFrame, positions: Mapping[str, Any]
+    ) -> "SplitResult":
+        result = cls()
+        result._source = source
+        result._groups = {
+            name: np.asarray(pos, dtype=np.intp) for name, pos in positions.items()
+        }
+        return result
+
+    @classmethod
+    def from_masks(cls, source: pd.DataFrame, masks: Mapping[str, Any]) -> "SplitResult":
+        return cls.from_positions(
+            source, {name: np.flatnonzero(np.asarray(mask, dtype=bool)) for name, mask in masks.items()}
+        )
+
+    def _materialize(self, name: str) -> pd.DataFrame:
+        group = self._groups[name]
+        if isinstance(group, np.ndarray):
+            return self._source.iloc[group]
+        return group
+
+    @property
+    def splits(self) -> "SplitView":
+        return SplitView(self)
 
     def get(self, name: str, default: pd.DataFrame | None = None) -> pd.DataFrame:
-        return self.splits.get(name, default or pd.DataFrame())
+        if name in self._groups:
+            return self._materialize(name)
+        return default if default is not None else pd.DataFrame()
 
     @property
     def names(self) -> list[str]:
-        return list(self.splits.keys())
+        return list(self._groups.keys())
+
+    @property
+    def sizes(self) -> dict[str, int]:
+        return {name: len(group) for name, group in self._groups.items()}
+
+    def iter_chunks(self, name: str, chunk_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Yield group ``name`` in slices of ``chunk_rows`` (one empty slice if empty)."""
+        group = self._groups[name]
+        total = len(group)
+        for start in range(0, max(total, 1), chunk_rows):
+            if isinstance(group, np.ndarray):
+                yield self._source.iloc[group[start:start + chunk_rows]]
+            else:
+                yield group.iloc[start:start + chunk_rows]
+
+    def rename(self, names: Mapping[str, str]) -> "SplitResult":
+        """The groups in ``names`` (no copy), in that order, under their new names."""
+        result = SplitResult()
+        result._source = self._source
+        result._groups = {new: self._groups[old] for old, new in names.items()}
+        return result
+
+
+class SplitView(Mapping[str, pd.DataFrame]):
+    """Read-only ``name -> DataFrame`` view of a ``SplitResult``, materialized on access."""
+
+    def __init__(self, result: SplitResult):
+        self._result = result
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        return self._result._materialize(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._result.names)
+
+    def __len__(self) -> int:
+        return len(self._result.names)
+
+    def iter_chunks(self, name: str, chunk_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+        return self._result.iter_chunks(name, chunk_rows)
 
 
 @dataclass
@@ -64,6 +169,9 @@ class ProcessorResult:
 class BaseValidator(ABC):
     """Abstract base class for data validators."""
 
+    # Each row is judged on its own (the engine may validate in slices)
+    row_local: bool = True
+
     def __init__(self, config: ValidatorConfig):
         self.config = config
         self.enabled = config.enabled
@@ -108,6 +216,8 @@ class BaseLoader(ABC):
         self.config = config
         self.client_config = client_config
         self.params = config.params
+        # Columns to parse; set by the engine (None = all columns)
+        self.projection: ColumnProjection | None = None
 
     @abstractmethod
     def load(self) -> LoaderResult:
@@ -124,6 +234,10 @@ class BaseLoader(ABC):
 class BaseProcessor(ABC):
     """Abstract base class for pipeline processors."""
 
+    # Input columns used beyond those named in params; None (default) reads
+    # all columns, a tuple opts the processor into column projection
+    input_columns: tuple[str, ...] | None = None
+
     def __init__(self, client_config: ClientConfig, params: dict[str, Any] | None = None):
         self.client_config = client_config
         self.params = params or {}
@@ -148,6 +262,9 @@ class BaseProcessor(ABC):
 class BaseKeyGenerator(ABC):
     """Abstract base class for CHAVE (key) generators."""
 
+    # Each key depends only on its own row (the engine may generate in slices)
+    row_local: bool = True
+
     @abstractmethod
     def generate(self, df: pd.DataFrame) -> pd.DataFrame:
         """Generate keys and add them to the dataframe."""
@@ -0,0 +1,253 @@
+"""
+Stage checkpoints for resumable pipeline runs.
+
+Every stage that finishes successfully records a checkpoint keyed by the
+content hashes of its inputs (plus any parameters that affect its output).
+When a run is resumed, stages whose key is unchanged and whose persisted
+outputs are still intact are skipped and their recorded result is reused.
+Frames saved with a checkpoint are written as Arrow IPC files; frames
+already spilled to disk are linked from their scratch files as-is.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+import pandas as pd
+
+from ..utils.catalog import hash_conteudo, metadados_dataset, resolver_mais_recente
+from .memory import copy_frame_file, read_frame, write_frame
+from .profiling import StageProfiler, profile_stage
+
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIRNAME = ".checkpoints"
+
+
+def file_fingerprint(path: Path | str) -> str:
+    """Content hash of a file, reusing the dataset catalog entry when valid."""
+    entry = metadados_dataset(path)
+    if entry is not None:
+        return entry.content_hash
+    return hash_conteudo(path)
+
+
+# Params naming input files in client configs (validators, splitters, processors)
+PATH_PARAMS = ("path", "source_path", "judicial_source")
+
+
+def param_inputs(params: Mapping[str, Any]) -> list[Path]:
+    """Input files named by ``params`` (globs resolve to their newest match), for ``stage_key``."""
+    inputs: list[Path] = []
+    for name in PATH_PARAMS:
+        value = os.path.expandvars(str(params.get(name) or ""))
+        if not value or "$" in value:
+            continue
+        path = Path(value)
+        if any(c in path.name for c in "*?["):
+            try:
+                path = resolver_mais_recente(path.parent, path.name)
+            except FileNotFoundError:
+                pass
+        inputs.append(path)
+    return inputs
+
+
+def stage_key(inputs: Iterable[Path | str | None] = (), **params: Any) -> str:
+    """
+    Build a checkpoint key from input files and stage parameters.
+
+    Missing inputs contribute their path only, so the key still changes
+    when an input appears later.
+    """
+    digest = hashlib.sha256()
+    for item in inputs:
+        if item is None:
+            digest.update(b"<none>")
+            continue
+        path = Path(item)
+        digest.update(str(path.name).encode("utf-8"))
+        if path.is_file():
+            digest.update(file_fingerprint(path).encode("ascii"))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def collect_files(value: Any) -> list[Path]:
+    """Recursively collect existing file paths referenced by a stage result."""
+    found: list[Path] = []
+    if isinstance(value, Mapping):
+        for item in value.values():
+            found.extend(collect_files(item))
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            found.extend(collect_files(item))
+    elif isinstance(value, (str, Path)):
+        text = str(value)
+        if text and len(text) < 1024:
+            path = Path(text)
+            try:
+                if path.is_file():
+                    found.append(path)
+            except OSError:
+                pass
+    return found
+
+
+@dataclass
+class Checkpoint:
+    """A persisted stage completion record."""
+    stage: str
+    key: str
+    result: Any
+    outputs: dict[str, str] = field(default_factory=dict)
+    frames: dict[str, list[str]] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+
+class CheckpointStore:
+    """
+    Directory-backed checkpoint store (one JSON file per stage).
+
+    Outputs are verified by size and content hash before a checkpoint is
+    considered valid, so manually edited or deleted outputs force a rerun.
+    ``run`` writes checkpoints only when resuming or when ``enabled``.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        profiler: StageProfiler | None = None,
+        enabled: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        # Stages executed through ``run`` are profiled when set (--profile)
+        self.profiler = profiler
+
+    def _path(self, stage: str) -> Path:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in stage)
+        return self.directory / f"{safe}.json"
+
+    def load(self, stage: str, key: str) -> Checkpoint | None:
+        """Return the checkpoint for ``stage`` if its key and outputs still match."""
+        path = self._path(stage)
+        if not path.exists():
+            return None
+        try:
+            checkpoint = Checkpoint(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+        if checkpoint.key != key:
+            return None
+        for output, digest in checkpoint.outputs.items():
+            output_path = Path(output)
+            if not output_path.is_file() or file_fingerprint(output_path) != digest:
+                logger.info(f"Checkpoint {stage}: output changed or missing ({output})")
+                return None
+        if any(not path.is_file() for paths in self.frame_files(checkpoint).values() for path in paths):
+            return None
+        return checkpoint
+
+    def save(
+        self,
+        stage: str,
+        key: str,
+        result: Any,
+        outputs: Iterable[Path] | None = None,
+        frames: Mapping[str, pd.DataFrame | Sequence[Path]] | None = None,
+    ) -> Checkpoint:
+        """
+        Persist a stage result (and optionally frames) under ``key``.
+
+        A frame is either a DataFrame or the files of a frame already on
+        disk (``FrameStore.parts``), which are linked without being loaded.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if outputs is None:
+            outputs = collect_files(result)
+
+        frame_paths: dict[str, list[str]] = {}
+        for name, frame in (frames or {}).items():
+            base = self._path(f"{stage}.{name}").with_suffix("")
+            for stale in self.directory.glob(f"{base.name}.*"):
+                stale.unlink(missing_ok=True)
+            if isinstance(frame, pd.DataFrame):
+                written = [write_frame(frame, base.with_name(f"{base.name}.arrow"))]
+            else:
+                written = [
+                    copy_frame_file(Path(part), base.with_name(f"{base.name}.{i:03d}{Path(part).suffix}"))
+                    for i, part in enumerate(frame, 1)
+                ]
+            frame_paths[name] = [str(path) for path in written]
+
+        checkpoint = Checkpoint(
+            stage=stage,
+            key=key,
+            result=json.loads(json.dumps(result, default=str)),
+            outputs={str(Path(p).resolve()): file_fingerprint(p) for p in outputs},
+            frames=frame_paths,
+        )
+        tmp = self._path(stage).with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(asdict(checkpoint), indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self._path(stage))
+        return checkpoint
+
+    @staticmethod
+    def frame_files(checkpoint: Checkpoint) -> dict[str, list[Path]]:
+        """Files of each frame persisted alongside a checkpoint."""
+        return {
+            name: [Path(p) for p in ([paths] if isinstance(paths, str) else paths)]
+            for name, paths in checkpoint.frames.items()
+        }
+
+    def load_frames(self, checkpoint: Checkpoint) -> dict[str, pd.DataFrame]:
+        """Load the DataFrames persisted alongside a checkpoint."""
+        frames: dict[str, pd.DataFrame] = {}
+        for name, paths in self.frame_files(checkpoint).items():
+            parts = [read_frame(path) for path in paths]
+            frames[name] = parts[0] if len(parts) == 1 else pd.concat(parts)
+        return frames
+
+    def run(
+        self,
+        stage: str,
+        key: str,
+        func: Callable[[], Any],
+        resume: bool = False,
+    ) -> Any:
+        """
+        Run ``func`` unless ``resume`` is set and a valid checkpoint exists.
+
+        The (possibly reused) result is returned. Successful executions are
+        checkpointed (outputs fingerprinted) only when ``resume`` or
+        ``enabled`` is set, like the engine; plain runs write nothing.
+        """
+        if resume:
+            checkpoint = self.load(stage, key)
+            if checkpoint is not None:
+                logger.info(f"Checkpoint hit for stage '{stage}' ({checkpoint.created_at}); skipping")
+                return checkpoint.result
+
+        with profile_stage(self.profiler, stage):
+            result = func()
+        if resume or self.enabled:
+            self.save(stage, key, result)
+        return result
+
+    def clear(self) -> None:
+        """Remove all checkpoints."""
+        if not self.directory.exists():
+            return
+        for item in self.directory.iterdir():
+            if item.suffix in (".json", ".arrow", ".pkl", ".tmp"):
+                item.unlink(missing_ok=True)
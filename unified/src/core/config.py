@@ -1,11 +1,20 @@
 """
 Configuration loader for client YAML files.
 Validates and converts YAML to typed dataclasses.
+
+Parsed configurations are kept in a process-wide ``ConfigRegistry`` and
+reused until the file changes (mtime/size, then content hash), so API
+requests and repeated jobs do not re-parse YAML. Cached ``ClientConfig``
+objects are shared and must be treated as read-only.
 """
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
@@ -26,23 +35,139 @@ from .schemas import (
     ValidatorType,
 )
 
+if TYPE_CHECKING:
+    from .base import BaseKeyGenerator, BaseValidator
+
+# libyaml's parser when available (same results, much faster)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigError(Exception):
     """Configuration loading or validation error."""
     pass
 
 
+@dataclass
+class CompiledConfig:
+    """
+    A client configuration with its validators and key generators.
+
+    Validators and key generators are instantiated on first use and reused
+    by every run of the same (unchanged) configuration.
+    """
+    config: ClientConfig
+    path: Path | None = None
+    signature: tuple[int, int] | None = None
+    digest: str | None = None
+    _validators: list[BaseValidator] | None = field(default=None, init=False, repr=False)
+    _key_generators: dict[str, BaseKeyGenerator | None] = field(default_factory=dict, init=False, repr=False)
+
+    def validators(self) -> list[BaseValidator]:
+        """Enabled validators of the client source, in configuration order."""
+        if self._validators is None:
+            from ..validators import create_validator
+
+            source = self.config.client_source
+            self._validators = [
+                create_validator(validator_config)
+                for validator_config in (source.validators if source else [])
+                if validator_config.enabled
+            ]
+        return self._validators
+
+    def key_generator(self, source: str) -> BaseKeyGenerator | None:
+        """Key generator of the ``"client"`` or ``"max"`` source (None if absent)."""
+        if source not in self._key_generators:
+            from .keys import create_key_generator
+
+            source_config = self.config.client_source if source == "client" else self.config.max_source
+            self._key_generators[source] = create_key_generator(source_config.key) if source_config else None
+        return self._key_generators[source]
+
+
+class ConfigRegistry:
+    """
+    Thread-safe cache of parsed client configurations.
+
+    Entries are validated with ``os.stat`` on every lookup; when mtime or
+    size changed the file is hashed and only re-parsed if its content did.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Path, CompiledConfig] = {}
+        self._lock = threading.Lock()
+        self.parses = 0
+
+    def get(self, path: Path | str) -> CompiledConfig:
+        """Compiled configuration for ``path``, re-parsed only if the file changed."""
+        path = Path(path).resolve()
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.invalidate(path)
+            raise ConfigError(f"Configuration file not found: {path}")
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                return entry
+
+            content = path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if entry is not None and entry.digest == digest:
+                entry.signature = signature
+                return entry
+
+            config = ConfigLoader(cache=False).load_from_bytes(content, path)
+            entry = CompiledConfig(config=config, path=path, signature=signature, digest=digest)
+            self._entries[path] = entry
+            self.parses += 1
+            return entry
+
+    def load(self, path: Path | str) -> ClientConfig:
+        """Parsed ``ClientConfig`` for ``path`` (shared, read-only)."""
+        return self.get(path).config
+
+    def compiled(self, config: ClientConfig) -> CompiledConfig | None:
+        """Cached entry holding ``config`` (None for configs not loaded through the registry)."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.config is config:
+                    return entry
+        return None
+
+    def invalidate(self, path: Path | str | None = None) -> None:
+        """Drop the entry for ``path`` (all entries when omitted)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(path).resolve(), None)
+
+
+# Shared by every ConfigLoader, the engine and the API
+CONFIG_REGISTRY = ConfigRegistry()
+
+
 class ConfigLoader:
     """Loads and validates client configuration from YAML files."""
 
-    def __init__(self, config_dir: Path | str | None = None):
-        """Initialize loader with optional config directory."""
+    def __init__(self, config_dir: Path | str | None = None, cache: bool = True):
+        """Initialize loader with optional config directory.
+
+        With ``cache`` (default), files are parsed once through the shared
+        ``CONFIG_REGISTRY`` and reused until they change.
+        """
         self.config_dir = Path(config_dir) if config_dir else None
+        self.registry = CONFIG_REGISTRY if cache else None
 
     def load(self, client_name: str) -> ClientConfig:
-        """Load configuration for a specific client."""
+        """Load configuration for a specific client (``<client>.yaml`` or ``<client>.yml``)."""
         if self.config_dir:
             config_path = self.config_dir / f"{client_name}.yaml"
+            if not config_path.exists() and config_path.with_suffix(".yml").exists():
+                config_path = config_path.with_suffix(".yml")
         else:
             config_path = Path(client_name)
 
@@ -54,14 +179,24 @@ class ConfigLoader:
     def load_from_file(self, path: Path | str) -> ClientConfig:
         """Load configuration from a specific file path."""
         path = Path(path)
+        if self.registry is not None:
+            return self.registry.load(path)
+        return self.load_from_bytes(path.read_bytes(), path)
+
+    def load_from_bytes(self, content: bytes, path: Path) -> ClientConfig:
+        """Parse the YAML ``content`` of ``path``."""
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+            data = yaml.load(content.decode("utf-8"), Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             raise ConfigError(f"Invalid YAML in {path}: {e}")
 
         return self._parse_config(data, path.stem)
 
+    def compile(self, config: ClientConfig) -> CompiledConfig:
+        """Cached compiled form of ``config``, or a fresh one if it was not loaded from a file."""
+        compiled = self.registry.compiled(config) if self.registry is not None else None
+        return compiled or CompiledConfig(config=config)
+
     def load_from_dict(self, data: dict[str, Any], name: str = "unknown") -> ClientConfig:
         """Load configuration from a dictionary."""
         return self._parse_config(data, name)
@@ -0,0 +1,356 @@
+"""
+Long-lived pipeline worker (``cli daemon``).
+
+A ``PipelineDaemon`` keeps one warm ``PipelineEngine`` - pandas and the
+loaders/validators already imported, client configs compiled, SQL
+connection pools open and reference lists cached - and runs pipeline
+jobs in a thread pool. Jobs arrive over a local Unix socket
+(``DaemonServer``, one JSON object per line) or through the REST API
+(``POST /run/<client>/async``), so back-to-back runs skip the cold start
+of a fresh interpreter.
+
+Socket protocol (request -> response, one line each)::
+
+    {"action": "run", "client": "vic", "resume": false, "wait": true, "coalesce": false}
+    {"action": "status", "job_id": "..."}
+    {"action": "jobs"} | {"action": "ping"} | {"action": "shutdown"}
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ..utils.log_estruturado import escopo_execucao, novo_id_execucao
+from .config import CONFIG_REGISTRY, ConfigError, ConfigLoader
+
+if TYPE_CHECKING:
+    from .engine import PipelineEngine, PipelineResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = Path("data/run/pipeline.sock")
+MAX_FINISHED_JOBS = 200
+
+
+@dataclass
+class Job:
+    """A pipeline run submitted to the daemon."""
+
+    job_id: str
+    client: str
+    resume: bool = False
+    run_id: str = field(default_factory=novo_id_execucao)
+    status: str = "queued"  # queued, running, success, failed
+    submitted_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    started_at: str | None = None
+    finished_at: str | None = None
+    duration_seconds: float | None = None
+    summary: dict[str, Any] = field(default_factory=dict)
+    outputs: dict[str, str] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("success", "failed")
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class PipelineDaemon:
+    """
+    Warm engine plus a worker pool executing submitted jobs.
+
+    Runs of the same client are serialized (they share output and
+    checkpoint directories): each client has a queue, and its next job is
+    handed to the pool only when the previous one finishes, so waiting
+    jobs never hold a worker. Different clients run concurrently. Each
+    job logs under its own run id (``Job.run_id``).
+
+    Args:
+        config_dir: Client configuration directory
+        output_dir: Pipeline output directory
+        workers: Concurrent pipeline runs
+        engine: Pre-built engine (standard processors are registered otherwise)
+    """
+
+    def __init__(
+        self,
+        config_dir: Path | str = "./configs/clients",
+        output_dir: Path | str = "./output",
+        workers: int = 2,
+        engine: "PipelineEngine | None" = None,
+    ):
+        if engine is None:
+            from .engine import PipelineEngine
+
+            engine = PipelineEngine(config_dir=config_dir, output_dir=output_dir)
+            engine.register_standard_processors()
+        self.engine = engine
+        self.config_dir = Path(config_dir)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pipeline-job")
+        self._jobs: dict[str, Job] = {}
+        self._futures: dict[str, Future] = {}
+        self._queues: dict[str, deque[Job]] = {}
+        self._running: set[str] = set()
+        self._lock = threading.Lock()
+
+    def warm(self) -> list[str]:
+        """Import the pipeline stack and compile every client config; returns the warmed clients."""
+        from ..loaders import _LOADER_REGISTRY
+        from ..splitters import _SPLITTER_REGISTRY
+        from ..validators import _VALIDATOR_REGISTRY
+
+        for registry in (_LOADER_REGISTRY, _VALIDATOR_REGISTRY, _SPLITTER_REGISTRY):
+            for key in list(registry):
+                try:
+                    registry.get(key)
+                except ImportError as e:  # optional dependency missing
+                    logger.warning("Could not preload %s %s: %s", registry.kind, key, e)
+
+        warmed = []
+        for path in sorted(self.config_dir.glob("*.yaml")) + sorted(self.config_dir.glob("*.yml")):
+            try:
+                compiled = CONFIG_REGISTRY.get(path)
+                compiled.validators()
+                warmed.append(compiled.config.name)
+            except Exception as e:
+                logger.warning("Could not preload config %s: %s", path.name, e)
+        logger.info("Daemon warm: %s", ", ".join(warmed) or "no clients")
+        return warmed
+
+    # ------------------------------------------------------------------
+    def submit(self, client: str, resume: bool = False, coalesce: bool = False) -> Job:
+        """Queue a run of ``client``; returns immediately.
+
+        With ``coalesce``, a run of ``client`` still waiting in the queue is
+        returned instead of queueing another one (it will see the new inputs).
+        """
+        if coalesce:
+            with self._lock:
+                for queued in self._jobs.values():
+                    if queued.client == client and queued.status == "queued" and queued.resume == resume:
+                        return queued
+        job_id = f"{client}_{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        job = Job(job_id=job_id, client=client, resume=resume)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._futures[job.job_id] = Future()
+            if client in self._running:
+                self._queues.setdefault(client, deque()).append(job)
+            else:
+                self._running.add(client)
+                self._dispatch(job)
+            self._prune()
+        logger.info("Job queued: %s", job.job_id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Job | None:
+        """Block until ``job_id`` finishes (or ``timeout``)."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.get(job_id)
+
+    def run(self, client: str, resume: bool = False, timeout: float | None = None) -> Job:
+        """Submit and wait."""
+        job = self.submit(client, resume=resume)
+        return self.wait(job.job_id, timeout=timeout) or job
+
+    def close(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # ------------------------------------------------------------------
+    def _dispatch(self, job: Job) -> None:
+        """Hand ``job`` to the pool (caller holds ``_lock``)."""
+        try:
+            self._executor.submit(self._execute, job)
+        except RuntimeError as e:  # pool shut down: fail this client's pending jobs
+            for pending in [job, *self._queues.pop(job.client, ())]:
+                pending.status = "failed"
+                pending.errors.append(str(e))
+                self._futures[pending.job_id].set_result(None)
+            self._running.discard(job.client)
+
+    def _execute(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            with escopo_execucao(job.run_id):
+                result = self.engine.run(job.client, resume=job.resume)
+            self._record(job, result)
+        except Exception as e:  # the worker must survive any job failure
+            logger.exception("Job %s failed", job.job_id)
+            job.errors.append(str(e))
+            job.status = "failed"
+        job.finished_at = datetime.now().isoformat(timespec="seconds")
+        logger.info("Job %s finished: %s", job.job_id, job.status)
+
+        with self._lock:
+            future = self._futures.get(job.job_id)
+            queue = self._queues.get(job.client)
+            if queue:
+                self._dispatch(queue.popleft())
+            else:
+                self._queues.pop(job.client, None)
+                self._running.discard(job.client)
+        if future is not None:
+            future.set_result(None)
+
+    @staticmethod
+    def _record(job: Job, result: "PipelineResult") -> None:
+        job.duration_seconds = result.duration_seconds
+        job.summary = {k: v for k, v in result.summary.items() if k != "outputs"}
+        job.outputs = {k: str(v) for k, v in result.context.outputs.items()}
+        job.errors = list(result.context.errors)
+        job.status = "success" if result.success else "failed"
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self._jobs.pop(job_id, None)
+            self._futures.pop(job_id, None)
+
+    # ------------------------------------------------------------------
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Execute one protocol request."""
+        action = request.get("action")
+        if action == "ping":
+            return {"success": True, "pid": os.getpid(), "jobs": len(self.jobs())}
+        if action == "run":
+            client = request.get("client")
+            if not client:
+                return {"success": False, "error": "Missing 'client'"}
+            try:
+                ConfigLoader(self.config_dir).load(client)
+            except ConfigError as e:
+                return {"success": False, "error": str(e)}
+            job = self.submit(
+                client,
+                resume=bool(request.get("resume", False)),
+                coalesce=bool(request.get("coalesce", False)),
+            )
+            if request.get("wait"):
+                job = self.wait(job.job_id, timeout=request.get("timeout")) or job
+            return {"success": job.status != "failed", "job": job.to_dict()}
+        if action == "status":
+            job = self.get(str(request.get("job_id")))
+            if job is None:
+                return {"success": False, "error": f"Unknown job: {request.get('job_id')}"}
+            return {"success": True, "job": job.to_dict()}
+        if action == "jobs":
+            return {"success": True, "jobs": [job.to_dict() for job in self.jobs()]}
+        return {"success": False, "error": f"Unknown action: {action}"}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: DaemonServer = self.server  # type: ignore[assignment]
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if request.get("action") == "shutdown":
+                    response = {"success": True}
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                else:
+                    response = server.pipeline.handle(request)
+            except Exception as e:
+                response = {"success": False, "error": str(e)}
+            self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class DaemonServer(socketserver.ThreadingUnixStreamServer):
+        """Unix socket front end of a ``PipelineDaemon``."""
+
+        daemon_threads = True
+
+        def __init__(self, daemon: PipelineDaemon, socket_path: Path | str = DEFAULT_SOCKET):
+            self.pipeline = daemon
+            self.socket_path = Path(socket_path)
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.socket_path.exists():
+                if _socket_alive(self.socket_path):
+                    raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+                self.socket_path.unlink()
+            super().__init__(str(self.socket_path), _RequestHandler)
+            os.chmod(self.socket_path, 0o600)
+
+        def server_close(self) -> None:
+            super().server_close()
+            self.socket_path.unlink(missing_ok=True)
+
+else:  # pragma: no cover - Windows without AF_UNIX
+
+    class DaemonServer:  # type: ignore[no-redef]
+        def __init__(self, *_args: Any, **_kwargs: Any):
+            raise RuntimeError("Unix sockets are not available here; submit jobs through the REST API")
+
+
+def _socket_alive(socket_path: Path) -> bool:
+    try:
+        request_daemon({"action": "ping"}, socket_path, timeout=1)
+        return True
+    except OSError:
+        return False
+
+
+def request_daemon(
+    request: dict[str, Any],
+    socket_path: Path | str = DEFAULT_SOCKET,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Send one request to a running daemon and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError(f"No response from daemon at {socket_path}")
+    return json.loads(line)
+
+
+def serve(
+    config_dir: Path | str = "./configs/clients",
+    output_dir: Path | str = "./output",
+    socket_path: Path | str = DEFAULT_SOCKET,
+    workers: int = 2,
+) -> None:
+    """Warm up and serve jobs on ``socket_path`` until a ``shutdown`` request."""
+    daemon = PipelineDaemon(config_dir, output_dir, workers=workers)
+    daemon.warm()
+    with DaemonServer(daemon, socket_path) as server:
+        logger.info("Pipeline daemon listening on %s (pid %s)", socket_path, os.getpid())
+        try:
+            server.serve_forever()
+        finally:
+            daemon.close()
+
+
+__all__ = ["DEFAULT_SOCKET", "DaemonServer", "Job", "PipelineDaemon", "request_daemon", "serve"]
@@ -5,6 +5,7 @@ Coordinates the execution of the entire pipeline for a client.
 from __future__ import annotations
 
 import logging
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -12,30 +13,63 @@ from typing import Any
 
 import pandas as pd
 
-from .base import BaseClientExtension, ProcessorResult
+from .base import BaseClientExtension, CountedMessage, ProcessorResult
+from .checkpoint import CHECKPOINT_DIRNAME, CheckpointStore, param_inputs, stage_key
+from .profiling import StageProfiler, profile_stage
 from .config import ConfigLoader
-from .keys import create_key_generator
-from .schemas import ClientConfig, ProcessorType
+from .memory import SCRATCH_DIRNAME, FrameStore, parse_size
+from .projection import ColumnProjection, referenced_columns
+from .registry import LazyRegistry
+from .schemas import ClientConfig, LoaderType, ProcessorType, SourceConfig
 
 from ..loaders import create_loader
-from ..validators import create_validator
 from ..splitters import create_splitter
+from ..utils.catalog import resolver_mais_recente
 
 
 logger = logging.getLogger(__name__)
 
+# Standard processors, imported when a pipeline first uses them
+STANDARD_PROCESSORS: dict[ProcessorType, str] = {
+    ProcessorType.TRATAMENTO: "..processors:TratamentoProcessor",
+    ProcessorType.BATIMENTO: "..processors:BatimentoProcessor",
+    ProcessorType.BAIXA: "..processors:BaixaProcessor",
+    ProcessorType.DEVOLUCAO: "..processors:DevolucaoProcessor",
+    ProcessorType.ENRIQUECIMENTO: "..processors:EnriquecimentoProcessor",
+}
 
 @dataclass
 class PipelineContext:
-    """Context passed through the pipeline."""
+    """
+    Context passed through the pipeline.
+
+    ``client_data`` and ``max_data`` live in ``frames``: under a memory
+    budget, a frame the current stage does not use may be spilled to the
+    scratch area and is reloaded on its next access.
+    """
     client_config: ClientConfig
-    client_data: pd.DataFrame = field(default_factory=pd.DataFrame)
-    max_data: pd.DataFrame = field(default_factory=pd.DataFrame)
     start_time: datetime = field(default_factory=datetime.now)
     output_dir: Path = field(default_factory=lambda: Path.cwd())
     metadata: dict[str, Any] = field(default_factory=dict)
     errors: list[str] = field(default_factory=list)
     outputs: dict[str, Path] = field(default_factory=dict)
+    frames: FrameStore = field(default_factory=FrameStore, repr=False)
+
+    @property
+    def client_data(self) -> pd.DataFrame:
+        return self.frames.get("client")
+
+    @client_data.setter
+    def client_data(self, df: pd.DataFrame) -> None:
+        self.frames.set("client", df)
+
+    @property
+    def max_data(self) -> pd.DataFrame:
+        return self.frames.get("max")
+
+    @max_data.setter
+    def max_data(self, df: pd.DataFrame) -> None:
+        self.frames.set("max", df)
 
     def add_error(self, error: str) -> None:
         """Add an error message to the context."""
@@ -66,26 +100,49 @@ class PipelineEngine:
         self,
         config_dir: Path | str | None = None,
         output_dir: Path | str | None = None,
+        profiler: StageProfiler | None = None,
+        memory_budget: int | str | None = None,
     ):
         self.config_loader = ConfigLoader(config_dir)
         self.output_dir = Path(output_dir) if output_dir else Path.cwd() / "output"
+        # Optional per-stage profiler (cli run --profile)
+        self.profiler = profiler
+        # Limit for live pipeline frames ("2GB"; PIPELINE_MEMORY_BUDGET when unset)
+        self.memory_budget = parse_size(
+            memory_budget if memory_budget is not None else os.getenv("PIPELINE_MEMORY_BUDGET")
+        )
         self._extensions: dict[str, type[BaseClientExtension]] = {}
-        self._processors: dict[ProcessorType, type] = {}
+        self._processors: LazyRegistry[ProcessorType] = LazyRegistry("processor", package=__package__)
 
     def register_extension(self, name: str, extension_class: type[BaseClientExtension]) -> None:
         """Register a client extension class."""
         self._extensions[name] = extension_class
 
-    def register_processor(self, processor_type: ProcessorType, processor_class: type) -> None:
-        """Register a processor class."""
-        self._processors[processor_type] = processor_class
+    def register_processor(self, processor_type: ProcessorType, processor_class: type | str) -> None:
+        """Register a processor class or its ``"module:Class"`` reference (imported on first use)."""
+        self._processors.register(processor_type, processor_class)
+
+    def register_standard_processors(self) -> None:
+        """Register the built-in processors (lazily)."""
+        for processor_type, reference in STANDARD_PROCESSORS.items():
+            self.register_processor(processor_type, reference)
+
+    def _processor_class(self, processor_type: ProcessorType) -> type | None:
+        """Registered processor class; None if missing or not importable."""
+        try:
+            return self._processors.get(processor_type)
+        except ImportError as e:
+            logger.error("Processor %s could not be imported: %s", processor_type.value, e)
+            return None
 
-    def run(self, client_name: str) -> PipelineResult:
+    def run(self, client_name: str, resume: bool = False, full: bool = False) -> PipelineResult:
         """
         Run the complete pipeline for a client.
 
         Args:
             client_name: Name of the client (matches config file)
+            resume: Reuse checkpointed stages whose inputs are unchanged
+            full: Enrichment re-emits every contact, ignoring the sent history
 
         Returns:
             PipelineResult with execution details
@@ -114,34 +171,15 @@ class PipelineEngine:
             client_config=config,
             start_time=start_time,
             output_dir=client_output_dir,
+            frames=self._frame_store(config),
+            metadata={"full": True} if full else {},
         )
 
         # Get extension if specified
         extension = self._get_extension(config)
 
         try:
-            # Stage 1: Load data
-            self._load_data(context, extension)
-
-            # Stage 2: Pre-process (extension hook)
-            if extension:
-                context.client_data = extension.pre_process(context.client_data, "client")
-                context.max_data = extension.pre_process(context.max_data, "max")
-
-            # Stage 3: Generate keys
-            self._generate_keys(context)
-
-            # Stage 4: Apply validators
-            self._apply_validators(context)
-
-            # Stage 5: Run pipeline processors
-            self._run_processors(context, extension)
-
-            # Stage 6: Post-process (extension hook)
-            if extension:
-                context.client_data = extension.post_process(context.client_data, "client")
-                context.max_data = extension.post_process(context.max_data, "max")
-
+            self._execute_stages(context, extension, resume)
             success = len(context.errors) == 0
 
         except Exception as e:
@@ -158,11 +196,13 @@ class PipelineEngine:
             "client": client_name,
             "success": success,
             "duration_seconds": duration,
-            "client_records": len(context.client_data),
-            "max_records": len(context.max_data),
+            "client_records": context.frames.rows("client"),
+            "max_records": context.frames.rows("max"),
             "errors": len(context.errors),
             "outputs": {k: str(v) for k, v in context.outputs.items()},
         }
+        if context.frames.budget:
+            summary["memory"] = context.frames.summary()
 
         return PipelineResult(
             success=success,
@@ -171,7 +211,7 @@ class PipelineEngine:
             summary=summary,
         )
 
-    def run_from_config(self, config: ClientConfig) -> PipelineResult:
+    def run_from_config(self, config: ClientConfig, resume: bool = False, full: bool = False) -> PipelineResult:
         """Run pipeline from an already loaded config."""
         start_time = datetime.now()
 
@@ -183,25 +223,14 @@ class PipelineEngine:
             client_config=config,
             start_time=start_time,
             output_dir=client_output_dir,
+            frames=self._frame_store(config),
+            metadata={"full": True} if full else {},
         )
 
         extension = self._get_extension(config)
 
         try:
-            self._load_data(context, extension)
-
-            if extension:
-                context.client_data = extension.pre_process(context.client_data, "client")
-                context.max_data = extension.pre_process(context.max_data, "max")
-
-            self._generate_keys(context)
-            self._apply_validators(context)
-            self._run_processors(context, extension)
-
-            if extension:
-                context.client_data = extension.post_process(context.client_data, "client")
-                context.max_data = extension.post_process(context.max_data, "max")
-
+            self._execute_stages(context, extension, resume)
             success = len(context.errors) == 0
 
         except Exception as e:
@@ -220,12 +249,125 @@ class PipelineEngine:
                 "client": config.name,
                 "success": success,
                 "duration_seconds": duration,
-                "client_records": len(context.client_data),
-                "max_records": len(context.max_data),
+                "client_records": context.frames.rows("client"),
+                "max_records": context.frames.rows("max"),
                 "errors": len(context.errors),
             },
         )
 
+    def _frame_store(self, config: ClientConfig) -> FrameStore:
+        """Frame store for a run; ``global.memory_budget`` overrides the engine budget."""
+        budget = parse_size(config.global_settings.get("memory_budget")) or self.memory_budget
+        return FrameStore(budget=budget, scratch_dir=self.output_dir / config.name / SCRATCH_DIRNAME)
+
+    def _execute_stages(
+        self,
+        context: PipelineContext,
+        extension: BaseClientExtension | None,
+        resume: bool = False,
+    ) -> None:
+        """
+        Execute all pipeline stages, checkpointing after each one when enabled.
+
+        With ``resume`` (or ``global.checkpoints: true``) the prepared data
+        (load, pre-process, keys, validators) and the output of every
+        processor are checkpointed under ``output_dir/<client>/.checkpoints``;
+        with ``resume``, stages whose input fingerprint is unchanged are
+        restored instead of rerun. Plain runs write no checkpoints.
+        """
+        config = context.client_config
+        store = None
+        prepared_key = None
+        if resume or config.global_settings.get("checkpoints"):
+            store = CheckpointStore(self.output_dir / config.name / CHECKPOINT_DIRNAME)
+            prepared_key = self._prepared_key(config)
+
+        checkpoint = store.load("prepared", prepared_key) if store and resume and prepared_key else None
+        if checkpoint is not None:
+            # Under a budget the frames stay on disk until a stage reads them
+            for name, paths in store.frame_files(checkpoint).items():
+                context.frames.attach(name, paths)
+            context.metadata.update(checkpoint.result.get("metadata", {}))
+            context.metadata["resumed_stages"] = ["prepared"]
+            logger.info(f"Resumed prepared data from checkpoint ({checkpoint.created_at})")
+        else:
+            # Stage 1: Load data
+            with profile_stage(self.profiler, "extracao"):
+                self._load_data(context, extension)
+
+            # Stage 2: Pre-process (extension hook)
+            if extension:
+                with profile_stage(self.profiler, "pre_process"), context.frames.pinned("client", "max"):
+                    context.client_data = extension.pre_process(context.client_data, "client")
+                    context.max_data = extension.pre_process(context.max_data, "max")
+
+            # Stage 3: Generate keys
+            with profile_stage(self.profiler, "chaves"):
+                self._generate_keys(context)
+
+            # Stage 4: Apply validators
+            with profile_stage(self.profiler, "validacao"):
+                self._apply_validators(context)
+
+            if store and prepared_key and not context.errors:
+                store.save(
+                    "prepared",
+                    prepared_key,
+                    {"metadata": context.metadata},
+                    outputs=[],
+                    frames=self._checkpoint_frames(context, "client", "max"),
+                )
+
+        # Stage 5: Run pipeline processors
+        self._run_processors(context, extension, store, prepared_key, resume)
+
+        # Stage 6: Post-process (extension hook)
+        if extension:
+            with profile_stage(self.profiler, "post_process"), context.frames.pinned("client", "max"):
+                context.client_data = extension.post_process(context.client_data, "client")
+                context.max_data = extension.post_process(context.max_data, "max")
+
+    @staticmethod
+    def _checkpoint_frames(context: PipelineContext, *names: str) -> dict[str, Any]:
+        """Frames to checkpoint; spilled ones are passed as their scratch files (not reloaded)."""
+        return {name: context.frames.parts(name) or context.frames.get(name) for name in names}
+
+    def _prepared_key(self, config: ClientConfig) -> str | None:
+        """
+        Fingerprint of everything the prepared data depends on.
+
+        Only file sources can be fingerprinted; any other loader (SQL,
+        email, API) disables checkpoint reuse for the run. Files read by
+        validators and splitters (``source_path``) are fingerprinted too.
+        """
+        inputs: list[Path] = []
+        for source in (config.client_source, config.max_source):
+            if source is None:
+                continue
+            path = self._source_file(source)
+            if path is None:
+                return None
+            inputs.append(path)
+            for item in [*source.validators, *source.splitters]:
+                inputs.extend(param_inputs(item.params))
+        return stage_key(inputs, config=repr(config))
+
+    @staticmethod
+    def _source_file(source: SourceConfig) -> Path | None:
+        """Resolve the file a file loader would read, if any."""
+        if source.loader.type != LoaderType.FILE:
+            return None
+        file_path = source.loader.params.get("path")
+        if not file_path:
+            return None
+        path = Path(file_path)
+        if "*" in str(path):
+            try:
+                path = resolver_mais_recente(path.parent, path.name)
+            except FileNotFoundError:
+                return None
+        return path if path.is_file() else None
+
     def _get_extension(self, config: ClientConfig) -> BaseClientExtension | None:
         """Get extension instance for client."""
         if config.extension_class and config.extension_class in self._extensions:
@@ -233,6 +375,16 @@ class PipelineEngine:
             return extension_class(config)
         return None
 
+    def _projection(self, config: ClientConfig, source: SourceConfig) -> ColumnProjection | None:
+        """Columns the loader for ``source`` needs to parse (None = all)."""
+        processors = [
+            processor_class
+            for proc in config.pipeline.processors
+            if proc.enabled and (processor_class := self._processor_class(proc.type)) is not None
+        ]
+        columns = referenced_columns(config, source, processors)
+        return ColumnProjection.of(columns) if columns else None
+
     def _load_data(self, context: PipelineContext, extension: BaseClientExtension | None) -> None:
         """Load data from configured sources."""
         config = context.client_config
@@ -240,51 +392,55 @@ class PipelineEngine:
         # Load client data
         if config.client_source:
             loader = create_loader(config.client_source.loader, config)
+            loader.projection = self._projection(config, config.client_source)
             result = loader.load()
             if "error" in result.metadata:
                 context.add_error(f"Client data load error: {result.metadata['error']}")
             context.client_data = result.data
             context.metadata["client_source"] = result.metadata
-            logger.info(f"Loaded {len(result.data)} client records")
+            logger.info("Loaded %s client records", len(result.data))
 
         # Load MAX data
         if config.max_source:
             loader = create_loader(config.max_source.loader, config)
+            loader.projection = self._projection(config, config.max_source)
             result = loader.load()
             if "error" in result.metadata:
                 context.add_error(f"MAX data load error: {result.metadata['error']}")
             context.max_data = result.data
             context.metadata["max_source"] = result.metadata
-            logger.info(f"Loaded {len(result.data)} MAX records")
+            logger.info("Loaded %s MAX records", len(result.data))
 
     def _generate_keys(self, context: PipelineContext) -> None:
         """Generate CHAVE keys for loaded data."""
         config = context.client_config
 
-        # Generate client keys
-        if config.client_source and not context.client_data.empty:
-            key_gen = create_key_generator(config.client_source.key)
-            context.client_data = key_gen.generate(context.client_data)
-            logger.info(f"Generated client keys in column: {key_gen.output_column}")
+        compiled = self.config_loader.compile(config)
 
-        # Generate MAX keys
-        if config.max_source and not context.max_data.empty:
-            key_gen = create_key_generator(config.max_source.key)
-            context.max_data = key_gen.generate(context.max_data)
-            logger.info(f"Generated MAX keys in column: {key_gen.output_column}")
+        for source, name in ((config.client_source, "client"), (config.max_source, "max")):
+            if not source or not context.frames.rows(name):
+                continue
+            key_gen = compiled.key_generator(name)
+            if key_gen.row_local and context.frames.needs_chunking(name):
+                # Too big for the budget: generate slice by slice from scratch
+                context.frames.map_chunks(name, key_gen.generate)
+            else:
+                context.frames.set(name, key_gen.generate(context.frames.get(name)))
+            logger.info(f"Generated {name} keys in column: {key_gen.output_column}")
 
     def _apply_validators(self, context: PipelineContext) -> None:
         """Apply validators to client data."""
         config = context.client_config
 
-        if not config.client_source or context.client_data.empty:
+        if not config.client_source or not context.frames.rows("client"):
             return
 
-        for validator_config in config.client_source.validators:
-            if not validator_config.enabled:
-                continue
+        validators = self.config_loader.compile(config).validators()
+        if context.frames.needs_chunking("client") and all(v.row_local for v in validators):
+            self._apply_validators_chunked(context, validators)
+            return
 
-            validator = create_validator(validator_config)
+        for validator in validators:
             result = validator.validate(context.client_data)
 
             # Log errors
@@ -298,17 +454,78 @@ class PipelineEngine:
                 f"{result.total_invalid} invalid"
             )
 
+    def _apply_validators_chunked(self, context: PipelineContext, validators: list) -> None:
+        """
+        Out-of-core variant: every slice goes through all validators, results go to scratch.
+
+        Messages are logged once per validator after the last slice; the
+        counts of ``CountedMessage`` errors are summed per template.
+        """
+        totals = {validator.name: [0, 0] for validator in validators}
+        # (template or text, counted) -> summed count (None for plain messages)
+        messages: dict[str, dict[tuple[str, bool], int | None]] = {validator.name: {} for validator in validators}
+
+        def validate(chunk: pd.DataFrame) -> pd.DataFrame:
+            for validator in validators:
+                result = validator.validate(chunk)
+                seen = messages[validator.name]
+                for error in result.errors:
+                    if isinstance(error, CountedMessage):
+                        seen[error.template, True] = (seen.get((error.template, True)) or 0) + error.count
+                    else:
+                        seen.setdefault((str(error), False), None)
+                totals[validator.name][0] += result.total_valid
+                totals[validator.name][1] += result.total_invalid
+                chunk = result.valid
+            return chunk
+
+        context.frames.map_chunks("client", validate)
+        for name, (valid, invalid) in totals.items():
+            for (text, counted), count in messages[name].items():
+                logger.warning(f"Validator {name}: {CountedMessage(text, count) if counted else text}")
+            logger.info(f"Validator {name}: {valid} valid, {invalid} invalid")
+
     def _run_processors(
-        self, context: PipelineContext, extension: BaseClientExtension | None
+        self,
+        context: PipelineContext,
+        extension: BaseClientExtension | None,
+        store: CheckpointStore | None = None,
+        base_key: str | None = None,
+        resume: bool = False,
     ) -> None:
         """Run configured pipeline processors."""
         config = context.client_config
+        key = base_key
 
-        for proc_config in config.pipeline.processors:
+        for index, proc_config in enumerate(config.pipeline.processors):
             if not proc_config.enabled:
                 continue
 
-            processor_class = self._processors.get(proc_config.type)
+            stage = f"processor_{index}_{proc_config.type.value}"
+            if key is not None:
+                key = stage_key(
+                    param_inputs(proc_config.params),
+                    previous=key,
+                    type=proc_config.type.value,
+                    params=proc_config.params,
+                )
+
+            # A full enrichment run must emit again even if its inputs are unchanged
+            reusable = resume and not (
+                context.metadata.get("full") and proc_config.type is ProcessorType.ENRIQUECIMENTO
+            )
+            checkpoint = store.load(stage, key) if store and reusable and key else None
+            if checkpoint is not None:
+                files = store.frame_files(checkpoint)
+                if "client" in files:
+                    context.frames.attach("client", files["client"])
+                for name, path in checkpoint.result.get("outputs", {}).items():
+                    context.add_output(name, Path(path))
+                context.metadata.setdefault("resumed_stages", []).append(stage)
+                logger.info(f"Processor {proc_config.type.value} resumed from checkpoint")
+                continue
+
+            processor_class = self._processor_class(proc_config.type)
             if not processor_class:
                 context.add_error(f"Processor not registered: {proc_config.type}")
                 continue
@@ -316,11 +533,16 @@ class PipelineEngine:
             processor = processor_class(config, proc_config.params)
 
             try:
-                result = processor.process(
-                    context.client_data,
-                    context.max_data,
-                    {"output_dir": context.output_dir, **context.metadata},
-                )
+                with profile_stage(self.profiler, proc_config.type.value), context.frames.pinned("client", "max"):
+                    result = processor.process(
+                        context.client_data,
+                        context.max_data,
+                        {
+                            "output_dir": context.output_dir,
+                            "memory_budget": context.frames.budget,
+                            **context.metadata,
+                        },
+                    )
 
                 # Update context with results
                 context.client_data = result.data
@@ -329,9 +551,22 @@ class PipelineEngine:
                 for path in result.output_files:
                     context.add_output(path.stem, path)
 
+                if store and key and not result.errors:
+                    store.save(
+                        stage,
+                        key,
+                        {"outputs": {p.stem: str(p) for p in result.output_files}},
+                        outputs=result.output_files,
+                        frames=self._checkpoint_frames(context, "client"),
+                    )
+                else:
+                    # Downstream checkpoints are only valid after a clean stage
+                    key = None
+
                 logger.info(f"Processor {processor.name} completed")
 
             except Exception as e:
+                key = None
                 context.add_error(f"Processor {proc_config.type} failed: {e}")
                 if extension:
                     extension.on_error(e, f"processor:{proc_config.type}")
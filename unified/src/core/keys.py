@@ -99,6 +99,8 @@ class ColumnKeyGenerator(BaseKeyGenerator):
 class CustomKeyGenerator(BaseKeyGenerator):
     """Custom key generator using a provided function."""
 
+    row_local = False  # arbitrary function: always sees the whole frame
+
     def __init__(self, config: KeyConfig, generator_func: Callable[[pd.DataFrame], pd.DataFrame]):
         self.config = config
         self._output_column = config.output_column
@@ -0,0 +1,153 @@
+"""
+Multi-pattern matching for splitters and filters.
+
+``PatternMatcher`` compiles every literal pattern of every rule into one
+automaton (Aho-Corasick for ``contains``, a prefix trie for ``startswith``,
+a hash map for ``exact``) and assigns each value the first rule it matches.
+Matching runs over the unique values of the column only; the result is
+broadcast back to the rows through the factorized codes, so the cost is one
+pass over the column regardless of how many rules or patterns are defined.
+"""
+from __future__ import annotations
+
+import sys
+from collections import deque
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+NO_MATCH = -1
+_NONE = sys.maxsize
+
+MATCH_MODES = ("exact", "contains", "startswith")
+
+
+def normalize_values(values: pd.Series, case_sensitive: bool = False) -> pd.Series:
+    """``strip`` (and ``upper`` unless case sensitive), as the filters compare values."""
+    normalized = values.astype(str).str.strip()
+    return normalized if case_sensitive else normalized.str.upper()
+
+
+class PatternMatcher:
+    """
+    Assigns each value the index of the first rule with a matching pattern.
+
+    Args:
+        rules: One sequence of literal patterns per rule, in priority order.
+        mode: ``exact``, ``contains`` or ``startswith`` (unknown modes fall
+            back to ``exact``).
+        case_sensitive: Compare without upper-casing values and patterns.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Iterable[Any]],
+        mode: str = "contains",
+        case_sensitive: bool = False,
+    ):
+        self.mode = mode if mode in MATCH_MODES else "exact"
+        self.case_sensitive = case_sensitive
+        self.rule_count = len(rules)
+
+        self._exact: dict[str, int] = {}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[int] = [_NONE]
+
+        for rule_id, patterns in enumerate(rules):
+            for pattern in patterns:
+                text = str(pattern) if case_sensitive else str(pattern).upper()
+                if self.mode == "exact":
+                    self._exact.setdefault(text, rule_id)
+                else:
+                    self._add(text, rule_id)
+
+        if self.mode == "contains":
+            self._link()
+
+    # ------------------------------------------------------------------ #
+    # Automaton
+    # ------------------------------------------------------------------ #
+    def _add(self, pattern: str, rule_id: int) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(_NONE)
+                self._goto[node][char] = nxt
+            node = nxt
+        self._out[node] = min(self._out[node], rule_id)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; outputs inherit the lowest rule of their suffixes."""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            # Depth-1 nodes fail to the root (an empty pattern matches everything)
+            self._out[node] = min(self._out[node], self._out[0])
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = min(self._out[child], self._out[self._fail[child]])
+                queue.append(child)
+
+    def _first_contains(self, text: str) -> int:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        best = out[0]
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node] < best:
+                best = out[node]
+                if best == 0:
+                    break
+        return best
+
+    def _first_prefix(self, text: str) -> int:
+        goto, out = self._goto, self._out
+        node = 0
+        best = out[0]
+        for char in text:
+            node = goto[node].get(char, -1)
+            if node < 0:
+                break
+            best = min(best, out[node])
+        return best
+
+    def first_rule(self, text: str) -> int:
+        """Rule index of the first rule matching a normalized value, or ``NO_MATCH``."""
+        if self.mode == "exact":
+            return self._exact.get(text, NO_MATCH)
+        best = self._first_contains(text) if self.mode == "contains" else self._first_prefix(text)
+        return NO_MATCH if best == _NONE else best
+
+    # ------------------------------------------------------------------ #
+    # Columns
+    # ------------------------------------------------------------------ #
+    def assign(self, values: pd.Series) -> np.ndarray:
+        """First matching rule per row (``NO_MATCH`` for none or missing values)."""
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        normalized = normalize_values(pd.Series(uniques, dtype=object), self.case_sensitive)
+        per_unique = np.fromiter(
+            (NO_MATCH if pd.isna(v) else self.first_rule(v) for v in normalized),
+            dtype=np.int64,
+            count=len(normalized),
+        )
+        assigned = np.full(len(codes), NO_MATCH, dtype=np.int64)
+        present = codes >= 0
+        assigned[present] = per_unique[codes[present]]
+        return assigned
+
+    def matches(self, values: pd.Series) -> pd.Series:
+        """Boolean mask of rows matching any rule."""
+        return pd.Series(self.assign(values) != NO_MATCH, index=values.index)
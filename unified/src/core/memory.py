@@ -0,0 +1,441 @@
+"""
+Memory budget for pipeline frames.
+
+``FrameStore`` holds the frames of a ``PipelineContext`` (``client``,
+``max``). Without a budget it is a plain name -> DataFrame mapping. With
+one, it tracks the approximate size of the live frames and, when a write
+or reload pushes the total over the budget, spills the least recently
+used frames (except pinned ones) to a local scratch area as Arrow IPC
+files. A spilled frame is reloaded - memory-mapped - on its next access.
+
+Frames that cannot fit even alone are processed out of core:
+``map_chunks`` streams a spilled frame through a row-local function in
+slices read from the mapped file and writes the result back to scratch,
+so keys and validators never hold the whole input and output at once.
+Checkpoints take spilled frames as their scratch files (``parts``) and
+restore them the same way (``attach``), without loading them.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import weakref
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCRATCH_DIRNAME = ".scratch"
+# A stage typically holds its input plus one working copy
+WORKING_COPY_FACTOR = 2.0
+# Share of the budget used by each slice in the chunked path
+CHUNK_SHARE = 0.125
+
+_UNITS = {"": 1, "B": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*$", re.IGNORECASE)
+
+
+def parse_size(value: int | float | str | None) -> int | None:
+    """Bytes from ``2GB``, ``512MiB``, ``1.5G`` or a plain number (None/0/"" = no limit)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) or None
+    match = _SIZE_RE.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid memory size: {value!r} (expected e.g. 512MB, 2GB)")
+    size = int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+    return size or None
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Approximate in-memory size of ``df`` (deep: counts string payloads)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def configured_budget(config: Mapping[str, Any] | None = None) -> int | None:
+    """Memory budget of a client config (``global.memory_budget``), else ``PIPELINE_MEMORY_BUDGET``."""
+    value = ((config or {}).get("global") or {}).get("memory_budget")
+    return parse_size(value if value not in (None, "") else os.getenv("PIPELINE_MEMORY_BUDGET"))
+
+
+def file_nbytes(path: Path | str) -> int:
+    """Uncompressed size of a data file (sum of the members of a ZIP); 0 if missing."""
+    path = Path(path)
+    if not path.is_file():
+        return 0
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return sum(member.file_size for member in archive.infolist())
+    return path.stat().st_size
+
+
+def exceeds_budget(
+    paths: Iterable[Path | str | None], budget: int | None, factor: float = WORKING_COPY_FACTOR
+) -> bool:
+    """
+    True when loading ``paths`` would not fit ``budget``.
+
+    Same rule as ``FrameStore.needs_chunking``, with the uncompressed file
+    size standing in for the frame size (a text CSV loaded as ``str``
+    takes at least as much memory as on disk).
+    """
+    if budget is None:
+        return False
+    return sum(file_nbytes(path) for path in paths if path) * factor > budget
+
+
+@dataclass
+class SpilledFrame:
+    """A frame written to scratch: one or more Arrow IPC (or pickle) parts."""
+
+    parts: list[Path]
+    rows: int
+    nbytes: int
+
+
+@dataclass
+class _Stats:
+    spills: int = 0
+    reloads: int = 0
+    chunked: int = 0
+    spilled_bytes: int = 0
+    peak_bytes: int = 0
+    events: list[str] = field(default_factory=list)
+
+
+class FrameStore:
+    """
+    Named frames under an optional memory budget.
+
+    Args:
+        budget: Maximum bytes of live frames (None = unlimited, never spills)
+        scratch_dir: Directory for spilled frames (a private temporary
+            directory is created inside it on first spill and removed with
+            the store)
+    """
+
+    def __init__(self, budget: int | str | None = None, scratch_dir: Path | str | None = None):
+        self.budget = parse_size(budget)
+        self.scratch_root = Path(scratch_dir) if scratch_dir else None
+        self._live: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._spilled: dict[str, SpilledFrame] = {}
+        self._pinned: set[str] = set()
+        self._scratch: Path | None = None
+        self._cleanup: weakref.finalize | None = None
+        self._counter = 0
+        self.stats = _Stats()
+
+    # ------------------------------------------------------------------
+    def get(self, name: str) -> pd.DataFrame:
+        """The frame ``name`` (reloaded from scratch if spilled; empty if unknown)."""
+        if name in self._live:
+            self._live.move_to_end(name)
+            return self._live[name]
+        spilled = self._spilled.pop(name, None)
+        if spilled is None:
+            return pd.DataFrame()
+        df = _read_parts(spilled.parts)
+        _remove(spilled.parts)
+        self.stats.reloads += 1
+        logger.debug("Reloaded %s frame (%s rows) from scratch", name, spilled.rows)
+        self._store(name, df)
+        return df
+
+    def set(self, name: str, df: pd.DataFrame) -> None:
+        """Replace the frame ``name``; may spill other frames to stay within the budget."""
+        spilled = self._spilled.pop(name, None)
+        if spilled is not None:
+            _remove(spilled.parts)
+        self._store(name, df)
+
+    def rows(self, name: str) -> int:
+        """Row count of ``name`` without reloading it."""
+        if name in self._spilled:
+            return self._spilled[name].rows
+        return len(self._live.get(name, ()))
+
+    def nbytes(self, name: str) -> int:
+        """Tracked size of ``name`` (live or spilled; 0 without a budget)."""
+        if name in self._spilled:
+            return self._spilled[name].nbytes
+        return self._sizes.get(name, 0)
+
+    def is_spilled(self, name: str) -> bool:
+        return name in self._spilled
+
+    def parts(self, name: str) -> list[Path]:
+        """Scratch files holding ``name`` while it is spilled (empty when live or unknown)."""
+        spilled = self._spilled.get(name)
+        return list(spilled.parts) if spilled else []
+
+    def attach(self, name: str, parts: list[Path]) -> None:
+        """
+        Replace ``name`` with the frame stored in ``parts`` (``write_frame`` files).
+
+        Under a budget the files are linked into scratch and the frame stays
+        spilled until its first access; without one they are read at once.
+        """
+        if self.budget is None:
+            self.set(name, _read_parts(parts))
+            return
+        self._live.pop(name, None)
+        self._sizes.pop(name, None)
+        previous = self._spilled.pop(name, None)
+        if previous is not None:
+            _remove(previous.parts)
+        linked = [copy_frame_file(part, self._scratch_path(name, part.suffix)) for part in parts]
+        rows = nbytes = 0
+        for part in linked:
+            part_rows, part_bytes = _part_size(part)
+            rows += part_rows
+            nbytes += part_bytes
+        self._spilled[name] = SpilledFrame(parts=linked, rows=rows, nbytes=nbytes)
+
+    @property
+    def live_bytes(self) -> int:
+        return sum(self._sizes.get(name, 0) for name in self._live)
+
+    # ------------------------------------------------------------------
+    @contextmanager
+    def pinned(self, *names: str) -> Iterator[None]:
+        """Keep ``names`` in memory while a stage uses them together."""
+        previous = set(self._pinned)
+        self._pinned.update(names)
+        try:
+            yield
+        finally:
+            self._pinned = previous
+
+    def enforce(self, keep: tuple[str, ...] = ()) -> list[str]:
+        """Spill least recently used frames until the live total fits the budget."""
+        spilled: list[str] = []
+        if self.budget is None:
+            return spilled
+        for name in list(self._live):
+            if self.live_bytes <= self.budget:
+                break
+            if name in keep or name in self._pinned:
+                continue
+            self.spill(name)
+            spilled.append(name)
+        return spilled
+
+    def spill(self, name: str) -> bool:
+        """Write ``name`` to scratch and drop it from memory."""
+        if name not in self._live:
+            return False
+        df = self._live.pop(name)
+        nbytes = self._sizes.pop(name, 0) or frame_nbytes(df)
+        part = self._write(name, df)
+        self._spilled[name] = SpilledFrame(parts=[part], rows=len(df), nbytes=nbytes)
+        self.stats.spills += 1
+        self.stats.spilled_bytes += nbytes
+        self.stats.events.append(f"spill:{name}")
+        logger.info("Memory budget: spilled %s frame (%s rows, %.1f MB) to scratch", name, len(df), nbytes / 1e6)
+        return True
+
+    # ------------------------------------------------------------------
+    def needs_chunking(self, name: str, factor: float = WORKING_COPY_FACTOR) -> bool:
+        """True when ``name`` plus its working copies would exceed the budget."""
+        return self.budget is not None and self.nbytes(name) * factor > self.budget
+
+    def chunk_rows(self, name: str) -> int:
+        """Rows per slice so that one slice uses about ``CHUNK_SHARE`` of the budget."""
+        rows, nbytes = self.rows(name), self.nbytes(name)
+        if not self.budget or not rows or not nbytes:
+            return max(rows, 1)
+        return max(1, int(rows * self.budget * CHUNK_SHARE / nbytes))
+
+    def iter_chunks(self, name: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Yield ``name`` in slices, read from the mapped scratch file when spilled."""
+        spilled = self._spilled.get(name)
+        if spilled is None:
+            df = self.get(name)
+            for start in range(0, len(df), chunk_rows):
+                yield df.iloc[start:start + chunk_rows]
+            return
+        for part in spilled.parts:
+            yield from _iter_part(part, chunk_rows)
+
+    def map_chunks(self, name: str, func: Callable[[pd.DataFrame], pd.DataFrame]) -> int:
+        """
+        Replace ``name`` with ``func`` applied slice by slice (out of core).
+
+        ``func`` must be row-local. The input is spilled first and the
+        output slices are written straight to scratch; returns the number of
+        slices processed.
+        """
+        chunk_rows = self.chunk_rows(name)
+        self.spill(name)
+        source = self._spilled.get(name)
+        if source is None:
+            return 0
+        parts: list[Path] = []
+        rows = nbytes = chunks = 0
+        for chunk in self.iter_chunks(name, chunk_rows):
+            result = func(chunk)
+            if len(result) or not parts:
+                parts.append(self._write(name, result))
+                rows += len(result)
+                nbytes += frame_nbytes(result)
+            chunks += 1
+        self._spilled[name] = SpilledFrame(parts=parts, rows=rows, nbytes=nbytes)
+        _remove(source.parts)
+        self.stats.chunked += 1
+        self.stats.events.append(f"chunked:{name}")
+        logger.info(
+            "Memory budget: processed %s frame out of core (%s slices of %s rows)", name, chunks, chunk_rows
+        )
+        return chunks
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "budget_bytes": self.budget,
+            "peak_live_bytes": self.stats.peak_bytes,
+            "spills": self.stats.spills,
+            "reloads": self.stats.reloads,
+            "chunked_passes": self.stats.chunked,
+            "spilled_frames": sorted(self._spilled),
+        }
+
+    # ------------------------------------------------------------------
+    def _store(self, name: str, df: pd.DataFrame) -> None:
+        self._live[name] = df
+        self._live.move_to_end(name)
+        if self.budget is None:
+            return
+        self._sizes[name] = frame_nbytes(df)
+        self.stats.peak_bytes = max(self.stats.peak_bytes, self.live_bytes)
+        self.enforce(keep=(name,))
+
+    def _scratch_path(self, name: str, suffix: str = ".arrow") -> Path:
+        if self._scratch is None:
+            root = self.scratch_root or Path(tempfile.gettempdir())
+            root.mkdir(parents=True, exist_ok=True)
+            self._scratch = Path(tempfile.mkdtemp(prefix="frames_", dir=root))
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._scratch, True)
+        self._counter += 1
+        return self._scratch / f"{name}_{self._counter:05d}{suffix}"
+
+    def _write(self, name: str, df: pd.DataFrame) -> Path:
+        return write_frame(df, self._scratch_path(name))
+
+    def close(self) -> None:
+        """Drop every frame and remove the scratch area."""
+        self._live.clear()
+        self._sizes.clear()
+        self._spilled.clear()
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = self._scratch = None
+
+
+def write_frame(df: pd.DataFrame, path: Path) -> Path:
+    """
+    Write ``df`` (with its index) as an Arrow IPC file at ``path``.
+
+    Falls back to a pickle next to it (``.pkl``) when pyarrow is missing or
+    a column mixes types Arrow cannot hold; returns the path written.
+    """
+    try:
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return path
+    except (ImportError, TypeError, ValueError) as e:
+        # pyarrow missing or mixed-type object columns: pickle keeps them as-is
+        logger.debug("Writing %s as pickle: %s", path.name, e)
+        path.unlink(missing_ok=True)
+        path = path.with_suffix(".pkl")
+        df.to_pickle(path)
+        return path
+
+
+def read_frame(path: Path | str) -> pd.DataFrame:
+    """Read a frame written by ``write_frame``."""
+    return _read_parts([Path(path)])
+
+
+def copy_frame_file(source: Path, target: Path) -> Path:
+    """
+    Hard-link ``source`` at ``target`` (copy across filesystems).
+
+    Frame files are written once and never modified, so a link is as good
+    as a copy and costs no I/O.
+    """
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+    return target
+
+
+def _open_ipc(path: Path) -> Any:
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+
+def _read_parts(parts: list[Path]) -> pd.DataFrame:
+    frames = [
+        pd.read_pickle(part) if part.suffix == ".pkl" else _open_ipc(part).to_pandas()
+        for part in parts
+    ]
+    return frames[0] if len(frames) == 1 else pd.concat(frames)
+
+
+def _part_size(part: Path) -> tuple[int, int]:
+    """Rows and approximate in-memory size of one frame file."""
+    if part.suffix == ".pkl":
+        df = pd.read_pickle(part)
+        return len(df), frame_nbytes(df)
+    table = _open_ipc(part)
+    return table.num_rows, table.nbytes
+
+
+def _iter_part(part: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if part.suffix == ".pkl":
+        df = pd.read_pickle(part)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+        return
+    table = _open_ipc(part)  # memory-mapped: only the current slice is materialized
+    for start in range(0, table.num_rows, chunk_rows):
+        yield table.slice(start, chunk_rows).to_pandas()
+
+
+def _remove(parts: list[Path]) -> None:
+    for part in parts:
+        try:
+            part.unlink(missing_ok=True)
+        except OSError:  # still mapped (Windows): removed with the scratch directory
+            pass
+
+
+__all__ = [
+    "FrameStore",
+    "SCRATCH_DIRNAME",
+    "SpilledFrame",
+    "configured_budget",
+    "copy_frame_file",
+    "exceeds_budget",
+    "file_nbytes",
+    "frame_nbytes",
+    "parse_size",
+    "read_frame",
+    "write_frame",
+]
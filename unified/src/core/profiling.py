@@ -0,0 +1,281 @@
+"""
+Per-stage profiling for pipeline runs (``--profile``).
+
+Each stage (load, tratamento, batimento, baixa, devolução,
+enriquecimento...) runs inside ``StageProfiler.stage``, which writes into
+the run's profile directory:
+
+* ``NN_<stage>.prof`` - ``cProfile`` stats (deterministic mode), loadable
+  with ``pstats``/snakeviz; or ``NN_<stage>.folded`` - collapsed stacks
+  (sampling mode), ready for flamegraph tools;
+* ``NN_<stage>_memory.txt`` - with ``memory=True``, the allocation growth
+  of the stage by source line (``tracemalloc``) and its peak;
+* ``summary.txt`` / ``summary.json`` - wall time, peak memory and the
+  top-N hot functions of every stage.
+
+The sampling mode has far lower overhead on long runs: a background thread
+records the stack of the profiled thread every ``interval`` seconds.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIRNAME = "profile"
+MODES = ("cprofile", "sampling")
+
+T = TypeVar("T")
+
+
+@dataclass
+class StageProfile:
+    """Profiling result of one stage."""
+
+    stage: str
+    seconds: float
+    profile: str | None = None
+    memory_report: str | None = None
+    peak_memory_bytes: int | None = None
+    hot: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _safe_name(stage: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in stage)
+
+
+def _function_label(filename: str, lineno: int, function: str) -> str:
+    if filename == "~":  # built-in
+        return function
+    return f"{Path(filename).name}:{lineno}({function})"
+
+
+class _Sampler:
+    """Background thread sampling the stack of one thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stage-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: list[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(_function_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def __enter__(self) -> "_Sampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class StageProfiler:
+    """
+    Profiles pipeline stages into ``output_dir``.
+
+    Args:
+        output_dir: Directory for the per-stage files and the summary
+        mode: ``"cprofile"`` (deterministic) or ``"sampling"``
+        top: Hot functions listed per stage
+        memory: Also snapshot allocations per stage with ``tracemalloc``
+        interval: Sampling interval in seconds (sampling mode)
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        mode: str = "cprofile",
+        top: int = 20,
+        memory: bool = False,
+        interval: float = 0.005,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (expected one of {', '.join(MODES)})")
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.top = top
+        self.memory = memory
+        self.interval = interval
+        self.stages: list[StageProfile] = []
+        self._active = False
+
+    @classmethod
+    def for_run(cls, base_dir: Path | str, **kwargs: Any) -> "StageProfiler":
+        """Profiler writing to ``<base_dir>/profile/<timestamp>``."""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return cls(Path(base_dir) / PROFILE_DIRNAME / stamp, **kwargs)
+
+    def _prefix(self, stage: str) -> Path:
+        return self.output_dir / f"{len(self.stages) + 1:02d}_{_safe_name(stage)}"
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as stage ``name``.
+
+        Nested stages are only timed: the enclosing stage already profiles them.
+        """
+        if self._active:
+            yield
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        prefix = self._prefix(name)
+        self._active = True
+
+        started_tracing = False
+        before = None
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+
+        profiler = cProfile.Profile() if self.mode == "cprofile" else None
+        sampler = _Sampler(threading.get_ident(), self.interval) if self.mode == "sampling" else None
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            with sampler if sampler is not None else nullcontext():
+                yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            result = StageProfile(stage=name, seconds=round(time.perf_counter() - start, 4))
+            try:
+                if profiler is not None:
+                    self._write_cprofile(profiler, prefix, result)
+                if sampler is not None:
+                    self._write_samples(sampler, prefix, result)
+                if before is not None:
+                    self._write_memory(before, prefix, result)
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+                self._active = False
+            self.stages.append(result)
+            logger.info("Profiled stage %s in %.2fs -> %s", name, result.seconds, result.profile)
+
+    def wrap(self, name: str, func: Callable[[], T]) -> Callable[[], T]:
+        """``func`` run as stage ``name``."""
+
+        def profiled() -> T:
+            with self.stage(name):
+                return func()
+
+        return profiled
+
+    # ------------------------------------------------------------------
+    def _write_cprofile(self, profiler: cProfile.Profile, prefix: Path, result: StageProfile) -> None:
+        path = prefix.with_suffix(".prof")
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+        ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[: self.top]
+        result.profile = path.name
+        result.hot = [
+            {
+                "function": _function_label(*func),
+                "calls": calls,
+                "self_seconds": round(self_time, 4),
+                "cumulative_seconds": round(cumulative, 4),
+            }
+            for func, (_primitive, calls, self_time, cumulative, _callers) in ranked
+        ]
+
+    def _write_samples(self, sampler: _Sampler, prefix: Path, result: StageProfile) -> None:
+        path = prefix.with_suffix(".folded")
+        with open(path, "w", encoding="utf-8") as handle:
+            for stack, count in sampler.stacks.most_common():
+                handle.write(f"{';'.join(stack)} {count}\n")
+        total = sum(sampler.stacks.values()) or 1
+        own: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        for stack, count in sampler.stacks.items():
+            own[stack[-1]] += count
+            for function in set(stack):
+                inclusive[function] += count
+        result.profile = path.name
+        result.hot = [
+            {
+                "function": function,
+                "samples": count,
+                "self_share": round(count / total, 4),
+                "cumulative_share": round(inclusive[function] / total, 4),
+            }
+            for function, count in own.most_common(self.top)
+        ]
+
+    def _write_memory(self, before: tracemalloc.Snapshot, prefix: Path, result: StageProfile) -> None:
+        _current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>")]
+        )
+        growth = after.compare_to(before, "lineno")[: self.top]
+        path = prefix.parent / f"{prefix.name}_memory.txt"
+        lines = [f"Stage: {result.stage}", f"Peak traced memory: {peak / 2**20:.1f} MiB", ""]
+        lines += [str(stat) for stat in growth]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        result.memory_report = path.name
+        result.peak_memory_bytes = peak
+
+    # ------------------------------------------------------------------
+    def write_summary(self) -> Path | None:
+        """Write ``summary.txt`` and ``summary.json``; returns the text summary path."""
+        if not self.stages:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        payload = {"mode": self.mode, "top": self.top, "stages": [asdict(s) for s in self.stages]}
+        (self.output_dir / "summary.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+        total = sum(s.seconds for s in self.stages) or 1.0
+        lines = [f"Profile ({self.mode}) - {len(self.stages)} stage(s), {total:.2f}s", ""]
+        for s in self.stages:
+            memory = f", peak {s.peak_memory_bytes / 2**20:.1f} MiB" if s.peak_memory_bytes is not None else ""
+            lines.append(f"{s.stage}: {s.seconds:.2f}s ({s.seconds / total:.0%}){memory} [{s.profile}]")
+            for hot in s.hot:
+                if "self_seconds" in hot:
+                    lines.append(
+                        f"    {hot['self_seconds']:>9.3f}s self {hot['cumulative_seconds']:>9.3f}s cum "
+                        f"{hot['calls']:>9} calls  {hot['function']}"
+                    )
+                else:
+                    lines.append(
+                        f"    {hot['self_share']:>8.1%} self {hot['cumulative_share']:>8.1%} cum  {hot['function']}"
+                    )
+            lines.append("")
+        path = self.output_dir / "summary.txt"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        return path
+
+
+def profile_stage(profiler: StageProfiler | None, name: str) -> ContextManager[None]:
+    """``profiler.stage(name)``, or a no-op when profiling is off."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+__all__ = ["MODES", "PROFILE_DIRNAME", "StageProfile", "StageProfiler", "profile_stage"]
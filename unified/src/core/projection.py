@@ -0,0 +1,174 @@
+"""
+Column projection for loaders.
+
+The engine derives the set of columns a client pipeline actually references
+(column mappings, required columns, key components, validator/splitter and
+processor parameters) and hands it to the loaders, which parse only those
+columns. Names are compared after ``strip().upper()``, the same normalization
+the loaders apply to headers.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+import pandas as pd
+
+from .schemas import ClientConfig, SourceConfig, ValidatorType
+
+
+logger = logging.getLogger(__name__)
+
+# Column defaults used by validators/splitters when the param is omitted
+_DEFAULT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "aging": ("VENCIMENTO",),
+    "campaign": ("CAMPANHA",),
+    "blacklist": ("CPF_CNPJ",),
+    "status": ("STATUS_TITULO",),
+    "daterange": ("VENCIMENTO",),
+    "type_filter": ("TIPO_PARCELA",),
+    "judicial": ("CPF_CNPJ",),
+}
+
+
+def normalize_column(name: Any) -> str:
+    """Header normalization shared with the loaders."""
+    return str(name).strip().upper()
+
+
+def _param_columns(params: Any) -> set[str]:
+    """Collect column names from ``*column``/``*columns`` params, recursively."""
+    found: set[str] = set()
+    if isinstance(params, dict):
+        for key, value in params.items():
+            name = str(key).lower()
+            if name == "column" or name.endswith("_column") or name == "key" or name.endswith("_key"):
+                if isinstance(value, str):
+                    found.add(value)
+            elif name == "columns" or name.endswith("_columns"):
+                if isinstance(value, dict):
+                    found.update(str(k) for k in value)
+                    found.update(str(v) for v in value.values())
+                elif isinstance(value, (list, tuple)):
+                    found.update(str(v) for v in value)
+            else:
+                found |= _param_columns(value)
+    elif isinstance(params, (list, tuple)):
+        for item in params:
+            found |= _param_columns(item)
+    return found
+
+
+def _component_columns(components: Iterable[Any]) -> set[str]:
+    found: set[str] = set()
+    for component in components:
+        if isinstance(component, str):
+            found.add(component)
+        elif isinstance(component, dict):
+            found |= _param_columns(component)
+    return found
+
+
+def referenced_columns(
+    config: ClientConfig,
+    source: SourceConfig,
+    processors: Iterable[type] = (),
+) -> set[str] | None:
+    """
+    Columns of ``source`` referenced anywhere in the client pipeline.
+
+    Returns ``None`` when the set cannot be derived safely: projection is
+    disabled (``global.column_projection: false``), an extension class may
+    touch arbitrary columns, a validator inspects every column, or a
+    processor has not declared its ``input_columns`` (projection is opt-in).
+    """
+    if not config.global_settings.get("column_projection", True):
+        return None
+    if config.extension_class:
+        return None
+
+    columns: set[str] = set(source.columns) | set(source.columns.values())
+    columns.update(source.required_columns)
+    columns |= _component_columns(source.key.components)
+    if source.key.column:
+        columns.add(source.key.column)
+    columns.add(source.key.output_column)
+
+    for item in (*source.validators, *source.splitters):
+        if not item.enabled:
+            continue
+        if item.type == ValidatorType.LINEBREAK and item.params.get("check_all", False):
+            return None
+        columns.update(_DEFAULT_COLUMNS.get(item.type.value, ()))
+        columns |= _param_columns(item.params)
+
+    for proc_config in config.pipeline.processors:
+        if proc_config.enabled:
+            columns |= _param_columns(proc_config.params)
+
+    for processor_class in processors:
+        declared = getattr(processor_class, "input_columns", None)
+        if declared is None:
+            return None
+        columns.update(declared)
+
+    return {normalize_column(c) for c in columns if str(c).strip()}
+
+
+@dataclass
+class ColumnProjection:
+    """
+    ``usecols`` callable that keeps only referenced columns.
+
+    Tracks kept and dropped headers of the last read so loaders can report
+    what was skipped.
+    """
+    columns: frozenset[str]
+    kept: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+
+    @classmethod
+    def of(cls, columns: Iterable[str]) -> "ColumnProjection":
+        return cls(frozenset(normalize_column(c) for c in columns))
+
+    def __call__(self, name: Any) -> bool:
+        keep = normalize_column(name) in self.columns
+        seen = self.kept if keep else self.dropped
+        if str(name) not in seen:  # pandas may probe a header more than once
+            seen.append(str(name))
+        return keep
+
+    def reset(self) -> None:
+        self.kept.clear()
+        self.dropped.clear()
+
+
+def read_projected(
+    read: Callable[[ColumnProjection | None], pd.DataFrame],
+    projection: ColumnProjection | None,
+    source: str = "",
+) -> pd.DataFrame:
+    """
+    Run ``read(usecols)`` with the projection, falling back to all columns.
+
+    If the projection matches none of the source headers (e.g. a renamed
+    layout), the file is read again without projection rather than
+    returning an empty frame.
+    """
+    if projection is None:
+        return read(None)
+
+    projection.reset()
+    df = read(projection)
+    if not projection.kept:
+        logger.debug("Column projection matched no column in %s; reading all columns", source)
+        projection.reset()
+        return read(None)
+
+    if projection.dropped:
+        logger.debug(
+            f"Column projection for {source}: kept {len(projection.kept)}, "
+            f"dropped {len(projection.dropped)} columns: {', '.join(projection.dropped)}"
+        )
+    return df
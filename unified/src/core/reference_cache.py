@@ -0,0 +1,67 @@
+"""
+In-process cache of reference lists (blacklists, judicial CPF/CNPJ lists).
+
+Values are keyed by file path, a caller key (e.g. the column read) and the
+file's mtime/size, so a long-lived process (``cli daemon``, the REST API)
+reads each reference file once and picks up replaced files automatically.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class ReferenceCache:
+    """
+    Bounded LRU cache of values loaded from files.
+
+    Args:
+        max_entries: Entries kept (least recently used are evicted)
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path | str, key: Hashable, load: Callable[[], T | None]) -> T | None:
+        """Cached ``load()`` for ``path``/``key``; ``None`` results are not cached."""
+        path = Path(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return load()
+        cache_key = (str(path.resolve()), key, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if cache_key in self._entries:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return self._entries[cache_key]
+            self.misses += 1
+
+        value = load()
+        if value is not None:
+            with self._lock:
+                self._entries[cache_key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by the blacklist validator and the judicial splitter
+REFERENCE_CACHE = ReferenceCache()
+
+
+__all__ = ["REFERENCE_CACHE", "ReferenceCache"]
@@ -0,0 +1,92 @@
+"""
+Lazy registries and module attributes.
+
+Factories and classes are registered as ``"module:attribute"`` references
+(entry-point style) and only imported when first used, so importing a
+package - and running ``cli list``/``validate``/``--help`` or the API
+health check - does not pull pandas, requests or database drivers in.
+Relative module names (``".file_loader:create_file_loader"``) resolve
+against the registry's package.
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Any, Generic, Hashable, Iterator, Mapping, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+def resolve(reference: Any, package: str | None = None) -> Any:
+    """Import the object behind ``"module:attribute"``; other values are returned as-is."""
+    if not isinstance(reference, str):
+        return reference
+    module_name, sep, attribute = reference.partition(":")
+    if not sep or not attribute:
+        raise ValueError(f"Invalid reference '{reference}' (expected 'module:attribute')")
+    module = importlib.import_module(module_name, package)
+    try:
+        return getattr(module, attribute)
+    except AttributeError as exc:
+        raise ImportError(f"'{module.__name__}' has no attribute '{attribute}'") from exc
+
+
+class LazyRegistry(Generic[K]):
+    """
+    Mapping of keys to objects or ``"module:attribute"`` references.
+
+    References are resolved on first ``get`` and cached.
+
+    Args:
+        kind: Name used in error messages ("loader", "processor"...)
+        entries: Initial registrations
+        package: Package used to resolve relative references
+    """
+
+    def __init__(self, kind: str, entries: Mapping[K, Any] | None = None, package: str | None = None):
+        self.kind = kind
+        self.package = package
+        self._entries: dict[K, Any] = dict(entries or {})
+
+    def register(self, key: K, target: Any) -> None:
+        """Register an object or a ``"module:attribute"`` reference."""
+        self._entries[key] = target
+
+    def get(self, key: K) -> Any | None:
+        """Resolved object for ``key`` (None if not registered)."""
+        target = self._entries.get(key)
+        if isinstance(target, str):
+            target = resolve(target, self.package)
+            self._entries[key] = target
+        return target
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def lazy_attributes(package: str, attributes: Mapping[str, str]):
+    """
+    Module ``__getattr__`` (PEP 562) importing ``attributes`` on first access.
+
+    ``attributes`` maps public names to ``"module:attribute"`` references;
+    resolved values are cached in the module namespace.
+    """
+
+    def __getattr__(name: str) -> Any:
+        reference = attributes.get(name)
+        if reference is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = resolve(reference, package)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
+
+
+__all__ = ["LazyRegistry", "lazy_attributes", "resolve"]
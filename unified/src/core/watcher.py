@@ -0,0 +1,301 @@
+"""
+Filesystem trigger for pipelines (``cli watch``).
+
+Input directories are mapped to clients - derived from each client's
+config (loader ``path``, ``source_path``/``judicial_source`` of validators,
+splitters and processors) or given explicitly - and watched with inotify
+on Linux (polling elsewhere). A file is considered complete when its
+``<name>.done`` marker appears or, without markers, when its size and
+mtime stay unchanged for ``settle_seconds``. Each client with completed
+inputs is enqueued once with ``resume=True``: stages whose inputs did not
+change are restored from their checkpoints, so only the affected stages
+run again.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .checkpoint import PATH_PARAMS
+from .config import ConfigLoader
+from .schemas import ClientConfig, LoaderType
+
+logger = logging.getLogger(__name__)
+
+DONE_SUFFIX = ".done"
+# Partial or temporary files written by browsers, Excel, curl and our own writers
+IGNORED_PATTERNS = ("*.tmp", "*.part", "*.crdownload", "~$*", ".*")
+
+
+@dataclass
+class WatchRule:
+    """Files matching ``pattern`` in ``directory`` feed ``client``."""
+
+    directory: Path
+    client: str
+    pattern: str = "*"
+
+    def matches(self, path: Path) -> bool:
+        return path.parent == self.directory and fnmatch.fnmatch(path.name, self.pattern)
+
+
+def _config_paths(config: ClientConfig) -> Iterable[str]:
+    for source in (config.client_source, config.max_source):
+        if source is None:
+            continue
+        if source.loader.type == LoaderType.FILE:
+            yield source.loader.params.get("path", "")
+        for item in [*source.validators, *source.splitters]:
+            yield item.params.get("source_path", "")
+    for proc in config.pipeline.processors:
+        for name in PATH_PARAMS:
+            yield proc.params.get(name, "")
+
+
+def rules_from_configs(config_dir: Path | str, base_dir: Path | str = ".") -> list[WatchRule]:
+    """Watch rules for the input files referenced by every client config in ``config_dir``."""
+    loader = ConfigLoader(config_dir)
+    rules: list[WatchRule] = []
+    for config_path in sorted(Path(config_dir).glob("*.yaml")) + sorted(Path(config_dir).glob("*.yml")):
+        try:
+            config = loader.load_from_file(config_path)
+        except Exception as e:
+            logger.warning("Skipping %s: %s", config_path.name, e)
+            continue
+        for raw in _config_paths(config):
+            value = os.path.expandvars(str(raw or ""))
+            if not value or "$" in value:
+                continue
+            path = (Path(base_dir) / value).resolve()
+            rule = WatchRule(directory=path.parent, client=config_path.stem, pattern=path.name)
+            if rule not in rules:
+                rules.append(rule)
+    return rules
+
+
+def parse_rule(spec: str) -> WatchRule:
+    """``DIR=CLIENT`` or ``DIR/PATTERN=CLIENT`` (e.g. ``data/input/vic/*.zip=vic``)."""
+    target, sep, client = spec.rpartition("=")
+    if not sep or not target or not client:
+        raise ValueError(f"Invalid watch rule '{spec}' (expected DIR=CLIENT)")
+    path = Path(target)
+    if any(c in path.name for c in "*?["):
+        return WatchRule(directory=path.parent.resolve(), client=client, pattern=path.name)
+    return WatchRule(directory=path.resolve(), client=client)
+
+
+# ----------------------------------------------------------------------
+# Event backends: ``read(timeout)`` returns the paths touched since the last call
+
+
+class _PollingBackend:
+    """Portable fallback: compares directory listings (name -> mtime/size)."""
+
+    def __init__(self, directories: Iterable[Path], interval: float = 1.0):
+        self.directories = sorted(set(directories))
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+        return snapshot
+
+    def read(self, timeout: float) -> list[Path]:
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = [path for path, signature in current.items() if self._snapshot.get(path) != signature]
+        self._snapshot = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyBackend:
+    """Linux inotify through libc (no extra dependency)."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0x00000800
+    IN_CLOEXEC = 0x00080000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, directories: Iterable[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, Path] = {}
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        for directory in sorted(set(directories)):
+            if not directory.is_dir():
+                logger.warning("Watch directory does not exist (skipped): %s", directory)
+                continue
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), mask)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self._watches[wd] = directory
+
+    def read(self, timeout: float) -> list[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths: list[Path] = []
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, _mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name and wd in self._watches:
+                paths.append(self._watches[wd] / os.fsdecode(name))
+        return paths
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _backend(directories: list[Path], polling: bool, interval: float) -> Any:
+    if not polling and hasattr(os, "uname") and os.uname().sysname == "Linux":
+        try:
+            return _InotifyBackend(directories)
+        except (OSError, AttributeError) as e:
+            logger.warning("inotify unavailable (%s); falling back to polling", e)
+    return _PollingBackend(directories, interval)
+
+
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class _Pending:
+    signature: tuple[int, int] | None
+    since: float
+    marker: bool = False
+
+
+@dataclass
+class FileWatcher:
+    """
+    Debounces input files and triggers their clients.
+
+    Args:
+        rules: Directory/pattern -> client mapping
+        trigger: Called once per client with the completed files
+        settle_seconds: Size/mtime stability required without a marker
+        require_marker: Only ``<name>.done`` markers complete a file
+        polling: Force the polling backend
+        poll_interval: Polling backend scan interval
+    """
+
+    rules: list[WatchRule]
+    trigger: Callable[[str, list[Path]], Any]
+    settle_seconds: float = 5.0
+    require_marker: bool = False
+    polling: bool = False
+    poll_interval: float = 1.0
+    _pending: dict[Path, _Pending] = field(default_factory=dict, init=False, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        """Watch until ``stop()``."""
+        backend = _backend([rule.directory for rule in self.rules], self.polling, self.poll_interval)
+        logger.info(
+            "Watching %s director(ies) with %s",
+            len({rule.directory for rule in self.rules}),
+            type(backend).__name__.strip("_"),
+        )
+        try:
+            while not self._stop.is_set():
+                self.observe(backend.read(timeout=min(1.0, self.settle_seconds or 1.0)))
+                self.flush()
+        finally:
+            backend.close()
+
+    def observe(self, paths: Iterable[Path]) -> None:
+        """Record changed paths (``.done`` markers complete their data file)."""
+        now = time.monotonic()
+        for path in paths:
+            path = Path(path).parent.resolve() / Path(path).name
+            marker = path.name.endswith(DONE_SUFFIX)
+            if marker:
+                path = path.with_name(path.name[: -len(DONE_SUFFIX)])
+            elif any(fnmatch.fnmatch(path.name, pattern) for pattern in IGNORED_PATTERNS):
+                continue
+            if not self._clients_for(path):
+                continue
+            pending = self._pending.get(path)
+            if pending is None:
+                pending = self._pending[path] = _Pending(signature=None, since=now)
+            pending.marker = pending.marker or marker
+
+    def flush(self) -> dict[str, list[Path]]:
+        """Trigger clients whose pending files are complete; returns what was triggered."""
+        now = time.monotonic()
+        ready: list[Path] = []
+        for path, pending in list(self._pending.items()):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                del self._pending[path]  # removed or renamed before completing
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if pending.marker:
+                ready.append(path)
+            elif not self.require_marker:
+                if signature != pending.signature:
+                    pending.signature, pending.since = signature, now
+                elif now - pending.since >= self.settle_seconds:
+                    ready.append(path)
+
+        triggered: dict[str, list[Path]] = {}
+        for path in ready:
+            del self._pending[path]
+            for client in self._clients_for(path):
+                triggered.setdefault(client, []).append(path)
+        for client, paths in triggered.items():
+            logger.info("Inputs ready for %s: %s", client, ", ".join(p.name for p in paths))
+            try:
+                self.trigger(client, paths)
+            except Exception:  # a failed submission must not stop the watcher
+                logger.exception("Could not trigger %s", client)
+        return triggered
+
+    def _clients_for(self, path: Path) -> list[str]:
+        clients: list[str] = []
+        for rule in self.rules:
+            if rule.matches(path) and rule.client not in clients:
+                clients.append(rule.client)
+        return clients
+
+
+__all__ = ["DONE_SUFFIX", "FileWatcher", "WatchRule", "parse_rule", "rules_from_configs"]
@@ -1,3 +1,11 @@
+from .csv_codec import EscritorCSV, escrever_csv, ler_csv
 from .file_manager import FileManager
 from .packager import ExportacaoService, criar_servico_exportacao
-__all__ = ["FileManager", "ExportacaoService", "criar_servico_exportacao"]
+__all__ = [
+    "EscritorCSV",
+    "ExportacaoService",
+    "FileManager",
+    "criar_servico_exportacao",
+    "escrever_csv",
+    "ler_csv",
+]
@@ -0,0 +1,424 @@
+"""Codec CSV baseado em Arrow para entradas e entregáveis.
+
+Reproduz o contrato dos CSVs do projeto com o leitor multithread e os
+kernels de texto do ``pyarrow``:
+
+* Leitura equivalente a ``pd.read_csv(..., dtype=str)``: todas as colunas
+  como texto, BOM ignorado, aspas duplas, e os mesmos marcadores de nulo do
+  pandas (campo vazio, ``NA``, ``NULL``...) lidos como ``NaN``.
+* Escrita equivalente a ``df.to_csv(index=False, ...)``: aspas apenas onde
+  necessário (separador, aspas ou quebra de linha), nulos como texto vazio,
+  vírgula decimal opcional para floats e BOM único em ``utf-8-sig``.
+
+O ``pyarrow`` é dependência opcional: sem ele (ou diante de um arquivo que
+o leitor Arrow não aceita, ex.: linhas com menos campos), as rotinas seguem
+pelo pandas com o mesmo resultado.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import logging
+import os
+import re
+from pathlib import Path
+from typing import IO, Callable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+logger = logging.getLogger(__name__)
+
+Fonte = Union[str, Path, IO[bytes]]
+Colunas = Optional[Union[Sequence[str], Callable[[str], bool]]]
+
+# Linhas por bloco na escrita
+LINHAS_POR_BLOCO = 100_000
+# Bytes por bloco do leitor Arrow
+BLOCO_LEITURA = 16 << 20
+
+# Marcadores de nulo padrão do ``pd.read_csv``
+VALORES_NULOS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
+
+def arrow_disponivel() -> bool:
+    """Indica se o pacote ``pyarrow`` pode ser importado."""
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _utf8(encoding: str) -> bool:
+    return codecs.lookup(encoding).name in ("utf-8", "utf-8-sig")
+
+
+# ---------------------------------------------------------------------- #
+# Leitura
+# ---------------------------------------------------------------------- #
+def _cabecalho(fonte: Fonte, sep: str, encoding: str) -> List[str]:
+    """Nomes das colunas (primeira linha), sem consumir a fonte."""
+    if isinstance(fonte, (str, Path)):
+        with open(fonte, "rb") as arquivo:
+            linha = arquivo.readline()
+    else:
+        inicio = fonte.tell()
+        linha = fonte.readline()
+        fonte.seek(inicio)
+    texto = linha.decode("utf-8-sig" if _utf8(encoding) else encoding)
+    return next(csv.reader([texto.rstrip("\r\n")], delimiter=sep), [])
+
+
+def _selecionar(nomes: List[str], usecols: Colunas) -> List[str]:
+    if usecols is None:
+        return nomes
+    if callable(usecols):
+        return [nome for nome in nomes if usecols(nome)]
+    faltando = set(usecols) - set(nomes)
+    if faltando:
+        raise ValueError(f"Usecols do not match columns, columns expected but not found: {sorted(faltando)}")
+    return [nome for nome in nomes if nome in set(usecols)]
+
+
+def _opcoes_arrow(fonte: Fonte, sep: str, encoding: str, usecols: Colunas) -> Optional[dict]:
+    """Opções do leitor Arrow, ou ``None`` se o cabeçalho exige o pandas."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    nomes = _cabecalho(fonte, sep, encoding)
+    # Cabeçalhos que o pandas renomeia (vazios/duplicados) ficam com o pandas
+    if not nomes or "" in nomes or len(set(nomes)) != len(nomes):
+        return None
+    return {
+        "read_options": pacsv.ReadOptions(
+            use_threads=True,
+            encoding="utf8" if _utf8(encoding) else encoding,
+            block_size=BLOCO_LEITURA,
+        ),
+        "parse_options": pacsv.ParseOptions(delimiter=sep, newlines_in_values=True),
+        "convert_options": pacsv.ConvertOptions(
+            column_types={nome: pa.string() for nome in nomes},
+            include_columns=_selecionar(nomes, usecols),
+            null_values=VALORES_NULOS,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True,
+        ),
+    }
+
+
+def _para_pandas(tabela) -> pd.DataFrame:
+    df = tabela.to_pandas()
+    # pandas < 3 devolve object com None; ``read_csv(dtype=str)`` usa NaN
+    for coluna in df.columns[df.dtypes == object]:
+        df[coluna] = df[coluna].where(df[coluna].notna(), np.nan)
+    return df
+
+
+def _ler_arrow(fonte: Fonte, sep: str, encoding: str, usecols: Colunas) -> Optional[pd.DataFrame]:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    opcoes = _opcoes_arrow(fonte, sep, encoding, usecols)
+    if opcoes is None:
+        return None
+    try:
+        tabela = pacsv.read_csv(fonte, **opcoes)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as exc:
+        logger.debug("Leitor Arrow recusou o CSV (%s); usando pandas", exc)
+        return None
+    return _para_pandas(tabela)
+
+
+def ler_csv(
+    fonte: Fonte,
+    sep: str = ";",
+    encoding: str = "utf-8-sig",
+    usecols: Colunas = None,
+) -> pd.DataFrame:
+    """Lê um CSV como texto, equivalente a ``pd.read_csv(dtype=str)``.
+
+    ``fonte`` é um caminho ou um arquivo binário posicionável (ex.: membro
+    de ZIP aberto com ``ZipFile.open``).
+    """
+    if arrow_disponivel():
+        inicio = None if isinstance(fonte, (str, Path)) else fonte.tell()
+        df = _ler_arrow(fonte, sep, encoding, usecols)
+        if df is not None:
+            return df
+        if inicio is not None:
+            fonte.seek(inicio)
+    return pd.read_csv(fonte, sep=sep, encoding=encoding, dtype=str, usecols=usecols)
+
+
+def iterar_csv(
+    fonte: Fonte,
+    sep: str = ";",
+    encoding: str = "utf-8-sig",
+    usecols: Colunas = None,
+    linhas_por_lote: int = LINHAS_POR_BLOCO,
+) -> Iterator[pd.DataFrame]:
+    """Lê um CSV em lotes de até ``linhas_por_lote`` linhas de texto (como ``ler_csv``).
+
+    O arquivo é lido em streaming, em blocos de ``BLOCO_LEITURA`` bytes.
+    """
+    if arrow_disponivel():
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        inicio = None if isinstance(fonte, (str, Path)) else fonte.tell()
+        opcoes = _opcoes_arrow(fonte, sep, encoding, usecols)
+        leitor = None
+        if opcoes is not None:
+            try:
+                leitor = pacsv.open_csv(fonte, **opcoes)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as exc:
+                logger.debug("Leitor Arrow recusou o CSV (%s); usando pandas", exc)
+        if leitor is not None:
+            for bloco in leitor:
+                for inicio in range(0, bloco.num_rows, linhas_por_lote):
+                    yield _para_pandas(pa.Table.from_batches([bloco.slice(inicio, linhas_por_lote)]))
+            return
+        if inicio is not None:
+            fonte.seek(inicio)
+    with pd.read_csv(
+        fonte, sep=sep, encoding=encoding, dtype=str, usecols=usecols, chunksize=linhas_por_lote
+    ) as leitor_pandas:
+        yield from leitor_pandas
+
+
+def contar_linhas(fonte: Fonte, tamanho_bloco: int = BLOCO_LEITURA) -> int:
+    """Registros de um CSV (sem o cabeçalho) sem interpretar os campos.
+
+    Conta as quebras de linha fora de aspas em blocos de bytes brutos: a
+    quantidade de ``"`` antes de cada ``\\n`` indica se ela está dentro de
+    um campo citado (aspas escapadas ``""`` não alteram a paridade). Vale
+    para CSVs com aspas no padrão do ``to_csv``/``EscritorCSV`` e
+    codificações compatíveis com ASCII.
+    """
+    if isinstance(fonte, (str, Path)):
+        with open(fonte, "rb") as arquivo:
+            return contar_linhas(arquivo, tamanho_bloco)
+
+    quebras = 0
+    dentro_aspas = False
+    ultimo = b""
+    for bloco in iter(lambda: fonte.read(tamanho_bloco), b""):
+        ultimo = bloco[-1:]
+        if b'"' not in bloco and not dentro_aspas:
+            quebras += bloco.count(b"\n")
+            continue
+        dados = np.frombuffer(bloco, dtype=np.uint8)
+        aspas = np.flatnonzero(dados == 34)
+        novas = np.flatnonzero(dados == 10)
+        # Aspas antes de cada quebra (mais a que ficou aberta no bloco anterior)
+        antes = np.searchsorted(aspas, novas) + dentro_aspas
+        quebras += int(np.count_nonzero((antes & 1) == 0))
+        dentro_aspas = bool((len(aspas) + dentro_aspas) & 1)
+    if not ultimo:
+        return 0
+    # Última linha sem terminador também é um registro
+    linhas = quebras + (ultimo != b"\n")
+    return max(linhas - 1, 0)
+
+
+# ---------------------------------------------------------------------- #
+# Escrita
+# ---------------------------------------------------------------------- #
+def _caracteres_aspas(sep: str, terminador: str) -> str:
+    """Caracteres que fazem o módulo ``csv`` (usado pelo ``to_csv``) citar o campo."""
+    especiais = ""
+    for caractere in dict.fromkeys((sep, '"', "\r", "\n")):
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=sep, lineterminator=terminador).writerow(["a" + caractere])
+        if buffer.getvalue().startswith('"'):
+            especiais += caractere
+    return especiais
+
+
+def _campo_cabecalho(valor: str, especiais: str, unico: bool) -> str:
+    if any(c in valor for c in especiais) or (unico and valor == ""):
+        return '"' + valor.replace('"', '""') + '"'
+    return valor
+
+
+class EscritorCSV:
+    """Grava DataFrames em sequência como um único CSV em ``destino``.
+
+    O cabeçalho (e o BOM de ``utf-8-sig``) sai apenas na primeira chamada
+    de :meth:`escrever`; as seguintes acrescentam linhas. A saída é
+    byte a byte a de ``df.to_csv(index=False, sep=sep, decimal=decimal)``
+    codificada em ``encoding``.
+
+    Args:
+        destino: Arquivo binário de saída (arquivo, membro de ZIP, buffer).
+        sep: Separador de campos.
+        encoding: Codificação da saída.
+        decimal: Separador decimal dos floats.
+        cabecalho: Se grava a linha de cabeçalho.
+    """
+
+    def __init__(
+        self,
+        destino: IO[bytes],
+        sep: str = ";",
+        encoding: str = "utf-8-sig",
+        decimal: str = ".",
+        cabecalho: bool = True,
+    ) -> None:
+        self.destino = destino
+        self.sep = sep
+        self.encoding = encoding
+        self.decimal = decimal
+        self.cabecalho = cabecalho
+        self.terminador = os.linesep
+        self.linhas = 0
+        self.colunas: List[str] = []
+        self._iniciado = False
+        self._arrow = arrow_disponivel()
+        self._codificador = codecs.getincrementalencoder(encoding)()
+        self._direto = _utf8(encoding)
+        self._especiais = _caracteres_aspas(sep, self.terminador)
+        self._precisa_aspas = "[" + "".join(re.escape(c) for c in self._especiais) + "]"
+
+    def _gravar_texto(self, texto: str) -> None:
+        self.destino.write(self._codificador.encode(texto))
+
+    def _gravar_utf8(self, dados: bytes) -> None:
+        if self._direto:
+            self.destino.write(dados)
+        else:
+            self._gravar_texto(dados.decode("utf-8"))
+
+    def escrever(self, df: pd.DataFrame) -> int:
+        """Acrescenta ``df`` ao CSV; retorna o número de linhas gravadas."""
+        primeira = not self._iniciado
+        if primeira:
+            self._iniciado = True
+            self.colunas = [str(c) for c in df.columns]
+            # BOM (utf-8-sig) sai do codificador incremental na primeira escrita
+            self.destino.write(self._codificador.encode(""))
+
+        if not self._arrow or not len(df.columns):
+            self._gravar_texto(
+                df.to_csv(
+                    index=False,
+                    header=primeira and self.cabecalho,
+                    sep=self.sep,
+                    decimal=self.decimal,
+                )
+            )
+        else:
+            if primeira and self.cabecalho:
+                unico = len(self.colunas) == 1
+                campos = [_campo_cabecalho(c, self._especiais, unico) for c in self.colunas]
+                self._gravar_texto(self.sep.join(campos) + self.terminador)
+            for inicio in range(0, len(df), LINHAS_POR_BLOCO):
+                self._gravar_utf8(self._bloco_arrow(df.iloc[inicio:inicio + LINHAS_POR_BLOCO]))
+        self.linhas += len(df)
+        return len(df)
+
+    # ------------------------------------------------------------------ #
+    def _coluna_pandas(self, serie: pd.Series):
+        """Floats, datas e booleanos formatados pelo próprio pandas."""
+        import pyarrow as pa
+
+        texto = serie.to_frame().to_csv(
+            index=False, header=False, sep="\x1f", decimal=self.decimal, lineterminator="\n"
+        )
+        # Coluna única: nulo sai como '""' (registro de campo vazio)
+        valores = ["" if v == '""' else v for v in texto.split("\n")[:-1]]
+        return pa.array(valores, type=pa.string())
+
+    def _coluna_texto(self, serie: pd.Series):
+        import pyarrow as pa
+
+        dtype = serie.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            serie = serie.astype(object)
+            dtype = serie.dtype
+        if ptypes.is_integer_dtype(dtype) or ptypes.is_string_dtype(dtype):
+            try:
+                arr = pa.array(serie, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+                arr = None
+            if arr is not None and (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+                return arr.cast(pa.string())
+            if arr is not None and pa.types.is_integer(arr.type):
+                return arr.cast(pa.string())
+            if arr is not None and pa.types.is_null(arr.type):
+                return pa.nulls(len(serie), type=pa.string())
+            if dtype == object:
+                # Objetos mistos: ``str`` de cada valor, como o ``to_csv``
+                nulos = serie.isna().to_numpy()
+                valores = [None if nulo else str(v) for v, nulo in zip(serie.to_numpy(), nulos)]
+                return pa.array(valores, type=pa.string())
+        return self._coluna_pandas(serie)
+
+    def _bloco_arrow(self, df: pd.DataFrame) -> bytes:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        unico = len(df.columns) == 1
+        colunas = []
+        for posicao in range(len(df.columns)):
+            arr = pc.fill_null(self._coluna_texto(df.iloc[:, posicao]), "")
+            aspas = pc.match_substring_regex(arr, self._precisa_aspas)
+            if unico:
+                aspas = pc.or_(aspas, pc.equal(arr, ""))
+            if pc.any(aspas).as_py():
+                citado = pc.binary_join_element_wise(
+                    '"', pc.replace_substring(arr, '"', '""'), '"', ""
+                )
+                arr = pc.if_else(aspas, citado, arr)
+            colunas.append(arr)
+
+        linhas = pc.binary_join_element_wise(*colunas, self.sep)
+        linhas = pc.binary_join_element_wise(linhas, self.terminador, "")
+        if isinstance(linhas, pa.ChunkedArray):
+            linhas = linhas.combine_chunks()
+        offsets = np.frombuffer(linhas.buffers()[1], dtype=np.int32)
+        inicio, fim = offsets[linhas.offset], offsets[linhas.offset + len(linhas)]
+        if fim == inicio:
+            return b""
+        return bytes(memoryview(linhas.buffers()[2])[inicio:fim])
+
+
+def escrever_csv(
+    df: pd.DataFrame,
+    destino: Union[str, Path, IO[bytes]],
+    sep: str = ";",
+    encoding: str = "utf-8-sig",
+    decimal: str = ".",
+) -> int:
+    """Grava ``df`` como CSV completo (caminho ou arquivo binário)."""
+    if isinstance(destino, (str, Path)):
+        with open(destino, "wb") as arquivo:
+            return EscritorCSV(arquivo, sep, encoding, decimal).escrever(df)
+    return EscritorCSV(destino, sep, encoding, decimal).escrever(df)
+
+
+def csv_bytes(df: pd.DataFrame, sep: str = ";", encoding: str = "utf-8-sig", decimal: str = ".") -> bytes:
+    """CSV completo de ``df`` em memória."""
+    buffer = io.BytesIO()
+    escrever_csv(df, buffer, sep, encoding, decimal)
+    return buffer.getvalue()
+
+
+__all__ = [
+    "EscritorCSV",
+    "VALORES_NULOS",
+    "arrow_disponivel",
+    "contar_linhas",
+    "csv_bytes",
+    "escrever_csv",
+    "iterar_csv",
+    "ler_csv",
+]
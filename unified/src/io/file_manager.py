@@ -11,10 +11,13 @@ from __future__ import annotations
 import logging
 import zipfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 import pandas as pd
 
+from src.io.csv_codec import EscritorCSV, escrever_csv, ler_csv
+from src.utils.catalog import ResumoMembro, registrar_dataset, resolver_mais_recente
+
 
 class FileManager:
     """Gerencia operações de entrada e saída de arquivos."""
@@ -88,7 +91,11 @@ class FileManager:
 
     # ------------------------------------------------------------------
     def ler_csv(self, arquivo: Union[str, Path], **kwargs: Any) -> pd.DataFrame:
-        """Lê um CSV aplicando as configurações globais padrão."""
+        """Lê um CSV aplicando as configurações globais padrão.
+
+        Sem ``kwargs`` extras a leitura usa o codec Arrow; opções específicas
+        do pandas seguem para ``pd.read_csv``.
+        """
 
         path = self.validar_arquivo_existe(arquivo)
         final_kwargs = {
@@ -99,7 +106,10 @@ class FileManager:
         }
 
         try:
-            df = pd.read_csv(path, **final_kwargs)
+            if kwargs:
+                df = pd.read_csv(path, **final_kwargs)
+            else:
+                df = ler_csv(path, sep=self.csv_separator, encoding=self.encoding)
             self.logger.debug(
                 "CSV carregado: %s (%s registros)", path, f"{len(df):,}"
             )
@@ -144,11 +154,10 @@ class FileManager:
                         )
 
                 with zip_file.open(csv_target) as csv_file:
-                    df = pd.read_csv(
+                    df = ler_csv(
                         csv_file,
                         sep=self.csv_separator,
                         encoding=self.encoding,
-                        dtype=str,
                     )
 
             self.logger.debug(
@@ -179,7 +188,11 @@ class FileManager:
 
     # ------------------------------------------------------------------
     def salvar_csv(
-        self, df: pd.DataFrame, arquivo: Union[str, Path], **kwargs: Any
+        self,
+        df: pd.DataFrame,
+        arquivo: Union[str, Path],
+        entradas: Sequence[Union[str, Path]] = (),
+        **kwargs: Any,
     ) -> Path:
         """Salva ``df`` como CSV garantindo o diretório alvo."""
 
@@ -194,10 +207,14 @@ class FileManager:
         }
 
         try:
-            df.to_csv(path, **final_kwargs)
+            if kwargs:
+                df.to_csv(path, **final_kwargs)
+            else:
+                escrever_csv(df, path, sep=self.csv_separator, encoding=self.encoding)
             self.logger.info(
                 "CSV salvo: %s (%s registros)", path, f"{len(df):,}"
             )
+            registrar_dataset(path, df, entradas=entradas)
             return path
         except Exception as exc:  # pragma: no cover - reempacota exceções
             raise ValueError(f"Erro ao salvar CSV {path}: {exc}") from exc
@@ -206,6 +223,7 @@ class FileManager:
     def salvar_zip(
         self, arquivos: Dict[str, Union[pd.DataFrame, Path, str]],
         arquivo_zip: Union[str, Path],
+        entradas: Sequence[Union[str, Path]] = (),
     ) -> Path:
         """Salva múltiplos arquivos em um ZIP."""
 
@@ -213,14 +231,16 @@ class FileManager:
         zip_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
+            frames: Dict[str, ResumoMembro] = {}
             with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
                 for nome_arquivo, conteudo in arquivos.items():
                     if isinstance(conteudo, pd.DataFrame):
-                        csv_content = conteudo.to_csv(
-                            sep=self.csv_separator,
-                            index=False,
-                        ).encode(self.encoding)
-                        zip_file.writestr(nome_arquivo, csv_content)
+                        with zip_file.open(nome_arquivo, "w", force_zip64=True) as destino:
+                            escritor = EscritorCSV(
+                                destino, sep=self.csv_separator, encoding=self.encoding
+                            )
+                            escritor.escrever(conteudo)
+                        frames[nome_arquivo] = ResumoMembro(escritor.colunas, escritor.linhas)
                     else:
                         arquivo_path = Path(conteudo)
                         if arquivo_path.exists():
@@ -236,6 +256,7 @@ class FileManager:
                 zip_path,
                 f"{len(arquivos):,}",
             )
+            registrar_dataset(zip_path, frames, entradas=entradas)
             return zip_path
         except Exception as exc:  # pragma: no cover - reempacota exceções
             raise ValueError(f"Erro ao criar ZIP {zip_path}: {exc}") from exc
@@ -280,11 +301,10 @@ class FileManager:
         if not dir_path.exists():
             return None
 
-        arquivos = [f for f in dir_path.glob(padrao) if f.is_file()]
-        if not arquivos:
+        try:
+            arquivo_mais_recente = resolver_mais_recente(dir_path, padrao)
+        except FileNotFoundError:
             return None
-
-        arquivo_mais_recente = max(arquivos, key=lambda f: f.stat().st_mtime)
         self.logger.info(
             "Arquivo mais recente encontrado: %s", arquivo_mais_recente
         )
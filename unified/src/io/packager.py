@@ -34,7 +34,7 @@ def clean_old_files(directory: Path, name_prefix: str, extension: str, keep: int
         for old in candidates[keep:]:
             try:
                 old.unlink()
-                logger.debug(f"Removido arquivo antigo: {old}")
+                logger.debug("Removido arquivo antigo: %s", old)
             except Exception:
                 logger.warning(f"Falha ao remover arquivo antigo: {old}")
     except Exception as e:
@@ -134,7 +134,7 @@ class ExportacaoService:
         # Exportar usando FileManager
         try:
             path_exportado = self.file_manager.salvar_csv(df, caminho_arquivo, **kwargs)
-            self.logger.debug(f"CSV exportado: {path_exportado} ({len(df)} registros)")
+            self.logger.debug("CSV exportado: %s (%s registros)", path_exportado, len(df))
             # Limpeza de arquivos antigos (se timestamp estiver ativo)
             usar_timestamp = self.add_timestamp if add_timestamp is None else add_timestamp
             if usar_timestamp and self.keep_latest_only:
@@ -215,7 +215,7 @@ class ExportacaoService:
         # Exportar usando FileManager
         try:
             path_exportado = self.file_manager.salvar_zip(arquivos, caminho_zip)
-            self.logger.debug(f"ZIP exportado: {path_exportado} ({len(arquivos)} arquivos)")
+            self.logger.debug("ZIP exportado: %s (%s arquivos)", path_exportado, len(arquivos))
             # Limpeza de arquivos antigos (se timestamp estiver ativo)
             usar_timestamp = self.add_timestamp if add_timestamp is None else add_timestamp
             if usar_timestamp and self.keep_latest_only:
@@ -370,12 +370,12 @@ class ExportacaoService:
                 try:
                     arquivo.unlink()
                     removidos += 1
-                    self.logger.debug(f"Arquivo antigo removido: {arquivo}")
+                    self.logger.debug("Arquivo antigo removido: %s", arquivo)
                 except Exception as e:
                     self.logger.warning(f"Erro ao remover arquivo {arquivo}: {e}")
         
         if removidos > 0:
-            self.logger.debug(f"Limpeza concluída: {removidos} arquivos antigos removidos")
+            self.logger.debug("Limpeza concluída: %s arquivos antigos removidos", removidos)
         
         return removidos
 
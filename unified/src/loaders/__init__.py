@@ -1,35 +1,48 @@
 """
 Loaders package.
 Provides data loading components for the pipeline.
+
+Loader modules (and pandas, requests, pyodbc behind them) are imported on
+first use: the registry holds ``"module:factory"`` references.
 """
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Callable
 
-from ..core.base import BaseLoader, LoaderResult
+from ..core.registry import LazyRegistry, lazy_attributes
 from ..core.schemas import LoaderConfig, LoaderType
 
-from .file_loader import FileLoader, create_file_loader
-from .email_loader import EmailLoader, create_email_loader
-from .sql_loader import SQLLoader, create_sql_loader
-from .api_loader import APILoader, create_api_loader
-
 if TYPE_CHECKING:
+    from ..core.base import BaseLoader
     from ..core.schemas import ClientConfig
 
 
 # Registry of loader factories
-_LOADER_REGISTRY: dict[
-    LoaderType, Callable[[LoaderConfig, "ClientConfig"], BaseLoader]
-] = {
-    LoaderType.FILE: create_file_loader,
-    LoaderType.EMAIL: create_email_loader,
-    LoaderType.SQL: create_sql_loader,
-    LoaderType.API: create_api_loader,
-}
-
-
-def create_loader(config: LoaderConfig, client_config: "ClientConfig") -> BaseLoader:
+_LOADER_REGISTRY: LazyRegistry[LoaderType] = LazyRegistry(
+    "loader",
+    {
+        LoaderType.FILE: ".file_loader:create_file_loader",
+        LoaderType.EMAIL: ".email_loader:create_email_loader",
+        LoaderType.SQL: ".sql_loader:create_sql_loader",
+        LoaderType.API: ".api_loader:create_api_loader",
+    },
+    package=__name__,
+)
+
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "BaseLoader": "..core.base:BaseLoader",
+        "LoaderResult": "..core.base:LoaderResult",
+        "FileLoader": ".file_loader:FileLoader",
+        "EmailLoader": ".email_loader:EmailLoader",
+        "SQLLoader": ".sql_loader:SQLLoader",
+        "APILoader": ".api_loader:APILoader",
+    },
+)
+
+
+def create_loader(config: LoaderConfig, client_config: "ClientConfig") -> "BaseLoader":
     """
     Factory function to create a loader based on configuration.
 
@@ -51,16 +64,17 @@ def create_loader(config: LoaderConfig, client_config: "ClientConfig") -> BaseLo
 
 def register_loader(
     loader_type: LoaderType,
-    factory: Callable[[LoaderConfig, "ClientConfig"], BaseLoader],
+    factory: Callable[[LoaderConfig, "ClientConfig"], "BaseLoader"] | str,
 ) -> None:
     """
     Register a custom loader factory.
 
     Args:
         loader_type: The loader type to register
-        factory: Factory function that creates the loader
+        factory: Factory function that creates the loader, or its
+            ``"module:function"`` reference (imported on first use)
     """
-    _LOADER_REGISTRY[loader_type] = factory
+    _LOADER_REGISTRY.register(loader_type, factory)
 
 
 __all__ = [
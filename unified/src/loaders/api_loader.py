@@ -12,6 +12,7 @@ import pandas as pd
 import requests
 
 from ..core.base import BaseLoader, LoaderResult
+from ..utils.http_stream import TAMANHO_BLOCO, iterar_array_json, obter_sessao, paginas_prefetch
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
@@ -51,6 +52,8 @@ class APILoader(BaseLoader):
         page_size = self.params.get("page_size", 100)
         data_key = self.params.get("data_key", "items")
         max_pages = self.params.get("max_pages", 100)
+        prefetch_pages = self.params.get("prefetch_pages", 4)
+        pool_size = self.params.get("pool_size", 8)
 
         # Retry configuration
         max_retries = self.params.get("max_retries", 3)
@@ -73,6 +76,9 @@ class APILoader(BaseLoader):
         elif auth_type == "api_key" and api_key:
             request_headers[api_key_header] = api_key
 
+        # Keep-alive session shared by all requests (and prefetch threads)
+        self._session = obter_sessao(pool_size)
+
         # Build auth tuple for basic auth
         auth = None
         if auth_type == "basic" and username and password:
@@ -93,6 +99,7 @@ class APILoader(BaseLoader):
                     page_size=page_size,
                     data_key=data_key,
                     max_pages=max_pages,
+                    prefetch_pages=prefetch_pages,
                     max_retries=max_retries,
                     retry_delay=retry_delay,
                 )
@@ -149,38 +156,51 @@ class APILoader(BaseLoader):
         max_retries: int,
         retry_delay: int,
     ) -> requests.Response:
-        """Make HTTP request with retry logic."""
+        """Make a streamed HTTP request (pooled session) with retry logic.
+
+        A failed attempt's streamed response is closed before retrying, so
+        its connection goes back to the pool instead of being leaked.
+        """
         last_error = None
+        session = getattr(self, "_session", None) or obter_sessao()
 
         for attempt in range(max_retries):
+            response = None
             try:
                 if method == "GET":
-                    response = requests.get(
+                    response = session.get(
                         url,
                         headers=headers,
                         params=params,
                         auth=auth,
                         timeout=timeout,
+                        stream=True,
                     )
                 elif method == "POST":
-                    response = requests.post(
+                    response = session.post(
                         url,
                         headers=headers,
                         params=params,
                         json=body,
                         auth=auth,
                         timeout=timeout,
+                        stream=True,
                     )
                 else:
                     raise ValueError(f"Unsupported HTTP method: {method}")
 
                 response.raise_for_status()
-                return response
+                ready, response = response, None
+                return ready
 
             except requests.RequestException as e:
                 last_error = e
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
+            finally:
+                if response is not None:
+                    response.close()
+
+            if attempt < max_retries - 1:
+                time.sleep(retry_delay * (attempt + 1))
 
         raise last_error
 
@@ -202,6 +222,16 @@ class APILoader(BaseLoader):
             return [response_json]
         return []
 
+    def _read_records(self, response: requests.Response, data_key: str) -> list[dict]:
+        """Decode records incrementally from a streamed response."""
+        with response:
+            return list(
+                iterar_array_json(
+                    response.iter_content(chunk_size=TAMANHO_BLOCO),
+                    lambda document: self._extract_data(document, data_key),
+                )
+            )
+
     def _load_single(
         self,
         url: str,
@@ -219,7 +249,7 @@ class APILoader(BaseLoader):
         response = self._make_request(
             url, method, headers, params, body, auth, timeout, max_retries, retry_delay
         )
-        return self._extract_data(response.json(), data_key)
+        return self._read_records(response, data_key)
 
     def _load_paginated(
         self,
@@ -235,33 +265,25 @@ class APILoader(BaseLoader):
         page_size: int,
         data_key: str,
         max_pages: int,
+        prefetch_pages: int,
         max_retries: int,
         retry_delay: int,
     ) -> list[dict]:
-        """Load data from paginated API."""
-        all_data = []
-        page = 1
+        """Load data from paginated API, prefetching up to ``prefetch_pages`` pages."""
 
-        while page <= max_pages:
+        def fetch(page: int) -> list[dict]:
             # Add pagination params
             page_params = {**params, page_param: page, page_size_param: page_size}
-
             response = self._make_request(
                 url, method, headers, page_params, body, auth, timeout, max_retries, retry_delay
             )
+            return self._read_records(response, data_key)
 
-            data = self._extract_data(response.json(), data_key)
-            if not data:
-                break
-
+        all_data = []
+        # Pages arrive in order; stops at the first empty or short (last) page
+        for data in paginas_prefetch(fetch, page_size, max_pages, concorrencia=prefetch_pages):
             all_data.extend(data)
 
-            # Check if we got less than page_size (last page)
-            if len(data) < page_size:
-                break
-
-            page += 1
-
         return all_data
 
 
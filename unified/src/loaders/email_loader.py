@@ -5,7 +5,6 @@ Loads data from email attachments via IMAP.
 from __future__ import annotations
 
 import email
-import imaplib
 import os
 import zipfile
 from datetime import datetime, timedelta
@@ -17,13 +16,23 @@ from typing import TYPE_CHECKING
 import pandas as pd
 
 from ..core.base import BaseLoader, LoaderResult
+from ..core.projection import read_projected
+from ..utils.imap_idle import aguardar_email, conectar_imap
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
 
 
 class EmailLoader(BaseLoader):
-    """Loads data from email attachments."""
+    """
+    Loads data from email attachments.
+
+    With ``wait_minutes`` the loader holds an IMAP IDLE session until a
+    message from ``sender_filter`` whose subject contains every
+    ``subject_tokens`` entry (default: ``subject_filter``) arrives, then
+    downloads it right away instead of failing with "No matching emails".
+    ``ssl: false`` connects in plain text (local IMAP servers).
+    """
 
     @property
     def name(self) -> str:
@@ -42,6 +51,8 @@ class EmailLoader(BaseLoader):
         sender_filter = self.params.get("sender_filter", "")
         days_back = self.params.get("days_back", 7)
         attachment_pattern = self.params.get("attachment_pattern", "*.csv")
+        wait_minutes = float(self.params.get("wait_minutes", 0) or 0)
+        use_ssl = bool(self.params.get("ssl", True))
 
         if not all([server, email_addr, password]):
             return LoaderResult(
@@ -50,9 +61,26 @@ class EmailLoader(BaseLoader):
             )
 
         try:
+            waited = None
+            if wait_minutes > 0:
+                subject_tokens = self.params.get("subject_tokens") or [subject_filter]
+                waited = aguardar_email(
+                    server, email_addr, password,
+                    remetente=sender_filter,
+                    tokens_assunto=[t for t in subject_tokens if t],
+                    prazo_minutos=wait_minutes,
+                    porta=port,
+                    usar_ssl=use_ssl,
+                    pasta=folder,
+                )
+                if waited is None:
+                    return LoaderResult(
+                        data=pd.DataFrame(),
+                        metadata={"error": f"No matching email arrived within {wait_minutes:g} min"},
+                    )
+
             # Connect to IMAP server
-            mail = imaplib.IMAP4_SSL(server, port)
-            mail.login(email_addr, password)
+            mail = conectar_imap(server, email_addr, password, porta=port, usar_ssl=use_ssl)
             mail.select(folder)
 
             # Build search criteria
@@ -98,8 +126,12 @@ class EmailLoader(BaseLoader):
                         metadata={"error": "No matching attachment found"},
                     )
 
-                # Load data from attachment
-                df = self._load_attachment(attachment_path)
+                # Load data from attachment (only referenced columns)
+                df = read_projected(
+                    lambda usecols: self._load_attachment(attachment_path, usecols),
+                    self.projection,
+                    attachment_path.name,
+                )
 
                 # Normalize column names
                 df.columns = [str(c).strip().upper() for c in df.columns]
@@ -111,6 +143,8 @@ class EmailLoader(BaseLoader):
                         "columns": list(df.columns),
                         "source": f"email:{self._decode_subject(msg)}",
                         "attachment": attachment_path.name,
+                        "waited_seconds": round(waited.espera_segundos, 1) if waited else 0.0,
+                        "dropped_columns": list(self.projection.dropped) if self.projection else [],
                     },
                 )
 
@@ -179,25 +213,26 @@ class EmailLoader(BaseLoader):
 
         return None
 
-    def _load_attachment(self, path: Path) -> pd.DataFrame:
+    def _load_attachment(self, path: Path, usecols=None) -> pd.DataFrame:
         """Load data from attachment file."""
         suffix = path.suffix.lower()
         encoding = self.params.get("encoding", "utf-8-sig")
         separator = self.params.get("separator", ";")
 
         if suffix == ".zip":
-            return self._load_from_zip(path, encoding, separator)
+            return self._load_from_zip(path, encoding, separator, usecols)
         elif suffix == ".csv":
             return pd.read_csv(
-                path, sep=separator, encoding=encoding, dtype=str, low_memory=False
+                path, sep=separator, encoding=encoding, dtype=str, low_memory=False,
+                usecols=usecols,
             )
         elif suffix in (".xlsx", ".xls"):
-            return pd.read_excel(path, dtype=str)
+            return pd.read_excel(path, dtype=str, usecols=usecols)
         else:
             raise ValueError(f"Unsupported attachment type: {suffix}")
 
     def _load_from_zip(
-        self, zip_path: Path, encoding: str, separator: str
+        self, zip_path: Path, encoding: str, separator: str, usecols=None
     ) -> pd.DataFrame:
         """Load data from ZIP attachment."""
         with zipfile.ZipFile(zip_path, "r") as zf:
@@ -206,11 +241,12 @@ class EmailLoader(BaseLoader):
                 if lower.endswith(".csv"):
                     with zf.open(name) as f:
                         return pd.read_csv(
-                            f, sep=separator, encoding=encoding, dtype=str, low_memory=False
+                            f, sep=separator, encoding=encoding, dtype=str, low_memory=False,
+                            usecols=usecols,
                         )
                 elif lower.endswith((".xlsx", ".xls")):
                     with zf.open(name) as f:
-                        return pd.read_excel(f, dtype=str)
+                        return pd.read_excel(f, dtype=str, usecols=usecols)
 
         raise ValueError(f"No data file found in ZIP: {zip_path}")
 
@@ -15,6 +15,8 @@ from typing import TYPE_CHECKING
 import pandas as pd
 
 from ..core.base import BaseLoader, LoaderResult
+from ..core.projection import read_projected
+from ..utils.catalog import resolver_mais_recente
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
@@ -23,6 +25,9 @@ if TYPE_CHECKING:
 class FileLoader(BaseLoader):
     """Loads data from local files, including password-protected ZIPs."""
 
+    # usecols of the read in progress (column projection)
+    _usecols = None
+
     @property
     def name(self) -> str:
         return "file"
@@ -42,11 +47,10 @@ class FileLoader(BaseLoader):
             parent = path.parent
             pattern = path.name
             if parent.exists():
-                matches = list(parent.glob(pattern))
-                if matches:
-                    # Get most recent file
-                    path = max(matches, key=lambda p: p.stat().st_mtime)
-                else:
+                try:
+                    # Get most recent file (dataset catalog, mtime fallback)
+                    path = resolver_mais_recente(parent, pattern)
+                except FileNotFoundError:
                     return LoaderResult(
                         data=pd.DataFrame(),
                         metadata={"error": f"No files matching pattern: {file_path}"},
@@ -65,24 +69,22 @@ class FileLoader(BaseLoader):
         sheet_name = self.params.get("sheet_name", 0)
         password = self.params.get("password")
 
-        try:
+        if suffix not in (".zip", ".csv", ".xlsx", ".xls"):
+            return LoaderResult(
+                data=pd.DataFrame(),
+                metadata={"error": f"Unsupported file type: {suffix}"},
+            )
+
+        def read(usecols):
+            self._usecols = usecols
             if suffix == ".zip":
-                df = self._load_from_zip(path, encoding, separator, sheet_name, password)
-            elif suffix == ".csv":
-                df = pd.read_csv(
-                    path,
-                    sep=separator,
-                    encoding=encoding,
-                    dtype=str,
-                    low_memory=False,
-                )
-            elif suffix in (".xlsx", ".xls"):
-                df = pd.read_excel(path, sheet_name=sheet_name, dtype=str)
-            else:
-                return LoaderResult(
-                    data=pd.DataFrame(),
-                    metadata={"error": f"Unsupported file type: {suffix}"},
-                )
+                return self._load_from_zip(path, encoding, separator, sheet_name, password)
+            if suffix == ".csv":
+                return self._read_csv(path, encoding, separator)
+            return self._read_excel(path, sheet_name)
+
+        try:
+            df = read_projected(read, self.projection, path.name)
 
             # Normalize column names
             df.columns = [str(c).strip().upper() for c in df.columns]
@@ -92,6 +94,7 @@ class FileLoader(BaseLoader):
                 metadata={
                     "rows": len(df),
                     "columns": list(df.columns),
+                    "dropped_columns": list(self.projection.dropped) if self.projection else [],
                     "source": str(path),
                 },
                 source_path=path,
@@ -103,6 +106,21 @@ class FileLoader(BaseLoader):
                 metadata={"error": f"Failed to load file: {e}"},
             )
 
+    def _read_csv(self, source, encoding: str, separator: str) -> pd.DataFrame:
+        """Read a CSV (path or buffer) with the active column projection."""
+        return pd.read_csv(
+            source,
+            sep=separator,
+            encoding=encoding,
+            dtype=str,
+            low_memory=False,
+            usecols=self._usecols,
+        )
+
+    def _read_excel(self, source, sheet_name: int | str) -> pd.DataFrame:
+        """Read an Excel sheet (path or buffer) with the active column projection."""
+        return pd.read_excel(source, sheet_name=sheet_name, dtype=str, usecols=self._usecols)
+
     def _load_from_zip(
         self,
         zip_path: Path,
@@ -186,16 +204,10 @@ class FileLoader(BaseLoader):
             lower = name.lower()
             if lower.endswith(".csv"):
                 with zf.open(name) as f:
-                    return pd.read_csv(
-                        f,
-                        sep=separator,
-                        encoding=encoding,
-                        dtype=str,
-                        low_memory=False,
-                    )
+                    return self._read_csv(f, encoding, separator)
             elif lower.endswith((".xlsx", ".xls")):
                 with zf.open(name) as f:
-                    return pd.read_excel(f, sheet_name=sheet_name, dtype=str)
+                    return self._read_excel(f, sheet_name)
 
         raise ValueError(f"No CSV or Excel file found in ZIP")
 
@@ -211,16 +223,10 @@ class FileLoader(BaseLoader):
             lower = name.lower()
             if lower.endswith(".csv"):
                 data = zf.read(name)
-                return pd.read_csv(
-                    io.BytesIO(data),
-                    sep=separator,
-                    encoding=encoding,
-                    dtype=str,
-                    low_memory=False,
-                )
+                return self._read_csv(io.BytesIO(data), encoding, separator)
             elif lower.endswith((".xlsx", ".xls")):
                 data = zf.read(name)
-                return pd.read_excel(io.BytesIO(data), sheet_name=sheet_name, dtype=str)
+                return self._read_excel(io.BytesIO(data), sheet_name)
 
         raise ValueError(f"No CSV or Excel file found in ZIP")
 
@@ -255,15 +261,9 @@ class FileLoader(BaseLoader):
             # Find and load extracted file
             for file in temp_path.rglob("*"):
                 if file.suffix.lower() == ".csv":
-                    return pd.read_csv(
-                        file,
-                        sep=separator,
-                        encoding=encoding,
-                        dtype=str,
-                        low_memory=False,
-                    )
+                    return self._read_csv(file, encoding, separator)
                 elif file.suffix.lower() in (".xlsx", ".xls"):
-                    return pd.read_excel(file, sheet_name=sheet_name, dtype=str)
+                    return self._read_excel(file, sheet_name)
 
             raise ValueError("No CSV or Excel file found after extraction")
 
@@ -292,15 +292,9 @@ class FileLoader(BaseLoader):
             # Find and load extracted file
             for file in temp_path.rglob("*"):
                 if file.suffix.lower() == ".csv":
-                    return pd.read_csv(
-                        file,
-                        sep=separator,
-                        encoding=encoding,
-                        dtype=str,
-                        low_memory=False,
-                    )
+                    return self._read_csv(file, encoding, separator)
                 elif file.suffix.lower() in (".xlsx", ".xls"):
-                    return pd.read_excel(file, sheet_name=sheet_name, dtype=str)
+                    return self._read_excel(file, sheet_name)
 
             raise ValueError("No CSV or Excel file found after extraction")
 
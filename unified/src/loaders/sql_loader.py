@@ -4,17 +4,22 @@ Loads data from SQL Server databases.
 """
 from __future__ import annotations
 
+import logging
 import os
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
 
 import pandas as pd
 
 from ..core.base import BaseLoader, LoaderResult
+from ..utils import sql_conn
 
 if TYPE_CHECKING:
     from ..core.schemas import ClientConfig, LoaderConfig
 
 
+logger = logging.getLogger(__name__)
+
+
 class SQLLoader(BaseLoader):
     """Loads data from SQL Server databases."""
 
@@ -28,7 +33,8 @@ class SQLLoader(BaseLoader):
         database = self.params.get("database", os.getenv("SQL_DATABASE", ""))
         username = self.params.get("username", os.getenv("SQL_USER", ""))
         password = self.params.get("password", os.getenv("SQL_PASSWORD", ""))
-        driver = self.params.get("driver", "{ODBC Driver 17 for SQL Server}")
+        # None = driver discovered (and cached) per server by the pool
+        driver = self.params.get("driver")
 
         # Query configuration
         query = self.params.get("query", "")
@@ -48,22 +54,18 @@ class SQLLoader(BaseLoader):
             )
 
         try:
-            # Try pyodbc first, fall back to pymssql
-            conn = self._get_connection(server, database, username, password, driver)
-
-            if not conn:
-                return LoaderResult(
-                    data=pd.DataFrame(),
-                    metadata={"error": "Failed to connect to SQL Server"},
-                )
+            # Pooled pyodbc connection; pymssql only when pyodbc is unavailable
+            conn, release = self._get_connection(server, database, username, password, driver)
 
             # Build query if table specified
             if not query:
                 query = f"SELECT * FROM [{schema}].[{table}]"
 
             # Execute query
-            df = pd.read_sql(query, conn, dtype=str)
-            conn.close()
+            try:
+                df = pd.read_sql(query, conn, dtype=str)
+            finally:
+                release(conn)
 
             # Normalize column names
             df.columns = [str(c).strip().upper() for c in df.columns]
@@ -90,52 +92,32 @@ class SQLLoader(BaseLoader):
         database: str,
         username: str,
         password: str,
-        driver: str,
-    ):
-        """Get database connection using available driver."""
-        # Try pyodbc first
-        try:
-            import pyodbc
-
-            if username and password:
-                conn_str = (
-                    f"DRIVER={driver};"
-                    f"SERVER={server};"
-                    f"DATABASE={database};"
-                    f"UID={username};"
-                    f"PWD={password};"
-                    "TrustServerCertificate=yes;"
-                )
-            else:
-                conn_str = (
-                    f"DRIVER={driver};"
-                    f"SERVER={server};"
-                    f"DATABASE={database};"
-                    "Trusted_Connection=yes;"
-                    "TrustServerCertificate=yes;"
-                )
-            return pyodbc.connect(conn_str)
-        except ImportError:
-            pass
-        except Exception:
-            pass
+        driver: str | None,
+    ) -> tuple[Any, Callable[[Any], None]]:
+        """
+        Get a database connection and the function that gives it back.
+
+        pyodbc connections come from the process-wide pool (reused across
+        loads, driver cached per server). pymssql is used only when pyodbc
+        cannot be imported; connection errors are raised, not swallowed.
+        """
+        if sql_conn.pyodbc is not None:
+            pool = sql_conn.get_pool(server, database, username, password, driver)
+            return pool.acquire(), pool.release
 
-        # Fall back to pymssql
         try:
             import pymssql
-
-            return pymssql.connect(
-                server=server,
-                database=database,
-                user=username,
-                password=password,
-            )
         except ImportError:
-            pass
-        except Exception:
-            pass
-
-        return None
+            raise RuntimeError("Neither pyodbc nor pymssql is available") from None
+
+        logger.warning(f"pyodbc unavailable; connecting to {server} with pymssql")
+        conn = pymssql.connect(
+            server=server,
+            database=database,
+            user=username,
+            password=password,
+        )
+        return conn, lambda c: c.close()
 
 
 def create_sql_loader(config: LoaderConfig, client_config: ClientConfig) -> SQLLoader:
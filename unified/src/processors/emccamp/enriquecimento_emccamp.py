@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Set
 import zipfile
@@ -10,6 +9,7 @@ import zipfile
 import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
+from src.utils.historico_contatos import HistoricoContatos
 from src.utils.io import DatasetIO
 from src.utils.output_formatter import OutputFormatter
 from src.utils.path_manager import PathManager
@@ -25,6 +25,8 @@ class ContactEnrichmentStats:
     deduplicated: int
     output_path: Path
     output_records: int
+    already_sent: int = 0
+    full: bool = True
 
 
 class ContactEnrichmentProcessor:
@@ -93,10 +95,6 @@ class ContactEnrichmentProcessor:
         if missing:
             raise KeyError(f"Colunas ausentes na base de origem: {missing}")
 
-    @staticmethod
-    def _normalize_phone(value: Any) -> str:
-        return re.sub(r"\D", "", str(value or ""))
-
     @staticmethod
     def _format_date(value: Any) -> str:
         if pd.isna(value) or value is None:
@@ -106,6 +104,76 @@ class ContactEnrichmentProcessor:
             return date.today().strftime("%d/%m/%Y")
         return parsed.strftime("%d/%m/%Y")
 
+    @staticmethod
+    def _explode_contacts(
+        df: pd.DataFrame,
+        cpf_col: str,
+        nome_col: str,
+        telefone_cols: List[str],
+        email_cols: List[str],
+        limpar_telefone: bool,
+        descartar_email_sem_arroba: bool,
+    ) -> tuple[pd.DataFrame, Dict[str, int]]:
+        """Um registro por telefone/e-mail preenchido, na ordem linha -> coluna."""
+        phone_order = {col: idx for idx, col in enumerate(telefone_cols)}
+        email_order = {col: idx for idx, col in enumerate(email_cols)}
+        counts = {"phone_rows": 0, "phone_discarded": 0, "email_rows": 0, "email_discarded": 0}
+        df = df.reset_index(drop=True)
+        parts: List[pd.DataFrame] = []
+
+        columns = [("TEL", col) for col in telefone_cols] + [("EMAIL", col) for col in email_cols]
+        for seq, (tipo, col) in enumerate(columns):
+            valores = df[col].dropna().astype(str)
+            valores = valores[valores.str.strip() != ""]
+            if tipo == "TEL":
+                contato = valores.str.replace(r"\D", "", regex=True) if limpar_telefone else valores.str.strip()
+                valido = contato != ""
+                counts["phone_discarded"] += int((~valido).sum())
+                counts["phone_rows"] += int(valido.sum())
+                telefone, email, ordem = contato[valido], "", phone_order[col]
+                contato = telefone
+            else:
+                contato = valores.str.strip()
+                valido = contato.str.contains("@", regex=False) if descartar_email_sem_arroba else contato != ""
+                counts["email_discarded"] += int((~valido).sum())
+                counts["email_rows"] += int(valido.sum())
+                telefone, email, ordem = "", contato[valido], email_order[col]
+                contato = email.str.lower()
+            if contato.empty:
+                continue
+            linhas = contato.index
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "CPFCNPJ CLIENTE": df.loc[linhas, cpf_col],
+                        "TELEFONE": telefone,
+                        "EMAIL": email,
+                        "NOME": df.loc[linhas, nome_col],
+                        "TIPO": tipo,
+                        "CONTATO": contato,
+                        "ORDEM_CONTATO": ordem,
+                        "_POS": linhas,
+                        "_SEQ": seq,
+                    }
+                )
+            )
+
+        if not parts:
+            return pd.DataFrame(), counts
+        registros = pd.concat(parts, ignore_index=True)
+        registros = registros.sort_values(["_POS", "_SEQ"], kind="stable")
+        return registros.drop(columns=["_POS", "_SEQ"]).reset_index(drop=True), counts
+
+    def _history(self) -> Optional[HistoricoContatos]:
+        history_cfg = self.settings.get("historico", {}) or {}
+        if not history_cfg.get("enabled", True):
+            return None
+        raw_path = history_cfg.get(
+            "path", f"data/cache/enriquecimento_contato/{self.dataset_key}_historico.pkl"
+        )
+        path = Path(raw_path)
+        return HistoricoContatos(path if path.is_absolute() else Path(self.config.base_path) / path)
+
     def _collect_keys(self, path: Path, column: str, members: Optional[List[str]] = None) -> Set[str]:
         keys: Set[str] = set()
         if path.suffix.lower() == ".zip":
@@ -135,7 +203,8 @@ class ContactEnrichmentProcessor:
     # ------------------------------------------------------------------ #
     # Public API
     # ------------------------------------------------------------------ #
-    def run(self) -> ContactEnrichmentStats:
+    def run(self, full: bool = False) -> ContactEnrichmentStats:
+        """Gera o layout; sem ``full`` envia apenas contatos novos ou alterados, num ZIP com sufixo de data/hora."""
         input_file = self._resolve_input_file()
         mapping = self.settings.get("mapping", {})
         rules = self.settings.get("rules", {})
@@ -165,11 +234,8 @@ class ContactEnrichmentProcessor:
 
         if key_components:
             self._ensure_columns(df_source, key_components)
-            composed = (
-                df_source[key_components]
-                .astype(str)
-                .apply(lambda row: key_separator.join(part.strip() for part in row), axis=1)
-            )
+            parts = [df_source[col].astype(str).str.strip() for col in key_components]
+            composed = parts[0].str.cat(parts[1:], sep=key_separator) if len(parts) > 1 else parts[0]
             df_source[key_column_name] = composed
 
         filters_cfg = self.settings.get("filters", {})
@@ -199,75 +265,21 @@ class ContactEnrichmentProcessor:
         observacao_prefix = rules.get("observacao_prefix", "Base")
         telefone_principal_value = str(rules.get("telefone_principal_value", "1"))
 
-        registros: List[Dict[str, Any]] = []
-        phone_order = {col: idx for idx, col in enumerate(telefone_cols)}
-        email_order = {col: idx for idx, col in enumerate(email_cols)}
-
-        phone_created = phone_discarded = 0
-        email_created = email_discarded = 0
-
-        for _, row in df_source.iterrows():
-            cpf_value = row.get(cpf_col, "")
-            nome_value = row.get(nome_col, "")
-            # Usar data atual da base em vez da data individual do registro
-            observacao = f"{observacao_prefix} - {date.today().strftime('%d/%m/%Y')}"
-
-            # Telefones
-            for col in telefone_cols:
-                valor = row.get(col, "")
-                if pd.isna(valor) or str(valor).strip() == "":
-                    continue
-                telefone = (
-                    self._normalize_phone(valor) if limpar_telefone else str(valor).strip()
-                )
-                if not telefone:
-                    phone_discarded += 1
-                    continue
-                registros.append(
-                    {
-                        "CPFCNPJ CLIENTE": cpf_value,
-                        "TELEFONE": telefone,
-                        "EMAIL": "",
-                        "OBSERVACAO": observacao,
-                        "NOME": nome_value,
-                        "TELEFONE PRINCIPAL": telefone_principal_value,
-                        "TIPO": "TEL",
-                        "CONTATO": telefone,
-                        "ORDEM_CONTATO": phone_order.get(col, 0),
-                    }
-                )
-                phone_created += 1
-
-            # E-mails
-            for col in email_cols:
-                valor = row.get(col, "")
-                if pd.isna(valor):
-                    continue
-                email = str(valor).strip()
-                if not email:
-                    continue
-                if descartar_email_sem_arroba and "@" not in email:
-                    email_discarded += 1
-                    continue
-                registros.append(
-                    {
-                        "CPFCNPJ CLIENTE": cpf_value,
-                        "TELEFONE": "",
-                        "EMAIL": email,
-                        "OBSERVACAO": observacao,
-                        "NOME": nome_value,
-                        "TELEFONE PRINCIPAL": telefone_principal_value,
-                        "TIPO": "EMAIL",
-                        "CONTATO": email.lower(),
-                        "ORDEM_CONTATO": email_order.get(col, 0),
-                    }
-                )
-                email_created += 1
-
-        if not registros:
+        df_saida, counts = self._explode_contacts(
+            df_source,
+            cpf_col,
+            nome_col,
+            telefone_cols,
+            email_cols,
+            limpar_telefone,
+            descartar_email_sem_arroba,
+        )
+        if df_saida.empty:
             raise RuntimeError("Nenhum contato valido encontrado na base de origem.")
 
-        df_saida = pd.DataFrame(registros)
+        # Usar data atual da base em vez da data individual do registro
+        df_saida["OBSERVACAO"] = f"{observacao_prefix} - {date.today().strftime('%d/%m/%Y')}"
+        df_saida["TELEFONE PRINCIPAL"] = telefone_principal_value
         df_saida["ORD_TIPO"] = df_saida["TIPO"].map({"TEL": 0, "EMAIL": 1}).fillna(2)
 
         duplicated_mask = df_saida.duplicated(subset=dedup_keys, keep="first")
@@ -279,9 +291,11 @@ class ContactEnrichmentProcessor:
             by=["ORD_TIPO", "CPFCNPJ CLIENTE", "ORDEM_CONTATO", "NOME"], kind="stable"
         ).reset_index(drop=True)
 
-        df_saida = df_saida[
-            ["CPFCNPJ CLIENTE", "TELEFONE", "EMAIL", "OBSERVACAO", "NOME", "TELEFONE PRINCIPAL"]
-        ]
+        history = self._history()
+        incremental = history is not None and not full
+        already_sent = 0
+        if incremental:
+            df_saida, already_sent = history.filtrar_novos(df_saida)
 
         output_dir = output_cfg.get("dir", "data/output/enriquecimento_contato")
         output_dir_path = (
@@ -291,19 +305,39 @@ class ContactEnrichmentProcessor:
 
         csv_name = output_cfg.get("csv_name", f"enriquecimento_contato_{self.dataset_key}.csv")
         zip_name = output_cfg.get("zip_name", f"enriquecimento_contato_{self.dataset_key}.zip")
+        if incremental:
+            # Cada delta em arquivo proprio: outra execucao no mesmo dia nao sobrescreve o anterior
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            csv_name = f"{Path(csv_name).stem}_{timestamp}{Path(csv_name).suffix}"
+            zip_name = f"{Path(zip_name).stem}_{timestamp}{Path(zip_name).suffix}"
         output_zip = output_dir_path / zip_name
+        if incremental and output_zip.exists():
+            raise FileExistsError(f"Delta de enriquecimento ja existe: {output_zip}")
 
-        self.io.write_zip({csv_name: df_saida}, output_zip)
+        layout = df_saida[
+            ["CPFCNPJ CLIENTE", "TELEFONE", "EMAIL", "OBSERVACAO", "NOME", "TELEFONE PRINCIPAL"]
+        ]
+        try:
+            self.io.write_zip({csv_name: layout}, output_zip, inputs=[input_file])
+        except Exception:
+            # ZIP parcial nao conta como envio
+            output_zip.unlink(missing_ok=True)
+            raise
+        # Marca como enviados apenas depois que o arquivo foi gravado
+        if history is not None:
+            history.registrar(df_saida)
 
         return ContactEnrichmentStats(
             input_rows=len(df_source),
-            phone_rows=phone_created,
-            phone_discarded=phone_discarded,
-            email_rows=email_created,
-            email_discarded=email_discarded,
+            phone_rows=counts["phone_rows"],
+            phone_discarded=counts["phone_discarded"],
+            email_rows=counts["email_rows"],
+            email_discarded=counts["email_discarded"],
             deduplicated=deduplicated,
             output_path=output_zip,
-            output_records=len(df_saida),
+            output_records=len(layout),
+            already_sent=already_sent,
+            full=full or history is None,
         )
 
     def print_summary(self, stats: ContactEnrichmentStats) -> None:
@@ -314,15 +348,21 @@ class ContactEnrichmentProcessor:
         print(OutputFormatter.metric("Emails gerados", stats.email_rows))
         print(OutputFormatter.metric("Emails descartados", stats.email_discarded))
         print(OutputFormatter.metric("Removidos na deduplicacao", stats.deduplicated))
+        if not stats.full:
+            print(OutputFormatter.metric("Ja enviados (historico)", stats.already_sent))
         print(OutputFormatter.section("Arquivo gerado"))
         print(OutputFormatter.file_info("Saida ZIP", str(stats.output_path), stats.output_records))
         print(OutputFormatter.footer())
 
 
-def run(dataset_key: str = "default", loader: Optional[ConfigLoader] = None) -> ContactEnrichmentStats:
+def run(
+    dataset_key: str = "default",
+    loader: Optional[ConfigLoader] = None,
+    full: bool = False,
+) -> ContactEnrichmentStats:
     loader = loader or ConfigLoader()
     config = loader.load()
     processor = ContactEnrichmentProcessor(config, dataset_key)
-    stats = processor.run()
+    stats = processor.run(full=full)
     processor.print_summary(stats)
     return stats
@@ -331,16 +331,14 @@ def run(loader: ConfigLoader) -> None:
     emccamp_tratada = paths.resolve_output("emccamp_tratada", "emccamp_tratada")
     max_tratada = paths.resolve_output("max_tratada", "max_tratada")
 
-    emccamp_files = sorted(emccamp_tratada.glob("emccamp_tratada*.zip"), key=lambda p: p.stat().st_mtime, reverse=True)
-    max_files = sorted(max_tratada.glob("max_tratada*.zip"), key=lambda p: p.stat().st_mtime, reverse=True)
-
-    if not emccamp_files:
-        raise FileNotFoundError(f"Arquivo EMCCAMP tratado nao encontrado em {emccamp_tratada}")
-    if not max_files:
-        raise FileNotFoundError(f"Arquivo MAX tratado nao encontrado em {max_tratada}")
-
-    emccamp_file = emccamp_files[0]
-    max_file = max_files[0]
+    try:
+        emccamp_file = DatasetIO.latest_file(emccamp_tratada, "emccamp_tratada*.zip")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Arquivo EMCCAMP tratado nao encontrado em {emccamp_tratada}") from None
+    try:
+        max_file = DatasetIO.latest_file(max_tratada, "max_tratada*.zip")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Arquivo MAX tratado nao encontrado em {max_tratada}") from None
 
     inicio = datetime.now()
     stats = executar_baixa(emccamp_file, max_file, config, logger)
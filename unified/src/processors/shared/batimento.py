@@ -10,7 +10,9 @@ from typing import Dict, Optional, Tuple
 import pandas as pd
 
 from src.config.loader import ConfigLoader, LoadedConfig
+from src.core.base import SplitResult
 from src.utils import digits_only, procv_emccamp_menos_max
+from src.utils.duckdb_backend import abrir_backend
 from src.utils.io import DatasetIO
 from src.utils.logger import get_logger
 from src.utils.output_formatter import format_batimento_output
@@ -30,6 +32,24 @@ LAYOUT_COLS = [
     "CNPJ CREDOR",
 ]
 
+# Colunas de origem (preferencial, alternativa) de cada campo do layout
+LAYOUT_SOURCES: Dict[str, Tuple[str, ...]] = {
+    "CPFCNPJ CLIENTE": ("CPF_CNPJ", "CPFCNPJ_CLIENTE"),
+    "NOME / RAZAO SOCIAL": ("NOME_RAZAO_SOCIAL", "CLIENTE"),
+    "NUMERO CONTRATO": ("CONTRATO", "NUMERO_CONTRATO"),
+    "PARCELA": ("CHAVE",),
+    "OBSERVACAO PARCELA": ("PARCELA",),
+    "VENCIMENTO": ("DATA_VENCIMENTO", "VENCIMENTO"),
+    "VALOR": ("VALOR_PARCELA", "VALOR"),
+    "EMPREENDIMENTO": ("NOME_EMPREENDIMENTO", "EMPREENDIMENTO"),
+    "CNPJ EMPREENDIMENTO": ("CNPJ_EMPREENDIMENTO",),
+    "TIPO PARCELA": ("TIPO_PAGTO",),
+}
+
+# Projeção de leitura: apenas as colunas usadas pelo batimento
+EMCCAMP_INPUT_COLS = {"CHAVE", "TIPO_PAGTO"} | {col for cols in LAYOUT_SOURCES.values() for col in cols}
+MAX_INPUT_COLS = {"CHAVE", "PARCELA", "DT_BAIXA"}
+
 
 @dataclass
 class BatimentoStats:
@@ -85,8 +105,8 @@ class BatimentoProcessor:
         emccamp_path = self._resolve_file(self.emccamp_dir, "emccamp_tratada_*.zip")
         max_path = self._resolve_file(self.max_dir, "max_tratada_*.zip")
 
-        df_emccamp = self.io.read(emccamp_path)
-        df_max = self.io.read(max_path)
+        df_emccamp = self.io.read(emccamp_path, columns=EMCCAMP_INPUT_COLS)
+        df_max = self.io.read(max_path, columns=MAX_INPUT_COLS)
 
         if self.filtrar_tipo_pagto:
             if "TIPO_PAGTO" not in df_emccamp.columns:
@@ -101,18 +121,21 @@ class BatimentoProcessor:
             raise ValueError("Coluna CHAVE ausente na base MAX tratada")
 
         df_max_dedup = self._deduplicate_max(df_max)
-        df_batimento = procv_emccamp_menos_max(
-            df_emccamp,
-            df_max_dedup,
-            col_emccamp="CHAVE",
-            col_max="CHAVE",
-        )
+        # DuckDB quando configurado ou quando as entradas passam do orçamento de memória
+        with abrir_backend(self.config, entradas=[emccamp_path, max_path]) as backend:
+            df_batimento = procv_emccamp_menos_max(
+                df_emccamp,
+                df_max_dedup,
+                col_emccamp="CHAVE",
+                col_max="CHAVE",
+                backend=backend,
+            )
 
         df_formatado = self._format_layout(df_batimento)
         self._load_judicial_cpfs()
-        df_judicial, df_extrajudicial = self._split_portfolios(df_formatado)
+        carteiras = self._split_portfolios(df_formatado)
 
-        arquivo_saida = self._export(df_judicial, df_extrajudicial)
+        arquivo_saida = self._export(carteiras, inputs=(emccamp_path, max_path))
 
         duracao = (datetime.now() - inicio).total_seconds()
         stats = BatimentoStats(
@@ -120,8 +143,8 @@ class BatimentoProcessor:
             registros_max=len(df_max),
             registros_max_dedup=len(df_max_dedup),
             registros_batimento=len(df_formatado),
-            judicial=len(df_judicial),
-            extrajudicial=len(df_extrajudicial),
+            judicial=carteiras.sizes["judicial"],
+            extrajudicial=carteiras.sizes["extrajudicial"],
             arquivo_saida=arquivo_saida,
             duracao=duracao,
         )
@@ -132,10 +155,7 @@ class BatimentoProcessor:
         if not directory.exists():
             raise FileNotFoundError(f"Diretorio nao encontrado: {directory}")
 
-        candidates = sorted(directory.glob(pattern), key=lambda path: path.stat().st_mtime, reverse=True)
-        if not candidates:
-            raise FileNotFoundError(f"Nenhum arquivo correspondente a {pattern} em {directory}")
-        return candidates[0]
+        return DatasetIO.latest_file(directory, pattern)
 
     def _deduplicate_max(self, df_max: pd.DataFrame) -> pd.DataFrame:
         if "PARCELA" not in df_max.columns:
@@ -163,27 +183,10 @@ class BatimentoProcessor:
             return pd.Series(["" for _ in range(len(df))], index=df.index)
 
         formatted = pd.DataFrame(index=df.index)
-        formatted["CPFCNPJ CLIENTE"] = _column("CPF_CNPJ", "CPFCNPJ_CLIENTE")
-        formatted["NOME / RAZAO SOCIAL"] = _column("NOME_RAZAO_SOCIAL", "CLIENTE")
-        formatted["NUMERO CONTRATO"] = _column("CONTRATO", "NUMERO_CONTRATO")
-        formatted["PARCELA"] = _column("CHAVE")
-        formatted["OBSERVACAO PARCELA"] = _column("PARCELA")
-        formatted["VENCIMENTO"] = _column("DATA_VENCIMENTO", "VENCIMENTO")
-        formatted["VALOR"] = _column("VALOR_PARCELA", "VALOR")
-        # Converte VALOR para numérico para que a escrita CSV aplique vírgula decimal
-        serie_valor = formatted["VALOR"].astype(str).str.strip()
-        mask_comma = serie_valor.str.contains(',', na=False)
-        # Valores com vírgula: mantém formato original com vírgula
-        valor_comma = serie_valor[mask_comma]
-        # Valores sem vírgula: mantém formato original  
-        valor_dot = serie_valor[~mask_comma]
-        formatted.loc[mask_comma, "VALOR"] = valor_comma
-        formatted.loc[~mask_comma, "VALOR"] = valor_dot
-        # Não converter para numérico - manter vírgulas como decimal no CSV
-        # formatted["VALOR"] = pd.to_numeric(formatted["VALOR"], errors="coerce")  # REMOVIDO
-        formatted["EMPREENDIMENTO"] = _column("NOME_EMPREENDIMENTO", "EMPREENDIMENTO")
-        formatted["CNPJ EMPREENDIMENTO"] = _column("CNPJ_EMPREENDIMENTO")
-        formatted["TIPO PARCELA"] = _column("TIPO_PAGTO").str.upper()
+        for layout_col, sources in LAYOUT_SOURCES.items():
+            formatted[layout_col] = _column(*sources)
+        # VALOR mantém o texto original (vírgula como decimal no CSV)
+        formatted["TIPO PARCELA"] = formatted["TIPO PARCELA"].str.upper()
         formatted["CNPJ CREDOR"] = self.cnpj_credor
         return formatted[LAYOUT_COLS]
 
@@ -215,16 +218,24 @@ class BatimentoProcessor:
 
         self.judicial_cpfs = set(digits_only(df[column_name].dropna().astype(str)).tolist())
 
-    def _split_portfolios(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def _split_portfolios(self, df: pd.DataFrame) -> SplitResult:
+        """Carteiras judicial/extrajudicial como posicoes sobre ``df`` (sem copia)."""
         if df.empty:
-            return df, df
+            return SplitResult.from_positions(df, {"judicial": [], "extrajudicial": []})
 
         normalizado = digits_only(df["CPFCNPJ CLIENTE"].fillna(""))
         mask_judicial = normalizado.isin(self.judicial_cpfs)
-        return df[mask_judicial].copy(), df[~mask_judicial].copy()
+        return SplitResult.from_masks(
+            df, {"judicial": mask_judicial, "extrajudicial": ~mask_judicial}
+        )
 
-    def _export(self, df_judicial: pd.DataFrame, df_extrajudicial: pd.DataFrame) -> Path | None:
-        if df_judicial.empty and df_extrajudicial.empty:
+    def _export(
+        self,
+        carteiras: SplitResult,
+        inputs: Tuple[Path, ...] = (),
+    ) -> Path | None:
+        tamanhos = carteiras.sizes
+        if not any(tamanhos.values()):
             return None
 
         self.batimento_dir.mkdir(parents=True, exist_ok=True)
@@ -234,13 +245,13 @@ class BatimentoProcessor:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         zip_path = self.batimento_dir / f"emccamp_batimento_{timestamp}.zip"
 
-        arquivos: Dict[str, pd.DataFrame] = {}
-        if not df_judicial.empty:
-            arquivos[f"emccamp_batimento_judicial_{timestamp}.csv"] = df_judicial
-        if not df_extrajudicial.empty:
-            arquivos[f"emccamp_batimento_extrajudicial_{timestamp}.csv"] = df_extrajudicial
-
-        self.io.write_zip(arquivos, zip_path)
+        # Cada carteira e gravada em blocos direto do layout, sem copia completa
+        nomes = {
+            nome: f"emccamp_batimento_{nome}_{timestamp}.csv"
+            for nome in ("judicial", "extrajudicial")
+            if tamanhos[nome]
+        }
+        self.io.write_zip(carteiras.rename(nomes).splits, zip_path, inputs=inputs)
         return zip_path
 
     def _show_summary(self, stats: BatimentoStats, emccamp_nome: str, max_nome: str) -> None:
@@ -166,15 +166,7 @@ class DevolucaoProcessor:
         if not directory.exists():
             raise FileNotFoundError(f"Diretório não encontrado: {directory}")
 
-        candidates = sorted(
-            directory.glob(pattern),
-            key=lambda path: path.stat().st_mtime,
-            reverse=True
-        )
-        if not candidates:
-            raise FileNotFoundError(f"Nenhum arquivo correspondente a {pattern} em {directory}")
-        
-        return candidates[0]
+        return DatasetIO.latest_file(directory, pattern)
 
     def _aplicar_filtros_emccamp(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
         """Aplica filtros configurados na base EMCCAMP."""
@@ -409,8 +401,8 @@ class DevolucaoProcessor:
         serie = digits_only(df[cpf_col].fillna(""))
         mask_judicial = serie.isin(self._judicial_cpfs)
 
-        df_judicial = df[mask_judicial].copy()
-        df_extrajudicial = df[~mask_judicial].copy()
+        df_judicial = df[mask_judicial]
+        df_extrajudicial = df[~mask_judicial]
 
         return df_judicial, df_extrajudicial
 
@@ -6,7 +6,7 @@ import re
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 
@@ -14,6 +14,7 @@ from src.config.loader import ConfigLoader, LoadedConfig
 from src.utils.io import DatasetIO
 from src.utils.logger import get_logger
 from src.utils.output_formatter import format_treatment_output
+from src.utils.parallel import criar_executor, formato_datas
 from src.utils.path_manager import PathManager
 
 
@@ -43,6 +44,7 @@ class MaxProcessor:
         self.encoding = global_cfg.get("encoding", "utf-8-sig")
         self.separator = global_cfg.get("csv_separator", ",")
         self.io = DatasetIO(separator=self.separator, encoding=self.encoding)
+        self.executor = criar_executor(config)
 
         self.input_dir = self.paths.resolve_input("base_max", "data/input/base_max")
         self.output_dir = self.paths.resolve_output("max_tratada", "max_tratada")
@@ -52,7 +54,9 @@ class MaxProcessor:
         source_file = self._resolve_source_file()
         df_raw = self.io.read(source_file)
 
-        df_norm = self._normalize(df_raw)
+        due_column = self._due_date_column(df_raw)
+        date_format = formato_datas(df_raw[due_column]) if due_column else None
+        df_norm = self.executor.executar(self._normalize, df_raw, self._partition_key, date_format)
         df_valid, df_incons = self._validate(df_norm)
 
         PathManager.cleanup(self.output_dir, "max_tratada_*.zip", self.logger, silent=True)
@@ -60,7 +64,7 @@ class MaxProcessor:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         csv_name = f"max_tratada_{timestamp}.csv"
         zip_path = self.output_dir / f"max_tratada_{timestamp}.zip"
-        self.io.write_zip({csv_name: df_valid}, zip_path)
+        self.io.write_zip({csv_name: df_valid}, zip_path, inputs=[source_file])
 
         zip_incons = None
         if not df_incons.empty:
@@ -85,7 +89,21 @@ class MaxProcessor:
             raise FileNotFoundError(f"Nenhum arquivo MAX encontrado em {self.input_dir}")
         return candidates[0]
 
-    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _partition_key(self, df: pd.DataFrame) -> pd.Series:
+        """Contract column (raw name) used to spread rows across workers."""
+        rename_map: Dict[str, str] = self.mapping.get("rename", {})
+        for column in df.columns:
+            if rename_map.get(column, column) == "NUMERO_CONTRATO":
+                return df[column]
+        return df.iloc[:, 0]
+
+    def _due_date_column(self, df: pd.DataFrame) -> Optional[str]:
+        """Raw column that becomes DATA_VENCIMENTO (same precedence as ``_normalize``)."""
+        rename_map: Dict[str, str] = self.mapping.get("rename", {})
+        renamed = {rename_map.get(column, column): column for column in df.columns}
+        return renamed.get("DATA_VENCIMENTO") or renamed.get("VENCIMENTO")
+
+    def _normalize(self, df: pd.DataFrame, date_format: Optional[str] = None) -> pd.DataFrame:
         rename_map: Dict[str, str] = self.mapping.get("rename", {})
         df_norm = df.rename(columns=rename_map).copy()
 
@@ -107,9 +125,11 @@ class MaxProcessor:
                 )
 
         if "DATA_VENCIMENTO" in df_norm.columns:
-            df_norm["DATA_VENCIMENTO"] = pd.to_datetime(df_norm["DATA_VENCIMENTO"], errors="coerce")
+            df_norm["DATA_VENCIMENTO"] = pd.to_datetime(
+                df_norm["DATA_VENCIMENTO"], format=date_format, errors="coerce"
+            )
         elif "VENCIMENTO" in df_norm.columns:
-            df_norm["DATA_VENCIMENTO"] = pd.to_datetime(df_norm["VENCIMENTO"], errors="coerce")
+            df_norm["DATA_VENCIMENTO"] = pd.to_datetime(df_norm["VENCIMENTO"], format=date_format, errors="coerce")
 
         # VALOR mantém formato original (vírgulas como decimal) - não converter para numérico
         # if "VALOR" in df_norm.columns:
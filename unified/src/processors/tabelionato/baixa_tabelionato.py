@@ -25,6 +25,8 @@ from src.utils.logger_config import (
     log_validation_result,
 )
 
+from src.utils.duckdb_backend import DuckDBBackend, criar_backend
+from src.utils.io import write_csv_to_zip
 from src.utils.validacao_resultados import (
     localizar_chaves_ausentes,
     localizar_chaves_presentes,
@@ -207,7 +209,11 @@ def filtrar_max_status_aberto(df_max: pd.DataFrame) -> pd.DataFrame:
         logger.error("Erro ao filtrar status aberto: %s", e)
         raise
 
-def identificar_diferenca_max_tabelionato(df_max: pd.DataFrame, df_tabelionato: pd.DataFrame) -> pd.DataFrame:
+def identificar_diferenca_max_tabelionato(
+    df_max: pd.DataFrame,
+    df_tabelionato: pd.DataFrame,
+    backend: Optional[DuckDBBackend] = None,
+) -> pd.DataFrame:
     """
     Identifica protocolos que esto na MAX mas no esto no Tabelionato.
     (Operao contrria ao batimento)
@@ -215,11 +221,24 @@ def identificar_diferenca_max_tabelionato(df_max: pd.DataFrame, df_tabelionato:
     Args:
         df_max: DataFrame da base MAX tratada (filtrada por status aberto)
         df_tabelionato: DataFrame da base Tabelionato tratada
+        backend: Backend DuckDB opcional (EXECUTION_BACKEND=duckdb)
         
     Returns:
         DataFrame com protocolos que esto apenas na MAX
     """
     try:
+        if backend is not None:
+            df_resultado = backend.anti_join(
+                df_max, df_tabelionato, 'CHAVE', 'CHAVE', normalizar=False
+            )
+            df_resultado = df_resultado[df_resultado['CHAVE'].notna()]
+
+            logger.info("Chaves na MAX: %s", df_max['CHAVE'].nunique())
+            logger.info("Chaves no Tabelionato: %s", df_tabelionato['CHAVE'].nunique())
+            logger.info("Chaves apenas na MAX: %s", df_resultado['CHAVE'].nunique())
+            logger.info("Registros finais aps diferena: %s", len(df_resultado))
+            return df_resultado
+
         # Usar coluna CHAVE para comparao (comum em ambas as bases)
         chaves_max = set(df_max['CHAVE'].dropna())
         chaves_tabelionato = set(df_tabelionato['CHAVE'].dropna())
@@ -242,7 +261,9 @@ def identificar_diferenca_max_tabelionato(df_max: pd.DataFrame, df_tabelionato:
         raise
 
 def enriquecer_com_custas(
-    df_diferenca: pd.DataFrame, df_custas: pd.DataFrame
+    df_diferenca: pd.DataFrame,
+    df_custas: pd.DataFrame,
+    backend: Optional[DuckDBBackend] = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Enriquece os dados da diferena com informaes de custas.
@@ -251,6 +272,7 @@ def enriquecer_com_custas(
     Args:
         df_diferenca: DataFrame com protocolos apenas na MAX
         df_custas: DataFrame com dados de custas tratados
+        backend: Backend DuckDB opcional (EXECUTION_BACKEND=duckdb)
         
     Returns:
         Tuple com (DataFrame enriquecido, DataFrame de checagem)
@@ -269,11 +291,19 @@ def enriquecer_com_custas(
         )
 
         # Merge LEFT para manter todos os registros da diferena
-        df_merged = df_trabalho.merge(
-            df_custas_trabalho[['CHAVE_STR', 'Valor Total Pago']],
-            on='CHAVE_STR',
-            how='left',
-        )
+        if backend is not None and 'Valor Total Pago' not in df_trabalho.columns:
+            pos_max, pos_custas = backend.left_join_posicoes(
+                df_trabalho, df_custas_trabalho, 'CHAVE_STR', 'CHAVE_STR'
+            )
+            df_merged = df_trabalho.iloc[pos_max].reset_index(drop=True)
+            valores = df_custas_trabalho['Valor Total Pago'].reset_index(drop=True)
+            df_merged['Valor Total Pago'] = valores.reindex(pos_custas).set_axis(df_merged.index)
+        else:
+            df_merged = df_trabalho.merge(
+                df_custas_trabalho[['CHAVE_STR', 'Valor Total Pago']],
+                on='CHAVE_STR',
+                how='left',
+            )
 
         # Separar registros com match (encontrados na base custas) e sem match
         df_enriquecido = df_merged[df_merged['Valor Total Pago'].notna()].copy()
@@ -423,19 +453,12 @@ def salvar_resultado_baixa(df_final: pd.DataFrame) -> str:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         nome_csv = f"baixa_tabelionato_{timestamp}.csv"
         nome_zip = f"baixa_tabelionato_{timestamp}.zip"
-        caminho_csv = BAIXA_DIR / nome_csv
-        caminho_zip = BAIXA_DIR / nome_zip
-        
-        # Salvar CSV temporrio
-        df_final.to_csv(caminho_csv, index=False, encoding='utf-8', sep=';')
-        
-        # Criar ZIP
-        with zipfile.ZipFile(caminho_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(caminho_csv, nome_csv)
-        
-        # Remover CSV temporrio
-        caminho_csv.unlink()
-        
+
+        # CSV gravado direto no membro do ZIP
+        caminho_zip = write_csv_to_zip(
+            {nome_csv: df_final}, BAIXA_DIR / nome_zip, sep=';', encoding='utf-8', decimal='.'
+        )
+
         logger.info("Resultado da baixa salvo: %s", caminho_zip)
         return str(caminho_zip)
 
@@ -453,6 +476,7 @@ def executar_processo_baixa() -> ResultadoBaixa:
     log_session_start("Baixa Tabelionato")
     inicio = datetime.now()
     sucesso = False
+    backend = criar_backend()
 
     try:
         # 1. Carregar bases tratadas
@@ -484,7 +508,9 @@ def executar_processo_baixa() -> ResultadoBaixa:
 
         # 3. Identificar diferena (MAX - Tabelionato)
         logger.info("3. Identificando protocolos apenas na MAX...")
-        df_diferenca = identificar_diferenca_max_tabelionato(df_max_aberto, df_tabelionato)
+        df_diferenca = identificar_diferenca_max_tabelionato(
+            df_max_aberto, df_tabelionato, backend
+        )
 
         validacao_origem_max = localizar_chaves_ausentes(
             df_diferenca,
@@ -539,7 +565,7 @@ def executar_processo_baixa() -> ResultadoBaixa:
 
         # 4. Enriquecer com custas
         logger.info("4. Enriquecendo com dados de custas...")
-        df_enriquecido, df_checagem = enriquecer_com_custas(df_diferenca, df_custas)
+        df_enriquecido, df_checagem = enriquecer_com_custas(df_diferenca, df_custas, backend)
 
         total_exportados = len(df_enriquecido)
         total_nao_exportados = len(df_checagem)
@@ -616,6 +642,8 @@ def executar_processo_baixa() -> ResultadoBaixa:
         logger.exception("Erro no processo de baixa")
         raise
     finally:
+        if backend is not None:
+            backend.close()
         log_session_end("Baixa Tabelionato", success=sucesso)
 
 def main() -> int:
@@ -12,8 +12,11 @@ from datetime import datetime
 import pandas as pd
 import zipfile
 
+from src.utils.catalog import resolver_mais_recente
 from src.utils.console import format_duration, format_int, print_section, suppress_console_info
 from src.utils.formatting import formatar_moeda_serie
+from src.utils.io import write_csv_to_zip, write_partitioned_zips
+from src.utils.log_estruturado import preguicoso
 from src.utils.logger_config import (
     get_logger,
     log_metrics,
@@ -31,6 +34,15 @@ from src.utils.validacao_resultados import (
 # Configuracoes
 DECIMAL_SEP = os.getenv('CSV_DECIMAL_SEPARATOR', ',')
 
+# Projecao de leitura das bases MAX: apenas as colunas usadas no batimento
+COLUNAS_MAX_TRATADA = frozenset({'CHAVE'})
+COLUNAS_MAX_BRUTA = frozenset({'CPFCNPJ_CLIENTE', 'CAMPANHA', 'STATUS_TITULO'})
+
+
+def _projecao(colunas: frozenset):
+    """usecols que mantm apenas ``colunas`` (ausentes so ignoradas)."""
+    return lambda nome: str(nome).strip() in colunas
+
 class TabelionatoBatimento:
     """Processador de batimento Tabelionato x MAX."""
     
@@ -85,7 +97,7 @@ class TabelionatoBatimento:
                 df = pd.read_csv(csv_data, encoding=self.encoding, sep=self.csv_separator, dtype=str)
         
         self.logger.info(f"Tabelionato carregado: {len(df):,} registros")
-        self.logger.info(f"Colunas Tabelionato: {list(df.columns)}")
+        self.logger.info("Colunas Tabelionato: %s", preguicoso(list, df.columns))
         return df
     
     def carregar_base_max(self):
@@ -95,11 +107,10 @@ class TabelionatoBatimento:
         if not max_dir.exists():
             raise FileNotFoundError(f"Diretrio no encontrado: {max_dir}")
         
-        arquivos = sorted(max_dir.glob('max_tratada*.zip'))
-        if not arquivos:
-            raise FileNotFoundError(f"Nenhum arquivo MAX encontrado em {max_dir}")
-
-        arquivo_mais_recente = max(arquivos, key=lambda x: x.stat().st_mtime)
+        try:
+            arquivo_mais_recente = resolver_mais_recente(max_dir, 'max_tratada*.zip')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Nenhum arquivo MAX encontrado em {max_dir}") from None
         self.logger.info(f"Carregando MAX: {arquivo_mais_recente.name}")
         
         with zipfile.ZipFile(arquivo_mais_recente, 'r') as zip_file:
@@ -108,7 +119,13 @@ class TabelionatoBatimento:
                 raise ValueError("Nenhum arquivo CSV encontrado no ZIP MAX")
             
             with zip_file.open(csv_files[0]) as csv_data:
-                df = pd.read_csv(csv_data, encoding=self.encoding, sep=self.csv_separator, dtype=str)
+                df = pd.read_csv(
+                    csv_data,
+                    encoding=self.encoding,
+                    sep=self.csv_separator,
+                    dtype=str,
+                    usecols=_projecao(COLUNAS_MAX_TRATADA),
+                )
         
         self.logger.info(f"MAX carregado: {len(df):,} registros")
         return df
@@ -118,13 +135,12 @@ class TabelionatoBatimento:
         if not self.max_input_dir.exists():
             raise FileNotFoundError(f"Diretrio no encontrado: {self.max_input_dir}")
 
-        arquivos = [f for f in self.max_input_dir.glob('*.zip') if f.is_file()]
-        if not arquivos:
+        try:
+            arquivo_mais_recente = resolver_mais_recente(self.max_input_dir, '*.zip')
+        except FileNotFoundError:
             raise FileNotFoundError(
                 f"Nenhum arquivo MAX bruto encontrado em {self.max_input_dir}"
-            )
-
-        arquivo_mais_recente = max(arquivos, key=lambda x: x.stat().st_mtime)
+            ) from None
         self.logger.info(f"Carregando MAX bruto: {arquivo_mais_recente.name}")
 
         with zipfile.ZipFile(arquivo_mais_recente, 'r') as zip_file:
@@ -138,6 +154,7 @@ class TabelionatoBatimento:
                     encoding='utf-8-sig',
                     sep=';',
                     dtype=str,
+                    usecols=_projecao(COLUNAS_MAX_BRUTA),
                 )
 
         self.logger.info(
@@ -414,26 +431,16 @@ class TabelionatoBatimento:
                 'Campanha 94': 'batimento_campanha94',
             }
 
-            for campanha, nome_base in mapa_campanhas.items():
-                df_campanha = df_pendentes[df_pendentes['Campanha'] == campanha].copy()
-                if df_campanha.empty:
-                    continue
-                contagens[campanha] = len(df_campanha)
-
-                # Criar CSV temporário
-                csv_temp = self.output_dir / f"{nome_base}.csv"
-                df_saida = df_campanha.drop(columns=['Campanha'], errors='ignore')
-                df_saida.to_csv(csv_temp, sep=self.csv_separator, encoding=self.encoding, index=False)
-                
-                # Criar ZIP
-                zip_path = self.output_dir / f"{nome_base}.zip"
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
-                    zip_ref.write(csv_temp, csv_temp.name)
-                
-                # Remover CSV temporário
-                csv_temp.unlink()
-                
-                arquivos_gerados[campanha] = zip_path
+            # Agrupa por campanha uma vez e grava cada grupo direto no seu ZIP
+            arquivos_gerados.update(write_partitioned_zips(
+                df_pendentes,
+                'Campanha',
+                {campanha: self.output_dir / f"{nome_base}.zip" for campanha, nome_base in mapa_campanhas.items()},
+                sep=self.csv_separator,
+                encoding=self.encoding,
+                decimal='.',
+            ))
+            contagens = df_pendentes['Campanha'].value_counts().reindex(list(arquivos_gerados)).to_dict()
             if contagens:
                 for camp, qtd in contagens.items():
                     self.logger.info("%s: %s registros exportados", camp, format_int(qtd))
@@ -441,23 +448,19 @@ class TabelionatoBatimento:
                 "Arquivos de batimento gerados para campanhas 58, 78 e 94.")
 
         if df_enriquecimento is not None and not df_enriquecimento.empty:
-            # Criar CSV temporrio (pasta propria de enriquecimento)
-            csv_temp = self.output_enriquecimento_dir / 'tabela_enriquecimento.csv'
             df_enriquecimento_export = df_enriquecimento.copy()
             if 'Custas' in df_enriquecimento_export.columns:
                 df_enriquecimento_export['Custas'] = formatar_moeda_serie(
                     df_enriquecimento_export['Custas'], decimal_separator=DECIMAL_SEP
                 )
-            df_enriquecimento_export.to_csv(csv_temp, sep=self.csv_separator, encoding=self.encoding, index=False)
-            
-            # Criar ZIP
-            zip_path = self.output_enriquecimento_dir / 'tabela_enriquecimento.zip'
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
-                zip_ref.write(csv_temp, csv_temp.name)
-            
-            # Remover CSV temporrio
-            csv_temp.unlink()
-            
+            zip_path = write_csv_to_zip(
+                {'tabela_enriquecimento.csv': df_enriquecimento_export},
+                self.output_enriquecimento_dir / 'tabela_enriquecimento.zip',
+                sep=self.csv_separator,
+                encoding=self.encoding,
+                decimal='.',
+            )
+
             arquivos_gerados['enriquecimento'] = zip_path
             self.logger.info(
                 "Tabela de enriquecimento gerada com %s registros",
@@ -9,7 +9,6 @@ import logging
 import sys
 import time
 import warnings
-import zipfile
 from datetime import datetime
 from pathlib import Path
 
@@ -17,6 +16,7 @@ import pandas as pd
 from dotenv import load_dotenv
 
 from src.utils.console import format_duration, format_int, print_section
+from src.utils.io import write_csv_to_zip
 from src.utils.logger_config import get_logger
 
 warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy connectable')
@@ -91,16 +91,9 @@ def extract_max_tabelionato_data(profile: str = 'tabelionato'):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         csv_name = f'MaxSmart_Tabelionato_{timestamp}.csv'
         zip_path = output_dir / output_filename
-        temp_csv = output_dir / csv_name
 
-        # Salvar CSV temporrio
-        df.to_csv(temp_csv, index=False, encoding='utf-8-sig', sep=';')
-        logger.info('CSV temporario gerado: %s', temp_csv)
-
-        # Compactar em ZIP
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.write(temp_csv, csv_name)
-        temp_csv.unlink()
+        # CSV gravado direto no membro do ZIP
+        write_csv_to_zip({csv_name: df}, zip_path, sep=';', decimal='.')
 
         logger.info('Arquivo compactado salvo em: %s', zip_path)
         logger.info('Registros extraidos: %s', f"{registros:,}")
@@ -12,6 +12,7 @@ import pandas as pd
 
 from src.utils.console import format_duration, format_int, format_percent, print_section, suppress_console_info
 from src.utils.formatting import formatar_moeda_serie
+from src.utils.io import write_csv_to_zip
 from src.utils.logger_config import get_logger, log_session_end, log_session_start
 
 # Configuracao de separador decimal para exportacao CSV
@@ -186,16 +187,16 @@ class TabelionatoMaxProcessor:
         for arquivo in self.output_inconsistencias_dir.glob("max_inconsistencias*.zip"):
             arquivo.unlink(missing_ok=True)
 
-        csv_temp = self.output_inconsistencias_dir / "max_inconsistencias.csv"
         df_export = df_invalido.copy()
         if 'VALOR' in df_export.columns:
             df_export['VALOR'] = formatar_moeda_serie(df_export['VALOR'], decimal_separator=DECIMAL_SEP)
-        df_export.to_csv(csv_temp, index=False, encoding=self.encoding, sep=self.csv_separator)
-
-        zip_path = self.output_inconsistencias_dir / "max_inconsistencias.zip"
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            zip_file.write(csv_temp, csv_temp.name)
-        csv_temp.unlink(missing_ok=True)
+        zip_path = write_csv_to_zip(
+            {"max_inconsistencias.csv": df_export},
+            self.output_inconsistencias_dir / "max_inconsistencias.zip",
+            sep=self.csv_separator,
+            encoding=self.encoding,
+            decimal=".",
+        )
 
         self.logger.info("Inconsistencias exportadas: %s", zip_path)
         return str(zip_path)
@@ -205,16 +206,17 @@ class TabelionatoMaxProcessor:
         for arquivo in self.output_tratada_dir.glob(f"{nome_base}*.zip"):
             arquivo.unlink(missing_ok=True)
 
-        csv_path = self.output_tratada_dir / f"{nome_base}.csv"
         df_export = df.copy()
         if 'VALOR' in df_export.columns:
             df_export['VALOR'] = formatar_moeda_serie(df_export['VALOR'], decimal_separator=DECIMAL_SEP)
-        df_export.to_csv(csv_path, index=False, encoding=self.encoding, sep=self.csv_separator)
-
-        zip_path = self.output_tratada_dir / f"{nome_base}.zip"
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            zip_file.write(csv_path, csv_path.name)
-        csv_path.unlink(missing_ok=True)
+        zip_path = write_csv_to_zip(
+            {f"{nome_base}.csv": df_export},
+            self.output_tratada_dir / f"{nome_base}.zip",
+            sep=self.csv_separator,
+            encoding=self.encoding,
+            decimal=".",
+            estagio="tratamento_max",
+        )
 
         self.logger.info("Arquivo exportado: %s", zip_path)
         return zip_path
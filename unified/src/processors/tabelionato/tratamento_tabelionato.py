@@ -9,14 +9,16 @@ import os
 import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import pandas as pd
 from pandas.api.types import is_string_dtype
 
 from src.utils.console import format_duration, format_int, format_percent, print_section, suppress_console_info
 from src.utils.formatting import formatar_moeda_serie
+from src.utils.io import write_csv_to_zip
 from src.utils.logger_config import get_logger, log_session_start, log_session_end
+from src.utils.parallel import criar_executor, formato_datas
 
 # Configuracao de separador decimal para exportacao CSV
 DECIMAL_SEP = os.getenv('CSV_DECIMAL_SEPARATOR', ',')
@@ -42,6 +44,9 @@ class TabelionatoProcessor:
         # Estatsticas da execucao
         self.stats = {}
 
+        # Execucao paralela por Protocolo (PARALLEL_WORKERS / PARALLEL_MIN_ROWS)
+        self.executor = criar_executor()
+
         # Diretrios de trabalho dentro do escopo isolado do Tabelionato
         self.base_dir = Path(__file__).parent.parent
         self.data_dir = self.base_dir / 'data'
@@ -143,7 +148,7 @@ class TabelionatoProcessor:
         self.logger.info(f"Dados carregados: {len(df):,} registros")
         return df
 
-    def padronizar_campos(self, df: pd.DataFrame) -> pd.DataFrame:
+    def padronizar_campos(self, df: pd.DataFrame, formato_data: Optional[str] = None) -> pd.DataFrame:
         """Tratamento conforme escopo: normalizar DtAnuencia, tratar CPF/CNPJ e calcular AGING."""
         df = df.copy()
 
@@ -155,7 +160,9 @@ class TabelionatoProcessor:
             self.logger.info("Normalizando formato da coluna DtAnuencia")
             
             # Converter para datetime se ainda no estiver
-            dt_anuencia = pd.to_datetime(df['DtAnuencia'], errors='coerce', dayfirst=True)
+            dt_anuencia = pd.to_datetime(
+                df['DtAnuencia'], errors='coerce', dayfirst=True, format=formato_data
+            )
             
             # Normalizar para remover a hora (manter apenas a data)
             dt_anuencia = dt_anuencia.dt.normalize()
@@ -284,6 +291,27 @@ class TabelionatoProcessor:
 
         return df
 
+    @staticmethod
+    def _chave_particao(df: pd.DataFrame) -> pd.Series:
+        """Protocolo (CHAVE) de cada linha; mantm a regra de aging misto na mesma partio."""
+        coluna_protocolo = next(
+            (coluna for coluna in df.columns if str(coluna).strip().lower() == 'protocolo'),
+            None,
+        )
+        if coluna_protocolo is None:
+            return df['CHAVE'] if 'CHAVE' in df.columns else pd.Series('', index=df.index)
+        return df[coluna_protocolo]
+
+    def padronizar_e_validar(
+        self, df: pd.DataFrame, formato_data: Optional[str] = None
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Padronizacao + validacao de uma particao (executado em paralelo).
+
+        ``formato_data`` e inferido uma vez na base inteira (``formato_datas``)
+        para que todas as particoes leiam DtAnuencia da mesma forma.
+        """
+        return self.validar_dados(self.padronizar_campos(df, formato_data), formato_data)
+
     def _exportar_inconsistencias(self, df_invalido: pd.DataFrame, caminho_saida: Path) -> str:
         """Exporta as inconsistencias encontradas para analise manual."""
         if df_invalido.empty:
@@ -297,26 +325,26 @@ class TabelionatoProcessor:
             arquivo_anterior.unlink(missing_ok=True)
             self.logger.info(f"Arquivo anterior de inconsistencias removido: {arquivo_anterior.name}")
 
-        csv_temp = caminho_saida / "tabelionato_inconsistencias.csv"
         df_export = df_invalido.copy()
         if 'Custas' in df_export.columns:
             df_export['Custas'] = formatar_moeda_serie(
                 df_export['Custas'], decimal_separator=DECIMAL_SEP
             )
-        df_export.to_csv(csv_temp, index=False, encoding=self.encoding, sep=self.csv_separator)
 
-        arquivo_zip = caminho_saida / "tabelionato_inconsistencias.zip"
-        # Criar arquivo ZIP
-        with zipfile.ZipFile(arquivo_zip, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            zip_file.write(csv_temp, csv_temp.name)
-        
-        # Remover arquivo CSV temporrio
-        csv_temp.unlink()
-        
+        arquivo_zip = write_csv_to_zip(
+            {"tabelionato_inconsistencias.csv": df_export},
+            caminho_saida / "tabelionato_inconsistencias.zip",
+            sep=self.csv_separator,
+            encoding=self.encoding,
+            decimal='.',
+        )
+
         self.logger.info("Inconsistencias exportadas: %s", arquivo_zip)
         return str(arquivo_zip)
 
-    def validar_dados(self, df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    def validar_dados(
+        self, df: pd.DataFrame, formato_data: Optional[str] = None
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
         """Valida dados conforme escopo: apenas DtAnuencia invlida."""
         if df.empty:
             return df.copy(), pd.DataFrame()
@@ -338,7 +366,9 @@ class TabelionatoProcessor:
             )
 
             # Tentar converter para datetime para casos que passaram no filtro anterior
-            dt_anuencia_convertida = pd.to_datetime(dt_anuencia_valores, errors='coerce')
+            dt_anuencia_convertida = pd.to_datetime(
+                dt_anuencia_valores, errors='coerce', dayfirst=True, format=formato_data
+            )
             mask_conversao_falhou = dt_anuencia_convertida.isna()
 
             # Datas anteriores a 1900 so consideradas inconsistentes
@@ -466,17 +496,15 @@ class TabelionatoProcessor:
                 df_export['Custas'], decimal_separator=DECIMAL_SEP
             )
 
-        # Salvar CSV temporrio
-        csv_temp = output_dir / "tabelionato_tratado.csv"
-        df_export.to_csv(csv_temp, index=False, encoding=self.encoding, sep=self.csv_separator)
-        
-        # Criar arquivo ZIP
-        with zipfile.ZipFile(arquivo_zip, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            zip_file.write(csv_temp, csv_temp.name)
-        
-        # Remover arquivo CSV temporrio
-        csv_temp.unlink()
-        
+        # CSV gravado direto no membro do ZIP
+        write_csv_to_zip(
+            {"tabelionato_tratado.csv": df_export},
+            arquivo_zip,
+            sep=self.csv_separator,
+            encoding=self.encoding,
+            decimal='.',
+        )
+
         self.logger.info(f"Arquivo exportado: {arquivo_zip}")
         return str(arquivo_zip)
 
@@ -490,11 +518,15 @@ class TabelionatoProcessor:
         df_original = self.carregar_arquivo_zip(entrada)
         registros_originais = len(df_original)
         
-        # Padronizar campos
-        df_padronizado = self.padronizar_campos(df_original)
-        
-        # Validar dados
-        df_valido, df_invalido = self.validar_dados(df_padronizado)
+        # Padronizar campos e validar dados (particionado por Protocolo)
+        if self.data_referencia_aging is None:
+            self.data_referencia_aging = pd.Timestamp.now().normalize()
+        formato_data = None
+        if 'DtAnuencia' in df_original.columns:
+            formato_data = formato_datas(df_original['DtAnuencia'], dayfirst=True)
+        df_valido, df_invalido = self.executor.executar(
+            self.padronizar_e_validar, df_original, self._chave_particao, formato_data
+        )
         inconsistencias_iniciais = len(df_invalido)
         
         # Exportar inconsistencias se houver
@@ -21,6 +21,7 @@ from src.io.file_manager import FileManager
 from src.io.packager import ExportacaoService
 from src.utils.filters import VicFilterApplier
 from src.utils import get_logger, log_section, digits_only, formatar_datas_serie
+from src.utils.duckdb_backend import DuckDBBackend, abrir_backend
 
 
 @dataclass(frozen=True)
@@ -64,6 +65,8 @@ class BaixaProcessor:
         self.file_manager = FileManager(self.config)
         self.exportacao_service = ExportacaoService(self.config, self.file_manager)
         self.filter_applier = VicFilterApplier(self.config, self.logger)
+        # Aberto por execução em processar() (execution.backend: duckdb)
+        self.backend: Optional[DuckDBBackend] = None
 
         self.global_cfg = loader.get_nested_value(self.config, "global", {})
         self.baixa_cfg = loader.get_nested_value(
@@ -237,9 +240,18 @@ class BaixaProcessor:
         df_vic_local = df_vic.copy()
         df_vic_local[self.key_column_name] = chave_vic
 
-        conjunto_max = set(chave_max[chave_max != ""])
-        mask = df_vic_local[self.key_column_name].isin(conjunto_max)
-        divergentes = df_vic_local[mask].copy()
+        chave_max_valida = chave_max[chave_max != ""]
+        if self.backend is not None:
+            divergentes = self.backend.semi_join(
+                df_vic_local,
+                chave_max_valida.to_frame(self.key_column_name),
+                self.key_column_name,
+                self.key_column_name,
+                normalizar=False,
+            )
+        else:
+            mask = df_vic_local[self.key_column_name].isin(set(chave_max_valida))
+            divergentes = df_vic_local[mask].copy()
 
         metrics = {
             "chaves_vic": len(chave_vic),
@@ -453,8 +465,8 @@ class BaixaProcessor:
             vazio = df.iloc[0:0].copy()
             return vazio, vazio
         mask_jud = self._mask_judicial(df)
-        df_jud = df[mask_jud].copy()
-        df_ext = df[~mask_jud].copy()
+        df_jud = df[mask_jud]
+        df_ext = df[~mask_jud]
         return df_jud, df_ext
 
     # ------------------------------------------------------------------
@@ -511,6 +523,18 @@ class BaixaProcessor:
         self,
         vic_path: Path | str,
         max_path: Path | str,
+    ) -> Dict[str, Any]:
+        with abrir_backend(self.config, entradas=[vic_path, max_path]) as backend:
+            self.backend = backend
+            try:
+                return self._processar(vic_path, max_path)
+            finally:
+                self.backend = None
+
+    def _processar(
+        self,
+        vic_path: Path | str,
+        max_path: Path | str,
     ) -> Dict[str, Any]:
         inicio = datetime.now()
 
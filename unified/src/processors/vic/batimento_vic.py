@@ -20,6 +20,7 @@ from src.utils.validator import InconsistenciaManager
 from src.io.packager import ExportacaoService
 from src.utils.logger import get_logger, log_section
 from src.utils.anti_join import procv_vic_menos_max
+from src.utils.duckdb_backend import DuckDBBackend, abrir_backend
 from src.utils.text import digits_only
 from src.processors.vic import VicFilterApplier
 
@@ -43,6 +44,8 @@ class BatimentoProcessor:
         self.file_manager = FileManager(self.config)
         self.inconsistencia_manager = InconsistenciaManager(self.config)
         self.exportacao_service = ExportacaoService(self.config, self.file_manager)
+        # Aberto por execução em processar() (execution.backend: duckdb)
+        self.backend: Optional[DuckDBBackend] = None
 
         # Configurações específicas de batimento
         self.columns_config = self.batimento_config.get('columns', {})
@@ -114,18 +117,25 @@ class BatimentoProcessor:
             self.logger.error(f"Erro ao carregar CPFs judiciais: {e}")
             self.judicial_cpfs = set()
 
-    def realizar_cruzamento(self, df_vic: pd.DataFrame, df_max: pd.DataFrame) -> pd.DataFrame:
-        """Identifica parcelas em aberto na VIC que não estão na MAX (left anti-join)."""
+    def realizar_cruzamento(self, df_vic: pd.DataFrame, df_max: Union[pd.DataFrame, str]) -> pd.DataFrame:
+        """Identifica parcelas em aberto na VIC que não estão na MAX (left anti-join).
+
+        ``df_max`` pode ser o nome de uma fonte registrada no backend DuckDB
+        (arquivo consultado direto, sem carregar a MAX no pandas).
+        """
         self.logger.info("PROCV VIC−MAX: iniciando identificação...")
 
         # No batimento não há filtro por status; usar MAX como recebido
-        df_max_filtrado = df_max.copy()
+        df_max_filtrado = df_max if isinstance(df_max, str) else df_max.copy()
+        colunas_max = (
+            self.backend.colunas(df_max_filtrado) if isinstance(df_max_filtrado, str) else df_max_filtrado.columns
+        )
 
         if 'CHAVE' not in df_vic.columns:
             raise ValueError(
                 "Coluna CHAVE ausente na base VIC tratada para cruzamento com MAX"
             )
-        if 'PARCELA' not in df_max_filtrado.columns:
+        if 'PARCELA' not in colunas_max:
             raise ValueError(
                 "Coluna PARCELA ausente na base MAX tratada para cruzamento com VIC"
             )
@@ -138,11 +148,15 @@ class BatimentoProcessor:
             )
             raise ValueError("CHAVE duplicada detectada na base VIC para batimento")
 
-        df_nao_encontradas = procv_vic_menos_max(df_vic, df_max_filtrado, 'CHAVE', 'PARCELA')
+        df_nao_encontradas = procv_vic_menos_max(
+            df_vic, df_max_filtrado, 'CHAVE', 'PARCELA', backend=self.backend
+        )
 
         self.metrics_ultima_execucao = {
             'registros_vic': len(df_vic),
-            'registros_max': len(df_max_filtrado),
+            'registros_max': (
+                self.backend.contar(df_max_filtrado) if isinstance(df_max_filtrado, str) else len(df_max_filtrado)
+            ),
             'registros_batimento': len(df_nao_encontradas),
         }
 
@@ -304,6 +318,44 @@ class BatimentoProcessor:
         output_dir: Optional[Union[str, Path]] = None
     ) -> Dict[str, Any]:
         """Executa o pipeline de batimento completo (carrega, cruza, formata e exporta)."""
+        with abrir_backend(self.config, entradas=[vic_path, max_path]) as backend:
+            self.backend = backend
+            try:
+                return self._processar(vic_path, max_path, output_dir)
+            finally:
+                self.backend = None
+
+    def _carregar_max(self, max_path: Union[str, Path]) -> Union[pd.DataFrame, str]:
+        """MAX tratada: com DuckDB, registrada como view sobre o arquivo; senão, DataFrame."""
+        if self.backend is None:
+            df_max = self.carregar_arquivo(max_path)
+            self.logger.info(f"MAX carregado: {len(df_max):,} registros")
+            return df_max
+        nome = self.backend.registrar(
+            'max',
+            max_path,
+            separador=self.file_manager.csv_separator,
+            encoding=self.file_manager.encoding,
+        )
+        self.logger.info("MAX consultado direto do arquivo (DuckDB): %s", max_path)
+        return nome
+
+    def _chaves_vic_na_max(self, df_vic: pd.DataFrame, df_max: Union[pd.DataFrame, str]) -> Set[str]:
+        """CHAVEs da VIC presentes na MAX (interseção usada nas validações)."""
+        vic_keys = set(df_vic['CHAVE'].astype(str).str.strip())
+        if isinstance(df_max, str):
+            presentes = self.backend.semi_join(df_vic, df_max, 'CHAVE', 'PARCELA')
+            return set(presentes['CHAVE'].astype(str).str.strip())
+        if 'PARCELA' not in df_max.columns:
+            return set()
+        return vic_keys & set(df_max['PARCELA'].astype(str).str.strip())
+
+    def _processar(
+        self,
+        vic_path: Union[str, Path],
+        max_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+    ) -> Dict[str, Any]:
         inicio = datetime.now()
         try:
             self.logger.info("Iniciando pipeline de batimento...")
@@ -324,8 +376,7 @@ class BatimentoProcessor:
             )
 
             self.logger.info(f"Carregando dados MAX: {max_path}")
-            df_max = self.carregar_arquivo(max_path)
-            self.logger.info(f"MAX carregado: {len(df_max):,} registros")
+            df_max = self._carregar_max(max_path)
 
             # Cruzamento
             df_cross = self.realizar_cruzamento(df_vic, df_max)
@@ -356,8 +407,8 @@ class BatimentoProcessor:
 
             # Calcular validações
             vic_keys = set(df_vic['CHAVE'].astype(str).str.strip())
-            max_df = getattr(self, '_max_filtrado', df_max)
-            max_keys = set(max_df['PARCELA'].astype(str).str.strip()) if 'PARCELA' in max_df.columns else set()
+            # Apenas a interseção VIC ∩ MAX importa para as três verificações
+            max_keys = self._chaves_vic_na_max(df_vic, getattr(self, '_max_filtrado', df_max))
             bat_keys = set(df_cross['CHAVE'].astype(str).str.strip()) if not df_cross.empty else set()
             
             validacao_subset = bat_keys.issubset(vic_keys)
@@ -20,6 +20,7 @@ from src.io.file_manager import FileManager
 from src.utils.validator import InconsistenciaManager
 from src.utils.logger import get_logger, log_section
 from src.utils.anti_join import procv_max_menos_vic
+from src.utils.duckdb_backend import DuckDBBackend, abrir_backend
 from src.utils.text import normalize_ascii_upper, digits_only
 from src.utils.helpers import primeiro_valor, normalizar_data_string, extrair_data_referencia
 from src.processors.vic import VicFilterApplier
@@ -66,6 +67,8 @@ class DevolucaoProcessor:
         self.inconsistencia_manager = InconsistenciaManager(self.config)
         self.exportacao_service = ExportacaoService(self.config, self.file_manager)
         self.filter_applier = VicFilterApplier(self.config, self.logger)
+        # Aberto por execução em processar() (execution.backend: duckdb)
+        self.backend: Optional[DuckDBBackend] = None
 
         # Parâmetros
         self.campanha_termo = (self.devolucao_config.get("campanha_termo") or "").strip()
@@ -205,7 +208,7 @@ class DevolucaoProcessor:
         if not caminhos:
             return df, 0
 
-        chaves_baixa: set[str] = set()
+        series_baixa: List[pd.Series] = []
         for caminho, nome_csv in caminhos:
             try:
                 if caminho.suffix.lower() == ".zip" and nome_csv:
@@ -227,11 +230,20 @@ class DevolucaoProcessor:
                 )
                 continue
             serie = df_baixa[coluna_baixa].astype(str).str.strip()
-            chaves_baixa.update(serie.dropna().tolist())
+            series_baixa.append(serie.dropna())
 
-        if not chaves_baixa:
+        if not any(len(serie) for serie in series_baixa):
             return df, 0
 
+        if self.backend is not None:
+            df_chaves = pd.concat(series_baixa, ignore_index=True).to_frame(self.ch_max)
+            resultado = self.backend.anti_join(df, df_chaves, self.ch_max, self.ch_max)
+            return resultado, len(df) - len(resultado)
+
+        chaves_baixa: set[str] = set()
+        for serie in series_baixa:
+            chaves_baixa.update(serie.tolist())
+
         serie_dev = df[self.ch_max].astype(str).str.strip()
         mask = ~serie_dev.isin(chaves_baixa)
         removidos = int((~mask).sum())
@@ -312,8 +324,8 @@ class DevolucaoProcessor:
             return vazio, vazio
 
         mask_jud = self._mask_judicial(df)
-        df_jud = df[mask_jud].copy()
-        df_ext = df[~mask_jud].copy()
+        df_jud = df[mask_jud]
+        df_ext = df[~mask_jud]
         return df_jud, df_ext
 
     # ------------------------------------------------------------------
@@ -444,7 +456,9 @@ class DevolucaoProcessor:
             counts["max_apos_status_excluir"] = len(df_max_f)
 
         # PROCV: MAX − VIC
-        df_out = procv_max_menos_vic(df_max_f, df_vic, self.ch_max, self.ch_vic)
+        df_out = procv_max_menos_vic(
+            df_max_f, df_vic, self.ch_max, self.ch_vic, backend=self.backend
+        )
 
         counts["registros_devolucao"] = len(df_out)
         self.logger.info("PROCV MAX−VIC: %s registros", f"{len(df_out):,}")
@@ -515,7 +529,19 @@ class DevolucaoProcessor:
         baixa_paths: Optional[Union[Dict[str, Any], Sequence[Union[str, Path]], str, Path]] = None,
     ) -> Dict[str, Any]:
         """Executa a pipeline completa de devolução."""
+        with abrir_backend(self.config, entradas=[vic_path, max_path]) as backend:
+            self.backend = backend
+            try:
+                return self._processar(vic_path, max_path, baixa_paths)
+            finally:
+                self.backend = None
 
+    def _processar(
+        self,
+        vic_path: Union[str, Path],
+        max_path: Union[str, Path],
+        baixa_paths: Optional[Union[Dict[str, Any], Sequence[Union[str, Path]], str, Path]] = None,
+    ) -> Dict[str, Any]:
         inicio = datetime.now()
         self.logger.info("Iniciando pipeline de devolucao...")
 
@@ -18,6 +18,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import pandas as pd
 
 from src.config.loader import ConfigLoader
+from src.core.memory import configured_budget, exceeds_budget
 from src.io.file_manager import FileManager
 from src.io.packager import ExportacaoService
 from src.utils.logger import get_logger, log_section
@@ -87,6 +88,9 @@ class EnriquecimentoVicProcessor:
             + ".csv"
         )
 
+        # Base VIC acima do orçamento de memória é lida em partes deste tamanho
+        self.chunk_rows: int = int(self.section_cfg.get("chunk_rows", 200_000))
+
         self._data_base_candidates: List[str] = [
             "DATA_BASE",
             "DATA BASE",
@@ -109,13 +113,21 @@ class EnriquecimentoVicProcessor:
         vic_base_zip = self.file_manager.validar_arquivo_existe(vic_base_zip)
         batimento_zip = self.file_manager.validar_arquivo_existe(batimento_zip)
 
-        df_vic_base = self._carregar_vic_base(vic_base_zip)
         df_batimento, origem_counts = self._carregar_batimento(batimento_zip)
+        if exceeds_budget([vic_base_zip], configured_budget(self.config)):
+            # Só as linhas cujo CPF está no batimento ficam em memória
+            cpfs = set(digits_only(df_batimento["CPFCNPJ CLIENTE"])) if not df_batimento.empty else set()
+            df_vic_base, registros_vic_base, primeiros = self._carregar_vic_base_em_partes(
+                vic_base_zip, cpfs
+            )
+            data_base_utilizada = self._data_base_de(primeiros)
+        else:
+            df_vic_base = self._carregar_vic_base(vic_base_zip)
+            registros_vic_base = len(df_vic_base)
+            data_base_utilizada = self._resolver_data_base(df_vic_base)
 
         df_vic_enriq = self._preparar_base_enriquecimento(df_vic_base, df_batimento)
 
-        data_base_utilizada = self._resolver_data_base(df_vic_base)
-
         df_saida, telefones_emitidos, emails_emitidos = self._montar_dataframe(
             df_vic_enriq
         )
@@ -137,7 +149,7 @@ class EnriquecimentoVicProcessor:
         duracao = (datetime.now() - inicio).total_seconds()
 
         stats = {
-            "registros_vic_base": len(df_vic_base),
+            "registros_vic_base": registros_vic_base,
             "registros_batimento": len(df_batimento),
             "batimento_judicial": origem_counts.get("judicial", 0),
             "batimento_extrajudicial": origem_counts.get("extrajudicial", 0),
@@ -222,12 +234,21 @@ class EnriquecimentoVicProcessor:
         return normalizar_data_string(valor)
 
     def _resolver_data_base(self, df: pd.DataFrame) -> str:
+        return self._data_base_de(
+            {
+                coluna: self._primeiro_valor(df[coluna])
+                for coluna in self._data_base_candidates
+                if coluna in df.columns
+            }
+        )
+
+    def _data_base_de(self, primeiros: Dict[str, Any]) -> str:
+        """Data base a partir do primeiro valor válido de cada coluna candidata."""
+
         for coluna in self._data_base_candidates:
-            if coluna in df.columns:
-                valor = self._primeiro_valor(df[coluna])
-                normalizado = self._normalizar_data(valor)
-                if normalizado:
-                    return normalizado
+            normalizado = self._normalizar_data(primeiros.get(coluna))
+            if normalizado:
+                return normalizado
 
         return datetime.now().strftime(self.date_format)
 
@@ -254,6 +275,53 @@ class EnriquecimentoVicProcessor:
         df = df.fillna("")
         return df
 
+    def _carregar_vic_base_em_partes(
+        self, arquivo_zip: Path, cpfs: set
+    ) -> Tuple[pd.DataFrame, int, Dict[str, Any]]:
+        """Lê a base tratada em partes, mantendo só os CPFs do batimento.
+
+        Devolve as linhas mantidas, o total de linhas da base e o primeiro
+        valor válido de cada coluna de data base (vistos na base inteira).
+        """
+
+        partes: List[pd.DataFrame] = []
+        total = 0
+        primeiros: Dict[str, Any] = {}
+        with zipfile.ZipFile(arquivo_zip, "r") as zf:
+            if self.vic_csv_name not in zf.namelist():
+                raise ValueError(
+                    f"Arquivo {self.vic_csv_name} não encontrado no ZIP {arquivo_zip}"
+                )
+            with zf.open(self.vic_csv_name) as fh:
+                leitor = pd.read_csv(
+                    fh,
+                    sep=self.csv_separator,
+                    encoding=self.encoding,
+                    dtype=str,
+                    chunksize=self.chunk_rows,
+                )
+                for parte in leitor:
+                    parte = parte.fillna("")
+                    total += len(parte)
+                    for coluna in self._data_base_candidates:
+                        if coluna in parte.columns and primeiros.get(coluna) is None:
+                            primeiros[coluna] = self._primeiro_valor(parte[coluna])
+                    coluna_cpf = "CPFCNPJ_LIMPO" if "CPFCNPJ_LIMPO" in parte.columns else "CPFCNPJ_CLIENTE"
+                    if coluna_cpf in parte.columns:
+                        parte = parte[digits_only(parte[coluna_cpf]).isin(cpfs)]
+                    else:
+                        parte = parte.iloc[0:0]
+                    partes.append(parte)
+
+        self.logger.info(
+            "Base VIC lida em partes (%s linhas por parte): %s de %s linhas mantidas",
+            self.chunk_rows,
+            sum(len(parte) for parte in partes),
+            total,
+        )
+        base = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+        return base, total, primeiros
+
     # ------------------------------------------------------------------
     def _carregar_batimento(self, arquivo_zip: Path) -> Tuple[pd.DataFrame, Dict[str, int]]:
         """Lê todos os CSVs gerados pelo batimento (judicial/extrajudicial)."""
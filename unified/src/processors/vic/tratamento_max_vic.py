@@ -16,6 +16,7 @@ from src.io.packager import ExportacaoService
 from src.utils.logger import get_logger, log_section
 from src.utils.queries_sql import get_query
 from src.utils.sql_conn import get_std_connection
+from src.utils.dimensoes import extrair_com_dimensoes, usar_dimensoes
 from src.utils.helpers import normalizar_decimal
 
 
@@ -52,12 +53,16 @@ class MaxProcessor:
 
     # -------------- IO --------------
     def extrair_dados_max(self) -> pd.DataFrame:
-        query = get_query('max')
         conn = get_std_connection()
         if not conn.connect():
             raise RuntimeError("Falha ao conectar com banco de dados")
         try:
-            df = pd.read_sql(query, conn.connection)
+            if usar_dimensoes(self.config):
+                # IDs crus + cache local de dimensões (sem UDF por linha)
+                return extrair_com_dimensoes(
+                    'max', lambda sql: pd.read_sql(sql, conn.connection), self.config
+                )
+            df = pd.read_sql(get_query('max'), conn.connection)
             return df
         finally:
             conn.close()
@@ -139,22 +144,26 @@ class MaxProcessor:
             df_inv = df_inv.copy()
             df_inv['motivo_inconsistencia'] = 'VALIDACAO_BASE'
 
+        # Regras do processador: um motivo por linha, máscaras sobre df_val sem cópias intermediárias
+        removidos = pd.Series(False, index=df_val.index)
+        partes = [df_inv]
+
         if self.remove_parcela_duplicada and 'PARCELA' in df_val.columns:
             duplicados_mask = df_val['PARCELA'].duplicated(keep=False)
             if duplicados_mask.any():
-                df_dup = df_val.loc[duplicados_mask].copy()
-                df_dup['motivo_inconsistencia'] = 'PARCELA_DUPLICADA'
-                df_inv = pd.concat([df_inv, df_dup], ignore_index=False)
-                df_val = df_val.loc[~duplicados_mask].copy()
+                partes.append(df_val[duplicados_mask].assign(motivo_inconsistencia='PARCELA_DUPLICADA'))
+                removidos |= duplicados_mask
 
         if self.block_tipo_parcela_vazio and 'TIPO_PARCELA' in df_val.columns:
             tipo_series = df_val['TIPO_PARCELA']
-            mask_tipo_vazio = tipo_series.isna() | tipo_series.astype(str).str.strip().eq('')
+            mask_tipo_vazio = (tipo_series.isna() | tipo_series.astype(str).str.strip().eq('')) & ~removidos
             if mask_tipo_vazio.any():
-                df_tipo = df_val.loc[mask_tipo_vazio].copy()
-                df_tipo['motivo_inconsistencia'] = 'TIPO_PARCELA_VAZIO'
-                df_inv = pd.concat([df_inv, df_tipo], ignore_index=False)
-                df_val = df_val.loc[~mask_tipo_vazio].copy()
+                partes.append(df_val[mask_tipo_vazio].assign(motivo_inconsistencia='TIPO_PARCELA_VAZIO'))
+                removidos |= mask_tipo_vazio
+
+        if removidos.any():
+            df_inv = pd.concat(partes, ignore_index=False)
+            df_val = df_val[~removidos]
 
         # MAX não cria CHAVE; mantém PARCELA como chave nativa
         df_final = df_val.copy()
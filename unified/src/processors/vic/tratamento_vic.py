@@ -27,6 +27,7 @@ from src.io.packager import ExportacaoService
 from src.utils.logger import get_logger, log_section
 from src.utils.queries_sql import get_query
 from src.utils.sql_conn import get_std_connection
+from src.utils.dimensoes import extrair_com_dimensoes, usar_dimensoes
 from src.utils.aging import filtrar_clientes_criticos
 from src.utils.text import digits_only
 from src.utils.helpers import (
@@ -36,6 +37,7 @@ from src.utils.helpers import (
     normalizar_decimal,
 )
 from src.utils.filters import VicFilterApplier
+from src.utils.parallel import criar_executor, formato_datas
 
 
 class VicProcessor:
@@ -77,6 +79,7 @@ class VicProcessor:
         self.phone_columns: List[str] = [str(col) for col in phone_cols_cfg if str(col).strip()]
         self.id_negociador_column = self.vic_config.get('id_negociador_column', 'ID_NEGOCIADOR')
         self.export_config = self.vic_config.get('export', {})
+        self.executor = criar_executor(self.config)
 
         # Atributos auxiliares
         self._default_data_columns = [
@@ -92,12 +95,16 @@ class VicProcessor:
 
     # ---------------- I/O ----------------
     def extrair_dados_vic(self) -> pd.DataFrame:
-        query = get_query('vic')
         conn = get_std_connection()
         if not conn.connect():
             raise RuntimeError("Falha ao conectar com banco de dados")
         try:
-            df = pd.read_sql(query, conn.connection)
+            if usar_dimensoes(self.config):
+                # IDs crus + cache local de dimensões (sem UDF por linha)
+                return extrair_com_dimensoes(
+                    'vic', lambda sql: pd.read_sql(sql, conn.connection), self.config
+                )
+            df = pd.read_sql(get_query('vic'), conn.connection)
             return df
         finally:
             conn.close()
@@ -150,13 +157,13 @@ class VicProcessor:
                 raise ValueError(f"Colunas obrigatorias ausentes apos normalizacao: {missing}")
             return df
 
-    def padronizar_valores(self, df: pd.DataFrame) -> pd.DataFrame:
+    def padronizar_valores(self, df: pd.DataFrame, formato_data: Optional[str] = None) -> pd.DataFrame:
         """Padroniza apenas os valores das colunas"""
         df = df.copy()
         # Padronizar valores
         df['NUMERO_CONTRATO'] = df['NUMERO_CONTRATO'].astype(str).str.strip()
         df['PARCELA'] = df['PARCELA'].astype(str).str.strip()
-        date_format = self.global_config.get('date_format')
+        date_format = self.global_config.get('date_format') or formato_data
         if date_format:
             df['VENCIMENTO'] = pd.to_datetime(df['VENCIMENTO'], format=date_format, errors='coerce')
         else:
@@ -178,6 +185,10 @@ class VicProcessor:
             return valor
         return f"{numero:.2f}".replace(".", ",")
 
+    def padronizar_particao(self, df: pd.DataFrame, formato_data: Optional[str] = None) -> pd.DataFrame:
+        """Padronização + colunas auxiliares (row-local, executável por partição)."""
+        return self.criar_colunas_auxiliares(self.padronizar_valores(df, formato_data))
+
     def criar_colunas_auxiliares(self, df: pd.DataFrame) -> pd.DataFrame:
         """Gera colunas auxiliares reutilizáveis (CPF/CNPJ limpo e telefone limpo)."""
 
@@ -368,9 +379,11 @@ class VicProcessor:
         df_val, df_inv = self.validator.validar_dados(df)
         inconsistencias_iniciais = len(df_inv)
 
-        # 4) Padronização e colunas auxiliares
-        df_val = self.padronizar_valores(df_val)
-        df_val = self.criar_colunas_auxiliares(df_val)
+        # 4) Padronização e colunas auxiliares (particionado por CPF/CNPJ)
+        formato_data = None
+        if not self.global_config.get('date_format') and 'VENCIMENTO' in df_val.columns:
+            formato_data = formato_datas(df_val['VENCIMENTO'])
+        df_val = self.executor.executar(self.padronizar_particao, df_val, 'CPFCNPJ_CLIENTE', formato_data)
 
         # 5) Base canônica (sem filtros)
         df_base_limpa, duplicatas_removidas, arquivo_dup = self.remover_duplicados_chave(df_val)
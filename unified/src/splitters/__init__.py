@@ -1,33 +1,46 @@
 """
 Splitters package.
 Provides data splitting components for the pipeline.
+
+Splitter modules are imported on first use: the registry holds
+``"module:factory"`` references.
 """
 from __future__ import annotations
 
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
-from ..core.base import BaseSplitter, SplitResult
+from ..core.registry import LazyRegistry, lazy_attributes
 from ..core.schemas import SplitterConfig, SplitterType
 
-from .judicial import JudicialSplitter, create_judicial_splitter
-from .campaign import CampaignSplitter, create_campaign_splitter
-from .field_value import (
-    FieldValueSplitter,
-    UniqueValueSplitter,
-    create_field_value_splitter,
-    create_unique_value_splitter,
-)
+if TYPE_CHECKING:
+    from ..core.base import BaseSplitter
 
 
 # Registry of splitter factories
-_SPLITTER_REGISTRY: dict[SplitterType, Callable[[SplitterConfig], BaseSplitter]] = {
-    SplitterType.JUDICIAL: create_judicial_splitter,
-    SplitterType.CAMPAIGN: create_campaign_splitter,
-    SplitterType.FIELD_VALUE: create_field_value_splitter,
-}
+_SPLITTER_REGISTRY: LazyRegistry[SplitterType] = LazyRegistry(
+    "splitter",
+    {
+        SplitterType.JUDICIAL: ".judicial:create_judicial_splitter",
+        SplitterType.CAMPAIGN: ".campaign:create_campaign_splitter",
+        SplitterType.FIELD_VALUE: ".field_value:create_field_value_splitter",
+    },
+    package=__name__,
+)
+
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "BaseSplitter": "..core.base:BaseSplitter",
+        "SplitResult": "..core.base:SplitResult",
+        "JudicialSplitter": ".judicial:JudicialSplitter",
+        "CampaignSplitter": ".campaign:CampaignSplitter",
+        "FieldValueSplitter": ".field_value:FieldValueSplitter",
+        "UniqueValueSplitter": ".field_value:UniqueValueSplitter",
+    },
+)
 
 
-def create_splitter(config: SplitterConfig) -> BaseSplitter:
+def create_splitter(config: SplitterConfig) -> "BaseSplitter":
     """
     Factory function to create a splitter based on configuration.
 
@@ -48,16 +61,17 @@ def create_splitter(config: SplitterConfig) -> BaseSplitter:
 
 def register_splitter(
     splitter_type: SplitterType,
-    factory: Callable[[SplitterConfig], BaseSplitter],
+    factory: Callable[[SplitterConfig], "BaseSplitter"] | str,
 ) -> None:
     """
     Register a custom splitter factory.
 
     Args:
         splitter_type: The splitter type to register
-        factory: Factory function that creates the splitter
+        factory: Factory function that creates the splitter, or its
+            ``"module:function"`` reference (imported on first use)
     """
-    _SPLITTER_REGISTRY[splitter_type] = factory
+    _SPLITTER_REGISTRY.register(splitter_type, factory)
 
 
 __all__ = [
@@ -7,6 +7,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..core.base import BaseSplitter, SplitResult
+from ..core.matching import NO_MATCH, PatternMatcher
 from ..core.schemas import SplitterConfig
 
 
@@ -31,37 +32,25 @@ class CampaignSplitter(BaseSplitter):
         if not rules:
             return SplitResult(splits={"default": df})
 
-        values = df[column].astype(str).str.strip().str.upper()
-        splits: dict[str, pd.DataFrame] = {}
-        remaining_mask = pd.Series(True, index=df.index)
+        # Rules without patterns never match
+        active = [rule for rule in rules if rule.get("patterns", [])]
+        matcher = PatternMatcher([rule["patterns"] for rule in active], mode="contains")
 
-        # Process each rule in order
-        for rule in rules:
-            group_name = rule.get("name", "unknown")
-            patterns = rule.get("patterns", [])
+        # One pass: each row gets the first rule (in order) with a matching pattern
+        assigned = matcher.assign(df[column])
+        positions = pd.Series(assigned).groupby(assigned).indices
+        groups: dict[str, object] = {}
 
-            if not patterns:
-                continue
-
-            # Match any of the patterns
-            match_mask = pd.Series(False, index=df.index)
-            for pattern in patterns:
-                pattern_upper = str(pattern).upper()
-                match_mask = match_mask | values.str.contains(
-                    pattern_upper, na=False, regex=False
-                )
-
-            # Only consider records not already assigned
-            group_mask = remaining_mask & match_mask
-            if group_mask.any():
-                splits[group_name] = df[group_mask].copy()
-                remaining_mask = remaining_mask & ~group_mask
+        for rule_id, rule in enumerate(active):
+            if rule_id in positions:
+                groups[rule.get("name", "unknown")] = positions[rule_id]
 
         # Add remaining to default group
-        if remaining_mask.any():
-            splits[default_group] = df[remaining_mask].copy()
+        if NO_MATCH in positions:
+            groups[default_group] = positions[NO_MATCH]
 
-        return SplitResult(splits=splits)
+        # Groups are row positions; frames are built only when exported
+        return SplitResult.from_positions(df, groups)
 
 
 def create_campaign_splitter(config: SplitterConfig) -> CampaignSplitter:
@@ -36,7 +36,7 @@ class FieldValueSplitter(BaseSplitter):
         else:
             values = df[column].astype(str)
 
-        splits: dict[str, pd.DataFrame] = {}
+        groups: dict[str, pd.Series] = {}
         remaining_mask = pd.Series(True, index=df.index)
 
         # Process each mapping
@@ -65,14 +65,14 @@ class FieldValueSplitter(BaseSplitter):
             # Only consider records not already assigned
             group_mask = remaining_mask & match_mask
             if group_mask.any():
-                splits[group_name] = df[group_mask].copy()
+                groups[group_name] = group_mask
                 remaining_mask = remaining_mask & ~group_mask
 
         # Add remaining to default group
         if remaining_mask.any():
-            splits[default_group] = df[remaining_mask].copy()
+            groups[default_group] = remaining_mask
 
-        return SplitResult(splits=splits)
+        return SplitResult.from_masks(df, groups)
 
 
 class UniqueValueSplitter(BaseSplitter):
@@ -94,28 +94,22 @@ class UniqueValueSplitter(BaseSplitter):
         if not column or column not in df.columns:
             return SplitResult(splits={"default": df})
 
-        # Get unique values
+        # Get unique values (no copy of the frame: only the key is built)
         if normalize:
-            df_copy = df.copy()
-            df_copy["_split_key"] = df[column].astype(str).str.strip().str.upper()
+            split_key = df[column].astype(str).str.strip().str.upper()
         else:
-            df_copy = df.copy()
-            df_copy["_split_key"] = df[column].astype(str)
+            split_key = df[column].astype(str)
 
-        unique_values = df_copy["_split_key"].unique()
+        codes, unique_values = pd.factorize(split_key)
+        positions = pd.Series(codes).groupby(codes).indices
 
         # Limit number of groups
-        if len(unique_values) > max_groups:
-            unique_values = unique_values[:max_groups]
-
-        splits: dict[str, pd.DataFrame] = {}
-        for value in unique_values:
+        groups: dict[str, object] = {}
+        for code, value in enumerate(unique_values[:max_groups]):
             group_name = f"{prefix}{value}" if prefix else str(value)
-            mask = df_copy["_split_key"] == value
-            if mask.any():
-                splits[group_name] = df[mask].copy()
+            groups[group_name] = positions[code]
 
-        return SplitResult(splits=splits)
+        return SplitResult.from_positions(df, groups)
 
 
 def create_field_value_splitter(config: SplitterConfig) -> FieldValueSplitter:
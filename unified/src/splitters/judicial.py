@@ -10,6 +10,7 @@ from pathlib import Path
 import pandas as pd
 
 from ..core.base import BaseSplitter, SplitResult
+from ..core.reference_cache import REFERENCE_CACHE
 from ..core.schemas import SplitterConfig
 
 
@@ -49,12 +50,12 @@ class JudicialSplitter(BaseSplitter):
         # Split
         is_judicial = df_values.isin(judicial_set)
 
-        return SplitResult(splits={
-            judicial_name: df[is_judicial].copy(),
-            extrajudicial_name: df[~is_judicial].copy(),
+        return SplitResult.from_masks(df, {
+            judicial_name: is_judicial,
+            extrajudicial_name: ~is_judicial,
         })
 
-    def _load_judicial_list(self, source_path: str, column: str) -> set | None:
+    def _load_judicial_list(self, source_path: str, column: str) -> frozenset | None:
         """Load judicial CPF/CNPJ list from file."""
         path = Path(source_path)
 
@@ -70,19 +71,25 @@ class JudicialSplitter(BaseSplitter):
             else:
                 return None
 
+        # Read once per file version in long-lived processes (daemon, API)
+        return REFERENCE_CACHE.get(path, ("judicial", column), lambda: self._read_judicial_list(path, column))
+
+    def _read_judicial_list(self, path: Path, column: str) -> frozenset | None:
+        """Read judicial CPF/CNPJ values from ``path``."""
         try:
             if path.suffix.lower() == ".zip":
-                return self._load_from_zip(path, column)
+                values = self._load_from_zip(path, column)
             elif path.suffix.lower() == ".csv":
                 df = pd.read_csv(path, sep=";", encoding="utf-8-sig", dtype=str)
-                return self._extract_column(df, column)
+                values = self._extract_column(df, column)
             elif path.suffix.lower() in (".xlsx", ".xls"):
                 df = pd.read_excel(path, dtype=str)
-                return self._extract_column(df, column)
+                values = self._extract_column(df, column)
             else:
                 return None
         except Exception:
             return None
+        return frozenset(values) if values is not None else None
 
     def _load_from_zip(self, zip_path: Path, column: str) -> set | None:
         """Load data from a ZIP file."""
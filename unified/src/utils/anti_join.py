@@ -6,10 +6,13 @@ por batimento e devolução, evitando duplicação de lógica.
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Optional
 
 import pandas as pd
 
+if TYPE_CHECKING:
+    from src.utils.duckdb_backend import DuckDBBackend
+
 
 def _normalize_series(values: pd.Series) -> pd.Series:
     """Normaliza série para comparação eficiente (string strip)."""
@@ -21,14 +24,22 @@ def procv_left_minus_right(
     df_right: pd.DataFrame,
     col_left: str,
     col_right: str,
+    backend: Optional["DuckDBBackend"] = None,
 ) -> pd.DataFrame:
-    """Retorna linhas de df_left cujas chaves não estão em df_right."""
+    """Retorna linhas de df_left cujas chaves não estão em df_right.
+
+    Com ``backend`` (DuckDB) o anti-join é executado fora do pandas, com
+    resultado idêntico (mesmas linhas, ordem e índice).
+    """
 
     if col_left not in df_left.columns:
         raise ValueError(f"Coluna obrigatória ausente no LEFT: {col_left}")
     if col_right not in df_right.columns:
         raise ValueError(f"Coluna obrigatória ausente no RIGHT: {col_right}")
 
+    if backend is not None:
+        return backend.anti_join(df_left, df_right, col_left, col_right)
+
     right_keys: Iterable[str] = set(_normalize_series(df_right[col_right]).dropna())
     mask = ~_normalize_series(df_left[col_left]).isin(right_keys)
     return df_left.loc[mask].copy()
@@ -39,13 +50,14 @@ def procv_max_menos_emccamp(
     df_emccamp: pd.DataFrame,
     col_max: str = "PARCELA",
     col_emccamp: str = "CHAVE",
+    backend: Optional["DuckDBBackend"] = None,
 ) -> pd.DataFrame:
     """Retorna registros MAX que NÃO estão em EMCCAMP (MAX - EMCCAMP).
     
     Usado para gerar arquivo de devolução: títulos no sistema de cobrança
     que não existem mais no credor.
     """
-    return procv_left_minus_right(df_max, df_emccamp, col_max, col_emccamp)
+    return procv_left_minus_right(df_max, df_emccamp, col_max, col_emccamp, backend)
 
 
 def procv_emccamp_menos_max(
@@ -53,16 +65,48 @@ def procv_emccamp_menos_max(
     df_max: pd.DataFrame,
     col_emccamp: str = "CHAVE",
     col_max: str = "PARCELA",
+    backend: Optional["DuckDBBackend"] = None,
 ) -> pd.DataFrame:
     """Retorna registros EMCCAMP que NÃO estão em MAX (EMCCAMP - MAX).
     
     Usado para batimento: títulos do credor ausentes no sistema de cobrança.
     """
-    return procv_left_minus_right(df_emccamp, df_max, col_emccamp, col_max)
+    return procv_left_minus_right(df_emccamp, df_max, col_emccamp, col_max, backend)
+
+
+def procv_vic_menos_max(
+    df_vic: pd.DataFrame,
+    df_max: pd.DataFrame,
+    col_vic: str = "CHAVE",
+    col_max: str = "PARCELA",
+    backend: Optional["DuckDBBackend"] = None,
+) -> pd.DataFrame:
+    """Retorna registros VIC que NÃO estão em MAX (VIC - MAX).
+
+    Usado para batimento VIC: títulos do credor ausentes no sistema de cobrança.
+    """
+    return procv_left_minus_right(df_vic, df_max, col_vic, col_max, backend)
+
+
+def procv_max_menos_vic(
+    df_max: pd.DataFrame,
+    df_vic: pd.DataFrame,
+    col_max: str = "PARCELA",
+    col_vic: str = "CHAVE",
+    backend: Optional["DuckDBBackend"] = None,
+) -> pd.DataFrame:
+    """Retorna registros MAX que NÃO estão em VIC (MAX - VIC).
+
+    Usado para devolução VIC: títulos no sistema de cobrança que não
+    existem mais no credor.
+    """
+    return procv_left_minus_right(df_max, df_vic, col_max, col_vic, backend)
 
 
 __all__ = [
     "procv_left_minus_right",
     "procv_max_menos_emccamp",
     "procv_emccamp_menos_max",
+    "procv_vic_menos_max",
+    "procv_max_menos_vic",
 ]
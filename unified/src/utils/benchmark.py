@@ -0,0 +1,380 @@
+"""Suíte de benchmark de loaders, geradores de chave, validadores e processadores.
+
+Cada caso roda sobre as bases de ``dados_sinteticos`` em escalas
+configuráveis (padrão 100k/1M/5M linhas). Os casos saem das configurações
+de cliente (``configs/clients/*.yaml``): a chave e cada validador de cada
+fonte, os processadores do pipeline e o estágio preparado do
+``PipelineEngine`` (carga + chaves + validadores) lendo os ZIPs gerados.
+
+O relatório é gravado em JSON e pode ser comparado com uma execução de
+referência: um caso é regressão quando fica mais de ``limite`` (fração)
+mais lento que na referência.
+
+Casos cujo componente não existe nesta árvore (ex.: processador de
+``STANDARD_PROCESSORS`` sem classe importável) são registrados como ``indisponivel``,
+com o motivo, em vez de abortar a suíte.
+"""
+
+from __future__ import annotations
+
+import copy
+import gc
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from src.core.config import ConfigLoader
+from src.core.engine import STANDARD_PROCESSORS, PipelineEngine
+from src.core.keys import create_key_generator
+from src.core.registry import LazyRegistry
+from src.core.schemas import LoaderConfig, LoaderType, PipelineConfig
+from src.loaders.file_loader import FileLoader
+from src.utils.dados_sinteticos import gerar_dataset, salvar_dataset
+from src.utils.io import write_csv_to_zip
+from src.utils.validator import MaxValidator, VicValidator
+from src.validators import create_validator
+
+logger = logging.getLogger(__name__)
+
+TAMANHOS_PADRAO = (100_000, 1_000_000, 5_000_000)
+LIMITE_PADRAO = 0.20
+# Casos abaixo deste tempo na referência não são comparados (ruído de medição)
+PISO_SEGUNDOS = 0.05
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "configs" / "clients"
+SAIDA_PADRAO = Path(__file__).resolve().parents[2] / "data" / "benchmarks"
+
+# Base sintética usada por cada fonte de cada cliente
+FONTES_CLIENTES: Dict[str, Dict[str, str]] = {
+    'vic': {'client': 'vic', 'max': 'max'},
+    'emccamp': {'client': 'emccamp', 'max': 'max'},
+    'tabelionato': {'client': 'tabelionato', 'max': 'max'},
+}
+
+
+class CasoIndisponivel(Exception):
+    """O componente medido pelo caso não existe nesta instalação."""
+
+
+@dataclass
+class CasoBenchmark:
+    """Um item medido pela suíte.
+
+    ``preparar`` monta a entrada (bases, arquivos, objetos) fora da medição;
+    só ``executar(entrada)`` é cronometrado.
+    """
+
+    nome: str
+    grupo: str
+    preparar: Callable[['ContextoBenchmark'], Any]
+    executar: Callable[[Any], Any]
+
+
+class ContextoBenchmark:
+    """Bases e arquivos sintéticos de uma escala, gerados sob demanda e reaproveitados."""
+
+    def __init__(self, linhas: int, diretorio: Path, semente: int = 0):
+        self.linhas = linhas
+        self.diretorio = Path(diretorio)
+        self.semente = semente
+        self._dados: Dict[str, pd.DataFrame] = {}
+        self._arquivos: Dict[str, Path] = {}
+
+    def dados(self, nome: str) -> pd.DataFrame:
+        if nome not in self._dados:
+            inicio = time.perf_counter()
+            self._dados[nome] = gerar_dataset(nome, self.linhas, semente=self.semente)
+            logger.info("Base sintética %s (%s linhas) gerada em %.1fs", nome, f"{self.linhas:,}",
+                        time.perf_counter() - inicio)
+        return self._dados[nome]
+
+    def arquivo(self, nome: str) -> Path:
+        if nome not in self._arquivos:
+            self._arquivos[nome] = salvar_dataset(self.dados(nome), self.diretorio / "entrada" / f"{nome}.zip")
+        return self._arquivos[nome]
+
+    def saida(self, nome: str) -> Path:
+        destino = self.diretorio / "saida" / nome
+        destino.mkdir(parents=True, exist_ok=True)
+        return destino
+
+
+def _carregar_configs(config_dir: Path) -> Dict[str, Any]:
+    loader = ConfigLoader(config_dir)
+    return {cliente: loader.load(cliente) for cliente in FONTES_CLIENTES if (config_dir / f"{cliente}.yaml").exists()}
+
+
+def _config_com_arquivos(config, cliente: str, ctx: ContextoBenchmark):
+    """Cópia da config com as fontes lendo os ZIPs sintéticos e sem processadores."""
+    config = copy.deepcopy(config)
+    for fonte, base in FONTES_CLIENTES[cliente].items():
+        source = getattr(config, f"{fonte}_source")
+        if source is not None:
+            source.loader = LoaderConfig(
+                type=LoaderType.FILE,
+                params={"path": str(ctx.arquivo(base)), "encoding": "utf-8-sig", "separator": ";"},
+            )
+    config.pipeline = PipelineConfig()
+    return config
+
+
+# Mesmas referências que o engine registra (relativas a src.core, resolvidas no primeiro uso)
+_PROCESSADORES = LazyRegistry("processor", STANDARD_PROCESSORS, package="src.core")
+
+
+def _classe_processador(tipo) -> type:
+    """Classe que o engine usa para o tipo de processador (``STANDARD_PROCESSORS``)."""
+    try:
+        classe = _PROCESSADORES.get(tipo)
+    except ImportError as exc:
+        raise CasoIndisponivel(f"processador {tipo.value}: {exc}") from exc
+    if classe is None:
+        raise CasoIndisponivel(f"processador {tipo.value} não registrado em STANDARD_PROCESSORS")
+    return classe
+
+
+def _caso_loader(base: str) -> CasoBenchmark:
+    def preparar(ctx):
+        config = LoaderConfig(
+            type=LoaderType.FILE,
+            params={"path": str(ctx.arquivo(base)), "encoding": "utf-8-sig", "separator": ";"},
+        )
+        return FileLoader(config, None)
+
+    def executar(loader):
+        resultado = loader.load()
+        if "error" in resultado.metadata:
+            raise RuntimeError(resultado.metadata["error"])
+        return resultado.data
+
+    return CasoBenchmark(f"loader.file.{base}", "loader", preparar, executar)
+
+
+def _caso_exportacao(base: str) -> CasoBenchmark:
+    def preparar(ctx):
+        return ctx.dados(base), ctx.saida("exportacao") / f"{base}.zip"
+
+    return CasoBenchmark(
+        f"io.write_csv_to_zip.{base}",
+        "io",
+        preparar,
+        lambda entrada: write_csv_to_zip({f"{base}.csv": entrada[0]}, entrada[1], sep=';'),
+    )
+
+
+def _casos_validadores_legados() -> List[CasoBenchmark]:
+    casos = []
+    for nome, classe, base in (('max', MaxValidator, 'max'), ('vic', VicValidator, 'vic')):
+        casos.append(CasoBenchmark(
+            f"validador.{nome}",
+            "validador",
+            lambda ctx, classe=classe, base=base: (classe({}, logger), ctx.dados(base)),
+            lambda entrada: entrada[0].validar_dados(entrada[1]),
+        ))
+    return casos
+
+
+def _casos_cliente(cliente: str, config) -> List[CasoBenchmark]:
+    casos = []
+    for fonte, base in FONTES_CLIENTES[cliente].items():
+        source = getattr(config, f"{fonte}_source")
+        if source is None:
+            continue
+
+        casos.append(CasoBenchmark(
+            f"chave.{cliente}.{fonte}",
+            "chave",
+            lambda ctx, key=source.key, base=base: (create_key_generator(key), ctx.dados(base)),
+            lambda entrada: entrada[0].generate(entrada[1]),
+        ))
+        for validador in source.validators:
+            if not validador.enabled:
+                continue
+            casos.append(CasoBenchmark(
+                f"validador.{cliente}.{fonte}.{validador.type.value}",
+                "validador",
+                lambda ctx, validador=validador, base=base: (create_validator(validador), ctx.dados(base)),
+                lambda entrada: entrada[0].validate(entrada[1]),
+            ))
+
+    def preparar_pipeline(ctx):
+        return PipelineEngine(output_dir=ctx.saida(f"engine_{cliente}")), _config_com_arquivos(config, cliente, ctx)
+
+    def executar_pipeline(entrada):
+        engine, config_local = entrada
+        resultado = engine.run_from_config(config_local)
+        if not resultado.success:
+            raise RuntimeError("; ".join(resultado.context.errors))
+        return resultado
+
+    casos.append(CasoBenchmark(f"pipeline.{cliente}", "processador", preparar_pipeline, executar_pipeline))
+
+    for processador in config.pipeline.processors:
+        if not processador.enabled:
+            continue
+
+        def preparar_processador(ctx, processador=processador):
+            classe = _classe_processador(processador.type)
+            dados = {}
+            for fonte, base in FONTES_CLIENTES[cliente].items():
+                source = getattr(config, f"{fonte}_source")
+                df = ctx.dados(base)
+                dados[fonte] = create_key_generator(source.key).generate(df) if source else df
+            contexto = {"output_dir": ctx.saida(f"{cliente}_{processador.type.value}")}
+            return classe(config, processador.params), dados["client"], dados.get("max", pd.DataFrame()), contexto
+
+        casos.append(CasoBenchmark(
+            f"processador.{cliente}.{processador.type.value}",
+            "processador",
+            preparar_processador,
+            lambda entrada: entrada[0].process(entrada[1], entrada[2], entrada[3]),
+        ))
+    return casos
+
+
+def montar_casos(config_dir: Union[str, Path] = CONFIG_DIR) -> List[CasoBenchmark]:
+    """Todos os casos da suíte, na ordem de execução."""
+    casos = [_caso_loader(base) for base in ('vic', 'max', 'emccamp', 'tabelionato')]
+    casos += [_caso_exportacao(base) for base in ('vic', 'max')]
+    casos += _casos_validadores_legados()
+    for cliente, config in _carregar_configs(Path(config_dir)).items():
+        casos += _casos_cliente(cliente, config)
+    return casos
+
+
+def filtrar_casos(casos: Iterable[CasoBenchmark], filtros: Optional[Sequence[str]]) -> List[CasoBenchmark]:
+    """Casos cujo nome contém algum dos ``filtros`` (todos, se vazio)."""
+    casos = list(casos)
+    if not filtros:
+        return casos
+    return [caso for caso in casos if any(filtro in caso.nome for filtro in filtros)]
+
+
+def _medir(caso: CasoBenchmark, ctx: ContextoBenchmark, repeticoes: int) -> Dict[str, Any]:
+    linha = {"caso": caso.nome, "grupo": caso.grupo, "linhas": ctx.linhas,
+             "segundos": None, "linhas_por_segundo": None, "status": "ok", "detalhe": ""}
+    try:
+        entrada = caso.preparar(ctx)
+        tempos = []
+        for _ in range(max(1, repeticoes)):
+            gc.collect()
+            inicio = time.perf_counter()
+            caso.executar(entrada)
+            tempos.append(time.perf_counter() - inicio)
+    except CasoIndisponivel as exc:
+        linha.update(status="indisponivel", detalhe=str(exc))
+        return linha
+    except Exception as exc:  # noqa: BLE001 - um caso com erro não interrompe a suíte
+        logger.warning("Benchmark %s (%s linhas) falhou: %s", caso.nome, f"{ctx.linhas:,}", exc)
+        linha.update(status="erro", detalhe=f"{type(exc).__name__}: {exc}")
+        return linha
+
+    segundos = min(tempos)
+    linha.update(
+        segundos=round(segundos, 6),
+        linhas_por_segundo=round(ctx.linhas / segundos) if segundos > 0 else None,
+    )
+    logger.info("Benchmark %s (%s linhas): %.3fs", caso.nome, f"{ctx.linhas:,}", segundos)
+    return linha
+
+
+def executar_benchmark(
+    tamanhos: Sequence[int] = TAMANHOS_PADRAO,
+    casos: Optional[Sequence[CasoBenchmark]] = None,
+    repeticoes: int = 1,
+    semente: int = 0,
+    diretorio_trabalho: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    """Executa os casos em cada escala e devolve o relatório.
+
+    Args:
+        tamanhos: Quantidades de linhas das bases sintéticas.
+        casos: Casos a medir (padrão: ``montar_casos()``).
+        repeticoes: Execuções por caso; vale o menor tempo.
+        semente: Semente das bases sintéticas.
+        diretorio_trabalho: Onde gravar ZIPs de entrada e saídas dos casos
+            (padrão: diretório temporário removido ao final de cada escala).
+
+    Returns:
+        Dict com ambiente de execução e ``resultados`` (um item por caso e escala).
+    """
+    casos = montar_casos() if casos is None else list(casos)
+    resultados: List[Dict[str, Any]] = []
+
+    for linhas in tamanhos:
+        with tempfile.TemporaryDirectory(prefix="benchmark_", dir=diretorio_trabalho) as tmp:
+            ctx = ContextoBenchmark(int(linhas), Path(tmp), semente=semente)
+            for caso in casos:
+                resultados.append(_medir(caso, ctx, repeticoes))
+            del ctx
+            gc.collect()
+
+    return {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "pandas": pd.__version__,
+        "semente": semente,
+        "repeticoes": repeticoes,
+        "tamanhos": [int(t) for t in tamanhos],
+        "resultados": resultados,
+    }
+
+
+def salvar_relatorio(relatorio: Mapping[str, Any], diretorio: Union[str, Path] = SAIDA_PADRAO) -> Path:
+    """Grava o relatório como ``benchmark_<timestamp>.json`` em ``diretorio``."""
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    destino = diretorio / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    destino.write_text(json.dumps(relatorio, ensure_ascii=False, indent=2), encoding="utf-8")
+    return destino
+
+
+def carregar_relatorio(caminho: Union[str, Path]) -> Dict[str, Any]:
+    return json.loads(Path(caminho).read_text(encoding="utf-8"))
+
+
+def comparar_com_referencia(
+    relatorio: Mapping[str, Any],
+    referencia: Mapping[str, Any],
+    limite: float = LIMITE_PADRAO,
+    piso_segundos: float = PISO_SEGUNDOS,
+) -> List[Dict[str, Any]]:
+    """Casos mais lentos que a referência além de ``limite``.
+
+    Só são comparados pares (caso, linhas) com status ``ok`` nos dois
+    relatórios e tempo de referência de pelo menos ``piso_segundos``.
+
+    Returns:
+        Lista de regressões com ``caso``, ``linhas``, ``referencia``,
+        ``atual`` (segundos) e ``variacao`` (fração; 0.35 = 35% mais lento).
+    """
+    anteriores = {
+        (r["caso"], r["linhas"]): r["segundos"]
+        for r in referencia.get("resultados", [])
+        if r.get("status") == "ok" and r.get("segundos")
+    }
+    regressoes = []
+    for resultado in relatorio.get("resultados", []):
+        antes = anteriores.get((resultado["caso"], resultado["linhas"]))
+        if resultado.get("status") != "ok" or antes is None or antes < piso_segundos:
+            continue
+        variacao = resultado["segundos"] / antes - 1
+        if variacao > limite:
+            regressoes.append({
+                "caso": resultado["caso"],
+                "linhas": resultado["linhas"],
+                "referencia": antes,
+                "atual": resultado["segundos"],
+                "variacao": round(variacao, 4),
+            })
+    return regressoes
@@ -0,0 +1,355 @@
+"""Catálogo de datasets (manifesto de execução) por diretório.
+
+Cada exportador registra o arquivo gerado em ``_catalog.json`` no próprio
+diretório de saída, com contagem de linhas, hash do schema, hash do
+conteúdo e as entradas que o originaram (linhagem). Os consumidores
+resolvem "o arquivo mais recente" lendo esse manifesto em O(1), sem
+listar o diretório nem depender de ``st_mtime`` (que empata e é lento em
+compartilhamentos de rede).
+
+Quando o diretório não possui catálogo, ou foi alterado por fora dele
+(arquivo copiado manualmente), a resolução recai no glob por ``st_mtime``
+com desempate pelo nome, de forma determinística.
+
+O ciclo ler/alterar/substituir do manifesto roda sob um lock de arquivo
+(``_catalog.json.lock``), de modo que estágios paralelos gravando no mesmo
+diretório não perdem registros uns dos outros. Arquivos com tamanho e
+``st_mtime_ns`` iguais aos registrados reaproveitam o hash gravado.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "_catalog.json"
+CATALOG_LOCK_FILENAME = CATALOG_FILENAME + ".lock"
+CATALOG_VERSION = 1
+
+# Tolerância entre o mtime do diretório e o do catálogo: o ``os.replace``
+# do próprio catálogo atualiza o diretório alguns instantes depois.
+_TOLERANCIA_MTIME = 2.0
+
+PathLike = Union[str, Path]
+Frames = Union[pd.DataFrame, Mapping[str, Any], None]
+
+
+def catalogo_habilitado() -> bool:
+    """Permite desativar o catálogo com ``DATASET_CATALOG=0``."""
+    return os.getenv("DATASET_CATALOG", "1").strip().lower() not in {"0", "false", "no"}
+
+
+def hash_conteudo(path: PathLike, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for bloco in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+@contextmanager
+def _trava_arquivo(caminho: Path) -> Iterator[None]:
+    """Lock exclusivo entre processos sobre ``caminho`` (bloqueia até obter)."""
+    with open(caminho, "a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK desiste após ~10 s; continua tentando
+                    continue
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def hash_schema(colunas: Iterable[Any]) -> str:
+    """Hash estável da lista ordenada de colunas."""
+    texto = "\x1f".join(str(c) for c in colunas)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class DatasetEntry:
+    """Registro de um arquivo produzido por um estágio."""
+
+    path: str
+    rows: Optional[int]
+    columns: List[str]
+    schema_hash: str
+    content_hash: str
+    bytes: int
+    created_at: str
+    seq: int
+    stage: Optional[str] = None
+    members: Dict[str, int] = field(default_factory=dict)
+    inputs: List[Dict[str, Any]] = field(default_factory=list)
+    mtime_ns: Optional[int] = None
+
+    def descreve(self, stat: os.stat_result) -> bool:
+        """Indica se a entrada ainda descreve o arquivo com este ``stat``."""
+        if stat.st_size != self.bytes:
+            return False
+        return self.mtime_ns is None or stat.st_mtime_ns == self.mtime_ns
+
+
+@dataclass
+class ResumoMembro:
+    """Linhas e colunas de um membro gravado em streaming (sem o DataFrame)."""
+
+    columns: List[str] = field(default_factory=list)
+    linhas: int = 0
+
+    def __len__(self) -> int:
+        return self.linhas
+
+
+class DatasetCatalog:
+    """Manifesto ``_catalog.json`` de um diretório de dados."""
+
+    def __init__(self, directory: PathLike) -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / CATALOG_FILENAME
+        self._entries: Optional[Dict[str, DatasetEntry]] = None
+
+    # ------------------------------------------------------------------
+    @property
+    def entries(self) -> Dict[str, DatasetEntry]:
+        if self._entries is None:
+            self._entries = self._carregar()
+        return self._entries
+
+    def _carregar(self) -> Dict[str, DatasetEntry]:
+        if not self.path.exists():
+            return {}
+        try:
+            bruto = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Catalogo ilegivel em %s: %s", self.path, exc)
+            return {}
+        return {
+            nome: DatasetEntry(**dados)
+            for nome, dados in bruto.get("datasets", {}).items()
+        }
+
+    def _salvar(self) -> None:
+        conteudo = {
+            "version": CATALOG_VERSION,
+            "datasets": {nome: asdict(entry) for nome, entry in self.entries.items()},
+        }
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(conteudo, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    @contextmanager
+    def _transacao(self) -> Iterator[Dict[str, DatasetEntry]]:
+        """Relê o manifesto sob lock, entrega as entradas e grava ao sair."""
+        with _trava_arquivo(self.directory / CATALOG_LOCK_FILENAME):
+            self._entries = self._carregar()
+            yield self._entries
+            self._salvar()
+
+    def esta_atualizado(self) -> bool:
+        """Indica se o diretório não foi alterado fora do catálogo."""
+        try:
+            return self.directory.stat().st_mtime <= self.path.stat().st_mtime + _TOLERANCIA_MTIME
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    def registrar(
+        self,
+        arquivo: PathLike,
+        frames: Frames = None,
+        *,
+        entradas: Sequence[PathLike] = (),
+        estagio: Optional[str] = None,
+    ) -> DatasetEntry:
+        """Registra ``arquivo`` (já gravado) no catálogo do diretório."""
+        arquivo = Path(arquivo)
+        if isinstance(frames, pd.DataFrame):
+            frames = {arquivo.name: frames}
+        frames = frames or {}
+
+        colunas: List[str] = []
+        membros: Dict[str, int] = {}
+        for nome, df in frames.items():
+            membros[nome] = len(df)
+            if not colunas:
+                colunas = [str(c) for c in df.columns]
+
+        # Hash e linhagem fora do lock (leitura do arquivo inteiro)
+        stat = arquivo.stat()
+        anterior = self.entries.get(arquivo.name)
+        if anterior is not None and anterior.descreve(stat):
+            content_hash = anterior.content_hash
+        else:
+            content_hash = hash_conteudo(arquivo)
+        inputs = [_descrever_entrada(Path(p)) for p in entradas]
+
+        with self._transacao() as entries:
+            # Remove entradas cujos arquivos já não existem (limpezas anteriores)
+            for nome in [n for n in entries if not (self.directory / n).exists()]:
+                del entries[nome]
+
+            entry = DatasetEntry(
+                path=arquivo.name,
+                rows=sum(membros.values()) if membros else None,
+                columns=colunas,
+                schema_hash=hash_schema(colunas),
+                content_hash=content_hash,
+                bytes=stat.st_size,
+                created_at=datetime.now().isoformat(timespec="seconds"),
+                seq=max((e.seq for e in entries.values()), default=0) + 1,
+                stage=estagio,
+                members=membros,
+                inputs=inputs,
+                mtime_ns=stat.st_mtime_ns,
+            )
+            entries[arquivo.name] = entry
+        return entry
+
+    def mais_recente(self, pattern: str) -> Optional[Path]:
+        """Último arquivo registrado que corresponde a ``pattern``.
+
+        Entradas cujo arquivo sumiu ou mudou de tamanho são ignoradas.
+        """
+        candidatos = sorted(
+            (e for n, e in self.entries.items() if fnmatch.fnmatch(n, pattern)),
+            key=lambda e: e.seq,
+            reverse=True,
+        )
+        for entry in candidatos:
+            caminho = self.directory / entry.path
+            try:
+                if caminho.stat().st_size == entry.bytes:
+                    return caminho
+            except OSError:
+                continue
+        return None
+
+    def entrada(self, arquivo: PathLike) -> Optional[DatasetEntry]:
+        return self.entries.get(Path(arquivo).name)
+
+
+def _descrever_entrada(caminho: Path) -> Dict[str, Any]:
+    entry = metadados_dataset(caminho)
+    if entry is not None:
+        content_hash = entry.content_hash
+    elif caminho.is_file():
+        content_hash = hash_conteudo(caminho)
+    else:
+        content_hash = None
+    return {"path": str(caminho.resolve()), "content_hash": content_hash}
+
+
+def registrar_dataset(
+    arquivo: PathLike,
+    frames: Frames = None,
+    *,
+    entradas: Sequence[PathLike] = (),
+    estagio: Optional[str] = None,
+) -> Optional[DatasetEntry]:
+    """Registra ``arquivo`` no catálogo do seu diretório (falhas só geram aviso)."""
+    if not catalogo_habilitado():
+        return None
+    try:
+        return DatasetCatalog(Path(arquivo).parent).registrar(
+            arquivo, frames, entradas=entradas, estagio=estagio
+        )
+    except Exception as exc:  # pragma: no cover - catálogo nunca interrompe exportação
+        logger.warning("Falha ao registrar %s no catalogo: %s", arquivo, exc)
+        return None
+
+
+def metadados_dataset(arquivo: PathLike) -> Optional[DatasetEntry]:
+    """Entrada do catálogo de ``arquivo`` se ainda descreve o arquivo em disco.
+
+    Linhas, colunas, bytes e hash gravados na exportação; ``None`` quando não
+    há catálogo/entrada ou o tamanho/``st_mtime_ns`` mudou (arquivo regravado
+    por fora).
+    """
+    caminho = Path(arquivo)
+    if not catalogo_habilitado():
+        return None
+    entry = DatasetCatalog(caminho.parent).entrada(caminho)
+    try:
+        if entry is not None and entry.descreve(caminho.stat()):
+            return entry
+    except OSError:
+        pass
+    return None
+
+
+def resolver_mais_recente(directory: PathLike, pattern: str) -> Path:
+    """Resolve o arquivo mais recente de ``pattern`` em ``directory``.
+
+    Usa o catálogo quando disponível e atualizado; caso contrário, ordena o
+    glob por ``(st_mtime, nome)``.
+    """
+    directory = Path(directory)
+    catalogo = DatasetCatalog(directory)
+    if catalogo_habilitado() and catalogo.path.exists() and catalogo.esta_atualizado():
+        encontrado = catalogo.mais_recente(pattern)
+        if encontrado is not None:
+            return encontrado
+
+    candidatos = [
+        p for p in directory.glob(pattern)
+        if p.is_file() and p.name not in (CATALOG_FILENAME, CATALOG_LOCK_FILENAME)
+    ]
+    if not candidatos:
+        raise FileNotFoundError(f"Nenhum arquivo correspondente a {pattern} em {directory}")
+    return max(candidatos, key=lambda p: (p.stat().st_mtime, p.name))
+
+
+def linhagem(arquivo: PathLike) -> Dict[str, Any]:
+    """Árvore de linhagem de ``arquivo`` seguindo os catálogos das entradas."""
+    caminho = Path(arquivo)
+    entry = DatasetCatalog(caminho.parent).entrada(caminho)
+    no: Dict[str, Any] = {"path": str(caminho), "content_hash": None, "inputs": []}
+    if entry is None:
+        return no
+    no["content_hash"] = entry.content_hash
+    no["inputs"] = [linhagem(item["path"]) for item in entry.inputs]
+    return no
+
+
+__all__ = [
+    "CATALOG_FILENAME",
+    "DatasetCatalog",
+    "DatasetEntry",
+    "ResumoMembro",
+    "hash_conteudo",
+    "hash_schema",
+    "linhagem",
+    "metadados_dataset",
+    "registrar_dataset",
+    "resolver_mais_recente",
+]
@@ -0,0 +1,459 @@
+"""Gerador de bases sintéticas para testes de carga e benchmark.
+
+Produz DataFrames com o layout das bases reais (VIC, MAX, EMCCAMP,
+Tabelionato cobrança/custas e judicial), todas as colunas como texto, como
+chegam dos loaders. A sujeira das bases reais é reproduzida de forma
+controlada:
+
+- linhas duplicadas (idênticas e com a mesma chave e valor diferente);
+- CPF/CNPJ pontuados, sem zeros à esquerda, com espaços, vazios ou truncados;
+- datas em formatos mistos e datas inválidas;
+- valores em formatos brasileiro/americano, com milhar e ``R$``;
+- quebras de linha dentro de nomes e endereços.
+
+A geração é vetorizada (pools de valores únicos indexados com numpy), o
+que permite gerar milhões de linhas em poucos segundos. A mesma
+``semente`` sempre produz a mesma base.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils.io import write_csv_to_zip
+
+# Fração de linhas com algum campo sujo (documento, data, valor, texto)
+TAXA_SUJEIRA = 0.02
+# Fração de linhas duplicadas (metade idêntica, metade com valor alterado)
+TAXA_DUPLICADAS = 0.01
+
+FORMATOS_DATA = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%Y%m%d', '%Y-%m-%d %H:%M:%S')
+DATAS_INVALIDAS = ('', '00/00/0000', '31/02/2023', '99/99/9999')
+
+PRIMEIROS_NOMES = (
+    'ANA', 'JOÃO', 'MARIA', 'JOSÉ', 'ANTÔNIO', 'FRANCISCO', 'CARLOS', 'PAULO',
+    'LUCAS', 'LUIZ', 'MARCOS', 'GABRIEL', 'RAFAEL', 'DANIEL', 'MARCELO', 'BRUNO',
+    'FERNANDA', 'PATRÍCIA', 'ALINE', 'SANDRA', 'CAMILA', 'AMANDA', 'JÉSSICA',
+    'LETÍCIA', 'JÚLIA', 'CONCEIÇÃO', 'RAIMUNDA', 'TEREZINHA', 'VITÓRIA', 'ÍCARO',
+)
+SOBRENOMES = (
+    'SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'RODRIGUES', 'FERREIRA', 'ALVES',
+    'PEREIRA', 'LIMA', 'GOMES', 'COSTA', 'RIBEIRO', 'MARTINS', 'CARVALHO',
+    'ARAÚJO', 'MELO', 'BARBOSA', 'CARDOSO', 'ROCHA', 'DIAS', 'NASCIMENTO',
+    'ANDRADE', 'MOREIRA', 'NUNES', 'MARQUES', 'MACHADO', 'MENDES', 'FREITAS',
+    "D'ÁVILA", 'CONCEIÇÃO',
+)
+EMPREENDIMENTOS = (
+    'RESIDENCIAL PARQUE DAS ÁGUAS', 'CONDOMÍNIO VILLA VERDE', 'EDIFÍCIO SOLAR',
+    'JARDIM DAS FLORES', 'RESIDENCIAL BELA VISTA', 'LOTEAMENTO SÃO JOSÉ',
+    'TORRE NORTE', 'RESIDENCIAL IPÊ AMARELO',
+)
+CIDADES = (
+    ('BELO HORIZONTE', 'MG'), ('CONTAGEM', 'MG'), ('BETIM', 'MG'),
+    ('SÃO PAULO', 'SP'), ('CAMPINAS', 'SP'), ('RIO DE JANEIRO', 'RJ'),
+    ('GOIÂNIA', 'GO'), ('UBERLÂNDIA', 'MG'),
+)
+LOGRADOUROS = ('RUA', 'AVENIDA', 'TRAVESSA', 'ALAMEDA', 'RODOVIA')
+
+
+def _sorteio(rng: np.random.Generator, n: int, taxa: float) -> np.ndarray:
+    return rng.random(n) < taxa
+
+
+def _escolher(rng: np.random.Generator, opcoes: Sequence, n: int, pesos=None) -> np.ndarray:
+    valores = np.asarray(opcoes, dtype=object)
+    return valores[rng.choice(len(valores), size=n, p=pesos)]
+
+
+def _texto(numeros: np.ndarray, largura: int = 0) -> np.ndarray:
+    textos = np.asarray(numeros, dtype=np.int64).astype(str)
+    return np.char.zfill(textos, largura) if largura and len(textos) else textos
+
+
+def _concatenar(*partes) -> np.ndarray:
+    resultado = partes[0]
+    for parte in partes[1:]:
+        resultado = np.char.add(resultado, parte)
+    return resultado
+
+
+def _digito_verificador(digitos: np.ndarray, pesos: Sequence[int]) -> np.ndarray:
+    resto = (digitos * np.asarray(pesos)).sum(axis=1) % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def _juntar_digitos(digitos: np.ndarray) -> np.ndarray:
+    return digitos @ (10 ** np.arange(digitos.shape[1] - 1, -1, -1, dtype=np.int64))
+
+
+def _documentos(rng: np.random.Generator, n: int, fracao_cnpj: float = 0.15) -> np.ndarray:
+    """CPFs e CNPJs com dígitos verificadores válidos, só números."""
+    cpf = rng.integers(0, 10, size=(n, 9))
+    cpf = np.column_stack([cpf, _digito_verificador(cpf, range(10, 1, -1))])
+    cpf = np.column_stack([cpf, _digito_verificador(cpf, range(11, 1, -1))])
+
+    cnpj = rng.integers(0, 10, size=(n, 12))
+    cnpj[:, 8:11] = 0
+    cnpj[:, 11] = 1
+    cnpj = np.column_stack([cnpj, _digito_verificador(cnpj, (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2))])
+    cnpj = np.column_stack([cnpj, _digito_verificador(cnpj, (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2))])
+
+    eh_cnpj = _sorteio(rng, n, fracao_cnpj)
+    return np.where(eh_cnpj, _texto(_juntar_digitos(cnpj), 14), _texto(_juntar_digitos(cpf), 11)).astype(object)
+
+
+def _sujar_documentos(rng: np.random.Generator, docs: np.ndarray, taxa: float) -> np.ndarray:
+    """Aplica em ``taxa`` das linhas um dos defeitos comuns de CPF/CNPJ."""
+    docs = np.array(docs, dtype=object)
+    sujos = np.flatnonzero(_sorteio(rng, len(docs), taxa))
+    if not len(sujos):
+        return docs
+
+    alvo = pd.Series(docs[sujos], dtype=object)
+    cpf = alvo.str.len() == 11
+    pontuado = (
+        alvo.str[:3] + '.' + alvo.str[3:6] + '.' + alvo.str[6:9] + '-' + alvo.str[9:]
+    ).where(cpf, alvo.str[:2] + '.' + alvo.str[2:5] + '.' + alvo.str[5:8] + '/' + alvo.str[8:12] + '-' + alvo.str[12:])
+    variantes = np.column_stack([
+        pontuado.to_numpy(object),
+        alvo.str.lstrip('0').to_numpy(object),
+        (' ' + alvo + ' ').to_numpy(object),
+        np.full(len(alvo), '', dtype=object),
+        alvo.str[:7].to_numpy(object),
+    ])
+    tipo = rng.choice(variantes.shape[1], size=len(alvo), p=(0.5, 0.2, 0.15, 0.1, 0.05))
+    docs[sujos] = variantes[np.arange(len(alvo)), tipo]
+    return docs
+
+
+def _datas(
+    rng: np.random.Generator,
+    n: int,
+    inicio: str,
+    fim: str,
+    formato: str,
+    taxa: float,
+) -> np.ndarray:
+    """Datas no ``formato`` da base; ``taxa`` das linhas em outro formato ou inválidas."""
+    dias = rng.integers(pd.Timestamp(inicio).value // 86_400_000_000_000,
+                        pd.Timestamp(fim).value // 86_400_000_000_000, size=n)
+    unicos, posicoes = np.unique(dias, return_inverse=True)
+    calendario = pd.to_datetime(unicos, unit='D')
+    datas = np.asarray(calendario.strftime(formato), dtype=object)[posicoes]
+
+    sujos = np.flatnonzero(_sorteio(rng, n, taxa))
+    if len(sujos):
+        alternativos = [f for f in FORMATOS_DATA if f != formato]
+        textos = np.column_stack(
+            [np.asarray(calendario.strftime(f), dtype=object)[posicoes[sujos]] for f in alternativos]
+            + [_escolher(rng, DATAS_INVALIDAS, len(sujos))]
+        )
+        pesos = np.r_[np.full(len(alternativos), 0.8 / len(alternativos)), 0.2]
+        datas[sujos] = textos[np.arange(len(sujos)), rng.choice(textos.shape[1], size=len(sujos), p=pesos)]
+    return datas
+
+
+def _valores(
+    rng: np.random.Generator,
+    n: int,
+    minimo: float,
+    maximo: float,
+    decimal: str,
+    taxa: float,
+) -> np.ndarray:
+    """Valores monetários com separador ``decimal``; ``taxa`` das linhas em outro formato."""
+    centavos = rng.integers(int(minimo * 100), int(maximo * 100), size=n)
+    valores = _concatenar(_texto(centavos // 100), decimal, _texto(centavos % 100, 2)).astype(object)
+
+    sujos = np.flatnonzero(_sorteio(rng, n, taxa))
+    for posicao, tipo in zip(sujos, rng.integers(0, 4, size=len(sujos))):
+        valor = centavos[posicao] / 100
+        milhar = f'{valor:,.2f}'.translate(str.maketrans(',.', '.,'))
+        valores[posicao] = (
+            milhar,
+            f'R$ {milhar}',
+            f'{valor:.2f}' if decimal == ',' else f'{valor:.2f}'.replace('.', ','),
+            '',
+        )[tipo]
+    return valores
+
+
+def _quebrar_linhas(rng: np.random.Generator, textos: np.ndarray, taxa: float) -> np.ndarray:
+    """Insere ``\\n``/``\\r\\n`` no meio de ``taxa`` dos textos."""
+    textos = np.array(textos, dtype=object)
+    sujos = np.flatnonzero(_sorteio(rng, len(textos), taxa))
+    quebras = _escolher(rng, ('\n', '\r\n', ' \n'), len(sujos))
+    textos[sujos] = [t.replace(' ', q, 1) for t, q in zip(textos[sujos], quebras)]
+    return textos
+
+
+def _nomes(rng: np.random.Generator, n: int) -> np.ndarray:
+    return _concatenar(
+        _escolher(rng, PRIMEIROS_NOMES, n).astype(str), ' ',
+        _escolher(rng, SOBRENOMES, n).astype(str), ' ',
+        _escolher(rng, SOBRENOMES, n).astype(str),
+    )
+
+
+def _enderecos(rng: np.random.Generator, n: int) -> np.ndarray:
+    return _concatenar(
+        _escolher(rng, LOGRADOUROS, n).astype(str), ' ',
+        _escolher(rng, SOBRENOMES, n).astype(str), ', ',
+        _texto(rng.integers(1, 3000, size=n)),
+    )
+
+
+def _por_grupo(rng: np.random.Generator, opcoes: Sequence, grupos: np.ndarray) -> np.ndarray:
+    """Um valor de ``opcoes`` por grupo (ex.: empreendimento do contrato)."""
+    n_grupos = int(grupos.max()) + 1 if len(grupos) else 0
+    return _escolher(rng, opcoes, n_grupos)[grupos]
+
+
+def _carteira(rng: np.random.Generator, n: int, parcelas_por_contrato: int = 4, contratos_por_cliente: int = 2):
+    """Estrutura cliente → contratos → parcelas.
+
+    Returns:
+        (cliente, contrato, parcela): arrays de ``n`` posições com o índice do
+        cliente, o índice do contrato e o número da parcela (1..k) no contrato.
+    """
+    n_contratos = max(1, n // parcelas_por_contrato)
+    n_clientes = max(1, n_contratos // contratos_por_cliente)
+    contrato = np.sort(rng.integers(0, n_contratos, size=n))
+    _, inicio, grupo = np.unique(contrato, return_index=True, return_inverse=True)
+    parcela = np.arange(n) - inicio[grupo] + 1
+    dono = rng.integers(0, n_clientes, size=n_contratos)
+    return dono[contrato], contrato, parcela
+
+
+def _clientes(rng: np.random.Generator, cliente: np.ndarray, sujeira: float):
+    """Documento e nome de cada linha, consistentes por cliente."""
+    n_clientes = int(cliente.max()) + 1 if len(cliente) else 0
+    docs = _documentos(rng, n_clientes)[cliente]
+    nomes = _nomes(rng, n_clientes)[cliente]
+    return _sujar_documentos(rng, docs, sujeira), _quebrar_linhas(rng, nomes, sujeira / 4)
+
+
+def _com_duplicatas(
+    rng: np.random.Generator,
+    df: pd.DataFrame,
+    linhas: int,
+    taxa: float,
+    coluna_alterada: Optional[str] = None,
+) -> pd.DataFrame:
+    """Completa ``df`` até ``linhas`` com cópias de linhas existentes.
+
+    As cópias ficam logo após a linha original. Em metade delas a
+    ``coluna_alterada`` recebe o valor de outra linha (mesma chave, dado
+    divergente), como nas reexportações das bases reais.
+    """
+    extras = linhas - len(df)
+    if extras <= 0 or df.empty:
+        return df.reset_index(drop=True)
+
+    origem = np.sort(rng.choice(len(df), size=extras, replace=extras > len(df)))
+    copias = df.iloc[origem].copy()
+    if coluna_alterada:
+        alteradas = np.arange(0, extras, 2)
+        outras = rng.integers(0, len(df), size=len(alteradas))
+        coluna = copias.columns.get_loc(coluna_alterada)
+        copias.iloc[alteradas, coluna] = df[coluna_alterada].to_numpy(object)[outras]
+
+    ordem = np.argsort(np.concatenate([np.arange(len(df)), origem]), kind='stable')
+    return pd.concat([df, copias], ignore_index=True).take(ordem).reset_index(drop=True)
+
+
+def _base_unica(linhas: int, taxa_duplicadas: float) -> int:
+    return max(1, linhas - int(linhas * taxa_duplicadas)) if linhas else 0
+
+
+def gerar_vic(linhas: int, semente: int = 0, sujeira: float = TAXA_SUJEIRA) -> pd.DataFrame:
+    """Base VIC como recebida por e-mail (layout de ``client_source`` do vic.yaml)."""
+    rng = np.random.default_rng(semente)
+    n = _base_unica(linhas, TAXA_DUPLICADAS)
+    cliente, contrato, parcela = _carteira(rng, n)
+    docs, nomes = _clientes(rng, cliente, sujeira)
+
+    df = pd.DataFrame({
+        'CPFCNPJ_CLIENTE': docs,
+        'NOME_RAZAO_SOCIAL': nomes,
+        'NUMERO_CONTRATO': _texto(100_000 + contrato),
+        'EMPREENDIMENTO': _por_grupo(rng, EMPREENDIMENTOS, contrato),
+        'PARCELA': _texto(parcela),
+        'VENCIMENTO': _datas(rng, n, '2015-01-01', '2026-12-31', '%d/%m/%Y', sujeira),
+        'VALOR': _valores(rng, n, 50, 25_000, ',', sujeira),
+        'STATUS_TITULO': _escolher(
+            rng, ('EM ABERTO', 'Aberto', 'em aberto ', 'BAIXADO', 'Pago'), n,
+            (0.6, 0.2, 0.05, 0.1, 0.05),
+        ),
+        'TIPO_PARCELA': _escolher(
+            rng, ('PARCELA', 'ENTRADA', 'CHAVES', 'INTERMEDIARIA', 'FINANCIAMENTO', ''), n,
+            (0.6, 0.1, 0.1, 0.1, 0.08, 0.02),
+        ),
+    }).astype(str)
+    return _com_duplicatas(rng, df, linhas, TAXA_DUPLICADAS, 'VALOR')
+
+
+def gerar_max(linhas: int, semente: int = 0, sujeira: float = TAXA_SUJEIRA) -> pd.DataFrame:
+    """Base MAX (layout da consulta ``max_source`` do vic.yaml)."""
+    rng = np.random.default_rng(semente)
+    n = _base_unica(linhas, TAXA_DUPLICADAS)
+    cliente, contrato, parcela = _carteira(rng, n)
+    docs, nomes = _clientes(rng, cliente, sujeira)
+
+    chave = _concatenar(_texto(100_000 + contrato), '-', _texto(parcela, 2)).astype(object)
+    sujas = np.flatnonzero(_sorteio(rng, n, sujeira))
+    originais = chave[sujas].astype(str)
+    defeitos = np.column_stack([
+        np.char.replace(originais, '-', '').astype(object),
+        np.full(len(sujas), '', dtype=object),
+        _datas(rng, len(sujas), '2020-01-01', '2024-12-31', '%d/%m/%Y', 0),
+        np.char.add(originais, ',00').astype(object),
+    ])
+    chave[sujas] = defeitos[np.arange(len(sujas)), rng.integers(0, 4, size=len(sujas))]
+
+    df = pd.DataFrame({
+        'CAMPANHA': _escolher(
+            rng, ('000041 - VIC EXTRAJUDICIAL', '000004 - VIC JUDICIAL', '000058 - TABELIONATO'), n,
+            (0.7, 0.2, 0.1),
+        ),
+        'CREDOR': 'VIC ENGENHARIA LTDA',
+        'CNPJ_CREDOR': '12.086.678/0001-18',
+        'CPFCNPJ_CLIENTE': docs,
+        'NOME_RAZAO_SOCIAL': nomes,
+        'NUMERO_CONTRATO': _texto(100_000 + contrato),
+        'EMPREENDIMENTO': _por_grupo(rng, EMPREENDIMENTOS, contrato),
+        'DATA_CADASTRO': _datas(rng, n, '2018-01-01', '2025-12-31', '%Y-%m-%d', 0),
+        'PARCELA': chave,
+        'Movimentacoes_ID': _texto(np.arange(1, n + 1) * 7 + 10_000_000),
+        'VENCIMENTO': _datas(rng, n, '2015-01-01', '2026-12-31', '%Y-%m-%d', sujeira),
+        'VALOR': _valores(rng, n, 50, 25_000, '.', sujeira),
+        'STATUS_TITULO': _escolher(rng, ('Aberto', 'Em negociação', 'Aberto '), n, (0.85, 0.1, 0.05)),
+        'TIPO_PARCELA': _escolher(rng, ('PARCELA', 'ENTRADA', 'CHAVES', ''), n, (0.8, 0.1, 0.08, 0.02)),
+    }).astype(str)
+    return _com_duplicatas(rng, df, linhas, TAXA_DUPLICADAS, 'VALOR')
+
+
+def gerar_emccamp(linhas: int, semente: int = 0, sujeira: float = TAXA_SUJEIRA) -> pd.DataFrame:
+    """Base EMCCAMP (layout de ``client_source`` do emccamp.yaml)."""
+    rng = np.random.default_rng(semente)
+    n = _base_unica(linhas, TAXA_DUPLICADAS)
+    cliente, contrato, parcela = _carteira(rng, n, parcelas_por_contrato=6)
+    docs, nomes = _clientes(rng, cliente, sujeira)
+    cidades = rng.integers(0, len(CIDADES), size=n)
+    valor_original = _valores(rng, n, 100, 15_000, ',', 0)
+
+    df = pd.DataFrame({
+        'CLIENTE': nomes,
+        'CPF': docs,
+        'NUM_VENDA': _texto(5_000 + contrato),
+        'ID_PARCELA': _texto(parcela),
+        'VENCIMENTO': _datas(rng, n, '2016-01-01', '2026-12-31', '%d/%m/%Y', sujeira),
+        'VALOR_ATUALIZADO': _valores(rng, n, 100, 30_000, ',', sujeira),
+        'NOME_EMPREENDIMENTO': _por_grupo(rng, EMPREENDIMENTOS, contrato),
+        'DSC_SIT_VENDA': _escolher(rng, ('ATIVA', 'DISTRATADA', 'QUITADA'), n, (0.85, 0.1, 0.05)),
+        'TIPO_PAGTO': _escolher(
+            rng, ('Mensal', 'Anual', 'Chaves', 'PERMUTA', 'Financiamento Fixo', 'mensal'), n,
+            (0.6, 0.1, 0.1, 0.05, 0.1, 0.05),
+        ),
+        'VALOR_ORIGINAL': valor_original,
+        'CNPJ_EMPREENDIMENTO': _sujar_documentos(rng, _documentos(rng, n, fracao_cnpj=1.0), sujeira),
+        'TELEFONE': np.char.add('(31) 9', _texto(rng.integers(0, 100_000_000, size=n), 8)),
+        'EMAIL': _concatenar('cliente', _texto(cliente), '@exemplo.com.br'),
+        'RUA': _quebrar_linhas(rng, _enderecos(rng, n), sujeira / 4),
+        'NUMERO': _texto(rng.integers(1, 3000, size=n)),
+        'COMPLEMENTO': _escolher(rng, ('', 'APTO 101', 'BLOCO B', 'CASA 2', 'LOJA 1'), n),
+        'CEP': _texto(rng.integers(30_000_000, 39_999_999, size=n), 8),
+        'BAIRRO': _escolher(rng, ('CENTRO', 'SAVASSI', 'ELDORADO', 'BARREIRO', 'PAMPULHA'), n),
+        'CIDADE': np.asarray([c for c, _ in CIDADES], dtype=object)[cidades],
+        'UF': np.asarray([u for _, u in CIDADES], dtype=object)[cidades],
+    }).astype(str)
+    return _com_duplicatas(rng, df, linhas, TAXA_DUPLICADAS, 'VALOR_ATUALIZADO')
+
+
+def gerar_tabelionato_cobranca(linhas: int, semente: int = 0, sujeira: float = TAXA_SUJEIRA) -> pd.DataFrame:
+    """Base de cobrança do Tabelionato (layout de ``client_source`` do tabelionato.yaml)."""
+    rng = np.random.default_rng(semente)
+    n = _base_unica(linhas, TAXA_DUPLICADAS)
+    cliente, protocolo, _ = _carteira(rng, n, parcelas_por_contrato=2, contratos_por_cliente=1)
+    docs, nomes = _clientes(rng, cliente, sujeira)
+    cidades = rng.integers(0, len(CIDADES), size=n)
+
+    protocolos = _texto(1_000_000 + protocolo).astype(object)
+    pontuados = np.flatnonzero(_sorteio(rng, n, sujeira))
+    alvo = pd.Series(protocolos[pontuados], dtype=object)
+    protocolos[pontuados] = (alvo.str[:1] + '.' + alvo.str[1:4] + '.' + alvo.str[4:] + ' ').to_numpy(object)
+
+    df = pd.DataFrame({
+        'PROTOCOLO': protocolos,
+        'VRTITULO': _valores(rng, n, 30, 50_000, ',', sujeira),
+        'DTANUENCIA': _datas(rng, n, '2012-01-01', '2025-12-31', '%d/%m/%Y', sujeira),
+        'DEVEDOR': nomes,
+        'ENDERECO': _quebrar_linhas(rng, _enderecos(rng, n), sujeira),
+        'CIDADE': np.asarray([c for c, _ in CIDADES], dtype=object)[cidades],
+        'CEP': _texto(rng.integers(30_000_000, 39_999_999, size=n), 8),
+        'CPFCNPJ': docs,
+        'INTIMADO': _escolher(rng, ('true', 'false', 'Verdadeiro', 'Falso', 'TRUE'), n),
+        'CUSTAS': _valores(rng, n, 10, 2_000, ',', sujeira),
+        'CREDOR': _escolher(rng, ('BANCO ALFA S.A.', 'COMERCIAL BETA LTDA', 'CONDOMINIO GAMA'), n),
+        'DATAEXTRACAO': '2025-01-15 08:30:00',
+    }).astype(str)
+    return _com_duplicatas(rng, df, linhas, TAXA_DUPLICADAS, 'CUSTAS')
+
+
+def gerar_tabelionato_custas(linhas: int, semente: int = 0, sujeira: float = TAXA_SUJEIRA) -> pd.DataFrame:
+    """Relatório de recebimento de custas postergadas do Tabelionato."""
+    rng = np.random.default_rng(semente)
+    n = _base_unica(linhas, TAXA_DUPLICADAS)
+    docs, nomes = _clientes(rng, rng.integers(0, max(1, n // 2), size=n), sujeira)
+
+    df = pd.DataFrame({
+        'Protocolo': _texto(1_000_000 + rng.integers(0, max(1, n * 2), size=n)),
+        'Devedor': nomes,
+        'CpfCnpj': docs,
+        'Dt. Pagamento': _datas(rng, n, '2023-01-01', '2025-12-31', '%d/%m/%Y', sujeira),
+        'Vr. Pago Custas Postergadas': _valores(rng, n, 10, 2_000, ',', sujeira),
+        'Vr. Pago Cancelamento': _valores(rng, n, 0, 300, ',', sujeira),
+    }).astype(str)
+    return _com_duplicatas(rng, df, linhas, TAXA_DUPLICADAS)
+
+
+def gerar_judicial(linhas: int, semente: int = 0, sujeira: float = TAXA_SUJEIRA) -> pd.DataFrame:
+    """Lista judicial combinada (AUTOJUR + MAX Smart), com sobreposição entre origens."""
+    rng = np.random.default_rng(semente)
+    n = _base_unica(linhas, TAXA_DUPLICADAS)
+    unicos = max(1, int(n * 0.8))
+    docs = _documentos(rng, unicos)[rng.integers(0, unicos, size=n)]
+
+    df = pd.DataFrame({
+        'CPF_CNPJ': _sujar_documentos(rng, docs, sujeira),
+        'ORIGEM': _escolher(rng, ('AUTOJUR', 'MAX_SMART'), n, (0.6, 0.4)),
+    }).astype(str)
+    return _com_duplicatas(rng, df, linhas, TAXA_DUPLICADAS)
+
+
+GERADORES: Dict[str, Callable[..., pd.DataFrame]] = {
+    'vic': gerar_vic,
+    'max': gerar_max,
+    'emccamp': gerar_emccamp,
+    'tabelionato': gerar_tabelionato_cobranca,
+    'tabelionato_custas': gerar_tabelionato_custas,
+    'judicial': gerar_judicial,
+}
+
+
+def gerar_dataset(nome: str, linhas: int, semente: int = 0, sujeira: float = TAXA_SUJEIRA) -> pd.DataFrame:
+    """Gera a base sintética ``nome`` (chave de ``GERADORES``)."""
+    try:
+        gerador = GERADORES[nome]
+    except KeyError:
+        raise ValueError(f"Base sintética desconhecida: {nome}. Disponíveis: {', '.join(GERADORES)}") from None
+    return gerador(linhas, semente=semente, sujeira=sujeira)
+
+
+def salvar_dataset(df: pd.DataFrame, destino: Union[str, Path], nome_csv: Optional[str] = None) -> Path:
+    """Grava a base como ZIP com um CSV (``;``, utf-8-sig), como os arquivos de entrada."""
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    return write_csv_to_zip({nome_csv or f"{destino.stem}.csv": df}, destino, sep=';')
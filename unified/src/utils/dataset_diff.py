@@ -0,0 +1,402 @@
+"""Comparação em streaming entre duas versões de um dataset (ZIP/CSV/Parquet).
+
+Cada lado é lido em lotes; para cada linha guarda-se apenas o hash da chave
+e um hash por coluna comparada, distribuídos em ``particoes`` arquivos
+temporários conforme o hash da chave. A comparação é feita partição a
+partição (memória proporcional a uma partição, não ao dataset) e reporta
+chaves adicionadas, removidas e alteradas, além de quantas linhas mudaram
+em cada coluna. Uma amostra das diferenças, com o texto da chave e os
+valores antes/depois, é obtida numa passada final que lê apenas as linhas
+das chaves amostradas.
+
+Chaves são comparadas pelo hash de 64 bits do texto (com ``strip``);
+valores, pelo texto exato (nulo e vazio são equivalentes). Coluna chave
+ausente em um dos lados é reportada em ``chaves_ausentes``: nenhuma linha
+pode ser casada, então todas contam como removidas/adicionadas.
+"""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.io.csv_codec import EscritorCSV, contar_linhas, iterar_csv
+from src.utils.catalog import DatasetEntry, metadados_dataset
+
+logger = logging.getLogger(__name__)
+
+Fonte = Union[str, Path, pd.DataFrame]
+
+PARTICOES = 16
+AMOSTRA = 100
+LINHAS_POR_LOTE = 100_000
+
+ADICIONADA = "ADICIONADA"
+REMOVIDA = "REMOVIDA"
+ALTERADA = "ALTERADA"
+
+
+# ---------------------------------------------------------------------- #
+# Leitura
+# ---------------------------------------------------------------------- #
+@contextmanager
+def _abrir_csv(caminho: Path):
+    if caminho.suffix.lower() == ".zip":
+        with zipfile.ZipFile(caminho) as zf:
+            membros = [n for n in zf.namelist() if n.lower().endswith(".csv")]
+            if not membros:
+                raise ValueError(f"Nenhum CSV encontrado em {caminho}")
+            with zf.open(membros[0]) as arquivo:
+                yield arquivo
+    else:
+        with open(caminho, "rb") as arquivo:
+            yield arquivo
+
+
+def _metadados(caminho: Path) -> Optional[DatasetEntry]:
+    """Metadados do catálogo, quando descrevem um único CSV (o lido aqui)."""
+    entry = metadados_dataset(caminho)
+    if entry is None or len(entry.members) > 1:
+        return None
+    return entry
+
+
+def colunas_dataset(fonte: Fonte, sep: str = ";", encoding: str = "utf-8-sig") -> List[str]:
+    """Colunas de um dataset sem ler os dados (catálogo ou cabeçalho)."""
+    if isinstance(fonte, pd.DataFrame):
+        return [str(c) for c in fonte.columns]
+    caminho = Path(fonte)
+    entry = _metadados(caminho)
+    if entry is not None and entry.columns:
+        return list(entry.columns)
+    if caminho.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.ParquetFile(caminho).schema_arrow.names)
+    with _abrir_csv(caminho) as arquivo:
+        primeiro = next(iterar_csv(arquivo, sep=sep, encoding=encoding, linhas_por_lote=1), None)
+    return [] if primeiro is None else [str(c) for c in primeiro.columns]
+
+
+def iterar_dataset(
+    fonte: Fonte,
+    colunas: Optional[Sequence[str]] = None,
+    sep: str = ";",
+    encoding: str = "utf-8-sig",
+    linhas_por_lote: int = LINHAS_POR_LOTE,
+) -> Iterator[pd.DataFrame]:
+    """Lotes de texto de ``fonte`` (DataFrame, CSV, ZIP com CSV ou Parquet)."""
+    if isinstance(fonte, pd.DataFrame):
+        dados = fonte if colunas is None else fonte[list(colunas)]
+        for inicio in range(0, len(dados), linhas_por_lote):
+            yield dados.iloc[inicio:inicio + linhas_por_lote]
+        return
+
+    caminho = Path(fonte)
+    if caminho.suffix.lower() == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(caminho)
+        nomes = list(colunas) if colunas is not None else None
+        for lote in arquivo.iter_batches(batch_size=linhas_por_lote, columns=nomes):
+            textos = [lote.column(i).cast(pa.string()) for i in range(lote.num_columns)]
+            yield pa.Table.from_arrays(textos, names=lote.schema.names).to_pandas()
+        return
+
+    wanted = None if colunas is None else frozenset(colunas)
+    usecols = None if wanted is None else (lambda nome: nome in wanted)
+    with _abrir_csv(caminho) as arquivo:
+        yield from iterar_csv(
+            arquivo, sep=sep, encoding=encoding, usecols=usecols, linhas_por_lote=linhas_por_lote
+        )
+
+
+# ---------------------------------------------------------------------- #
+# Hashes
+# ---------------------------------------------------------------------- #
+def _texto(serie: pd.Series) -> pd.Series:
+    return serie.astype(object).where(serie.notna(), "").astype(str)
+
+
+def _texto_chave(lote: pd.DataFrame, chaves: Sequence[str]) -> pd.Series:
+    partes = [_texto(lote[c]).str.strip() for c in chaves]
+    return partes[0] if len(partes) == 1 else partes[0].str.cat(partes[1:], sep=" | ")
+
+
+def _hash(serie: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(serie, index=False).to_numpy()
+
+
+class _Lado:
+    """Hashes de um lado do diff (só ``uint64``), espalhados em partições no disco."""
+
+    def __init__(self, nome: str, diretorio: Path, particoes: int):
+        self.nome = nome
+        self.registros = 0
+        self._arquivos = [open(diretorio / f"{nome}_{i}.pkl", "wb") for i in range(particoes)]
+
+    def gravar(self, hash_chave: np.ndarray, hashes: np.ndarray) -> None:
+        particao = hash_chave % np.uint64(len(self._arquivos))
+        for indice, arquivo in enumerate(self._arquivos):
+            selecao = np.flatnonzero(particao == indice)
+            if len(selecao):
+                pickle.dump(
+                    (hash_chave[selecao], hashes[selecao]),
+                    arquivo,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+        self.registros += len(hash_chave)
+
+    def fechar(self) -> None:
+        for arquivo in self._arquivos:
+            arquivo.close()
+
+    def carregar(self, indice: int, n_colunas: int) -> Tuple[np.ndarray, np.ndarray]:
+        partes = []
+        with open(self._arquivos[indice].name, "rb") as arquivo:
+            while True:
+                try:
+                    partes.append(pickle.load(arquivo))
+                except EOFError:
+                    break
+        if not partes:
+            return np.empty(0, dtype=np.uint64), np.empty((0, n_colunas), dtype=np.uint64)
+        return tuple(np.concatenate(p) for p in zip(*partes))  # type: ignore[return-value]
+
+
+def _particionar(
+    lado: _Lado,
+    fonte: Fonte,
+    chaves: Sequence[str],
+    colunas: Sequence[str],
+    sep: str,
+    encoding: str,
+) -> None:
+    for lote in iterar_dataset(fonte, [*dict.fromkeys([*chaves, *colunas])], sep, encoding):
+        hashes = np.empty((len(lote), len(colunas)), dtype=np.uint64)
+        for posicao, coluna in enumerate(colunas):
+            hashes[:, posicao] = _hash(_texto(lote[coluna]))
+        lado.gravar(_hash(_texto_chave(lote, chaves)), hashes)
+
+
+def _primeiras(hash_chave: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Posições da primeira ocorrência de cada chave e quantidade de duplicadas."""
+    _, posicoes = np.unique(hash_chave, return_index=True)
+    return posicoes, len(hash_chave) - len(posicoes)
+
+
+# ---------------------------------------------------------------------- #
+# Comparação
+# ---------------------------------------------------------------------- #
+def comparar_datasets(
+    esquerda: Fonte,
+    direita: Fonte,
+    chaves: Sequence[str],
+    colunas: Optional[Sequence[str]] = None,
+    sep: str = ";",
+    encoding: str = "utf-8-sig",
+    particoes: int = PARTICOES,
+    amostra: int = AMOSTRA,
+    saida_amostra: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Compara ``esquerda`` (antes) com ``direita`` (depois) pelas ``chaves``.
+
+    Args:
+        esquerda: Dataset de referência (DataFrame, CSV, ZIP ou Parquet).
+        direita: Dataset comparado.
+        chaves: Colunas que identificam a linha.
+        colunas: Colunas comparadas (``None``: todas as comuns, exceto chaves;
+            lista vazia: só a presença das chaves).
+        particoes: Partições em disco; a memória de pico é a de uma delas.
+        amostra: Máximo de chaves na amostra por tipo de diferença.
+        saida_amostra: CSV onde gravar a amostra (opcional).
+
+    Returns:
+        Dicionário com contagens por categoria, alterações por coluna e a
+        amostra de diferenças.
+    """
+    chaves = list(chaves)
+    colunas_esquerda = colunas_dataset(esquerda, sep, encoding)
+    colunas_direita = colunas_dataset(direita, sep, encoding)
+    comuns = [c for c in colunas_esquerda if c in colunas_direita and c not in chaves]
+    comparadas = [c for c in (comuns if colunas is None else colunas) if c in comuns]
+
+    resultado: Dict[str, Any] = {
+        "chaves": chaves,
+        "colunas_comparadas": comparadas,
+        "colunas_apenas_esquerda": [c for c in colunas_esquerda if c not in colunas_direita],
+        "colunas_apenas_direita": [c for c in colunas_direita if c not in colunas_esquerda],
+        "chaves_ausentes": {
+            "esquerda": [c for c in chaves if c not in colunas_esquerda],
+            "direita": [c for c in chaves if c not in colunas_direita],
+        },
+        "adicionadas": 0,
+        "removidas": 0,
+        "alteradas": 0,
+        "iguais": 0,
+        "duplicadas_esquerda": 0,
+        "duplicadas_direita": 0,
+        "alteracoes_por_coluna": {},
+        "amostra": [],
+    }
+    if any(resultado["chaves_ausentes"].values()):
+        # Sem a chave nenhuma linha casa: tudo conta como removido/adicionado
+        logger.warning("Coluna(s) chave ausente(s): %s", resultado["chaves_ausentes"])
+        resultado["registros_esquerda"] = resultado["removidas"] = contar_registros(esquerda, sep, encoding)
+        resultado["registros_direita"] = resultado["adicionadas"] = contar_registros(direita, sep, encoding)
+        return resultado
+
+    alteracoes = np.zeros(len(comparadas), dtype=np.int64)
+    exemplos: List[Tuple[str, int, List[int]]] = []
+    por_tipo = {REMOVIDA: 0, ADICIONADA: 0, ALTERADA: 0}
+
+    with tempfile.TemporaryDirectory(prefix="diff_") as tmp:
+        lados = [_Lado(nome, Path(tmp), particoes) for nome in ("esquerda", "direita")]
+        try:
+            for lado, fonte in zip(lados, (esquerda, direita)):
+                _particionar(lado, fonte, chaves, comparadas, sep, encoding)
+        finally:
+            for lado in lados:
+                lado.fechar()
+
+        duplicadas = [0, 0]
+        for indice in range(particoes):
+            ha, ca = lados[0].carregar(indice, len(comparadas))
+            hb, cb = lados[1].carregar(indice, len(comparadas))
+            pa_, dup_a = _primeiras(ha)
+            pb_, dup_b = _primeiras(hb)
+            duplicadas[0] += dup_a
+            duplicadas[1] += dup_b
+            ha, ca = ha[pa_], ca[pa_]
+            hb, cb = hb[pb_], cb[pb_]
+
+            _, ia, ib = np.intersect1d(ha, hb, assume_unique=True, return_indices=True)
+            mudou = ca[ia] != cb[ib]
+            linha_mudou = mudou.any(axis=1)
+            alteracoes += mudou.sum(axis=0)
+
+            removidas = np.setdiff1d(np.arange(len(ha)), ia, assume_unique=True)
+            adicionadas = np.setdiff1d(np.arange(len(hb)), ib, assume_unique=True)
+            resultado["removidas"] += len(removidas)
+            resultado["adicionadas"] += len(adicionadas)
+            resultado["alteradas"] += int(linha_mudou.sum())
+            resultado["iguais"] += int(len(ia) - linha_mudou.sum())
+
+            for tipo, posicoes, hashes in ((REMOVIDA, removidas, ha), (ADICIONADA, adicionadas, hb)):
+                for pos in posicoes[: amostra - por_tipo[tipo]]:
+                    exemplos.append((tipo, int(hashes[pos]), []))
+                    por_tipo[tipo] += 1
+            for pos in np.flatnonzero(linha_mudou)[: amostra - por_tipo[ALTERADA]]:
+                exemplos.append((ALTERADA, int(ha[ia[pos]]), list(np.flatnonzero(mudou[pos]))))
+                por_tipo[ALTERADA] += 1
+
+    resultado["registros_esquerda"] = lados[0].registros
+    resultado["registros_direita"] = lados[1].registros
+    resultado["duplicadas_esquerda"] = duplicadas[0]
+    resultado["duplicadas_direita"] = duplicadas[1]
+    resultado["alteracoes_por_coluna"] = {
+        coluna: int(n) for coluna, n in zip(comparadas, alteracoes) if n
+    }
+    resultado["amostra"] = _detalhar_amostra(
+        exemplos, esquerda, direita, chaves, comparadas, sep, encoding
+    )
+    if saida_amostra is not None and resultado["amostra"]:
+        saida_amostra = Path(saida_amostra)
+        saida_amostra.parent.mkdir(parents=True, exist_ok=True)
+        with open(saida_amostra, "wb") as destino:
+            EscritorCSV(destino, sep=sep, encoding=encoding).escrever(pd.DataFrame(resultado["amostra"]))
+        resultado["arquivo_amostra"] = str(saida_amostra)
+    return resultado
+
+
+def _detalhar_amostra(
+    exemplos: List[Tuple[str, int, List[int]]],
+    esquerda: Fonte,
+    direita: Fonte,
+    chaves: Sequence[str],
+    comparadas: Sequence[str],
+    sep: str,
+    encoding: str,
+) -> List[Dict[str, Any]]:
+    """Texto da chave e valores antes/depois das chaves amostradas (uma passada por lado)."""
+    # Removidas só existem à esquerda, adicionadas só à direita; alteradas nos dois
+    lados_do_tipo = {REMOVIDA: (0,), ADICIONADA: (1,), ALTERADA: (0, 1)}
+    procurados: List[set] = [set(), set()]
+    for tipo, hash_chave, _ in exemplos:
+        for lado in lados_do_tipo[tipo]:
+            procurados[lado].add(hash_chave)
+
+    textos: Dict[int, str] = {}
+    valores: List[Dict[int, pd.Series]] = [{}, {}]
+    colunas = [*dict.fromkeys([*chaves, *comparadas])]
+    for lado, fonte in enumerate((esquerda, direita)):
+        if not procurados[lado]:
+            continue
+        alvo = np.fromiter(procurados[lado], dtype=np.uint64, count=len(procurados[lado]))
+        for lote in iterar_dataset(fonte, colunas, sep, encoding):
+            texto_chave = _texto_chave(lote, chaves)
+            hashes = _hash(texto_chave)
+            for pos in np.flatnonzero(np.isin(hashes, alvo)):
+                textos.setdefault(int(hashes[pos]), texto_chave.iat[pos])
+                valores[lado].setdefault(int(hashes[pos]), lote.iloc[pos])
+
+    linhas = []
+    for tipo, hash_chave, posicoes in exemplos:
+        texto_chave = textos.get(hash_chave, "")
+        if tipo != ALTERADA:
+            linhas.append({"TIPO": tipo, "CHAVE": texto_chave, "COLUNA": "", "ANTES": "", "DEPOIS": ""})
+            continue
+        antes = valores[0].get(hash_chave)
+        depois = valores[1].get(hash_chave)
+        for posicao in posicoes:
+            coluna = comparadas[posicao]
+            linhas.append(
+                {
+                    "TIPO": tipo,
+                    "CHAVE": texto_chave,
+                    "COLUNA": coluna,
+                    "ANTES": "" if antes is None or pd.isna(antes[coluna]) else str(antes[coluna]),
+                    "DEPOIS": "" if depois is None or pd.isna(depois[coluna]) else str(depois[coluna]),
+                }
+            )
+    return linhas
+
+
+def contar_registros(fonte: Fonte, sep: str = ";", encoding: str = "utf-8-sig") -> int:
+    """Linhas de um dataset sem interpretar os dados.
+
+    Usa a contagem gravada no catálogo na exportação; sem ela, os metadados
+    do Parquet ou a contagem de quebras de linha do CSV em blocos de bytes.
+    """
+    if isinstance(fonte, pd.DataFrame):
+        return len(fonte)
+    caminho = Path(fonte)
+    entry = _metadados(caminho)
+    if entry is not None and entry.rows is not None:
+        return entry.rows
+    if caminho.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(caminho).metadata.num_rows
+    with _abrir_csv(caminho) as arquivo:
+        return contar_linhas(arquivo)
+
+
+__all__ = [
+    "ADICIONADA",
+    "ALTERADA",
+    "REMOVIDA",
+    "colunas_dataset",
+    "comparar_datasets",
+    "contar_registros",
+    "iterar_dataset",
+]
@@ -0,0 +1,209 @@
+"""Cache local de dimensões para a extração MAX/VIC sem UDF por linha.
+
+``SQL_MAX``/``SQL_VIC`` chamam ``dbo.RetornaNomeCampanha``,
+``dbo.RetornaNomeRazaoSocial``, ``dbo.RetornaCPFCNPJ`` e
+``dbo.RetornaStatusMovimentacao`` para cada movimentação. No modo
+``extracao.modo: dimensoes`` as movimentações são lidas com os IDs crus e
+as mesmas UDFs são avaliadas uma única vez por ID distinto, com o resultado
+guardado em cache local (um arquivo por dimensão). Em execuções seguintes
+só IDs novos ou com cache vencido (``validade_horas``) vão ao servidor.
+
+A saída tem as mesmas colunas, na mesma ordem, de ``SQL_MAX``/``SQL_VIC``
+(incluindo DISTINCT e ORDER BY CPFCNPJ_CLIENTE, VENCIMENTO).
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from src.utils.queries_sql import (
+    SQL_DIM_CAMPANHAS,
+    SQL_DIM_PESSOAS,
+    SQL_DIM_STATUS,
+    SQL_MAX_IDS,
+    SQL_VIC_IDS,
+)
+
+logger = logging.getLogger(__name__)
+
+Executor = Callable[[str], pd.DataFrame]
+
+# Limite de linhas de um construtor VALUES no SQL Server
+LOTE_IDS = 1000
+
+
+@dataclass(frozen=True)
+class Dimensao:
+    nome: str
+    sql: str
+    colunas: Sequence[str]
+
+
+DIMENSOES: Dict[str, Dimensao] = {
+    'pessoas': Dimensao('pessoas', SQL_DIM_PESSOAS, ('NOME', 'DOCUMENTO')),
+    'campanhas': Dimensao('campanhas', SQL_DIM_CAMPANHAS, ('NOME',)),
+    'status': Dimensao('status', SQL_DIM_STATUS, ('NOME',)),
+}
+
+# Colunas de saída: (coluna, dimensão, coluna de ID, atributo) ou passthrough
+_COLUNAS_SAIDA: Dict[str, List[tuple]] = {
+    'max': [
+        ('CAMPANHA', 'campanhas', 'MoCampanhasID', 'NOME'),
+        ('CREDOR', 'pessoas', 'MoClientesID', 'NOME'),
+        ('CNPJ_CREDOR', 'pessoas', 'MoClientesID', 'DOCUMENTO'),
+        ('CPFCNPJ_CLIENTE', 'pessoas', 'MoInadimplentesID', 'DOCUMENTO'),
+        ('NOME_RAZAO_SOCIAL', 'pessoas', 'MoInadimplentesID', 'NOME'),
+        ('NUMERO_CONTRATO',),
+        ('EMPREENDIMENTO',),
+        ('DATA_CADASTRO',),
+        ('PARCELA',),
+        ('Movimentacoes_ID',),
+        ('VENCIMENTO',),
+        ('VALOR',),
+        ('STATUS_TITULO', 'status', 'MoStatusMovimentacao', 'NOME'),
+        ('TIPO_PARCELA',),
+    ],
+}
+_COLUNAS_SAIDA['vic'] = [c for c in _COLUNAS_SAIDA['max'] if c[0] != 'Movimentacoes_ID']
+
+_SQL_IDS = {'max': SQL_MAX_IDS, 'vic': SQL_VIC_IDS}
+
+
+def _ids_validos(valores: Iterable[Any]) -> List[int]:
+    serie = pd.to_numeric(pd.Series(list(valores), dtype=object), errors='coerce').dropna()
+    return sorted({int(v) for v in serie})
+
+
+class CacheDimensoes:
+    """Dimensões (pessoas, campanhas, status) persistidas em ``diretorio``.
+
+    Args:
+        diretorio: Pasta do cache (um ``<dimensao>.pkl`` por dimensão).
+        executar: Função que executa uma consulta e retorna um DataFrame.
+        validade_horas: Idade máxima de uma entrada antes de ser recarregada.
+    """
+
+    def __init__(self, diretorio: Path | str, executar: Executor, validade_horas: float = 24) -> None:
+        self.diretorio = Path(diretorio)
+        self.executar = executar
+        self.validade = timedelta(hours=validade_horas)
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _arquivo(self, dimensao: Dimensao) -> Path:
+        return self.diretorio / f"{dimensao.nome}.pkl"
+
+    def _carregar(self, dimensao: Dimensao) -> pd.DataFrame:
+        arquivo = self._arquivo(dimensao)
+        if arquivo.exists():
+            try:
+                return pd.read_pickle(arquivo)
+            except Exception as exc:
+                logger.warning("Cache de %s ilegivel (%s); recriando", dimensao.nome, exc)
+        vazio = pd.DataFrame(columns=[*dimensao.colunas, 'ATUALIZADO_EM'])
+        vazio.index.name = 'ID'
+        return vazio
+
+    def _consultar(self, dimensao: Dimensao, ids: List[int]) -> pd.DataFrame:
+        partes = []
+        for inicio in range(0, len(ids), LOTE_IDS):
+            lote = ids[inicio:inicio + LOTE_IDS]
+            valores = ", ".join(f"({i})" for i in lote)
+            partes.append(self.executar(dimensao.sql.format(ids=valores)))
+        novos = pd.concat(partes, ignore_index=True)
+        novos['ID'] = novos['ID'].astype('int64')
+        novos['ATUALIZADO_EM'] = datetime.now()
+        return novos.set_index('ID')[[*dimensao.colunas, 'ATUALIZADO_EM']]
+
+    def resolver(self, nome: str, ids: Iterable[Any]) -> pd.DataFrame:
+        """Tabela da dimensão para ``ids``, buscando só ausentes ou vencidos."""
+        dimensao = DIMENSOES[nome]
+        cache = self._carregar(dimensao)
+        solicitados = _ids_validos(ids)
+
+        limite = datetime.now() - self.validade
+        atualizados = cache.index[pd.to_datetime(cache['ATUALIZADO_EM']) >= limite]
+        pendentes = sorted(set(solicitados) - set(int(i) for i in atualizados))
+
+        if pendentes:
+            novos = self._consultar(dimensao, pendentes)
+            cache = pd.concat([cache.drop(index=novos.index, errors='ignore'), novos])
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            cache.to_pickle(self._arquivo(dimensao))
+
+        self.stats[nome] = {
+            'solicitados': len(solicitados),
+            'consultados': len(pendentes),
+            'em_cache': len(solicitados) - len(pendentes),
+        }
+        logger.info(
+            "Dimensao %s: %s IDs (%s do cache, %s consultados)",
+            nome,
+            f"{len(solicitados):,}",
+            f"{len(solicitados) - len(pendentes):,}",
+            f"{len(pendentes):,}",
+        )
+        return cache.loc[cache.index.isin(solicitados), list(dimensao.colunas)]
+
+
+def montar_saida(consulta: str, df_ids: pd.DataFrame, cache: CacheDimensoes) -> pd.DataFrame:
+    """Resolve as dimensões e reproduz colunas, DISTINCT e ORDER BY da consulta original."""
+    colunas = _COLUNAS_SAIDA[consulta]
+
+    ids_por_dimensao: Dict[str, set] = {}
+    for coluna in colunas:
+        if len(coluna) > 1:
+            ids_por_dimensao.setdefault(coluna[1], set()).update(df_ids[coluna[2]].dropna().tolist())
+    tabelas = {nome: cache.resolver(nome, ids) for nome, ids in ids_por_dimensao.items()}
+
+    saida = pd.DataFrame(index=df_ids.index)
+    for coluna in colunas:
+        if len(coluna) == 1:
+            saida[coluna[0]] = df_ids[coluna[0]]
+            continue
+        nome_saida, dimensao, coluna_id, atributo = coluna
+        chaves = pd.to_numeric(df_ids[coluna_id], errors='coerce').astype('Int64')
+        saida[nome_saida] = chaves.map(tabelas[dimensao][atributo]).astype(object)
+        saida.loc[chaves.isna(), nome_saida] = None
+
+    saida = saida.drop_duplicates()
+    saida = saida.sort_values(
+        ['CPFCNPJ_CLIENTE', 'VENCIMENTO'], na_position='first', kind='mergesort'
+    )
+    return saida.reset_index(drop=True)
+
+
+def extrair_com_dimensoes(
+    consulta: str,
+    executar: Executor,
+    config: Optional[Mapping[str, Any]] = None,
+) -> pd.DataFrame:
+    """Extrai ``max``/``vic`` lendo IDs crus e resolvendo dimensões em cache."""
+    extracao_cfg = (config or {}).get('extracao', {}) or {}
+    cache = CacheDimensoes(
+        extracao_cfg.get('cache_dimensoes', 'data/cache/dimensoes'),
+        executar,
+        validade_horas=float(extracao_cfg.get('validade_horas', 24)),
+    )
+    df_ids = executar(_SQL_IDS[consulta])
+    return montar_saida(consulta, df_ids, cache)
+
+
+def usar_dimensoes(config: Optional[Mapping[str, Any]]) -> bool:
+    """Indica se a extração deve usar o cache de dimensões (``extracao.modo``)."""
+    extracao_cfg = (config or {}).get('extracao', {}) or {}
+    return str(extracao_cfg.get('modo', 'udf')).lower() == 'dimensoes'
+
+
+__all__ = [
+    'CacheDimensoes',
+    'DIMENSOES',
+    'extrair_com_dimensoes',
+    'montar_saida',
+    'usar_dimensoes',
+]
@@ -0,0 +1,413 @@
+"""Backend de execução DuckDB para os cruzamentos (anti-join, semi-join, PROCV).
+
+Os processadores continuam recebendo e devolvendo ``pandas.DataFrame``.
+Quando a esquerda é um DataFrame, o DuckDB calcula apenas *quais* linhas
+ficam (posições), em paralelo e com spill em disco; a montagem final é feita
+com ``iloc`` sobre o frame original, garantindo resultado idêntico ao caminho
+pandas (mesmas colunas, dtypes e índice).
+
+Para bases maiores que a RAM, as fontes podem ser registradas a partir de
+arquivos (CSV/ZIP/Parquet): viram *views* sobre ``read_csv_auto`` /
+``read_parquet``, consultadas direto no arquivo, sem cópia para o pandas nem
+para tabelas do DuckDB. Uma junção cuja esquerda é arquivo devolve apenas as
+linhas finais; :meth:`DuckDBBackend.exportar` grava um resultado direto em
+disco.
+
+O DuckDB é dependência opcional: quando não instalado, :func:`criar_backend`
+retorna ``None`` e os chamadores seguem pelo caminho pandas. Os processadores
+abrem o backend por execução com :func:`abrir_backend`, que fecha a conexão
+e remove o diretório temporário ao final.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.utils.anti_join import _normalize_series
+
+logger = logging.getLogger(__name__)
+
+Fonte = Union[pd.DataFrame, str, Path]
+
+# Strip de espaços (inclusive \t, \r, \n) para tabelas lidas de arquivo; nulos
+# permanecem nulos e nunca casam, como ``isin`` após ``dropna`` no pandas.
+_NORMALIZAR_SQL = "regexp_replace(CAST({col} AS VARCHAR), '^\\s+|\\s+$', '', 'g')"
+
+# Encodings do pandas -> nomes aceitos pelo read_csv do DuckDB (BOM é ignorado).
+# Os demais (ex.: cp1252, que difere do latin-1 em 0x80-0x9F) são lidos pelo pandas.
+_ENCODINGS_DUCKDB = {
+    "utf-8": "utf-8",
+    "utf8": "utf-8",
+    "utf-8-sig": "utf-8",
+    "latin-1": "latin-1",
+    "latin1": "latin-1",
+    "iso-8859-1": "latin-1",
+    "utf-16": "utf-16",
+}
+
+
+def duckdb_disponivel() -> bool:
+    """Indica se o pacote ``duckdb`` pode ser importado."""
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _quote(identificador: str) -> str:
+    return '"' + str(identificador).replace('"', '""') + '"'
+
+
+class DuckDBBackend:
+    """Executa junções no DuckDB preservando o resultado pandas.
+
+    Args:
+        memory_limit: Limite de memória do DuckDB (ex.: ``"4GB"``). Acima dele
+            os operadores fazem spill para ``temp_dir``.
+        threads: Número de threads (``None`` usa todos os núcleos).
+        temp_dir: Diretório de spill e de extração de ZIPs.
+    """
+
+    def __init__(
+        self,
+        memory_limit: Optional[str] = None,
+        threads: Optional[int] = None,
+        temp_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        import duckdb
+
+        self._tmp_owner: Optional[tempfile.TemporaryDirectory] = None
+        if temp_dir:
+            self.temp_dir = Path(temp_dir)
+            self.temp_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            self._tmp_owner = tempfile.TemporaryDirectory(prefix="duckdb_backend_")
+            self.temp_dir = Path(self._tmp_owner.name)
+
+        self.con = duckdb.connect(database=":memory:")
+        self.con.execute(f"SET temp_directory = '{self.temp_dir.as_posix()}'")
+        self.con.execute("SET preserve_insertion_order = true")
+        if memory_limit:
+            self.con.execute(f"SET memory_limit = '{memory_limit}'")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._views: set[str] = set()
+        self._contador = 0
+
+    # ------------------------------------------------------------------
+    def __enter__(self) -> "DuckDBBackend":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Fecha a conexão e remove o diretório temporário próprio."""
+        try:
+            self.con.close()
+        finally:
+            self._frames.clear()
+            if self._tmp_owner is not None:
+                self._tmp_owner.cleanup()
+                self._tmp_owner = None
+
+    # ------------------------------------------------------------------
+    def registrar(
+        self,
+        nome: str,
+        fonte: Fonte,
+        *,
+        separador: str = ";",
+        encoding: str = "utf-8",
+        colunas: Optional[Sequence[str]] = None,
+    ) -> str:
+        """Registra ``fonte`` como tabela ``nome`` e devolve o nome.
+
+        DataFrames são copiados apenas nas colunas necessárias (``colunas``).
+        Arquivos viram uma view consultada direto no disco: CSV/ZIP lidos
+        como texto (equivalente a ``dtype=str``) e Parquet sem conversão.
+        CSV em encoding que o DuckDB não lê é carregado pelo pandas.
+        """
+        tabela = _quote(nome)
+        self._remover(nome)
+        if isinstance(fonte, pd.DataFrame):
+            subset = fonte[list(colunas)] if colunas else fonte
+            view = f"__df_{nome}"
+            self.con.register(view, subset.reset_index(drop=True))
+            self.con.execute(f"CREATE TABLE {tabela} AS SELECT * FROM {_quote(view)}")
+            self.con.unregister(view)
+            self._frames[nome] = fonte
+            return nome
+
+        caminho = Path(fonte)
+        if not caminho.exists():
+            raise FileNotFoundError(caminho)
+
+        sufixo = caminho.suffix.lower()
+        if sufixo == ".zip":
+            caminho = self._extrair_zip(caminho)
+            sufixo = caminho.suffix.lower()
+
+        if sufixo == ".parquet":
+            origem = f"read_parquet('{caminho.as_posix()}')"
+        else:
+            codificacao = _ENCODINGS_DUCKDB.get(str(encoding).strip().lower())
+            if codificacao is None:
+                logger.info("Encoding %s sem suporte no DuckDB; %s carregado via pandas", encoding, caminho.name)
+                df = pd.read_csv(
+                    caminho,
+                    sep=separador,
+                    dtype=str,
+                    encoding=encoding,
+                    usecols=list(colunas) if colunas else None,
+                    keep_default_na=False,
+                    na_values=[""],
+                )
+                return self.registrar(nome, df, colunas=colunas)
+            origem = (
+                f"read_csv_auto('{caminho.as_posix()}', delim='{separador}', header=true, "
+                f"all_varchar=true, quote='\"', escape='\"', encoding='{codificacao}')"
+            )
+        projecao = ", ".join(_quote(c) for c in colunas) if colunas else "*"
+        self.con.execute(f"CREATE VIEW {tabela} AS SELECT {projecao} FROM {origem}")
+        self._views.add(nome)
+        return nome
+
+    def _remover(self, nome: str) -> None:
+        tipo = "VIEW" if nome in self._views else "TABLE"
+        self.con.execute(f"DROP {tipo} IF EXISTS {_quote(nome)}")
+        self._views.discard(nome)
+        self._frames.pop(nome, None)
+
+    def colunas(self, nome: str) -> List[str]:
+        """Colunas da tabela/view ``nome`` (sem ler as linhas)."""
+        return [coluna[0] for coluna in self.con.execute(f"SELECT * FROM {_quote(nome)} LIMIT 0").description]
+
+    def contar(self, nome: str) -> int:
+        """Número de linhas de ``nome`` (para views, uma passada no arquivo)."""
+        return int(self.con.execute(f"SELECT count(*) FROM {_quote(nome)}").fetchone()[0])
+
+    def _extrair_zip(self, caminho: Path) -> Path:
+        with zipfile.ZipFile(caminho) as zf:
+            membros = [m for m in zf.namelist() if m.lower().endswith((".csv", ".parquet"))]
+            if not membros:
+                raise ValueError(f"ZIP sem CSV/Parquet: {caminho}")
+            destino = self.temp_dir / f"{caminho.stem}_{membros[0].replace('/', '_')}"
+            with zf.open(membros[0]) as origem, open(destino, "wb") as saida:
+                while True:
+                    bloco = origem.read(1 << 20)
+                    if not bloco:
+                        break
+                    saida.write(bloco)
+        return destino
+
+    def _tabela_chave(
+        self, fonte: Union[str, pd.DataFrame], coluna: str, normalizar: bool
+    ) -> tuple[str, bool]:
+        """Registra a coluna-chave e indica se o strip deve ser feito em SQL.
+
+        Para DataFrames a normalização usa a mesma função do caminho pandas,
+        garantindo comparação idêntica independentemente da versão do pandas.
+        """
+        if isinstance(fonte, str):
+            return fonte, normalizar
+        if coluna not in fonte.columns:
+            raise ValueError(f"Coluna obrigatória ausente: {coluna}")
+        serie = _normalize_series(fonte[coluna]) if normalizar else fonte[coluna]
+        self._contador += 1
+        nome = f"__tmp_{self._contador}"
+        self.registrar(nome, serie.to_frame(coluna))
+        return nome, False
+
+    @staticmethod
+    def _chave(alias: str, coluna: str, normalizar: bool) -> str:
+        ref = f"{alias}.{_quote(coluna)}"
+        return _NORMALIZAR_SQL.format(col=ref) if normalizar else ref
+
+    def _filtro_existencia(
+        self,
+        esquerda: Union[str, pd.DataFrame],
+        direita: Union[str, pd.DataFrame],
+        col_esquerda: str,
+        col_direita: str,
+        normalizar: bool,
+        negar: bool,
+    ) -> pd.DataFrame:
+        nome_e, sql_e = self._tabela_chave(esquerda, col_esquerda, normalizar)
+        nome_d, sql_d = self._tabela_chave(direita, col_direita, normalizar)
+        condicao = (
+            f"{'NOT ' if negar else ''}EXISTS (SELECT 1 FROM {_quote(nome_d)} r "
+            f"WHERE {self._chave('r', col_direita, sql_d)} = {self._chave('l', col_esquerda, sql_e)})"
+        )
+        if nome_e in self._views:
+            # Esquerda em arquivo: o DuckDB devolve direto as linhas finais
+            return self._resultado(f"SELECT l.* FROM {_quote(nome_e)} l WHERE {condicao}")
+        sql = f"SELECT l.rowid AS pos FROM {_quote(nome_e)} l WHERE {condicao} ORDER BY pos"
+        return self._materializar(esquerda, nome_e, self._posicoes(sql))
+
+    def _posicoes(self, sql: str) -> np.ndarray:
+        resultado = self.con.execute(sql).fetchnumpy()
+        return np.asarray(resultado["pos"], dtype=np.int64)
+
+    def _materializar(self, fonte: Union[str, pd.DataFrame], nome: str, posicoes: np.ndarray) -> pd.DataFrame:
+        frame = fonte if isinstance(fonte, pd.DataFrame) else self._frames.get(nome)
+        if frame is not None:
+            return frame.iloc[posicoes].copy()
+        raise KeyError(f"Tabela {nome!r} não registrada")
+
+    def _resultado(self, sql: str) -> pd.DataFrame:
+        """Executa ``sql`` replicando o ``dtype=str`` do pandas (texto, nulos como NaN)."""
+        df = self.con.execute(sql).df().astype(object)
+        return df.where(df.notna(), np.nan)
+
+    # ------------------------------------------------------------------
+    def anti_join(
+        self,
+        esquerda: Union[str, pd.DataFrame],
+        direita: Union[str, pd.DataFrame],
+        col_esquerda: str,
+        col_direita: str,
+        *,
+        normalizar: bool = True,
+    ) -> pd.DataFrame:
+        """Linhas de ``esquerda`` cuja chave não existe em ``direita``.
+
+        Com ``normalizar=True`` replica ``procv_left_minus_right`` (chaves
+        convertidas para texto e com strip); com ``False`` compara os valores
+        crus, como ``isin``. Chaves nulas nunca casam.
+        """
+        return self._filtro_existencia(
+            esquerda, direita, col_esquerda, col_direita, normalizar, negar=True
+        )
+
+    def semi_join(
+        self,
+        esquerda: Union[str, pd.DataFrame],
+        direita: Union[str, pd.DataFrame],
+        col_esquerda: str,
+        col_direita: str,
+        *,
+        normalizar: bool = True,
+    ) -> pd.DataFrame:
+        """Linhas de ``esquerda`` cuja chave existe em ``direita``."""
+        return self._filtro_existencia(
+            esquerda, direita, col_esquerda, col_direita, normalizar, negar=False
+        )
+
+    def left_join_posicoes(
+        self,
+        esquerda: Union[str, pd.DataFrame],
+        direita: Union[str, pd.DataFrame],
+        col_esquerda: str,
+        col_direita: str,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Pares (posição esquerda, posição direita ou -1) de um LEFT JOIN.
+
+        A ordem é a mesma de ``DataFrame.merge(how='left')``: linhas da
+        esquerda na ordem original e, para múltiplos matches, a ordem da
+        direita. As chaves são comparadas como texto, sem strip, e nulos
+        casam entre si (como no ``merge``).
+        """
+        nome_e, _ = self._tabela_chave(esquerda, col_esquerda, False)
+        nome_d, _ = self._tabela_chave(direita, col_direita, False)
+        resultado = self.con.execute(
+            f"SELECT l.rowid AS pos_l, coalesce(r.rowid, -1) AS pos_r "
+            f"FROM {_quote(nome_e)} l LEFT JOIN {_quote(nome_d)} r "
+            f"ON CAST(l.{_quote(col_esquerda)} AS VARCHAR) "
+            f"IS NOT DISTINCT FROM CAST(r.{_quote(col_direita)} AS VARCHAR) "
+            "ORDER BY pos_l, pos_r"
+        ).fetchnumpy()
+        return (
+            np.asarray(resultado["pos_l"], dtype=np.int64),
+            np.asarray(resultado["pos_r"], dtype=np.int64),
+        )
+
+    # ------------------------------------------------------------------
+    def exportar(self, sql: str, destino: Union[str, Path], *, separador: str = ";") -> Path:
+        """Grava o resultado de ``sql`` em Parquet/CSV sem trazer para a RAM."""
+        destino = Path(destino)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        if destino.suffix.lower() == ".parquet":
+            opcoes = "FORMAT PARQUET"
+        else:
+            opcoes = f"FORMAT CSV, HEADER, DELIMITER '{separador}'"
+        self.con.execute(f"COPY ({sql}) TO '{destino.as_posix()}' ({opcoes})")
+        return destino
+
+
+def criar_backend(
+    config: Optional[Mapping[str, Any]] = None,
+    entradas: Sequence[Union[str, Path, None]] = (),
+) -> Optional[DuckDBBackend]:
+    """Cria o backend configurado em ``execution`` (ou ``None`` para pandas).
+
+    A seção ``execution`` aceita ``backend`` (``pandas``/``duckdb``),
+    ``memory_limit``, ``threads`` e ``temp_dir``. Sem config, a variável de
+    ambiente ``EXECUTION_BACKEND`` decide (usada pelos scripts Tabelionato).
+
+    Com orçamento de memória (``global.memory_budget`` ou
+    ``PIPELINE_MEMORY_BUDGET``) menor que o tamanho das ``entradas``, o
+    DuckDB é usado mesmo sem ``backend: duckdb``, limitado ao orçamento.
+    """
+    from src.core.memory import configured_budget, exceeds_budget
+
+    exec_cfg: Mapping[str, Any] = {}
+    if config:
+        exec_cfg = config.get("execution", {}) or {}
+    backend = str(exec_cfg.get("backend") or os.getenv("EXECUTION_BACKEND", "pandas")).strip().lower()
+    memory_limit = exec_cfg.get("memory_limit") or os.getenv("DUCKDB_MEMORY_LIMIT")
+    if backend != "duckdb":
+        orcamento = configured_budget(config)
+        if not exceeds_budget(entradas, orcamento):
+            return None
+        if not duckdb_disponivel():
+            logger.warning("Entradas acima do orçamento de memória e pacote 'duckdb' ausente; usando pandas.")
+            return None
+        logger.info("Entradas acima do orçamento de memória (%s bytes); usando DuckDB.", orcamento)
+        memory_limit = memory_limit or f"{max(orcamento >> 20, 1)}MB"
+    elif not duckdb_disponivel():
+        logger.warning("Backend DuckDB configurado mas pacote 'duckdb' ausente; usando pandas.")
+        return None
+    return DuckDBBackend(
+        memory_limit=memory_limit,
+        threads=exec_cfg.get("threads"),
+        temp_dir=exec_cfg.get("temp_dir") or os.getenv("DUCKDB_TEMP_DIR"),
+    )
+
+
+@contextmanager
+def abrir_backend(
+    config: Optional[Mapping[str, Any]] = None,
+    entradas: Sequence[Union[str, Path, None]] = (),
+) -> Iterator[Optional[DuckDBBackend]]:
+    """Backend de :func:`criar_backend` para uma execução; fechado ao sair.
+
+    Entrega ``None`` quando o caminho é pandas, de modo que o chamador usa
+    sempre ``with abrir_backend(config, entradas) as backend: ...``.
+    """
+    backend = criar_backend(config, entradas)
+    try:
+        yield backend
+    finally:
+        if backend is not None:
+            backend.close()
+
+
+__all__ = [
+    "DuckDBBackend",
+    "abrir_backend",
+    "criar_backend",
+    "duckdb_disponivel",
+]
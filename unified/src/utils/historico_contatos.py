@@ -0,0 +1,93 @@
+"""Historico local dos contatos ja enviados no layout de enriquecimento.
+
+Cada contato e identificado por (CPFCNPJ CLIENTE, TIPO, CONTATO), onde
+CONTATO e o telefone normalizado ou o e-mail em minusculas. Junto da chave
+fica uma assinatura dos campos exportados (NOME, TELEFONE, EMAIL,
+TELEFONE PRINCIPAL); uma execucao incremental envia apenas contatos sem
+historico ou cuja assinatura mudou.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CHAVE_CONTATO: Tuple[str, ...] = ("CPFCNPJ CLIENTE", "TIPO", "CONTATO")
+CAMPOS_ASSINATURA: Tuple[str, ...] = ("NOME", "TELEFONE", "EMAIL", "TELEFONE PRINCIPAL")
+
+
+def assinatura_contatos(df: pd.DataFrame, campos: Sequence[str] = CAMPOS_ASSINATURA) -> pd.Series:
+    """Hash por linha dos ``campos`` exportados (texto, para comparacao exata)."""
+    valores = df[list(campos)].astype(object).fillna("").astype(str)
+    return pd.util.hash_pandas_object(valores, index=False).astype(str)
+
+
+def _chaves(df: pd.DataFrame) -> pd.DataFrame:
+    return df[list(CHAVE_CONTATO)].astype(object).fillna("").astype(str)
+
+
+class HistoricoContatos:
+    """Contatos enviados, persistidos em ``caminho`` (pickle).
+
+    Args:
+        caminho: Arquivo do historico; criado na primeira gravacao.
+    """
+
+    COLUNAS = [*CHAVE_CONTATO, "ASSINATURA", "PRIMEIRO_ENVIO", "ULTIMO_ENVIO"]
+
+    def __init__(self, caminho: Path | str) -> None:
+        self.caminho = Path(caminho)
+
+    def carregar(self) -> pd.DataFrame:
+        if self.caminho.exists():
+            try:
+                return pd.read_pickle(self.caminho)
+            except Exception as exc:
+                logger.warning("Historico de contatos ilegivel (%s); envio sera completo", exc)
+        return pd.DataFrame(columns=self.COLUNAS)
+
+    def filtrar_novos(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """Retorna (contatos novos ou alterados, quantidade ja enviada sem mudanca)."""
+        historico = self.carregar()
+        if historico.empty:
+            return df, 0
+
+        atual = _chaves(df).assign(_ASSINATURA=assinatura_contatos(df).to_numpy())
+        comparado = atual.merge(
+            historico[[*CHAVE_CONTATO, "ASSINATURA"]], on=list(CHAVE_CONTATO), how="left"
+        )
+        inalterado = (comparado["ASSINATURA"] == comparado["_ASSINATURA"]).to_numpy()
+        return df[~inalterado], int(inalterado.sum())
+
+    def registrar(self, df: pd.DataFrame, data_envio: Optional[datetime] = None) -> int:
+        """Grava (upsert) os contatos enviados; retorna o total no historico."""
+        data_envio = data_envio or datetime.now()
+        historico = self.carregar()
+
+        enviados = _chaves(df).assign(
+            ASSINATURA=assinatura_contatos(df).to_numpy(), ULTIMO_ENVIO=data_envio
+        )
+        enviados = enviados.drop_duplicates(subset=list(CHAVE_CONTATO), keep="last")
+        enviados = enviados.merge(
+            historico[[*CHAVE_CONTATO, "PRIMEIRO_ENVIO"]], on=list(CHAVE_CONTATO), how="left"
+        )
+        enviados["PRIMEIRO_ENVIO"] = enviados["PRIMEIRO_ENVIO"].fillna(data_envio)
+
+        chave_historico = pd.MultiIndex.from_frame(historico[list(CHAVE_CONTATO)])
+        chave_enviados = pd.MultiIndex.from_frame(enviados[list(CHAVE_CONTATO)])
+        mantidos = historico[~chave_historico.isin(chave_enviados)]
+        historico = pd.concat([mantidos, enviados[self.COLUNAS]], ignore_index=True)
+
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        historico[self.COLUNAS].to_pickle(self.caminho)
+        logger.info("Historico de contatos: %s registrados em %s", f"{len(historico):,}", self.caminho)
+        return len(historico)
+
+
+__all__ = ["CAMPOS_ASSINATURA", "CHAVE_CONTATO", "HistoricoContatos", "assinatura_contatos"]
@@ -0,0 +1,310 @@
+"""Ingestão HTTP em streaming para as APIs (TOTVS/EMCCAMP e ``APILoader``).
+
+* ``obter_sessao``: ``requests.Session`` por processo com pool keep-alive,
+  reaproveitando conexões TCP/TLS entre requisições e páginas.
+* ``iterar_array_json``: decodificador incremental de um array JSON lido em
+  blocos (``Response.iter_content``); entrega um registro por vez sem montar
+  o payload inteiro nem a árvore de objetos completa.
+* ``paginas_prefetch``: busca páginas com concorrência limitada, entregando
+  na ordem e parando na primeira página vazia ou incompleta.
+* ``gravar_registros_zip``: grava registros em lotes no CSV dentro do ZIP
+  de saída, com colunas e tipos estáveis entre os lotes, mantendo em
+  memória apenas um lote por vez.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.io.csv_codec import EscritorCSV
+from src.utils.catalog import ResumoMembro, registrar_dataset
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_BLOCO = 1 << 16
+TAMANHO_LOTE = 20_000
+
+_ESPACOS = " \t\r\n\ufeff"
+
+_sessoes: Dict[int, requests.Session] = {}
+_sessoes_lock = threading.Lock()
+
+
+def obter_sessao(tamanho_pool: int = 8) -> requests.Session:
+    """Sessão HTTP do processo com até ``tamanho_pool`` conexões keep-alive por host."""
+    with _sessoes_lock:
+        sessao = _sessoes.get(tamanho_pool)
+        if sessao is None:
+            sessao = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool)
+            sessao.mount("http://", adaptador)
+            sessao.mount("https://", adaptador)
+            _sessoes[tamanho_pool] = sessao
+        return sessao
+
+
+def fechar_sessoes() -> None:
+    """Fecha as sessões (e conexões ociosas) do processo."""
+    with _sessoes_lock:
+        sessoes = list(_sessoes.values())
+        _sessoes.clear()
+    for sessao in sessoes:
+        sessao.close()
+
+
+def iterar_array_json(
+    blocos: Iterable[bytes],
+    extrair_objeto: Callable[[Any], Iterable[Any]] = lambda objeto: [objeto],
+    encoding: str = "utf-8",
+) -> Iterator[Any]:
+    """Itera os elementos de um array JSON recebido em ``blocos`` de bytes.
+
+    Se o documento não for um array (ex.: ``{"items": [...]}``), ele é lido
+    por inteiro e ``extrair_objeto`` define os registros entregues.
+    """
+    decoder = json.JSONDecoder()
+    texto = codecs.getincrementaldecoder(encoding)()
+    blocos = iter(blocos)
+    buffer = ""
+    pos = 0
+    fim = False
+
+    def ler() -> None:
+        nonlocal buffer, pos, fim
+        for bloco in blocos:
+            parte = texto.decode(bloco)
+            if parte:
+                buffer, pos = buffer[pos:] + parte, 0
+                return
+        buffer, pos = buffer[pos:] + texto.decode(b"", final=True), 0
+        fim = True
+
+    def pular_espacos() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _ESPACOS:
+                pos += 1
+            if pos < len(buffer) or fim:
+                return
+            ler()
+
+    pular_espacos()
+    if pos >= len(buffer):
+        return
+    if buffer[pos] != "[":
+        while not fim:
+            ler()
+        yield from extrair_objeto(decoder.decode(buffer[pos:]))
+        return
+
+    pos += 1
+    primeiro = True
+    while True:
+        pular_espacos()
+        if pos >= len(buffer):
+            raise ValueError("JSON truncado: array sem ']' final")
+        if buffer[pos] == "]":
+            return
+        if not primeiro:
+            if buffer[pos] != ",":
+                raise ValueError(f"JSON invalido: esperado ',' e encontrado {buffer[pos]!r}")
+            pos += 1
+            pular_espacos()
+        while True:
+            try:
+                valor, fim_valor = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fim:
+                    raise
+                ler()
+                continue
+            # Número/literal no fim do buffer pode continuar no próximo bloco
+            if fim_valor >= len(buffer) and not fim:
+                ler()
+                continue
+            break
+        pos = fim_valor
+        primeiro = False
+        yield valor
+
+
+def paginas_prefetch(
+    buscar: Callable[[int], List[Any]],
+    tamanho_pagina: int,
+    max_paginas: int,
+    concorrencia: int = 4,
+    primeira: int = 1,
+) -> Iterator[List[Any]]:
+    """Páginas de ``buscar(numero)`` em ordem, com até ``concorrencia`` em voo.
+
+    Para na primeira página vazia ou com menos de ``tamanho_pagina`` itens;
+    páginas já solicitadas além dela são descartadas.
+    """
+    concorrencia = max(1, int(concorrencia))
+    ultima = primeira + max_paginas - 1
+    with ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix="pagina") as pool:
+        pendentes: deque = deque()
+        proxima = primeira
+
+        def agendar() -> None:
+            nonlocal proxima
+            while len(pendentes) < concorrencia and proxima <= ultima:
+                pendentes.append(pool.submit(buscar, proxima))
+                proxima += 1
+
+        agendar()
+        try:
+            while pendentes:
+                dados = pendentes.popleft().result()
+                if not dados:
+                    break
+                yield dados
+                if len(dados) < tamanho_pagina:
+                    break
+                agendar()
+        finally:
+            for futuro in pendentes:
+                futuro.cancel()
+
+
+def _tipo_estavel(dtype: Any) -> Any:
+    """Tipo fixado para uma coluna: inteiros e booleanos na versão que aceita nulos."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "Int64"
+    return dtype
+
+
+def _inteiros_json(df: pd.DataFrame, lote: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+    """Colunas de inteiros JSON com nulos voltam a ``Int64`` (o pandas as lê como float).
+
+    Sem isso o tipo dependeria de o primeiro nulo cair ou não no primeiro
+    lote: ``1,0`` num caso e ``1`` no outro.
+    """
+    for coluna in df.columns:
+        if df[coluna].dtype.kind == "f" and df[coluna].hasnans:
+            valores = [registro.get(coluna) for registro in lote]
+            if pd.api.types.infer_dtype(valores, skipna=True) == "integer":
+                df[coluna] = pd.array(valores, dtype="Int64")
+    return df
+
+
+def _fixar_tipos(df: pd.DataFrame, tipos: Dict[str, Any]) -> pd.DataFrame:
+    """Converte ``df`` aos ``tipos`` já fixados; colunas novas fixam o tipo inferido."""
+    for coluna in df.columns:
+        nome = str(coluna)
+        if nome not in tipos:
+            if df[coluna].isna().all():
+                continue  # sem valores: o tipo é fixado pelo primeiro lote que os tiver
+            tipos[nome] = _tipo_estavel(df[coluna].dtype)
+        if df[coluna].dtype != tipos[nome]:
+            try:
+                df[coluna] = df[coluna].astype(tipos[nome])
+            except (TypeError, ValueError):
+                logger.warning("Coluna %s com valores fora do tipo %s; gravada como veio", nome, tipos[nome])
+    return df
+
+
+def gravar_registros_zip(
+    registros: Iterable[Dict[str, Any]],
+    zip_path: Path,
+    csv_name: str,
+    sep: str = ";",
+    encoding: str = "utf-8-sig",
+    transformar: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    colunas_vazio: Sequence[str] = (),
+    tamanho_lote: int = TAMANHO_LOTE,
+    colunas: Optional[Sequence[str]] = None,
+    dtypes: Optional[Mapping[str, Any]] = None,
+) -> int:
+    """Grava ``registros`` em lotes no membro ``csv_name`` de ``zip_path``.
+
+    Com ``colunas``, o CSV tem exatamente essas colunas nessa ordem (chaves a
+    mais são descartadas com aviso) e cada lote vai direto para o ZIP. Sem
+    ``colunas``, o cabeçalho é a união das chaves de todos os lotes (após
+    ``transformar``), na ordem em que aparecem; os lotes passam por arquivos
+    Arrow temporários até o fim da leitura, mantendo um lote por vez em
+    memória.
+
+    O tipo de cada coluna vem de ``dtypes`` ou é o inferido no primeiro lote
+    com valores; inteiros JSON são sempre ``Int64``, com ou sem nulos, de
+    modo que o mesmo valor sai igual em todos os lotes. Sem registros, grava apenas o cabeçalho
+    ``colunas_vazio``. Retorna o número de linhas gravadas.
+    """
+    from src.core.memory import read_frame, write_frame
+
+    zip_path = Path(zip_path)
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    tipos: Dict[str, Any] = {str(nome): tipo for nome, tipo in (dtypes or {}).items()}
+    esquema = [str(c) for c in colunas] if colunas is not None else None
+
+    def lotes() -> Iterator[pd.DataFrame]:
+        pendentes = iter(registros)
+        while True:
+            lote = list(islice(pendentes, tamanho_lote))
+            if not lote:
+                return
+            df = _inteiros_json(pd.DataFrame(lote), lote)
+            if transformar is not None:
+                df = transformar(df)
+            yield _fixar_tipos(df, tipos)
+
+    # Grava em arquivo parcial: falha no meio do download não deixa ZIP truncado
+    parcial = zip_path.with_name(zip_path.name + ".parcial")
+    try:
+        with zipfile.ZipFile(parcial, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            with zf.open(csv_name, "w", force_zip64=True) as destino:
+                # Usa vírgula como separador decimal em todos os CSVs
+                escritor = EscritorCSV(destino, sep=sep, encoding=encoding, decimal=",")
+                if esquema is not None:
+                    for df in lotes():
+                        extras = [c for c in df.columns if str(c) not in esquema]
+                        if extras:
+                            logger.warning("Colunas fora do esquema ignoradas: %s", extras)
+                        escritor.escrever(df.reindex(columns=esquema))
+                else:
+                    with tempfile.TemporaryDirectory(prefix="lotes_", dir=zip_path.parent) as pasta:
+                        uniao: List[str] = []
+                        partes: List[Path] = []
+                        for df in lotes():
+                            uniao.extend(str(c) for c in df.columns if str(c) not in uniao)
+                            partes.append(write_frame(df, Path(pasta) / f"{len(partes):05d}.arrow"))
+                        for parte in partes:
+                            escritor.escrever(read_frame(parte).reindex(columns=uniao))
+                if not escritor.colunas:
+                    vazio = pd.DataFrame(columns=list(colunas_vazio))
+                    if transformar is not None:
+                        vazio = transformar(vazio)
+                    escritor.escrever(vazio if esquema is None else vazio.reindex(columns=esquema))
+    except BaseException:
+        parcial.unlink(missing_ok=True)
+        raise
+    os.replace(parcial, zip_path)
+
+    registrar_dataset(zip_path, {csv_name: ResumoMembro(escritor.colunas, escritor.linhas)})
+    return escritor.linhas
+
+
+__all__ = [
+    "fechar_sessoes",
+    "gravar_registros_zip",
+    "iterar_array_json",
+    "obter_sessao",
+    "paginas_prefetch",
+]
@@ -0,0 +1,326 @@
+"""Espera por email via IMAP IDLE (RFC 2177) para as extrações VIC/Tabelionato.
+
+Em vez de buscar uma vez e desistir quando o email do dia ainda não chegou,
+``EsperaEmail.aguardar`` mantém uma sessão IDLE aberta: o servidor avisa
+(``* N EXISTS``) assim que uma mensagem entra na pasta, a busca é refeita
+e, se a mensagem casar com o remetente e as palavras do assunto, a espera
+termina e o chamador segue direto para o download do anexo.
+
+* keepalive: o IDLE é encerrado (``DONE``) e reaberto a cada
+  ``keepalive`` segundos, abaixo dos 30 minutos após os quais servidores
+  derrubam sessões ociosas;
+* reconexão: quedas de conexão/erros IMAP reabrem a sessão com backoff
+  exponencial (limitado por ``backoff_maximo``) até o prazo;
+* servidores sem ``IDLE`` na CAPABILITY caem para NOOP + busca a cada
+  ``intervalo_poll`` segundos.
+
+Só mensagens com data a partir de ``desde`` (padrão: início do dia) contam,
+de modo que o email do dia que já estava na caixa encerra a espera na hora.
+"""
+
+from __future__ import annotations
+
+import imaplib
+import logging
+import re
+import select
+import socket
+import ssl
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email import message_from_bytes
+from email.header import decode_header
+from email.utils import parsedate_to_datetime
+from typing import Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_PADRAO = 25 * 60
+CABECALHOS = "(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])"
+# Falhas de autenticação/pasta (``IMAP4.error``) não são retentadas
+_ERROS_CONEXAO = (OSError, EOFError, imaplib.IMAP4.abort)
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas, sem acentos e com espaços colapsados (comparação de assuntos)."""
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(ch for ch in decomposto if not unicodedata.combining(ch))
+    return re.sub(r"\s+", " ", sem_acentos).strip().lower()
+
+
+def decodificar(valor: Optional[str]) -> str:
+    """Decodifica um cabeçalho MIME (``=?utf-8?...?=``)."""
+    if not valor:
+        return ""
+    partes = []
+    for parte, codificacao in decode_header(valor):
+        if isinstance(parte, bytes):
+            partes.append(parte.decode(codificacao or "utf-8", errors="replace"))
+        else:
+            partes.append(parte)
+    return "".join(partes)
+
+
+@dataclass
+class CriterioEmail:
+    """Remetente e palavras obrigatórias no assunto (comparadas normalizadas)."""
+
+    remetente: str = ""
+    tokens_assunto: Sequence[str] = ()
+
+    def busca_imap(self, desde: Optional[datetime] = None) -> str:
+        criterios = []
+        if self.remetente:
+            criterios.append(f'FROM "{self.remetente}"')
+        if desde is not None:
+            criterios.append(f'SINCE "{desde:%d-%b-%Y}"')
+        return f"({' '.join(criterios)})" if criterios else "ALL"
+
+    def corresponde(self, remetente: str, assunto: str) -> bool:
+        if self.remetente and normalizar(self.remetente) not in normalizar(remetente):
+            return False
+        assunto_normalizado = normalizar(assunto)
+        return all(normalizar(token) in assunto_normalizado for token in self.tokens_assunto if token.strip())
+
+
+@dataclass
+class EmailEncontrado:
+    """Mensagem que encerrou a espera (``id`` é o número de sequência na pasta)."""
+
+    id: str
+    remetente: str
+    assunto: str
+    data: Optional[datetime]
+    espera_segundos: float = 0.0
+    reconexoes: int = 0
+
+
+def conectar_imap(
+    servidor: str,
+    usuario: str,
+    senha: str,
+    porta: Optional[int] = None,
+    usar_ssl: bool = True,
+    timeout: float = 60.0,
+) -> imaplib.IMAP4:
+    """Abre e autentica uma conexão IMAP (SSL por padrão; texto puro para servidores locais)."""
+    if usar_ssl:
+        conexao: imaplib.IMAP4 = imaplib.IMAP4_SSL(servidor, porta or 993, timeout=timeout)
+    else:
+        conexao = imaplib.IMAP4(servidor, porta or 143, timeout=timeout)
+    conexao.login(usuario, senha)
+    return conexao
+
+
+class _LeitorLinhas:
+    """Lê linhas do socket com prazo durante o IDLE.
+
+    O ``file`` do ``imaplib`` fica inutilizável após um timeout de leitura,
+    então as respostas do IDLE são lidas direto do socket (com ``select`` e
+    ``pending()`` para SSL).
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.buffer = b""
+
+    def linha(self, timeout: float) -> Optional[bytes]:
+        limite = time.monotonic() + max(0.0, timeout)
+        while b"\n" not in self.buffer:
+            restante = limite - time.monotonic()
+            pendente = isinstance(self.sock, ssl.SSLSocket) and self.sock.pending() > 0
+            if not pendente:
+                if restante <= 0:
+                    return None
+                prontos, _, _ = select.select([self.sock], [], [], restante)
+                if not prontos:
+                    return None
+            bloco = self.sock.recv(4096)
+            if not bloco:
+                raise EOFError("Conexão IMAP encerrada pelo servidor")
+            self.buffer += bloco
+        linha, _, self.buffer = self.buffer.partition(b"\n")
+        return linha.rstrip(b"\r")
+
+
+@dataclass
+class EsperaEmail:
+    """
+    Aguarda a chegada de um email com IMAP IDLE.
+
+    Args:
+        conectar: Abre uma conexão autenticada (chamado a cada (re)conexão)
+        criterio: Remetente/palavras do assunto da mensagem esperada
+        pasta: Pasta monitorada
+        keepalive: Segundos máximos de cada ciclo IDLE antes de renová-lo
+        intervalo_poll: Intervalo de NOOP + busca sem suporte a IDLE
+        backoff_maximo: Espera máxima entre tentativas de reconexão
+    """
+
+    conectar: Callable[[], imaplib.IMAP4]
+    criterio: CriterioEmail
+    pasta: str = "INBOX"
+    keepalive: float = KEEPALIVE_PADRAO
+    intervalo_poll: float = 60.0
+    backoff_maximo: float = 300.0
+    _sequencia: int = field(default=0, init=False, repr=False)
+
+    def aguardar(self, prazo_segundos: float, desde: Optional[datetime] = None) -> Optional[EmailEncontrado]:
+        """Bloqueia até chegar uma mensagem do critério (retorna ``None`` no prazo)."""
+        if desde is None:
+            desde = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        inicio = time.monotonic()
+        limite = inicio + prazo_segundos
+        reconexoes = falhas = 0
+        logger.info(
+            "Aguardando email de '%s' (assunto com: %s) por até %.0f min",
+            self.criterio.remetente or "*",
+            ", ".join(self.criterio.tokens_assunto) or "*",
+            prazo_segundos / 60,
+        )
+        while True:
+            conexao = None
+            try:
+                conexao = self.conectar()
+                conexao.select(self.pasta)
+                falhas = 0
+                encontrado = self._sessao(conexao, limite, desde)
+                if encontrado is not None:
+                    encontrado.espera_segundos = time.monotonic() - inicio
+                    encontrado.reconexoes = reconexoes
+                    logger.info(
+                        "Email recebido após %.1fs: %s", encontrado.espera_segundos, encontrado.assunto
+                    )
+                return encontrado
+            except _ERROS_CONEXAO as exc:
+                falhas += 1
+                espera = min(self.backoff_maximo, 2.0 ** (falhas - 1), max(0.0, limite - time.monotonic()))
+                logger.warning("Sessão IMAP interrompida (%s); reconectando em %.0fs", exc, espera)
+                if espera <= 0:
+                    return None
+                time.sleep(espera)
+                reconexoes += 1
+            finally:
+                if conexao is not None:
+                    _encerrar(conexao)
+
+    # ------------------------------------------------------------------
+    def _sessao(self, conexao: imaplib.IMAP4, limite: float, desde: datetime) -> Optional[EmailEncontrado]:
+        suporta_idle = "IDLE" in conexao.capabilities
+        if not suporta_idle:
+            logger.info("Servidor sem IDLE; verificando a cada %.0fs", self.intervalo_poll)
+        while True:
+            encontrado = self._buscar(conexao, desde)
+            if encontrado is not None:
+                return encontrado
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                logger.warning("Prazo de espera esgotado sem o email esperado")
+                return None
+            if suporta_idle:
+                self._idle(conexao, min(restante, self.keepalive))
+            else:
+                time.sleep(min(restante, self.intervalo_poll))
+                conexao.noop()
+
+    def _idle(self, conexao: imaplib.IMAP4, duracao: float) -> bool:
+        """Um ciclo IDLE; retorna ``True`` se o servidor avisou novidades na pasta."""
+        self._sequencia += 1
+        tag = f"IDLE{self._sequencia:04d}".encode("ascii")
+        leitor = _LeitorLinhas(conexao.sock)
+        conexao.send(tag + b" IDLE\r\n")
+        resposta = leitor.linha(conexao.sock.gettimeout() or 60.0)
+        if resposta is None or not resposta.startswith(b"+"):
+            raise imaplib.IMAP4.abort(f"IDLE recusado: {resposta!r}")
+
+        novidade = False
+        limite = time.monotonic() + duracao
+        while not novidade:
+            linha = leitor.linha(limite - time.monotonic())
+            if linha is None:
+                break  # keepalive/prazo: renova o IDLE
+            if linha.startswith(b"* BYE"):
+                raise imaplib.IMAP4.abort(linha.decode("ascii", "replace"))
+            novidade = linha.startswith(b"*") and linha.upper().endswith((b"EXISTS", b"RECENT"))
+
+        conexao.send(b"DONE\r\n")
+        while True:
+            linha = leitor.linha(conexao.sock.gettimeout() or 60.0)
+            if linha is None:
+                raise imaplib.IMAP4.abort("Sem resposta ao DONE do IDLE")
+            if linha.startswith(tag):
+                return novidade
+
+    def _buscar(self, conexao: imaplib.IMAP4, desde: datetime) -> Optional[EmailEncontrado]:
+        status, dados = conexao.search(None, self.criterio.busca_imap(desde))
+        if status != "OK" or not dados or not dados[0]:
+            return None
+        for msg_id in reversed(dados[0].split()):
+            status, partes = conexao.fetch(msg_id, CABECALHOS)
+            if status != "OK":
+                continue
+            bruto = next((parte[1] for parte in partes if isinstance(parte, tuple)), b"")
+            cabecalhos = message_from_bytes(bruto)
+            remetente = decodificar(cabecalhos.get("From"))
+            assunto = decodificar(cabecalhos.get("Subject"))
+            data = _data(cabecalhos.get("Date"))
+            if data is not None and data < _com_fuso(desde):
+                continue
+            if self.criterio.corresponde(remetente, assunto):
+                return EmailEncontrado(msg_id.decode("ascii"), remetente, assunto, data)
+        return None
+
+
+def _data(valor: Optional[str]) -> Optional[datetime]:
+    try:
+        return _com_fuso(parsedate_to_datetime(valor)) if valor else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _com_fuso(data: datetime) -> datetime:
+    return data if data.tzinfo else data.astimezone(timezone.utc)
+
+
+def _encerrar(conexao: imaplib.IMAP4) -> None:
+    try:
+        conexao.logout()
+    except Exception:
+        pass
+
+
+def aguardar_email(
+    servidor: str,
+    usuario: str,
+    senha: str,
+    remetente: str = "",
+    tokens_assunto: Sequence[str] = (),
+    prazo_minutos: float = 60.0,
+    porta: Optional[int] = None,
+    usar_ssl: bool = True,
+    pasta: str = "INBOX",
+    desde: Optional[datetime] = None,
+    keepalive: float = KEEPALIVE_PADRAO,
+) -> Optional[EmailEncontrado]:
+    """Atalho: conecta em ``servidor`` e aguarda o email (``None`` se o prazo esgotar)."""
+    espera = EsperaEmail(
+        conectar=lambda: conectar_imap(servidor, usuario, senha, porta=porta, usar_ssl=usar_ssl),
+        criterio=CriterioEmail(remetente=remetente, tokens_assunto=list(tokens_assunto)),
+        pasta=pasta,
+        keepalive=keepalive,
+    )
+    return espera.aguardar(prazo_minutos * 60, desde=desde)
+
+
+__all__: List[str] = [
+    "CriterioEmail",
+    "EmailEncontrado",
+    "EsperaEmail",
+    "aguardar_email",
+    "conectar_imap",
+    "normalizar",
+]
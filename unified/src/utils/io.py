@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 
+from src.io.csv_codec import EscritorCSV, ler_csv
+from src.utils.catalog import ResumoMembro, registrar_dataset, resolver_mais_recente
+
+logger = logging.getLogger(__name__)
+
 
 def ensure_directory(path: Path) -> Path:
     """Create directory hierarchy if needed and return the path."""
@@ -13,7 +19,13 @@ def ensure_directory(path: Path) -> Path:
     return path
 
 
-def read_csv_or_zip(path: Path, sep: str = ',', encoding: str = 'utf-8-sig') -> pd.DataFrame:
+def read_csv_or_zip(
+    path: Path,
+    sep: str = ',',
+    encoding: str = 'utf-8-sig',
+    usecols: Optional[Union[Sequence[str], Callable[[str], bool]]] = None,
+) -> pd.DataFrame:
+    """Read a CSV (or the first member of a ZIP), optionally only ``usecols``."""
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(path)
@@ -25,31 +37,98 @@ def read_csv_or_zip(path: Path, sep: str = ',', encoding: str = 'utf-8-sig') ->
             if not members:
                 raise ValueError(f"ZIP vazio: {path}")
             with zf.open(members[0]) as buffer:
-                return pd.read_csv(buffer, sep=sep, encoding=encoding, dtype=str)
-    return pd.read_csv(path, sep=sep, encoding=encoding, dtype=str)
+                return ler_csv(buffer, sep=sep, encoding=encoding, usecols=usecols)
+    return ler_csv(path, sep=sep, encoding=encoding, usecols=usecols)
+
+
+# Linhas por bloco ao gravar CSVs em streaming
+CHUNK_ROWS = 100_000
+
+
+def _iter_chunks(frames: Mapping[str, pd.DataFrame], name: str) -> Iterator[pd.DataFrame]:
+    """Blocos de linhas do membro ``name``; grupos preguiçosos não são materializados inteiros."""
+    chunker = getattr(frames, 'iter_chunks', None)
+    if chunker is not None:
+        yield from chunker(name, CHUNK_ROWS)
+        return
+    df = frames[name]
+    for start in range(0, max(len(df), 1), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS]
 
 
 def write_csv_to_zip(
-    dataframes: Dict[str, pd.DataFrame],
+    dataframes: Mapping[str, pd.DataFrame],
     zip_path: Path,
     sep: str = ',',
     encoding: str = 'utf-8-sig',
+    inputs: Sequence[Path] = (),
+    decimal: str = ',',
+    estagio: Optional[str] = None,
 ) -> Path:
-    import io
+    """Grava cada DataFrame como CSV no ZIP, em blocos direto no membro.
+
+    Aceita também a visão ``SplitResult.splits``: cada grupo é lido em
+    blocos do DataFrame de origem, sem cópia completa nem texto CSV inteiro
+    em memória. Nenhum CSV temporário é gravado em disco.
+    """
     import zipfile
 
     zip_path = Path(zip_path)
     zip_path.parent.mkdir(parents=True, exist_ok=True)
 
+    resumo: Dict[str, ResumoMembro] = {}
     with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
-        for name, df in dataframes.items():
-            buffer = io.StringIO()
-            # Usa vírgula como separador decimal em todos os CSVs
-            df.to_csv(buffer, index=False, sep=sep, decimal=',')
-            zf.writestr(name, buffer.getvalue().encode(encoding))
+        for name in dataframes:
+            with zf.open(name, 'w', force_zip64=True) as destino:
+                escritor = EscritorCSV(destino, sep=sep, encoding=encoding, decimal=decimal)
+                for chunk in _iter_chunks(dataframes, name):
+                    escritor.escrever(chunk)
+            resumo[name] = ResumoMembro(escritor.colunas, escritor.linhas)
+    registrar_dataset(zip_path, resumo, entradas=inputs, estagio=estagio)
     return zip_path
 
 
+def write_partitioned_zips(
+    df: pd.DataFrame,
+    column: str,
+    targets: Mapping[Any, Path],
+    sep: str = ',',
+    encoding: str = 'utf-8-sig',
+    decimal: str = ',',
+    drop_column: bool = True,
+    estagio: Optional[str] = None,
+) -> Dict[Any, Path]:
+    """Grava cada partição de ``df`` por ``column`` no seu próprio ZIP.
+
+    As linhas são agrupadas uma única vez (posições por valor) e cada
+    partição é transmitida em blocos para o membro ``<nome do zip>.csv``.
+    Valores sem destino em ``targets`` e partições vazias não geram arquivo.
+
+    Returns:
+        ``valor -> caminho do ZIP`` das partições gravadas, na ordem de ``targets``.
+    """
+    from src.core.base import SplitResult
+
+    posicoes = df.groupby(column, sort=False).indices if column in df.columns else {}
+    fonte = df.drop(columns=[column]) if drop_column and column in df.columns else df
+    particoes = SplitResult.from_positions(
+        fonte, {valor: posicoes[valor] for valor in targets if len(posicoes.get(valor, ()))}
+    )
+
+    gravados: Dict[Any, Path] = {}
+    for valor in particoes.names:
+        destino = Path(targets[valor])
+        gravados[valor] = write_csv_to_zip(
+            particoes.rename({valor: f"{destino.stem}.csv"}).splits,
+            destino,
+            sep=sep,
+            encoding=encoding,
+            decimal=decimal,
+            estagio=estagio,
+        )
+    return gravados
+
+
 @dataclass(slots=True)
 class DatasetIO:
     """High-level helpers for reading and writing project datasets."""
@@ -57,23 +136,49 @@ class DatasetIO:
     separator: str
     encoding: str
 
-    def read(self, path: Path) -> pd.DataFrame:
+    def read(self, path: Path, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Read a dataset; ``columns`` limits parsing to those headers.
+
+        If any of ``columns`` is missing from the file (renamed or
+        differently spelled header), the whole file is read instead, so
+        the caller's own column checks see the real layout.
+        """
+        if columns is None:
+            return read_csv_or_zip(path, sep=self.separator, encoding=self.encoding)
+        wanted = frozenset(columns)
+        df = read_csv_or_zip(
+            path,
+            sep=self.separator,
+            encoding=self.encoding,
+            usecols=lambda name: str(name).strip() in wanted,
+        )
+        missing = wanted - {str(name).strip() for name in df.columns}
+        if not missing:
+            return df
+        logger.warning(
+            "Colunas %s ausentes em %s; lendo todas as colunas", sorted(missing), Path(path).name
+        )
         return read_csv_or_zip(path, sep=self.separator, encoding=self.encoding)
 
-    def write_zip(self, frames: Dict[str, pd.DataFrame], path: Path) -> Path:
-        return write_csv_to_zip(frames, path, sep=self.separator, encoding=self.encoding)
+    def write_zip(
+        self,
+        frames: Mapping[str, pd.DataFrame],
+        path: Path,
+        inputs: Sequence[Path] = (),
+    ) -> Path:
+        return write_csv_to_zip(
+            frames, path, sep=self.separator, encoding=self.encoding, inputs=inputs
+        )
 
     def split_by_mask(
         self,
         df: pd.DataFrame,
         mask: pd.Series,
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Return (match, no_match) copies given a boolean mask."""
-        return df[mask].copy(), df[~mask].copy()
+        """Return (match, no_match) given a boolean mask (boolean indexing already copies)."""
+        return df[mask], df[~mask]
 
     @staticmethod
     def latest_file(directory: Path, pattern: str) -> Path:
-        candidates = sorted(directory.glob(pattern), key=lambda item: item.stat().st_mtime, reverse=True)
-        if not candidates:
-            raise FileNotFoundError(f"Nenhum arquivo correspondente a {pattern} em {directory}")
-        return candidates[0]
+        """Resolve the newest file via the dataset catalog (glob fallback)."""
+        return resolver_mais_recente(directory, pattern)
@@ -0,0 +1,321 @@
+"""Logging fora da thread de processamento, com sink JSON-lines.
+
+Os loggers do projeto (``TabelionatoLogger``, ``get_logger`` de
+``src.utils.logger`` e o CLI) recebem um ``QueueHandler``: o registro é
+enfileirado na thread chamadora e um ``QueueListener`` grava o arquivo
+texto e o arquivo ``.jsonl`` em segundo plano. O console continua
+síncrono, na ordem dos ``print`` do fluxo. O sink
+JSON-lines tem um objeto por linha (horário, nível, logger, mensagem,
+origem, processo, execução e campos passados em ``extra=``), pronto para
+análise das execuções.
+
+Enquanto a sessão está ativa, ``PIPELINE_LOG_JSONL`` e ``PIPELINE_RUN_ID``
+ficam no ambiente: etapas executadas em subprocesso os herdam e gravam no
+mesmo arquivo ``.jsonl`` (modo append, uma linha por escrita) com o mesmo
+identificador de execução. Ao encerrar a sessão o ambiente anterior é
+restaurado. Execuções concorrentes no mesmo processo (jobs do daemon)
+usam ``escopo_execucao(id)``: o identificador vale para os registros da
+thread que o definiu.
+
+Mensagens continuam no estilo ``%``: o texto só é montado se o nível
+estiver habilitado. Para argumentos caros (ex.: ``list(df.columns)``), use
+``preguicoso(list, df.columns)``, avaliado apenas nesse caso.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import uuid
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Union
+
+VARIAVEL_JSONL = "PIPELINE_LOG_JSONL"
+VARIAVEL_EXECUCAO = "PIPELINE_RUN_ID"
+
+# Atributos padrão do LogRecord (o restante veio de ``extra=``)
+_ATRIBUTOS_PADRAO = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_sessoes: Dict[str, "SessaoLogging"] = {}
+
+
+class Preguicoso:
+    """Argumento de log avaliado só quando a mensagem é formatada."""
+
+    __slots__ = ("_funcao", "_args")
+
+    def __init__(self, funcao: Callable[..., Any], *args: Any) -> None:
+        self._funcao = funcao
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._funcao(*self._args))
+
+    __repr__ = __str__
+
+
+def preguicoso(funcao: Callable[..., Any], *args: Any) -> Preguicoso:
+    """Atalho para ``Preguicoso(funcao, *args)``."""
+    return Preguicoso(funcao, *args)
+
+
+def novo_id_execucao() -> str:
+    """Identificador novo de execução (``AAAAMMDD_HHMMSS_<hex>``)."""
+    return f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+
+
+_id_processo = novo_id_execucao()
+_execucao_atual: ContextVar[Optional[str]] = ContextVar("execucao_atual", default=None)
+
+
+def id_execucao() -> str:
+    """Identificador da execução atual: o do ``escopo_execucao`` ativo, senão o do ambiente."""
+    return _execucao_atual.get() or os.environ.get(VARIAVEL_EXECUCAO) or _id_processo
+
+
+@contextmanager
+def escopo_execucao(execucao: str) -> Iterator[str]:
+    """Define o identificador de execução do contexto atual (thread/tarefa) dentro do bloco."""
+    token = _execucao_atual.set(execucao)
+    try:
+        yield execucao
+    finally:
+        _execucao_atual.reset(token)
+
+
+@contextmanager
+def variaveis_ambiente(**valores: Optional[str]) -> Iterator[None]:
+    """Define variáveis de ambiente (``None`` remove) e restaura as anteriores ao sair."""
+    anteriores = {nome: os.environ.get(nome) for nome in valores}
+    try:
+        for nome, valor in valores.items():
+            if valor is None:
+                os.environ.pop(nome, None)
+            else:
+                os.environ[nome] = valor
+        yield
+    finally:
+        for nome, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(nome, None)
+            else:
+                os.environ[nome] = valor
+
+
+class FormatterJSON(logging.Formatter):
+    """Um objeto JSON por linha."""
+
+    def __init__(self, execucao: Optional[str] = None) -> None:
+        super().__init__()
+        self.execucao = execucao
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+            "modulo": record.module,
+            "funcao": record.funcName,
+            "linha": record.lineno,
+            "pid": record.process,
+            "thread": record.threadName,
+            "execucao": getattr(record, "execucao", None) or self.execucao or id_execucao(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith("_"):
+                dados[chave] = valor
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            dados["excecao"] = record.exc_text
+        if record.stack_info:
+            dados["pilha"] = record.stack_info
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class _HandlerFila(QueueHandler):
+    """Enfileira o registro com a mensagem já resolvida.
+
+    Diferente do ``QueueHandler`` padrão, não aplica o formatter aqui: a
+    mensagem e o traceback ficam em campos separados para o sink JSON, e o
+    formato de cada destino é aplicado na thread do listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # O listener formata em outra thread: fixa aqui a execução de quem registrou
+        if _execucao_atual.get():
+            record.execucao = _execucao_atual.get()
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SessaoLogging:
+    """Handlers de arquivo atendidos por um ``QueueListener``; console direto no logger."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        handlers: List[logging.Handler],
+        console: Optional[logging.Handler] = None,
+        ambiente: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        self.logger = logger
+        self.handlers = handlers
+        self.console = console
+        self.ambiente = ambiente or {}
+        self.fila: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.handler_fila = _HandlerFila(self.fila)
+        self.listener = QueueListener(self.fila, *handlers, respect_handler_level=True)
+        self.arquivo_jsonl: Optional[Path] = None
+        self._pilha = ExitStack()
+        self._ativa = False
+
+    def iniciar(self) -> "SessaoLogging":
+        self._pilha.enter_context(variaveis_ambiente(**self.ambiente))
+        if self.console is not None:
+            self.logger.addHandler(self.console)
+        if self.handlers:
+            self.logger.addHandler(self.handler_fila)
+            self.listener.start()
+        self._ativa = True
+        return self
+
+    def parar(self) -> None:
+        """Esvazia a fila, fecha os arquivos e restaura o ambiente (idempotente)."""
+        if not self._ativa:
+            return
+        self._ativa = False
+        if self.console is not None:
+            self.logger.removeHandler(self.console)
+            self.console.flush()
+        if self.handlers:
+            self.logger.removeHandler(self.handler_fila)
+            self.listener.stop()
+        self._pilha.close()
+        for handler in self.handlers:
+            try:
+                handler.close()
+            except Exception:  # pragma: no cover - fechamento nunca interrompe o fluxo
+                pass
+        if _sessoes.get(self.logger.name) is self:
+            del _sessoes[self.logger.name]
+
+    def __enter__(self) -> "SessaoLogging":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.parar()
+
+
+def iniciar_logging(
+    logger: Union[str, logging.Logger, None] = None,
+    nivel: Union[int, str] = logging.INFO,
+    *,
+    console: bool = True,
+    formato_console: Optional[logging.Formatter] = None,
+    saida_console: Optional[IO[str]] = None,
+    arquivo_texto: Optional[Path] = None,
+    formato_arquivo: Optional[logging.Formatter] = None,
+    encoding_arquivo: str = "utf-8",
+    arquivo_jsonl: Optional[Path] = None,
+    nivel_destinos: Union[int, str, None] = None,
+    propagar: bool = False,
+) -> SessaoLogging:
+    """Configura ``logger`` (raiz por padrão) para gravar via fila.
+
+    Substitui os handlers atuais do logger. ``nivel_destinos`` filtra os
+    destinos mesmo que loggers filhos aceitem níveis menores.
+    ``arquivo_jsonl`` assume o valor de ``PIPELINE_LOG_JSONL`` quando
+    omitido. Ele e o identificador da execução são exportados no ambiente
+    para os subprocessos até ``parar()`` (ou o fim do bloco ``with``).
+    """
+    alvo = logger if isinstance(logger, logging.Logger) else logging.getLogger(logger)
+    anterior = _sessoes.get(alvo.name)
+    if anterior is not None:
+        anterior.parar()
+    for handler in list(alvo.handlers):
+        alvo.removeHandler(handler)
+        try:
+            handler.close()
+        except Exception:  # pragma: no cover
+            pass
+
+    handlers: List[logging.Handler] = []
+    handler_console: Optional[logging.Handler] = None
+    if console:
+        handler_console = logging.StreamHandler(saida_console or sys.stdout)
+        handler_console.setFormatter(formato_console or logging.Formatter("%(message)s"))
+    execucao = id_execucao()
+    ambiente: Dict[str, Optional[str]] = {VARIAVEL_EXECUCAO: execucao}
+    if arquivo_texto is not None:
+        Path(arquivo_texto).parent.mkdir(parents=True, exist_ok=True)
+        handler_texto = logging.FileHandler(arquivo_texto, mode="a", encoding=encoding_arquivo)
+        handler_texto.setFormatter(
+            formato_arquivo or logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+        handlers.append(handler_texto)
+
+    caminho_jsonl = arquivo_jsonl or os.environ.get(VARIAVEL_JSONL) or None
+    if caminho_jsonl:
+        caminho_jsonl = Path(caminho_jsonl).resolve()
+        caminho_jsonl.parent.mkdir(parents=True, exist_ok=True)
+        handler_jsonl = logging.FileHandler(caminho_jsonl, mode="a", encoding="utf-8")
+        handler_jsonl.setFormatter(FormatterJSON(execucao))
+        handlers.append(handler_jsonl)
+        ambiente[VARIAVEL_JSONL] = str(caminho_jsonl)
+    if nivel_destinos is not None:
+        for handler in [*handlers, *([handler_console] if handler_console else [])]:
+            handler.setLevel(nivel_destinos)
+
+    alvo.setLevel(nivel.upper() if isinstance(nivel, str) else nivel)
+    alvo.propagate = propagar
+
+    sessao = SessaoLogging(alvo, handlers, console=handler_console, ambiente=ambiente)
+    sessao.arquivo_jsonl = caminho_jsonl
+    _sessoes[alvo.name] = sessao
+    return sessao.iniciar()
+
+
+def encerrar_logging() -> None:
+    """Esvazia as filas e fecha todos os destinos (registrado no ``atexit``)."""
+    for sessao in list(_sessoes.values()):
+        sessao.parar()
+
+
+atexit.register(encerrar_logging)
+
+
+__all__ = [
+    "FormatterJSON",
+    "Preguicoso",
+    "SessaoLogging",
+    "VARIAVEL_EXECUCAO",
+    "VARIAVEL_JSONL",
+    "encerrar_logging",
+    "escopo_execucao",
+    "id_execucao",
+    "iniciar_logging",
+    "novo_id_execucao",
+    "preguicoso",
+    "variaveis_ambiente",
+]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import logging
+import sys
 from pathlib import Path
 from typing import Any, Mapping
 
+from src.utils.log_estruturado import iniciar_logging
+
 
 def _resolve_level(value: Any, default: int) -> int:
     """Return a logging level coerced from config."""
@@ -21,7 +24,12 @@ def get_logger(
     log_dir: Path,
     logging_cfg: Mapping[str, Any] | None = None,
 ) -> logging.Logger:
-    """Build a configured logger honoring project logging settings."""
+    """Build a configured logger honoring project logging settings.
+
+    Console output is written synchronously, in order with ``print``; file
+    output goes through a queue listener thread. When the file handler is
+    enabled a JSON-lines log (``<filename>.jsonl``) is written next to it.
+    """
 
     log_dir.mkdir(parents=True, exist_ok=True)
     logger = logging.getLogger(name)
@@ -34,27 +42,34 @@ def get_logger(
     message_format = logging_cfg.get("format", "%(asctime)s - %(levelname)s - %(message)s")
     date_format = logging_cfg.get("date_format")
 
-    logger.setLevel(level)
-    logger.propagate = False
-
     console_cfg = logging_cfg.get("console_handler", {}) if isinstance(logging_cfg, Mapping) else {}
     console_enabled = bool(console_cfg.get("enabled", True)) if isinstance(console_cfg, Mapping) else True
+    console_formatter = None
     if console_enabled:
         console_format = console_cfg.get("format", "%(message)s") if isinstance(console_cfg, Mapping) else "%(message)s"
         console_date_format = console_cfg.get("date_format") if isinstance(console_cfg, Mapping) else None
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter(console_format, datefmt=console_date_format))
-        logger.addHandler(console_handler)
+        console_formatter = logging.Formatter(console_format, datefmt=console_date_format)
 
     file_cfg = logging_cfg.get("file_handler", {}) if isinstance(logging_cfg, Mapping) else {}
     file_enabled = bool(file_cfg.get("enabled", False)) if isinstance(file_cfg, Mapping) else False
+    log_file = None
+    encoding = "utf-8"
     if file_enabled:
         filename = file_cfg.get("filename") if isinstance(file_cfg, Mapping) else None
         if not filename:
             filename = f"{name}.log"
         encoding = file_cfg.get("encoding", "utf-8") if isinstance(file_cfg, Mapping) else "utf-8"
-        file_handler = logging.FileHandler(log_dir / filename, encoding=encoding)
-        file_handler.setFormatter(logging.Formatter(message_format, datefmt=date_format))
-        logger.addHandler(file_handler)
+        log_file = log_dir / filename
 
+    iniciar_logging(
+        logger,
+        level,
+        console=console_enabled,
+        formato_console=console_formatter,
+        saida_console=sys.stderr,
+        arquivo_texto=log_file,
+        formato_arquivo=logging.Formatter(message_format, datefmt=date_format),
+        encoding_arquivo=encoding,
+        arquivo_jsonl=log_file.with_suffix(".jsonl") if log_file is not None else None,
+    )
     return logger
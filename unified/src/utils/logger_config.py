@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import logging
-import sys
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Iterable, Optional
 
+from src.utils.log_estruturado import VARIAVEL_JSONL, iniciar_logging
+
 FILE_LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(message)s"
 CONSOLE_LOG_FORMAT = "%(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -46,28 +48,18 @@ class TabelionatoLogger:
         logs_dir.mkdir(parents=True, exist_ok=True)
         log_file = logs_dir / "tabelionato.log"
 
+        # Console, arquivo texto e JSON-lines gravados pela thread do listener;
+        # etapas em subprocesso herdam o mesmo .jsonl via ambiente.
         logger = logging.getLogger("tabelionato")
-        logger.setLevel(logging.INFO)
-        logger.propagate = False
-
-        if logger.handlers:
-            for handler in logger.handlers:
-                try:
-                    handler.close()
-                except Exception:
-                    pass
-            logger.handlers.clear()
-
-        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(logging.Formatter(FILE_LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
-
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(_ConsoleFormatter(CONSOLE_LOG_FORMAT))
-
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        iniciar_logging(
+            logger,
+            logging.INFO,
+            formato_console=_ConsoleFormatter(CONSOLE_LOG_FORMAT),
+            arquivo_texto=log_file,
+            formato_arquivo=logging.Formatter(FILE_LOG_FORMAT, datefmt=LOG_DATE_FORMAT),
+            arquivo_jsonl=os.environ.get(VARIAVEL_JSONL) or logs_dir / "tabelionato.jsonl",
+            nivel_destinos=logging.INFO,
+        )
 
         logger.info(_HEADER_SEPARATOR)
         logger.info("NOVA SESSAO TABELIONATO - %s", datetime.now().strftime("%d/%m/%Y %H:%M:%S"))
@@ -0,0 +1,172 @@
+"""Execução paralela particionada por documento (CPF/CNPJ) ou CHAVE.
+
+Etapas "row-local" (padronização, validação por linha, geração de
+contatos) são independentes entre clientes. O executor particiona o
+DataFrame por hash da chave informada, processa as partições em um
+``ProcessPoolExecutor`` e recombina o resultado na ordem original das
+linhas, de modo que a saída é idêntica à execução serial.
+
+Regras para a função executada em paralelo:
+
+* deve ser *picklable* (função de módulo ou método de objeto picklable);
+* deve preservar o índice das linhas recebidas (filtros, ``assign``,
+  ``copy``) ou, ao expandir linhas, repetir o índice da linha de origem;
+* operações por chave (ex.: regra de aging misto por protocolo) só são
+  corretas se a partição for feita por essa mesma chave.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Any, Callable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+logger = logging.getLogger(__name__)
+
+Chave = Union[str, Callable[[pd.DataFrame], pd.Series]]
+
+# Textos que ``pd.to_datetime`` ignora ao procurar o primeiro valor
+_TEXTOS_NULOS = frozenset({"", "NaT", "nat", "NAT", "nan", "NaN", "NAN"})
+
+
+def ids_particao(chaves: pd.Series, particoes: int) -> np.ndarray:
+    """Número da partição de cada linha (hash estável entre processos)."""
+    normalizadas = chaves.astype(str).str.strip()
+    hashes = pd.util.hash_pandas_object(normalizadas, index=False).to_numpy()
+    return (hashes % np.uint64(particoes)).astype(np.int64)
+
+
+def formato_datas(serie: pd.Series, dayfirst: bool = False) -> Optional[str]:
+    """Formato de data a fixar antes de particionar ``serie``.
+
+    Sem ``format=``, ``pd.to_datetime`` infere o formato pelo primeiro valor
+    preenchido; em partições cada processo veria outro "primeiro valor"
+    (``03/04/2024`` x ``13/04/2024``) e poderia ler as datas de outra forma.
+    A inferência é feita uma vez na série inteira, como na execução serial,
+    e o resultado é repassado às partições via ``format=``. Retorna
+    ``"mixed"`` quando o primeiro valor não tem formato reconhecível (análise
+    linha a linha, também independente da partição) e ``None`` quando não
+    há texto a converter.
+    """
+    if not (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)):
+        return None
+    for valor in serie.dropna():
+        if isinstance(valor, str) and valor in _TEXTOS_NULOS:
+            continue
+        if not isinstance(valor, str):
+            return "mixed"
+        return guess_datetime_format(valor, dayfirst=dayfirst) or "mixed"
+    return None
+
+
+def _restaurar_ordem(frames: Sequence[pd.DataFrame], indice: pd.Index) -> pd.DataFrame:
+    preenchidos = [frame for frame in frames if not frame.empty] or list(frames[:1])
+    resultado = pd.concat(preenchidos) if len(preenchidos) > 1 else preenchidos[0]
+    resultado = resultado.sort_index(kind="stable")
+    resultado.index = indice[resultado.index.to_numpy(dtype=np.int64)]
+    return resultado
+
+
+def _combinar(resultados: List[Any], indice: pd.Index) -> Any:
+    primeiro = resultados[0]
+    if isinstance(primeiro, pd.DataFrame):
+        return _restaurar_ordem(resultados, indice)
+    if isinstance(primeiro, Mapping):
+        total: dict = {}
+        for parcial in resultados:
+            for nome, valor in parcial.items():
+                total[nome] = total.get(nome, 0) + valor
+        return total
+    if isinstance(primeiro, tuple):
+        return tuple(_combinar(list(partes), indice) for partes in zip(*resultados))
+    return resultados
+
+
+@dataclass
+class ExecutorParticionado:
+    """Executa funções row-local em partições por hash da chave.
+
+    Args:
+        workers: Número de processos (``0``/``None`` = todos os núcleos,
+            ``1`` = execução serial).
+        min_linhas: Abaixo deste volume a execução é serial (o custo de
+            serializar as partições supera o ganho).
+    """
+
+    workers: Optional[int] = 0
+    min_linhas: int = 100_000
+
+    def __post_init__(self) -> None:
+        if not self.workers:
+            self.workers = os.cpu_count() or 1
+
+    def _serial(self, total: int) -> bool:
+        return self.workers <= 1 or total < max(self.min_linhas, 2)
+
+    def executar(
+        self,
+        func: Callable[..., Any],
+        df: pd.DataFrame,
+        chave: Chave,
+        *args: Any,
+    ) -> Any:
+        """Aplica ``func(particao, *args)`` e recombina na ordem original.
+
+        ``func`` pode retornar um DataFrame, um dicionário de contadores
+        (somados entre partições) ou uma tupla desses valores.
+        """
+        if self._serial(len(df)):
+            return func(df, *args)
+
+        if callable(chave):
+            chaves = chave(df)
+        elif chave in df.columns:
+            chaves = df[chave]
+        else:
+            logger.debug("Coluna de particao %s ausente; executando em serie", chave)
+            return func(df, *args)
+
+        indice_original = df.index
+        trabalho = df.set_axis(pd.RangeIndex(len(df)), axis=0)
+        ids = ids_particao(chaves.set_axis(trabalho.index), self.workers)
+        particoes = [trabalho[ids == numero] for numero in range(self.workers)]
+        particoes = [parte for parte in particoes if not parte.empty]
+
+        logger.debug(
+            "Executando %s em %s particoes (%s registros)",
+            getattr(func, "__name__", func),
+            len(particoes),
+            f"{len(df):,}",
+        )
+        with ProcessPoolExecutor(max_workers=len(particoes)) as pool:
+            resultados = list(pool.map(func, particoes, *(repeat(arg) for arg in args)))
+        return _combinar(resultados, indice_original)
+
+
+def criar_executor(config: Optional[Mapping[str, Any]] = None) -> ExecutorParticionado:
+    """Cria o executor a partir de ``execution.workers``/``execution.min_rows``.
+
+    Sem config (scripts Tabelionato), usa ``PARALLEL_WORKERS`` e
+    ``PARALLEL_MIN_ROWS``.
+    """
+    exec_cfg: Mapping[str, Any] = {}
+    if config:
+        exec_cfg = config.get("execution", {}) or {}
+    workers = exec_cfg.get("workers", os.getenv("PARALLEL_WORKERS", 0))
+    min_linhas = exec_cfg.get("min_rows", os.getenv("PARALLEL_MIN_ROWS", 100_000))
+    return ExecutorParticionado(workers=int(workers or 0), min_linhas=int(min_linhas))
+
+
+__all__ = [
+    "ExecutorParticionado",
+    "criar_executor",
+    "formato_datas",
+    "ids_particao",
+]
@@ -61,6 +61,67 @@ WHERE
 ORDER BY dbo.RetornaCPFCNPJ(MoInadimplentesID,1), MoDataVencimento ASC
 """
 
+# Extração por dimensões: movimentações com IDs crus (sem UDF por linha).
+# Nomes/documentos/status são resolvidos pelo cache local de dimensões
+# (src/utils/dimensoes.py), produzindo as mesmas colunas de SQL_MAX/SQL_VIC.
+_FILTRO_MOVIMENTACOES_VIC = """
+WHERE 
+    (MoStatusMovimentacao = 0 OR MoStatusMovimentacao = 1) 
+    AND MoClientesID = 232 
+    AND MoOrigemMovimentacao in ('C', 'I') 
+"""
+
+SQL_MAX_IDS = """
+SELECT DISTINCT
+    MoCampanhasID,
+    MoClientesID,
+    MoInadimplentesID,
+    MoContrato AS 'NUMERO_CONTRATO',
+    MoMatricula AS 'EMPREENDIMENTO',
+    CAST(MoDataCriacaoRegistro AS DATE) AS 'DATA_CADASTRO',
+    MoNumeroDocumento AS 'PARCELA',
+    Movimentacoes_ID AS 'Movimentacoes_ID',
+    MoDataVencimento AS 'VENCIMENTO',
+    MoValorDocumento AS 'VALOR',
+    MoStatusMovimentacao,
+    MoTipoDocumento AS 'TIPO_PARCELA'
+FROM Movimentacoes 
+    INNER JOIN Pessoas ON MoInadimplentesID = Pessoas_ID 
+""" + _FILTRO_MOVIMENTACOES_VIC
+
+SQL_VIC_IDS = """
+SELECT DISTINCT
+    MoCampanhasID,
+    MoClientesID,
+    MoInadimplentesID,
+    MoContrato AS 'NUMERO_CONTRATO',
+    MoMatricula AS 'EMPREENDIMENTO',
+    CAST(MoDataCriacaoRegistro AS DATE) AS 'DATA_CADASTRO',
+    MoNumeroDocumento AS 'PARCELA',
+    MoDataVencimento AS 'VENCIMENTO',
+    MoValorDocumento AS 'VALOR',
+    MoStatusMovimentacao,
+    MoTipoDocumento AS 'TIPO_PARCELA'
+FROM Movimentacoes 
+    INNER JOIN Pessoas ON MoInadimplentesID = Pessoas_ID 
+""" + _FILTRO_MOVIMENTACOES_VIC
+
+# Dimensões: a UDF roda uma vez por ID distinto ({ids} = lista VALUES, até 1000)
+SQL_DIM_PESSOAS = """
+SELECT ids.ID, dbo.RetornaNomeRazaoSocial(ids.ID) AS NOME, dbo.RetornaCPFCNPJ(ids.ID,1) AS DOCUMENTO
+FROM (VALUES {ids}) AS ids(ID)
+"""
+
+SQL_DIM_CAMPANHAS = """
+SELECT ids.ID, dbo.RetornaNomeCampanha(ids.ID,1) AS NOME
+FROM (VALUES {ids}) AS ids(ID)
+"""
+
+SQL_DIM_STATUS = """
+SELECT ids.ID, dbo.RetornaStatusMovimentacao(ids.ID) AS NOME
+FROM (VALUES {ids}) AS ids(ID)
+"""
+
 # Query para dados judiciais - Autojur
 SQL_AUTOJUR = """
 SELECT DISTINCT 
@@ -96,7 +157,9 @@ QUERIES = {
     'vic': SQL_VIC,
     'autojur': SQL_AUTOJUR,
     'maxsmart_judicial': SQL_MAXSMART_JUDICIAL,
-    'test': SQL_TEST
+    'test': SQL_TEST,
+    'max_ids': SQL_MAX_IDS,
+    'vic_ids': SQL_VIC_IDS,
 }
 
 def get_query(query_name: str) -> str:
@@ -5,125 +5,327 @@ Conexes SQL Server - Projeto VIC
 
 Classes e funes para conectar com bancos SQL Server.
 Implementa Fail-Fast para credenciais ausentes.
+
+As conexoes sao servidas por um pool por processo (um por servidor/banco/
+usuario). O driver ODBC que funcionou para cada servidor fica em cache, de
+modo que apenas a primeira conexao percorre a lista de drivers.
 """
 
-import pyodbc
+import hashlib
+import logging
+import threading
+import time
 import pandas as pd
 from pathlib import Path
 import os
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 import warnings
 
+try:
+    import pyodbc
+except ImportError:  # driver nativo indisponivel (ex.: sem unixODBC)
+    pyodbc = None
+
 # Suprimir avisos do pandas sobre conexes DBAPI2
 warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy connectable')
 
-def get_std_connection():
-    """Retorna conexo com banco STD2016."""
-    # Carregar variveis de ambiente
+logger = logging.getLogger(__name__)
+
+# Drivers ODBC em ordem de preferencia
+DRIVERS_ODBC = [
+    "ODBC Driver 18 for SQL Server",
+    "ODBC Driver 17 for SQL Server",
+    "ODBC Driver 13 for SQL Server",
+    "ODBC Driver 11 for SQL Server",
+    "SQL Server Native Client 11.0",
+    "SQL Server",
+]
+
+# Driver que funcionou por servidor (cache do processo)
+_drivers_por_servidor: Dict[str, str] = {}
+_drivers_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _carregar_env() -> None:
+    """Carrega o .env do projeto uma unica vez por processo."""
     env_path = Path(__file__).parent.parent.parent / '.env'
     if env_path.exists():
         load_dotenv(env_path)
-    
-    # Fail-Fast: sem defaults perigosos
-    server = os.getenv('MSSQL_SERVER_STD')
-    if not server:
-        raise RuntimeError("MSSQL_SERVER_STD ausente (.env)")
-        
-    database = os.getenv('MSSQL_DATABASE_STD')
-    if not database:
-        raise RuntimeError("MSSQL_DATABASE_STD ausente (.env)")
-        
-    username = os.getenv('MSSQL_USER_STD')
-    if not username:
-        raise RuntimeError("MSSQL_USER_STD ausente (.env)")
-        
-    password = os.getenv('MSSQL_PASSWORD_STD')
-    if not password:
-        raise RuntimeError("MSSQL_PASSWORD_STD ausente (.env)")
-    
-    return SQLServerConnection(server, database, username, password)
+
+
+def _credenciais(prefixo: str) -> Tuple[str, str, str, str]:
+    """Le SERVER/DATABASE/USER/PASSWORD do ambiente (Fail-Fast)."""
+    _carregar_env()
+    valores = []
+    for campo in ('SERVER', 'DATABASE', 'USER', 'PASSWORD'):
+        nome = f'MSSQL_{campo}_{prefixo}'
+        valor = os.getenv(nome)
+        if not valor:
+            raise RuntimeError(f"{nome} ausente (.env)")
+        valores.append(valor)
+    return tuple(valores)  # type: ignore[return-value]
+
+
+def get_std_connection():
+    """Retorna conexo com banco STD2016."""
+    return SQLServerConnection(*_credenciais('STD'))
 
 def get_candiotto_connection():
     """Retorna conexo com banco CANDIOTTO."""
-    # Carregar variveis de ambiente
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-    
-    # Fail-Fast: sem defaults perigosos
-    server = os.getenv('MSSQL_SERVER_CANDIOTTO')
-    if not server:
-        raise RuntimeError("MSSQL_SERVER_CANDIOTTO ausente (.env)")
-        
-    database = os.getenv('MSSQL_DATABASE_CANDIOTTO')
-    if not database:
-        raise RuntimeError("MSSQL_DATABASE_CANDIOTTO ausente (.env)")
-        
-    username = os.getenv('MSSQL_USER_CANDIOTTO')
-    if not username:
-        raise RuntimeError("MSSQL_USER_CANDIOTTO ausente (.env)")
-        
-    password = os.getenv('MSSQL_PASSWORD_CANDIOTTO')
-    if not password:
-        raise RuntimeError("MSSQL_PASSWORD_CANDIOTTO ausente (.env)")
-    
-    return SQLServerConnection(server, database, username, password)
+    return SQLServerConnection(*_credenciais('CANDIOTTO'))
+
+
+def _drivers_candidatos(servidor: str) -> List[str]:
+    """Driver em cache primeiro; depois apenas os drivers instalados."""
+    instalados = set(pyodbc.drivers()) if pyodbc is not None else set()
+    candidatos = [d for d in DRIVERS_ODBC if d in instalados] or list(DRIVERS_ODBC)
+    em_cache = _drivers_por_servidor.get(servidor)
+    if em_cache:
+        candidatos = [em_cache] + [d for d in candidatos if d != em_cache]
+    return candidatos
+
+
+def conectar_odbc(
+    server: str,
+    database: str,
+    username: str,
+    password: str,
+    driver: Optional[str] = None,
+    timeout: int = 30,
+):
+    """Abre uma conexao pyodbc, descobrindo (e memorizando) o driver do servidor."""
+    if pyodbc is None:
+        raise RuntimeError("pyodbc indisponivel: instale o driver ODBC do SQL Server")
+
+    drivers = [driver.strip('{}')] if driver else _drivers_candidatos(server)
+    autenticacao = f"UID={username};PWD={password};" if username else "Trusted_Connection=yes;"
+    ultimo_erro: Optional[Exception] = None
+    for nome_driver in drivers:
+        connection_string = (
+            f"DRIVER={{{nome_driver}}};"
+            f"SERVER={server};"
+            f"DATABASE={database};"
+            f"{autenticacao}"
+            f"TrustServerCertificate=yes;"
+            f"Timeout={timeout};"
+        )
+        try:
+            conexao = pyodbc.connect(connection_string, timeout=timeout)
+        except Exception as exc:
+            ultimo_erro = exc
+            logger.debug("Driver %s falhou para %s: %s", nome_driver, server, exc)
+            if _drivers_por_servidor.get(server) == nome_driver:
+                with _drivers_lock:
+                    _drivers_por_servidor.pop(server, None)
+            continue
+        with _drivers_lock:
+            _drivers_por_servidor[server] = nome_driver
+        return conexao
+
+    raise ConnectionError(f"Nenhum driver ODBC conectou em {server}: {ultimo_erro}")
+
+
+class ConnectionPool:
+    """Pool de conexoes reutilizaveis com verificacao de saude.
+
+    Args:
+        fabrica: Funcao sem argumentos que abre uma nova conexao DB-API.
+        tamanho_maximo: Conexoes ociosas mantidas no pool.
+        verificar_apos: Segundos ociosos apos os quais a conexao e testada
+            (``SELECT 1``) antes de ser reutilizada.
+    """
+
+    def __init__(
+        self,
+        fabrica: Callable[[], Any],
+        tamanho_maximo: int = 4,
+        verificar_apos: float = 30.0,
+    ):
+        self.fabrica = fabrica
+        self.tamanho_maximo = tamanho_maximo
+        self.verificar_apos = verificar_apos
+        self._ociosas: List[Tuple[Any, float]] = []
+        self._lock = threading.Lock()
+        self._stats = {
+            'criadas': 0,
+            'reutilizadas': 0,
+            'descartadas': 0,
+            'falhas': 0,
+            'em_uso': 0,
+            'tempo_conexao_s': 0.0,
+        }
+
+    @staticmethod
+    def _saudavel(conexao: Any) -> bool:
+        try:
+            cursor = conexao.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _fechar(conexao: Any) -> None:
+        try:
+            conexao.close()
+        except Exception:
+            pass
+
+    def acquire(self) -> Any:
+        """Retorna uma conexao ociosa saudavel ou abre uma nova."""
+        while True:
+            with self._lock:
+                if not self._ociosas:
+                    break
+                conexao, devolvida_em = self._ociosas.pop()
+            if time.monotonic() - devolvida_em < self.verificar_apos or self._saudavel(conexao):
+                with self._lock:
+                    self._stats['reutilizadas'] += 1
+                    self._stats['em_uso'] += 1
+                return conexao
+            with self._lock:
+                self._stats['descartadas'] += 1
+            self._fechar(conexao)
+
+        inicio = time.perf_counter()
+        try:
+            conexao = self.fabrica()
+        except Exception:
+            with self._lock:
+                self._stats['falhas'] += 1
+            raise
+        with self._lock:
+            self._stats['criadas'] += 1
+            self._stats['em_uso'] += 1
+            self._stats['tempo_conexao_s'] += time.perf_counter() - inicio
+        return conexao
+
+    def release(self, conexao: Any) -> None:
+        """Devolve a conexao ao pool (ou fecha, se o pool estiver cheio)."""
+        try:
+            conexao.rollback()
+        except Exception:
+            with self._lock:
+                self._stats['em_uso'] -= 1
+                self._stats['descartadas'] += 1
+            self._fechar(conexao)
+            return
+        with self._lock:
+            self._stats['em_uso'] -= 1
+            if len(self._ociosas) < self.tamanho_maximo:
+                self._ociosas.append((conexao, time.monotonic()))
+                return
+            self._stats['descartadas'] += 1
+        self._fechar(conexao)
+
+    def close_all(self) -> None:
+        """Fecha todas as conexoes ociosas."""
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, []
+        for conexao, _ in ociosas:
+            self._fechar(conexao)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores do pool (criadas, reutilizadas, descartadas, ...)."""
+        with self._lock:
+            return {**self._stats, 'ociosas': len(self._ociosas)}
+
+
+# Chave: servidor, banco, usuario, driver e hash da senha (nunca a senha em texto)
+_pools: Dict[Tuple[str, str, str, str, str], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(server: str, database: str, username: str, password: str, driver: Optional[str] = None) -> ConnectionPool:
+    """Pool do processo por credencial completa (criado sob demanda).
+
+    Senha ou driver diferentes geram outro pool, em vez de reaproveitar
+    conexoes abertas com a credencial anterior.
+    """
+    chave = (server, database, username, driver or '', hashlib.sha256(password.encode('utf-8')).hexdigest())
+    with _pools_lock:
+        pool = _pools.get(chave)
+        if pool is None:
+            pool = ConnectionPool(
+                lambda: conectar_odbc(server, database, username, password, driver),
+                tamanho_maximo=int(os.getenv('SQL_POOL_SIZE', '4')),
+            )
+            _pools[chave] = pool
+        return pool
+
+
+def estatisticas_pool() -> Dict[str, Dict[str, Any]]:
+    """Estatisticas de todos os pools e drivers memorizados por servidor."""
+    with _pools_lock:
+        pools = dict(_pools)
+    resumo: Dict[str, Dict[str, Any]] = {}
+    for (s, d, u, drv, _), pool in pools.items():
+        nome = '/'.join(filter(None, (s, d, u, drv)))
+        # Mesma credencial com outra senha: sufixo numerico, sem expor o hash
+        if nome in resumo:
+            nome = f"{nome}#{len(resumo)}"
+        resumo[nome] = pool.stats()
+    resumo['drivers'] = dict(_drivers_por_servidor)
+    return resumo
+
+
+def fechar_pools() -> None:
+    """Fecha as conexoes ociosas de todos os pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
 
 class SQLServerConnection:
     """Classe para gerenciar conexes com SQL Server."""
-    
+
     def __init__(self, server: str, database: str, username: str, password: str):
         self.server = server
         self.database = database
         self.username = username
         self.password = password
         self.connection = None
-    
+        self._pool = get_pool(server, database, username, password)
+
     def connect(self) -> bool:
-        """Estabelece conexo com o banco de dados."""
-        # Lista de drivers ODBC para tentar
-        drivers = [
-            "ODBC Driver 18 for SQL Server",
-            "ODBC Driver 17 for SQL Server",
-            "ODBC Driver 13 for SQL Server",
-            "ODBC Driver 11 for SQL Server",
-            "SQL Server Native Client 11.0",
-            "SQL Server",
-        ]
-        
-        for driver in drivers:
-            try:
-                connection_string = (
-                    f"DRIVER={{{driver}}};"
-                    f"SERVER={self.server};"
-                    f"DATABASE={self.database};"
-                    f"UID={self.username};"
-                    f"PWD={self.password};"
-                    f"TrustServerCertificate=yes;"
-                    f"Timeout=30;"
-                )
-                self.connection = pyodbc.connect(connection_string, timeout=30)
-                return True
-            except Exception:
-                continue
-        
-        return False
-    
+        """Obtem conexao do pool (driver descoberto uma vez por servidor)."""
+        if self.connection is not None:
+            return True
+        try:
+            self.connection = self._pool.acquire()
+            return True
+        except Exception as exc:
+            logger.error("Falha ao conectar em %s/%s: %s", self.server, self.database, exc)
+            return False
+
     def execute_query(self, query: str) -> Optional[pd.DataFrame]:
         """Executa uma consulta SQL e retorna um DataFrame."""
         if not self.connection:
             return None
-        
+
         try:
             df = pd.read_sql(query, self.connection)
             return df
         except Exception:
             return None
-    
+
     def close(self):
-        """Fecha a conexo com o banco."""
+        """Devolve a conexo ao pool."""
         if self.connection:
-            self.connection.close()
-            self.connection = None
\ No newline at end of file
+            self._pool.release(self.connection)
+            self.connection = None
+
+    def __enter__(self) -> "SQLServerConnection":
+        if not self.connect():
+            raise RuntimeError("Falha ao conectar com banco de dados")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -5,10 +5,14 @@ from datetime import date, timedelta
 from pathlib import Path
 
 import pandas as pd
-import requests
 
 from src.config.loader import LoadedConfig
-from src.utils.io import write_csv_to_zip
+from src.utils.http_stream import (
+    TAMANHO_BLOCO,
+    gravar_registros_zip,
+    iterar_array_json,
+    obter_sessao,
+)
 from src.utils.logger import get_logger
 from src.utils.path_manager import PathManager
 from src.utils.output_formatter import OutputFormatter
@@ -61,11 +65,6 @@ def baixar_emccamp(config: LoadedConfig) -> tuple[Path, int]:
 
     params = {"parameters": parametros_str}
 
-    resp = requests.get(full_url, params=params, auth=(user, password), timeout=(15, 180))
-    resp.raise_for_status()
-
-    data = resp.json()
-    df = pd.DataFrame(data)
     timestamp = os.environ.get("EMCCAMP_RUN_TS") or pd.Timestamp.utcnow().strftime("%Y%m%d_%H%M%S")
     csv_name = f"Emccamp_{timestamp}.csv"
     zip_path = input_dir / "Emccamp.zip"
@@ -74,45 +73,21 @@ def baixar_emccamp(config: LoadedConfig) -> tuple[Path, int]:
     sep = global_cfg.get("csv_separator", ";")
     encoding = global_cfg.get("encoding", "utf-8-sig")
 
-    write_csv_to_zip({csv_name: df}, zip_path, sep=sep, encoding=encoding)
-    return zip_path, len(df)
-
-
-def baixar_baixas_emccamp(config: LoadedConfig) -> tuple[Path, int]:
-    """Baixa planilha de pagamentos (baixas) via API TOTVS e grava CSV. Retorna (path, num_registros)."""
-    paths = PathManager(config.base_path, config.data)
-    input_dir = paths.resolve_input("baixas", "data/input/baixas")
-    logging_cfg = config.get("logging", {})
-    logger = get_logger("api_totvs_baixas", paths.resolve_logs(), logging_cfg)
-    zip_path = input_dir / "baixa_emccamp.zip"
-    if zip_path.exists():
-        try:
-            zip_path.unlink()
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.warning("Nao foi possivel remover %s: %s", zip_path.name, exc)
-
-    # Configurações da API de baixas EMCCAMP
-    base_url = os.getenv("TOTVS_BASE_URL")
-    if not base_url:
-        raise RuntimeError("Variavel TOTVS_BASE_URL nao configurada")
-    
-    endpoint = "/api/framework/v1/consultaSQLServer/RealizaConsulta/CANDIOTTO.002/0/X"
-    full_url = f"{base_url}{endpoint}"
+    # Registros decodificados em streaming e gravados em lotes no ZIP
+    with obter_sessao().get(
+        full_url, params=params, auth=(user, password), timeout=(15, 180), stream=True
+    ) as resp:
+        resp.raise_for_status()
+        registros = iterar_array_json(resp.iter_content(chunk_size=TAMANHO_BLOCO))
+        total = gravar_registros_zip(registros, zip_path, csv_name, sep=sep, encoding=encoding)
+    return zip_path, total
 
-    user = os.getenv("TOTVS_USER")
-    password = os.getenv("TOTVS_PASS")
-    if not user or not password:
-        raise RuntimeError("Variaveis TOTVS_USER e TOTVS_PASS devem estar configuradas")
 
-    resp = requests.get(full_url, auth=(user, password), timeout=(15, 180))
-    resp.raise_for_status()
+COLUNAS_BAIXAS = ("NUM_VENDA", "ID_PARCELA", "HONORARIO_BAIXADO", "DATA_RECEBIMENTO", "VALOR_RECEBIDO")
 
-    data = resp.json()
-    df = pd.DataFrame(data)
-    if df.empty:
-        logger.warning("API de baixas retornou nenhum registro.")
-        df = pd.DataFrame(columns=["NUM_VENDA", "ID_PARCELA", "HONORARIO_BAIXADO", "DATA_RECEBIMENTO", "VALOR_RECEBIDO"])
 
+def _tratar_baixas(df: pd.DataFrame) -> pd.DataFrame:
+    """Filtra HONORARIO_BAIXADO != 0 e monta CHAVE/VALOR/DATA de um lote de baixas."""
     df.columns = [str(col).upper() for col in df.columns]
 
     def _pick_column(candidates: tuple[str, ...]) -> str:
@@ -146,11 +121,55 @@ def baixar_baixas_emccamp(config: LoadedConfig) -> tuple[Path, int]:
         df_filtrado[data_col], errors="coerce", dayfirst=True
     ).dt.strftime("%Y-%m-%d")
     df_filtrado["DATA_RECEBIMENTO"] = df_filtrado["DATA_RECEBIMENTO"].fillna("")
+    return df_filtrado
+
+
+def baixar_baixas_emccamp(config: LoadedConfig) -> tuple[Path, int]:
+    """Baixa planilha de pagamentos (baixas) via API TOTVS e grava CSV. Retorna (path, num_registros)."""
+    paths = PathManager(config.base_path, config.data)
+    input_dir = paths.resolve_input("baixas", "data/input/baixas")
+    logging_cfg = config.get("logging", {})
+    logger = get_logger("api_totvs_baixas", paths.resolve_logs(), logging_cfg)
+    zip_path = input_dir / "baixa_emccamp.zip"
+    if zip_path.exists():
+        try:
+            zip_path.unlink()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Nao foi possivel remover %s: %s", zip_path.name, exc)
+
+    # Configurações da API de baixas EMCCAMP
+    base_url = os.getenv("TOTVS_BASE_URL")
+    if not base_url:
+        raise RuntimeError("Variavel TOTVS_BASE_URL nao configurada")
+    
+    endpoint = "/api/framework/v1/consultaSQLServer/RealizaConsulta/CANDIOTTO.002/0/X"
+    full_url = f"{base_url}{endpoint}"
+
+    user = os.getenv("TOTVS_USER")
+    password = os.getenv("TOTVS_PASS")
+    if not user or not password:
+        raise RuntimeError("Variaveis TOTVS_USER e TOTVS_PASS devem estar configuradas")
 
     global_cfg = config.get("global", {})
     sep = global_cfg.get("csv_separator", ";")
     encoding = global_cfg.get("encoding", "utf-8-sig")
     timestamp = pd.Timestamp.utcnow().strftime("%Y%m%d_%H%M%S")
     csv_name = f"baixa_emccamp_{timestamp}.csv"
-    write_csv_to_zip({csv_name: df_filtrado}, zip_path, sep=sep, encoding=encoding)
-    return zip_path, len(df_filtrado)
+
+    with obter_sessao().get(
+        full_url, auth=(user, password), timeout=(15, 180), stream=True
+    ) as resp:
+        resp.raise_for_status()
+        registros = iterar_array_json(resp.iter_content(chunk_size=TAMANHO_BLOCO))
+        total = gravar_registros_zip(
+            registros,
+            zip_path,
+            csv_name,
+            sep=sep,
+            encoding=encoding,
+            transformar=_tratar_baixas,
+            colunas_vazio=COLUNAS_BAIXAS,
+        )
+    if total == 0:
+        logger.warning("API de baixas retornou nenhum registro com honorario baixado.")
+    return zip_path, total
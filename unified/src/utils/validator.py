@@ -4,6 +4,11 @@ Consolida funcionalidades de:
 - validador_vic.py (ValidadorVicSimplificado)
 - validador_consistencia.py (ValidadorConsistencia) 
 - inconsistencias.py (InconsistenciaManager)
+
+Os motivos de inconsistência ficam em ``RegistroMotivos``: uma máscara de
+bits por linha (um bit por motivo), de modo que marcar um motivo, separar
+válidos/inválidos e montar os textos de motivo são operações vetorizadas,
+sem custo proporcional a (linhas inválidas × motivos).
 """
 
 import re
@@ -15,6 +20,79 @@ import numpy as np
 
 import pandas as pd
 
+from src.utils.dataset_diff import comparar_datasets
+
+
+class RegistroMotivos:
+    """Motivos de inconsistência por linha como máscara de bits.
+
+    Cada motivo recebe um bit (até 64 motivos). O texto exportado em
+    ``motivo_inconsistencia`` lista os motivos na ordem em que foram
+    registrados, cada um terminado por ``;`` (ex.: ``CHAVE_VAZIA;``).
+
+    Args:
+        n_linhas: Quantidade de linhas do DataFrame validado.
+    """
+
+    COLUNA = 'motivo_inconsistencia'
+    MAX_MOTIVOS = 64
+
+    def __init__(self, n_linhas: int):
+        self.bits = np.zeros(n_linhas, dtype=np.uint64)
+        self.motivos: List[str] = []
+        self._codigos: Dict[str, int] = {}
+
+    def _bit(self, motivo: str) -> np.uint64:
+        codigo = self._codigos.get(motivo)
+        if codigo is None:
+            if len(self.motivos) >= self.MAX_MOTIVOS:
+                raise ValueError(f"Limite de {self.MAX_MOTIVOS} motivos de inconsistência excedido")
+            codigo = len(self.motivos)
+            self._codigos[motivo] = codigo
+            self.motivos.append(motivo)
+        return np.uint64(1) << np.uint64(codigo)
+
+    def marcar(self, mascara: Any, motivo: str) -> int:
+        """Marca ``motivo`` nas linhas onde ``mascara`` é verdadeira; retorna quantas."""
+        mascara = np.asarray(mascara, dtype=bool)
+        self.bits[mascara] |= self._bit(motivo)
+        return int(mascara.sum())
+
+    def marcar_posicoes(self, posicoes: Any, motivo: str) -> int:
+        """Marca ``motivo`` nas posições (0..n-1) informadas; retorna quantas."""
+        posicoes = np.asarray(posicoes, dtype=np.intp)
+        self.bits[posicoes] |= self._bit(motivo)
+        return len(posicoes)
+
+    @property
+    def invalidos(self) -> np.ndarray:
+        """Máscara booleana das linhas com ao menos um motivo."""
+        return self.bits != 0
+
+    def contagem(self) -> Dict[str, int]:
+        """Linhas marcadas por motivo."""
+        return {
+            motivo: int(np.count_nonzero(self.bits & (np.uint64(1) << np.uint64(codigo))))
+            for codigo, motivo in enumerate(self.motivos)
+        }
+
+    def _texto(self, bits: int) -> str:
+        return ''.join(f"{motivo};" for codigo, motivo in enumerate(self.motivos) if bits >> codigo & 1)
+
+    def textos(self, bits: Optional[np.ndarray] = None) -> np.ndarray:
+        """Texto de motivos por linha; calculado uma vez por combinação distinta de bits."""
+        bits = self.bits if bits is None else bits
+        codigos, combinacoes = pd.factorize(bits)
+        rotulos = np.array([self._texto(int(c)) for c in combinacoes], dtype=object)
+        return rotulos[codigos] if len(codigos) else np.array([], dtype=object)
+
+    def dividir(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Retorna (válidos, inválidos com ``motivo_inconsistencia``)."""
+        invalidos = self.invalidos
+        dados_validos = df[~invalidos]
+        dados_invalidos = df[invalidos].assign(**{self.COLUNA: self.textos(self.bits[invalidos])})
+        return dados_validos, dados_invalidos
+
 
 class MaxValidator:
     """Validador para dados MAX (CHAVE/PARCELA)."""
@@ -28,22 +106,23 @@ class MaxValidator:
             'chave_regex', r'^[A-Za-z0-9]+(?:-[A-Za-z0-9]+)+$'
         )
 
-    def validar_dados(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        df = df.copy()
-        df['motivo_inconsistencia'] = ''
+    def registrar_inconsistencias(self, df: pd.DataFrame) -> RegistroMotivos:
+        """Marca CHAVE/PARCELA vazia ou fora do formato ``chave_regex``."""
+        registro = RegistroMotivos(len(df))
 
         coluna = 'CHAVE' if 'CHAVE' in df.columns else 'PARCELA'
         if coluna in df.columns:
             chaves = df[coluna].astype(str).str.strip()
             mask_vazia = chaves.eq('') | df[coluna].isna()
-            df.loc[mask_vazia, 'motivo_inconsistencia'] += 'CHAVE_VAZIA;'
+            registro.marcar(mask_vazia, 'CHAVE_VAZIA')
 
             mask_invalida = ~chaves.str.match(self.regex_chave, na=False)
-            df.loc[mask_invalida & ~mask_vazia, 'motivo_inconsistencia'] += 'CHAVE_FORMATO_INVALIDO;'
+            registro.marcar(mask_invalida & ~mask_vazia, 'CHAVE_FORMATO_INVALIDO')
 
-        dados_invalidos = df[df['motivo_inconsistencia'] != '']
-        dados_validos = df[df['motivo_inconsistencia'] == ''].drop('motivo_inconsistencia', axis=1)
-        return dados_validos, dados_invalidos
+        return registro
+
+    def validar_dados(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        return self.registrar_inconsistencias(df).dividir(df)
 
     def validar_amostra(self, df: pd.DataFrame, n_amostras: int = 10) -> Dict[str, Any]:
         if len(df) == 0:
@@ -93,29 +172,26 @@ class VicValidator:
         Returns:
             Tuple[pd.DataFrame, pd.DataFrame]: (dados_validos, dados_invalidos)
         """
-        df = df.copy()
-        df['motivo_inconsistencia'] = ''
+        registro = RegistroMotivos(len(df))
 
         # Validar VENCIMENTO
         if 'VENCIMENTO' in df.columns:
-            mask_venc_inval = df['VENCIMENTO'].isna()
-            df.loc[mask_venc_inval, 'motivo_inconsistencia'] += 'VENCIMENTO_INVALIDO;'
+            registro.marcar(df['VENCIMENTO'].isna(), 'VENCIMENTO_INVALIDO')
 
         # Validar CPF/CNPJ (principal validação VIC)
         if 'CPFCNPJ_CLIENTE' in df.columns:
             docs = df['CPFCNPJ_CLIENTE'].astype(str).str.strip()
+            docs_lower = docs.str.lower()
             mask_doc_vazio = (
-                docs.eq('') | docs.eq('nan') | docs.eq('none') |
-                docs.str.lower().eq('nan') | docs.str.lower().eq('none') |
+                docs.eq('') | docs_lower.eq('nan') | docs_lower.eq('none') |
                 df['CPFCNPJ_CLIENTE'].isna()
             )
-            df.loc[mask_doc_vazio, 'motivo_inconsistencia'] += 'CPF/CNPJ nulo ou vazio;'
+            registro.marcar(mask_doc_vazio, 'CPF/CNPJ nulo ou vazio')
         else:
             self.logger.warning("Coluna CPFCNPJ_CLIENTE não encontrada no DataFrame")
 
         # Separar válidos e inválidos
-        dados_invalidos = df[df['motivo_inconsistencia'] != '']
-        dados_validos = df[df['motivo_inconsistencia'] == ''].drop(columns=['motivo_inconsistencia'])
+        dados_validos, dados_invalidos = registro.dividir(df)
         
         # Log das estatísticas
         total = len(df)
@@ -124,12 +200,9 @@ class VicValidator:
         
         self.logger.info(f"Validação VIC: {total:,} total, {validos:,} válidos, {invalidos:,} inválidos")
         
-        if invalidos > 0 and not dados_invalidos.empty:
-            # Contar motivos de inconsistência
-            motivos = dados_invalidos['motivo_inconsistencia'].str.split(';').explode()
-            motivos = motivos[motivos.str.strip() != ''].value_counts()
-            for motivo, count in motivos.items():
-                self.logger.info(f"  - {motivo.strip()}: {count:,} registros")
+        for motivo, count in registro.contagem().items():
+            if count:
+                self.logger.info("  - %s: %s registros", motivo, format(count, ","))
         
         return dados_validos, dados_invalidos
 
@@ -165,8 +238,8 @@ class InconsistenciaManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # Lista para armazenar inconsistências
-        self.inconsistencias: List[Dict[str, Any]] = []
+        # Posições marcadas por motivo (arrays, não um dict por linha)
+        self.inconsistencias: Dict[str, List[np.ndarray]] = {}
         
         # Contadores
         self.contadores = {
@@ -182,40 +255,45 @@ class InconsistenciaManager:
         """Adiciona motivo de inconsistência.
         
         Args:
-            indice: Índice do registro no DataFrame
+            indice: Posição do registro no DataFrame
             motivo: Motivo da inconsistência
             detalhes: Detalhes adicionais (opcional)
             valor_original: Valor original que causou a inconsistência
         """
-        inconsistencia = {
-            'indice': indice,
-            'motivo': motivo,
-            'detalhes': detalhes,
-            'valor_original': valor_original
-        }
-        
-        self.inconsistencias.append(inconsistencia)
-        self.contadores['motivos'][motivo] += 1
-        
-        self.logger.debug(f"Inconsistência adicionada: {motivo} (índice {indice})")
+        self.adicionar_motivos_em_lote([indice], motivo, detalhes)
     
-    def adicionar_motivos_em_lote(self, indices: List[int], motivo: str, 
+    def adicionar_motivos_em_lote(self, indices: Any, motivo: str, 
                                  detalhes: Optional[str] = None) -> None:
         """Adiciona mesmo motivo para múltiplos registros.
         
         Args:
-            indices: Lista de índices dos registros
+            indices: Posições dos registros (lista ou array)
             motivo: Motivo da inconsistência
             detalhes: Detalhes adicionais (opcional)
         """
-        for indice in indices:
-            self.adicionar_motivo(indice, motivo, detalhes)
+        posicoes = np.asarray(indices, dtype=np.intp).ravel()
+        self.inconsistencias.setdefault(motivo, []).append(posicoes)
+        self.contadores['motivos'][motivo] += len(posicoes)
         
-        self.logger.debug(f"Inconsistências em lote: {motivo} ({len(indices)} registros)")
+        self.logger.debug("Inconsistências em lote: %s (%d registros)", motivo, len(posicoes))
+
+    def adicionar_mascara(self, mascara: Any, motivo: str) -> None:
+        """Adiciona ``motivo`` às linhas onde a máscara booleana é verdadeira."""
+        self.adicionar_motivos_em_lote(np.flatnonzero(np.asarray(mascara, dtype=bool)), motivo)
+
+    def registro(self, n_linhas: int) -> RegistroMotivos:
+        """Máscara de bits com todos os motivos adicionados até aqui."""
+        registro = RegistroMotivos(n_linhas)
+        for motivo, partes in self.inconsistencias.items():
+            registro.marcar_posicoes(np.concatenate(partes), motivo)
+        return registro
     
     def dividir_validos_invalidos(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Divide DataFrame em registros válidos e inválidos.
         
+        Os inválidos recebem ``motivo_inconsistencia`` com todos os motivos
+        da linha.
+        
         Args:
             df: DataFrame original
             
@@ -228,23 +306,19 @@ class InconsistenciaManager:
             self.contadores['registros_validos'] = len(df)
             self.contadores['registros_invalidos'] = 0
             return df.copy(), pd.DataFrame()
-        
-        # Índices dos registros inválidos
-        indices_invalidos = {inc['indice'] for inc in self.inconsistencias}
-        
-        # Dividir DataFrames
-        df_invalidos = df.iloc[list(indices_invalidos)].copy()
-        df_validos = df.drop(indices_invalidos).copy()
+
+        df_validos, df_invalidos = self.registro(len(df)).dividir(df)
         
         # Atualizar contadores
         self.contadores['total_registros'] = len(df)
         self.contadores['registros_validos'] = len(df_validos)
         self.contadores['registros_invalidos'] = len(df_invalidos)
         
-        self.logger.info(
-            f"Divisão concluída: {len(df_validos)} válidos, "
-            f"{len(df_invalidos)} inválidos de {len(df)} total"
-        )
+        if len(df_invalidos):
+            self.logger.info(
+                f"Divisão concluída: {len(df_validos)} válidos, "
+                f"{len(df_invalidos)} inválidos de {len(df)} total"
+            )
         
         return df_validos, df_invalidos
     
@@ -255,7 +329,7 @@ class InconsistenciaManager:
             Dict com estatísticas detalhadas
         """
         return {
-            'total_inconsistencias': len(self.inconsistencias),
+            'total_inconsistencias': sum(self.contadores['motivos'].values()),
             'contadores': dict(self.contadores),
             'motivos_detalhados': dict(self.contadores['motivos'])
         }
@@ -329,19 +403,34 @@ class ValidadorConsistencia:
             self.logger.warning("Nenhuma coluna chave definida para comparação")
             return self.resultados
         
-        # Atualizar contadores básicos
-        self.resultados['total_registros_original'] = len(df_original)
-        self.resultados['total_registros_refatorado'] = len(df_refatorado)
+        # Hash por chave/coluna em lotes (sem conjuntos Python de chaves)
+        colunas = [
+            c for c in df_original.columns
+            if c in df_refatorado.columns and c not in chaves and c not in self.colunas_ignorar
+        ]
+        diff = comparar_datasets(df_original, df_refatorado, chaves, colunas=colunas)
+        
+        self.resultados['total_registros_original'] = diff['registros_esquerda']
+        self.resultados['total_registros_refatorado'] = diff['registros_direita']
+        self.resultados['registros_coincidentes'] = diff['iguais'] + diff['alteradas']
+        self.resultados['registros_apenas_original'] = diff['removidas']
+        self.resultados['registros_apenas_refatorado'] = diff['adicionadas']
+        self.resultados['registros_alterados'] = diff['alteradas']
+        self.resultados['diferencas_por_coluna'] = diff['alteracoes_por_coluna']
         
         # Comparação simples por tamanho
-        if len(df_original) == len(df_refatorado):
+        if any(diff['chaves_ausentes'].values()):
+            self.resultados['resumo_validacao'] = 'CHAVES_AUSENTES'
+        elif len(df_original) == len(df_refatorado):
             self.resultados['resumo_validacao'] = 'TAMANHOS_IGUAIS'
         else:
             self.resultados['resumo_validacao'] = 'TAMANHOS_DIFERENTES'
             
         self.logger.info(
             f"Comparação: Original={len(df_original)}, "
-            f"Refatorado={len(df_refatorado)}, Status={self.resultados['resumo_validacao']}"
+            f"Refatorado={len(df_refatorado)}, Status={self.resultados['resumo_validacao']}, "
+            f"Apenas original={diff['removidas']}, Apenas refatorado={diff['adicionadas']}, "
+            f"Alterados={diff['alteradas']}"
         )
         
         return self.resultados
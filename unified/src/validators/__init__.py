@@ -1,40 +1,57 @@
 """
 Validators package.
 Provides data validation components for the pipeline.
+
+Validator modules are imported on first use: the registry holds
+``"module:factory"`` references.
 """
 from __future__ import annotations
 
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.registry import LazyRegistry, lazy_attributes
 from ..core.schemas import ValidatorConfig, ValidatorType
 
-from .required import RequiredValidator, create_required_validator
-from .aging import AgingValidator, create_aging_validator
-from .blacklist import BlacklistValidator, create_blacklist_validator
-from .regex import RegexValidator, create_regex_validator
-from .campaign import CampaignValidator, create_campaign_validator
-from .status import StatusValidator, create_status_validator
-from .type_filter import TypeFilterValidator, create_type_filter_validator
-from .linebreak import LineBreakValidator, create_linebreak_validator
-from .daterange import DateRangeValidator, create_daterange_validator
+if TYPE_CHECKING:
+    from ..core.base import BaseValidator
 
 
 # Registry of validator factories
-_VALIDATOR_REGISTRY: dict[ValidatorType, Callable[[ValidatorConfig], BaseValidator]] = {
-    ValidatorType.REQUIRED: create_required_validator,
-    ValidatorType.AGING: create_aging_validator,
-    ValidatorType.BLACKLIST: create_blacklist_validator,
-    ValidatorType.REGEX: create_regex_validator,
-    ValidatorType.CAMPAIGN: create_campaign_validator,
-    ValidatorType.STATUS: create_status_validator,
-    ValidatorType.TYPE_FILTER: create_type_filter_validator,
-    ValidatorType.LINEBREAK: create_linebreak_validator,
-    ValidatorType.DATERANGE: create_daterange_validator,
-}
-
-
-def create_validator(config: ValidatorConfig) -> BaseValidator:
+_VALIDATOR_REGISTRY: LazyRegistry[ValidatorType] = LazyRegistry(
+    "validator",
+    {
+        ValidatorType.REQUIRED: ".required:create_required_validator",
+        ValidatorType.AGING: ".aging:create_aging_validator",
+        ValidatorType.BLACKLIST: ".blacklist:create_blacklist_validator",
+        ValidatorType.REGEX: ".regex:create_regex_validator",
+        ValidatorType.CAMPAIGN: ".campaign:create_campaign_validator",
+        ValidatorType.STATUS: ".status:create_status_validator",
+        ValidatorType.TYPE_FILTER: ".type_filter:create_type_filter_validator",
+        ValidatorType.LINEBREAK: ".linebreak:create_linebreak_validator",
+        ValidatorType.DATERANGE: ".daterange:create_daterange_validator",
+    },
+    package=__name__,
+)
+
+__getattr__ = lazy_attributes(
+    __name__,
+    {
+        "BaseValidator": "..core.base:BaseValidator",
+        "ValidationResult": "..core.base:ValidationResult",
+        "RequiredValidator": ".required:RequiredValidator",
+        "AgingValidator": ".aging:AgingValidator",
+        "BlacklistValidator": ".blacklist:BlacklistValidator",
+        "RegexValidator": ".regex:RegexValidator",
+        "CampaignValidator": ".campaign:CampaignValidator",
+        "StatusValidator": ".status:StatusValidator",
+        "TypeFilterValidator": ".type_filter:TypeFilterValidator",
+        "LineBreakValidator": ".linebreak:LineBreakValidator",
+        "DateRangeValidator": ".daterange:DateRangeValidator",
+    },
+)
+
+
+def create_validator(config: ValidatorConfig) -> "BaseValidator":
     """
     Factory function to create a validator based on configuration.
 
@@ -55,16 +72,17 @@ def create_validator(config: ValidatorConfig) -> BaseValidator:
 
 def register_validator(
     validator_type: ValidatorType,
-    factory: Callable[[ValidatorConfig], BaseValidator],
+    factory: Callable[[ValidatorConfig], "BaseValidator"] | str,
 ) -> None:
     """
     Register a custom validator factory.
 
     Args:
         validator_type: The validator type to register
-        factory: Factory function that creates the validator
+        factory: Factory function that creates the validator, or its
+            ``"module:function"`` reference (imported on first use)
     """
-    _VALIDATOR_REGISTRY[validator_type] = factory
+    _VALIDATOR_REGISTRY.register(validator_type, factory)
 
 
 __all__ = [
@@ -9,7 +9,7 @@ from datetime import date, datetime, timedelta
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -59,7 +59,7 @@ class AgingValidator(BaseValidator):
             null_action = self.params.get("null_action", "include")
             if null_action == "exclude":
                 valid_mask = valid_mask & ~null_dates
-                errors.append(f"{null_dates.sum()} records with null dates excluded")
+                errors.append(CountedMessage("{count} records with null dates excluded", null_dates.sum()))
             elif null_action == "include":
                 pass  # Keep null dates as valid
 
@@ -71,14 +71,14 @@ class AgingValidator(BaseValidator):
             too_old = non_null_mask & (date_series < min_dt)
             if too_old.any():
                 valid_mask = valid_mask & ~too_old
-                errors.append(f"{too_old.sum()} records before {min_date} excluded")
+                errors.append(CountedMessage(f"{{count}} records before {min_date} excluded", too_old.sum()))
 
         if max_date is not None:
             max_dt = pd.Timestamp(max_date)
             too_new = non_null_mask & (date_series > max_dt)
             if too_new.any():
                 valid_mask = valid_mask & ~too_new
-                errors.append(f"{too_new.sum()} records after {max_date} excluded")
+                errors.append(CountedMessage(f"{{count}} records after {max_date} excluded", too_new.sum()))
 
         return ValidationResult(
             valid=df[valid_mask].copy(),
@@ -9,8 +9,10 @@ from pathlib import Path
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
+from ..core.reference_cache import REFERENCE_CACHE
 from ..core.schemas import ValidatorConfig
+from ..utils.catalog import resolver_mais_recente
 
 
 class BlacklistValidator(BaseValidator):
@@ -64,11 +66,11 @@ class BlacklistValidator(BaseValidator):
         if mode == "exclude":
             # Exclude records in blacklist
             valid_mask = ~in_blacklist
-            errors.append(f"{in_blacklist.sum()} records excluded by blacklist")
+            errors.append(CountedMessage("{count} records excluded by blacklist", in_blacklist.sum()))
         else:
             # Include only records in blacklist (whitelist mode)
             valid_mask = in_blacklist
-            errors.append(f"{(~in_blacklist).sum()} records excluded (not in whitelist)")
+            errors.append(CountedMessage("{count} records excluded (not in whitelist)", (~in_blacklist).sum()))
 
         return ValidationResult(
             valid=df[valid_mask].copy(),
@@ -76,35 +78,39 @@ class BlacklistValidator(BaseValidator):
             errors=errors,
         )
 
-    def _load_blacklist(self, source_path: str, column: str) -> set | None:
+    def _load_blacklist(self, source_path: str, column: str) -> frozenset | None:
         """Load blacklist values from file (CSV, ZIP, or Excel)."""
         path = Path(source_path)
 
         if not path.exists():
             # Try glob pattern
             parent = path.parent
-            if parent.exists():
-                matches = list(parent.glob(path.name))
-                if matches:
-                    path = max(matches, key=lambda p: p.stat().st_mtime)
-                else:
-                    return None
-            else:
+            if not parent.exists():
+                return None
+            try:
+                path = resolver_mais_recente(parent, path.name)
+            except FileNotFoundError:
                 return None
 
+        # Read once per file version in long-lived processes (daemon, API)
+        return REFERENCE_CACHE.get(path, ("blacklist", column), lambda: self._read_blacklist(path, column))
+
+    def _read_blacklist(self, path: Path, column: str) -> frozenset | None:
+        """Read blacklist values from ``path``."""
         try:
             if path.suffix.lower() == ".zip":
-                return self._load_from_zip(path, column)
+                values = self._load_from_zip(path, column)
             elif path.suffix.lower() == ".csv":
                 df = pd.read_csv(path, sep=";", encoding="utf-8-sig", dtype=str)
-                return self._extract_column(df, column)
+                values = self._extract_column(df, column)
             elif path.suffix.lower() in (".xlsx", ".xls"):
                 df = pd.read_excel(path, dtype=str)
-                return self._extract_column(df, column)
+                values = self._extract_column(df, column)
             else:
                 return None
         except Exception:
             return None
+        return frozenset(values) if values is not None else None
 
     def _load_from_zip(self, zip_path: Path, column: str) -> set | None:
         """Load data from a ZIP file containing CSV/Excel."""
@@ -6,7 +6,8 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
+from ..core.matching import PatternMatcher
 from ..core.schemas import ValidatorConfig
 
 
@@ -32,38 +33,27 @@ class CampaignValidator(BaseValidator):
                 errors=[f"Campaign column '{column}' not found"],
             )
 
-        values = df[column].astype(str).str.strip().str.upper()
         valid_mask = pd.Series(True, index=df.index)
         errors = []
 
         # Apply include filter (must match at least one pattern)
         if include_patterns:
-            include_mask = pd.Series(False, index=df.index)
-            for pattern in include_patterns:
-                pattern_upper = str(pattern).upper()
-                include_mask = include_mask | values.str.contains(
-                    pattern_upper, na=False, regex=False
-                )
+            include_mask = PatternMatcher([include_patterns], mode="contains").matches(df[column])
             valid_mask = valid_mask & include_mask
             excluded = (~include_mask).sum()
             if excluded > 0:
                 errors.append(
-                    f"{excluded} records excluded (campaign not in: {include_patterns})"
+                    CountedMessage(f"{{count}} records excluded (campaign not in: {include_patterns})", excluded)
                 )
 
         # Apply exclude filter
         if exclude_patterns:
-            exclude_mask = pd.Series(False, index=df.index)
-            for pattern in exclude_patterns:
-                pattern_upper = str(pattern).upper()
-                exclude_mask = exclude_mask | values.str.contains(
-                    pattern_upper, na=False, regex=False
-                )
+            exclude_mask = PatternMatcher([exclude_patterns], mode="contains").matches(df[column])
             valid_mask = valid_mask & ~exclude_mask
             excluded = exclude_mask.sum()
             if excluded > 0:
                 errors.append(
-                    f"{excluded} records excluded (campaign in: {exclude_patterns})"
+                    CountedMessage(f"{{count}} records excluded (campaign in: {exclude_patterns})", excluded)
                 )
 
         return ValidationResult(
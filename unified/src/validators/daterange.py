@@ -9,7 +9,7 @@ from datetime import date, datetime
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -49,7 +49,7 @@ class DateRangeValidator(BaseValidator):
         if null_mask.any():
             if null_action == "exclude":
                 valid_mask = valid_mask & ~null_mask
-                errors.append(f"{null_mask.sum()} records with null dates excluded")
+                errors.append(CountedMessage("{count} records with null dates excluded", null_mask.sum()))
 
         # Build min/max date thresholds
         min_threshold = None
@@ -79,7 +79,7 @@ class DateRangeValidator(BaseValidator):
             if before_min.any():
                 valid_mask = valid_mask & ~before_min
                 errors.append(
-                    f"{before_min.sum()} records before {min_threshold.date()} excluded"
+                    CountedMessage(f"{{count}} records before {min_threshold.date()} excluded", before_min.sum())
                 )
 
         if max_threshold:
@@ -87,7 +87,7 @@ class DateRangeValidator(BaseValidator):
             if after_max.any():
                 valid_mask = valid_mask & ~after_max
                 errors.append(
-                    f"{after_max.sum()} records after {max_threshold.date()} excluded"
+                    CountedMessage(f"{{count}} records after {max_threshold.date()} excluded", after_max.sum())
                 )
 
         return ValidationResult(
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -50,7 +50,7 @@ class LineBreakValidator(BaseValidator):
         errors = []
 
         if affected_count > 0:
-            errors.append(f"{affected_count} records have internal line breaks")
+            errors.append(CountedMessage("{count} records have internal line breaks", affected_count))
 
         if action == "exclude":
             return ValidationResult(
@@ -76,7 +76,7 @@ class LineBreakValidator(BaseValidator):
             return ValidationResult(
                 valid=df,
                 invalid=pd.DataFrame(),
-                errors=[f"Cleaned line breaks from {affected_count} records"],
+                errors=[CountedMessage("Cleaned line breaks from {count} records", affected_count)],
             )
         else:
             return ValidationResult(
@@ -8,7 +8,7 @@ import re
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -64,7 +64,7 @@ class RegexValidator(BaseValidator):
         errors = []
         if invalid_count > 0:
             errors.append(
-                f"{invalid_count} records in '{column}' don't match pattern '{pattern}'"
+                CountedMessage(f"{{count}} records in '{column}' don't match pattern '{pattern}'", invalid_count)
             )
 
         return ValidationResult(
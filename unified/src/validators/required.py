@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
 from ..core.schemas import ValidatorConfig
 
 
@@ -42,7 +42,7 @@ class RequiredValidator(BaseValidator):
             col_valid = df[col].notna() & (df[col].astype(str).str.strip() != "")
             invalid_count = (~col_valid).sum()
             if invalid_count > 0:
-                errors.append(f"Column '{col}' has {invalid_count} empty/null values")
+                errors.append(CountedMessage(f"Column '{col}' has {{count}} empty/null values", invalid_count))
             valid_mask = valid_mask & col_valid
 
         return ValidationResult(
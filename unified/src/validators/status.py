@@ -7,7 +7,8 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
+from ..core.matching import PatternMatcher
 from ..core.schemas import ValidatorConfig
 
 
@@ -34,12 +35,6 @@ class StatusValidator(BaseValidator):
                 errors=[f"Status column '{column}' not found"],
             )
 
-        # Normalize values for comparison
-        if case_sensitive:
-            values = df[column].astype(str).str.strip()
-        else:
-            values = df[column].astype(str).str.strip().str.upper()
-
         valid_mask = pd.Series(True, index=df.index)
         errors = []
 
@@ -47,11 +42,12 @@ class StatusValidator(BaseValidator):
         if include:
             if not case_sensitive:
                 include = [str(v).upper() for v in include]
-            include_mask = values.isin(include)
+            # Values are normalized once per unique status, not per row
+            include_mask = PatternMatcher([include], "exact", case_sensitive).matches(df[column])
             excluded = (~include_mask).sum()
             if excluded > 0:
                 errors.append(
-                    f"{excluded} records excluded (status not in: {include})"
+                    CountedMessage(f"{{count}} records excluded (status not in: {include})", excluded)
                 )
             valid_mask = valid_mask & include_mask
 
@@ -59,11 +55,11 @@ class StatusValidator(BaseValidator):
         if exclude:
             if not case_sensitive:
                 exclude = [str(v).upper() for v in exclude]
-            exclude_mask = values.isin(exclude)
+            exclude_mask = PatternMatcher([exclude], "exact", case_sensitive).matches(df[column])
             excluded = exclude_mask.sum()
             if excluded > 0:
                 errors.append(
-                    f"{excluded} records excluded (status in: {exclude})"
+                    CountedMessage(f"{{count}} records excluded (status in: {exclude})", excluded)
                 )
             valid_mask = valid_mask & ~exclude_mask
 
@@ -7,7 +7,8 @@ from __future__ import annotations
 
 import pandas as pd
 
-from ..core.base import BaseValidator, ValidationResult
+from ..core.base import BaseValidator, CountedMessage, ValidationResult
+from ..core.matching import PatternMatcher
 from ..core.schemas import ValidatorConfig
 
 
@@ -35,12 +36,6 @@ class TypeFilterValidator(BaseValidator):
                 errors=[f"Type column '{column}' not found"],
             )
 
-        # Normalize values for comparison
-        if case_sensitive:
-            values = df[column].astype(str).str.strip()
-        else:
-            values = df[column].astype(str).str.strip().str.upper()
-
         valid_mask = pd.Series(True, index=df.index)
         errors = []
 
@@ -49,22 +44,12 @@ class TypeFilterValidator(BaseValidator):
             if not case_sensitive:
                 include = [str(v).upper() for v in include]
 
-            if match_mode == "exact":
-                include_mask = values.isin(include)
-            elif match_mode == "contains":
-                include_mask = pd.Series(False, index=df.index)
-                for pattern in include:
-                    include_mask = include_mask | values.str.contains(pattern, na=False, regex=False)
-            elif match_mode == "startswith":
-                include_mask = pd.Series(False, index=df.index)
-                for pattern in include:
-                    include_mask = include_mask | values.str.startswith(pattern, na=False)
-            else:
-                include_mask = values.isin(include)
+            # exact/contains/startswith in one pass over the unique types
+            include_mask = PatternMatcher([include], match_mode, case_sensitive).matches(df[column])
 
             excluded = (~include_mask).sum()
             if excluded > 0:
-                errors.append(f"{excluded} records excluded (type not in allowed list)")
+                errors.append(CountedMessage("{count} records excluded (type not in allowed list)", excluded))
             valid_mask = valid_mask & include_mask
 
         # Apply exclude filter
@@ -72,22 +57,12 @@ class TypeFilterValidator(BaseValidator):
             if not case_sensitive:
                 exclude = [str(v).upper() for v in exclude]
 
-            if match_mode == "exact":
-                exclude_mask = values.isin(exclude)
-            elif match_mode == "contains":
-                exclude_mask = pd.Series(False, index=df.index)
-                for pattern in exclude:
-                    exclude_mask = exclude_mask | values.str.contains(pattern, na=False, regex=False)
-            elif match_mode == "startswith":
-                exclude_mask = pd.Series(False, index=df.index)
-                for pattern in exclude:
-                    exclude_mask = exclude_mask | values.str.startswith(pattern, na=False)
-            else:
-                exclude_mask = values.isin(exclude)
+            # exact/contains/startswith in one pass over the unique types
+            exclude_mask = PatternMatcher([exclude], match_mode, case_sensitive).matches(df[column])
 
             excluded = exclude_mask.sum()
             if excluded > 0:
-                errors.append(f"{excluded} records excluded (type in exclusion list)")
+                errors.append(CountedMessage("{count} records excluded (type in exclusion list)", excluded))
             valid_mask = valid_mask & ~exclude_mask
 
         return ValidationResult(
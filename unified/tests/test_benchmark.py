@@ -0,0 +1,58 @@
+"""
+Tests for the synthetic data generator and the benchmark suite.
+Validates the dirty-data features of the generated datasets, a small
+benchmark run and the regression comparison against a baseline report.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.benchmark import comparar_com_referencia, executar_benchmark, filtrar_casos, montar_casos
+from src.utils.dados_sinteticos import GERADORES, gerar_dataset, gerar_max, gerar_vic
+
+
+def test_generators_are_deterministic_and_dirty():
+    for nome in GERADORES:
+        df = gerar_dataset(nome, 400, semente=3)
+        assert len(df) == 400
+        pd.testing.assert_frame_equal(df, gerar_dataset(nome, 400, semente=3))
+
+    vic = gerar_vic(5000, semente=1)
+    docs = vic["CPFCNPJ_CLIENTE"]
+    assert vic.duplicated().any()
+    assert vic.duplicated(["NUMERO_CONTRATO", "PARCELA"]).sum() > vic.duplicated().sum()
+    assert docs.str.contains(r"[.\-/ ]").any() and docs.eq("").any()
+    assert vic["NOME_RAZAO_SOCIAL"].str.contains("\n").any()
+    assert vic["VENCIMENTO"].str.match(r"^\d{4}-\d{2}-\d{2}").any()
+    assert vic["VENCIMENTO"].str.match(r"^\d{2}/\d{2}/\d{4}$").mean() > 0.9
+
+    chaves = gerar_max(5000, semente=1)["PARCELA"]
+    assert chaves.str.fullmatch(r"\d+-\d{2}").mean() > 0.9
+    assert not chaves.str.fullmatch(r"\d+-\d{2}").all()
+
+
+def test_benchmark_run_and_regression_check(tmp_path):
+    casos = filtrar_casos(montar_casos(), ["loader.file.vic", "validador.vic.client", "processador.vic.tratamento"])
+    relatorio = executar_benchmark((300,), casos, diretorio_trabalho=tmp_path)
+
+    status = {r["caso"]: r["status"] for r in relatorio["resultados"]}
+    assert status["loader.file.vic"] == "ok"
+    assert status["validador.vic.client.status"] == "ok"
+    assert status["processador.vic.tratamento"] in {"ok", "indisponivel"}
+    assert all(r["linhas"] == 300 for r in relatorio["resultados"])
+
+    referencia = {"resultados": [
+        {"caso": "a", "linhas": 10, "segundos": 1.0, "status": "ok"},
+        {"caso": "b", "linhas": 10, "segundos": 1.0, "status": "ok"},
+        {"caso": "c", "linhas": 10, "segundos": 0.01, "status": "ok"},
+    ]}
+    atual = {"resultados": [
+        {"caso": "a", "linhas": 10, "segundos": 1.5, "status": "ok"},
+        {"caso": "b", "linhas": 10, "segundos": 1.1, "status": "ok"},
+        {"caso": "c", "linhas": 10, "segundos": 0.04, "status": "ok"},
+    ]}
+    regressoes = comparar_com_referencia(atual, referencia, limite=0.2)
+    assert [(r["caso"], r["variacao"]) for r in regressoes] == [("a", 0.5)]
@@ -0,0 +1,93 @@
+"""
+Tests for the dataset catalog (run manifest).
+Validates O(1) latest-file resolution, tie handling, lineage, concurrent
+registration and hash reuse for unchanged files.
+"""
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import catalog
+from src.utils.catalog import CATALOG_FILENAME, DatasetCatalog, linhagem, resolver_mais_recente
+from src.utils.io import DatasetIO
+
+
+def test_latest_file_uses_catalog_on_mtime_tie(tmp_path):
+    io = DatasetIO(separator=";", encoding="utf-8")
+    df = pd.DataFrame({"PARCELA": ["1", "2"], "VALOR": ["1,0", "2,0"]})
+
+    primeiro = io.write_zip({"max_b.csv": df}, tmp_path / "max_tratada_b.zip")
+    segundo = io.write_zip({"max_a.csv": df.head(1)}, tmp_path / "max_tratada_a.zip")
+    # Mesmo mtime: o glob por st_mtime escolheria pelo nome, não pela ordem de escrita
+    os.utime(primeiro, (1_000_000, 1_000_000))
+    os.utime(segundo, (1_000_000, 1_000_000))
+
+    assert DatasetIO.latest_file(tmp_path, "max_tratada_*.zip") == segundo
+
+    entry = DatasetCatalog(tmp_path).entrada(segundo)
+    assert entry.rows == 1
+    assert entry.columns == ["PARCELA", "VALOR"]
+    assert entry.members == {"max_a.csv": 1}
+
+
+def test_fallback_to_glob_without_catalog(tmp_path):
+    (tmp_path / "base_1.csv").write_text("A\n1\n")
+    (tmp_path / "base_2.csv").write_text("A\n2\n")
+    os.utime(tmp_path / "base_1.csv", (2_000_000, 2_000_000))
+    os.utime(tmp_path / "base_2.csv", (1_000_000, 1_000_000))
+
+    assert not (tmp_path / CATALOG_FILENAME).exists()
+    assert resolver_mais_recente(tmp_path, "base_*.csv").name == "base_1.csv"
+
+
+def test_lineage_links_output_to_inputs(tmp_path):
+    io = DatasetIO(separator=";", encoding="utf-8")
+    entrada = io.write_zip({"max.csv": pd.DataFrame({"A": ["1"]})}, tmp_path / "in" / "max.zip")
+    saida = io.write_zip(
+        {"out.csv": pd.DataFrame({"A": ["1"]})}, tmp_path / "out" / "out.zip", inputs=[entrada]
+    )
+
+    arvore = linhagem(saida)
+    assert arvore["inputs"][0]["path"] == str(entrada.resolve())
+    assert arvore["inputs"][0]["content_hash"] == DatasetCatalog(entrada.parent).entrada(entrada).content_hash
+
+
+def test_concurrent_registration_keeps_every_entry(tmp_path):
+    arquivos = []
+    for i in range(16):
+        arquivo = tmp_path / f"parte_{i:02d}.csv"
+        arquivo.write_text(f"A\n{i}\n")
+        arquivos.append(arquivo)
+
+    threads = [threading.Thread(target=catalog.registrar_dataset, args=(a,)) for a in arquivos]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entradas = DatasetCatalog(tmp_path).entries
+    assert sorted(entradas) == [a.name for a in arquivos]
+    assert sorted(e.seq for e in entradas.values()) == list(range(1, 17))
+
+
+def test_unchanged_file_is_not_hashed_again(tmp_path, monkeypatch):
+    arquivo = tmp_path / "base.csv"
+    arquivo.write_text("A\n1\n")
+    catalog.registrar_dataset(arquivo)
+
+    chamadas = []
+    original = catalog.hash_conteudo
+    monkeypatch.setattr(catalog, "hash_conteudo", lambda p, *a: chamadas.append(p) or original(p, *a))
+
+    catalog.registrar_dataset(arquivo, entradas=[arquivo])
+    assert chamadas == []
+
+    arquivo.write_text("A\n2\n")
+    os.utime(arquivo, ns=(1, 1))
+    catalog.registrar_dataset(arquivo)
+    assert chamadas == [arquivo]
@@ -0,0 +1,132 @@
+"""
+Tests for stage checkpoints and PipelineEngine resume.
+Validates that unchanged stages are skipped, changed inputs (including files
+named in processor params) rerun, a full run re-emits the enrichment and plain
+runs write no checkpoints.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import ConfigLoader, PipelineEngine, ProcessorResult, ProcessorType
+from src.core.base import BaseProcessor
+from src.core.checkpoint import CheckpointStore, stage_key
+
+
+class CountingProcessor(BaseProcessor):
+    calls = 0
+    full = []
+
+    @property
+    def name(self) -> str:
+        return "counting"
+
+    def process(self, client_data, max_data, context):
+        CountingProcessor.calls += 1
+        CountingProcessor.full.append(context.get("full", False))
+        output = Path(context["output_dir"]) / "resultado.csv"
+        client_data.to_csv(output, index=False)
+        return ProcessorResult(
+            data=client_data.assign(PROCESSADO="1"),
+            metadata={},
+            output_files=[output],
+            errors=[],
+        )
+
+
+def _config(path: Path, params=None, processor="tratamento"):
+    return ConfigLoader().load_from_dict(
+        {
+            "name": "teste",
+            "client_source": {
+                "loader": {"type": "file", "params": {"path": str(path), "separator": ";"}},
+                "key": {"type": "column", "column": "CHAVE"},
+            },
+            "pipeline": {"processors": [{"type": processor, "params": params or {}}]},
+        }
+    )
+
+
+def test_store_run_skips_when_key_matches(tmp_path):
+    store = CheckpointStore(tmp_path / "ck")
+    chamadas = []
+
+    def etapa():
+        chamadas.append(1)
+        return {"total": 3}
+
+    chave = stage_key([], parametro="a")
+    assert store.run("etapa", chave, etapa) == {"total": 3}
+    assert not store.directory.exists()  # sem --resume nada é gravado
+    assert store.run("etapa", chave, etapa, resume=True) == {"total": 3}
+    assert store.run("etapa", chave, etapa, resume=True) == {"total": 3}
+    store.run("etapa", stage_key([], parametro="b"), etapa, resume=True)
+    assert len(chamadas) == 3
+
+
+def test_engine_resume_reuses_unchanged_stages(tmp_path):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text("CHAVE;VALOR\n1;10\n2;20\n", encoding="utf-8")
+
+    engine = PipelineEngine(output_dir=tmp_path / "out")
+    engine.register_processor(ProcessorType.TRATAMENTO, CountingProcessor)
+    CountingProcessor.calls = 0
+
+    simples = engine.run_from_config(_config(entrada))
+    assert simples.success
+    assert not (tmp_path / "out" / "teste" / ".checkpoints").exists()
+
+    primeira = engine.run_from_config(_config(entrada), resume=True)
+    assert primeira.success
+    assert CountingProcessor.calls == 2
+    assert {p.suffix for p in (tmp_path / "out" / "teste" / ".checkpoints").iterdir()} == {".arrow", ".json"}
+
+    retomada = engine.run_from_config(_config(entrada), resume=True)
+    assert retomada.success
+    assert CountingProcessor.calls == 2
+    assert retomada.context.metadata["resumed_stages"] == ["prepared", "processor_0_tratamento"]
+    assert list(retomada.context.client_data["PROCESSADO"]) == ["1", "1"]
+
+    entrada.write_text("CHAVE;VALOR\n1;10\n2;20\n3;30\n", encoding="utf-8")
+    alterada = engine.run_from_config(_config(entrada), resume=True)
+    assert CountingProcessor.calls == 3
+    assert len(alterada.context.client_data) == 3
+
+
+def test_processor_input_files_are_part_of_the_key(tmp_path):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text("CHAVE;VALOR\n1;10\n", encoding="utf-8")
+    judicial = tmp_path / "judicial.csv"
+    judicial.write_text("CPF\n1\n", encoding="utf-8")
+    params = {"judicial_source": str(judicial)}
+
+    engine = PipelineEngine(output_dir=tmp_path / "out")
+    engine.register_processor(ProcessorType.TRATAMENTO, CountingProcessor)
+    CountingProcessor.calls = 0
+
+    engine.run_from_config(_config(entrada, params), resume=True)
+    engine.run_from_config(_config(entrada, params), resume=True)
+    assert CountingProcessor.calls == 1
+
+    judicial.write_text("CPF\n1\n2\n", encoding="utf-8")
+    alterada = engine.run_from_config(_config(entrada, params), resume=True)
+    assert CountingProcessor.calls == 2
+    assert alterada.context.metadata["resumed_stages"] == ["prepared"]
+
+
+def test_full_run_reemits_enrichment_despite_checkpoint(tmp_path):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text("CHAVE;VALOR\n1;10\n", encoding="utf-8")
+
+    engine = PipelineEngine(output_dir=tmp_path / "out")
+    engine.register_processor(ProcessorType.ENRIQUECIMENTO, CountingProcessor)
+    CountingProcessor.calls, CountingProcessor.full = 0, []
+
+    engine.run_from_config(_config(entrada, processor="enriquecimento"), resume=True)
+    engine.run_from_config(_config(entrada, processor="enriquecimento"), resume=True)
+    completa = engine.run_from_config(_config(entrada, processor="enriquecimento"), resume=True, full=True)
+
+    assert completa.success
+    assert CountingProcessor.full == [False, True]
+    assert completa.context.metadata["resumed_stages"] == ["prepared"]
@@ -0,0 +1,78 @@
+"""
+Tests for the compiled configuration cache.
+Validates reuse of parsed configs, invalidation by mtime/content hash,
+shared validators across engine runs and the legacy loader env cache.
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.loader import ConfigLoader as LegacyConfigLoader
+from src.core import ConfigLoader, ConfigRegistry, PipelineEngine
+
+YAML = """\
+name: teste
+client_source:
+  loader:
+    type: file
+    params: {path: "%s", separator: ";"}
+  key: {type: column, column: CHAVE}
+  validators:
+    - type: required
+      params: {columns: [CHAVE]}
+"""
+
+
+def _touch(path, offset):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset))
+
+
+def test_registry_reparses_only_changed_content(tmp_path):
+    arquivo = tmp_path / "teste.yaml"
+    arquivo.write_text(YAML % "a.csv", encoding="utf-8")
+    registry = ConfigRegistry()
+
+    primeira = registry.load(arquivo)
+    assert registry.load(arquivo) is primeira
+
+    _touch(arquivo, 1_000_000)  # mtime only: hash matches, no re-parse
+    assert registry.load(arquivo) is primeira
+    assert registry.parses == 1
+
+    arquivo.write_text(YAML % "b.csv", encoding="utf-8")
+    _touch(arquivo, 2_000_000)
+    nova = registry.load(arquivo)
+    assert nova is not primeira
+    assert nova.client_source.loader.params["path"] == "b.csv"
+    assert registry.parses == 2
+
+
+def test_engine_reuses_compiled_validators(tmp_path):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text("CHAVE;VALOR\n1;10\n;20\n", encoding="utf-8")
+    (tmp_path / "teste.yaml").write_text(YAML % entrada.as_posix(), encoding="utf-8")
+
+    engine = PipelineEngine(config_dir=tmp_path, output_dir=tmp_path / "out")
+    assert engine.run("teste").context.client_data["CHAVE"].tolist() == ["1"]
+    config = ConfigLoader(tmp_path).load("teste")
+    validators = engine.config_loader.compile(config).validators()
+
+    assert engine.run("teste").success
+    assert ConfigLoader(tmp_path).load("teste") is config
+    assert engine.config_loader.compile(config).validators() is validators
+
+
+def test_legacy_loader_cache_follows_environment(tmp_path, monkeypatch):
+    arquivo = tmp_path / "config.yaml"
+    arquivo.write_text("global:\n  empresa:\n    cnpj: ${CNPJ_TESTE}\n", encoding="utf-8")
+    monkeypatch.setenv("CNPJ_TESTE", "111")
+
+    primeira = LegacyConfigLoader.load(arquivo)
+    primeira["global"]["empresa"]["cnpj"] = "alterado"
+    assert LegacyConfigLoader.load(arquivo)["global"]["empresa"]["cnpj"] == "111"
+
+    monkeypatch.setenv("CNPJ_TESTE", "222")
+    assert LegacyConfigLoader.load(arquivo)["global"]["empresa"]["cnpj"] == "222"
@@ -0,0 +1,53 @@
+"""
+Tests for the sent-contacts history of the contact enrichment.
+Validates that only new or changed contacts are emitted after the first run.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.historico_contatos import HistoricoContatos
+
+
+def _contatos(nome="Ana"):
+    return pd.DataFrame(
+        {
+            "CPFCNPJ CLIENTE": ["1", "1", "2"],
+            "TELEFONE": ["11999990000", "", "11888880000"],
+            "EMAIL": ["", "Ana@X.com", ""],
+            "NOME": [nome, nome, "Bia"],
+            "TELEFONE PRINCIPAL": ["1", "1", "1"],
+            "TIPO": ["TEL", "EMAIL", "TEL"],
+            "CONTATO": ["11999990000", "ana@x.com", "11888880000"],
+        }
+    )
+
+
+def test_only_new_or_changed_contacts_are_emitted(tmp_path):
+    historico = HistoricoContatos(tmp_path / "historico.pkl")
+
+    novos, enviados = historico.filtrar_novos(_contatos())
+    assert (len(novos), enviados) == (3, 0)
+    historico.registrar(novos)
+
+    novos, enviados = historico.filtrar_novos(_contatos())
+    assert (len(novos), enviados) == (0, 3)
+
+    novos, enviados = historico.filtrar_novos(_contatos("Ana Maria"))
+    assert list(novos["CONTATO"]) == ["11999990000", "ana@x.com"]
+    assert enviados == 1
+
+
+def test_registrar_keeps_first_send_date(tmp_path):
+    historico = HistoricoContatos(tmp_path / "historico.pkl")
+    primeiro = pd.Timestamp("2024-01-01")
+    historico.registrar(_contatos(), primeiro)
+    total = historico.registrar(_contatos("Ana Maria").iloc[:1], pd.Timestamp("2024-01-02"))
+
+    dados = historico.carregar().set_index("CONTATO")
+    assert total == 3
+    assert dados.loc["11999990000", "PRIMEIRO_ENVIO"] == primeiro
+    assert dados.loc["11999990000", "ULTIMO_ENVIO"] == pd.Timestamp("2024-01-02")
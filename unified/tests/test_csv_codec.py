@@ -0,0 +1,82 @@
+"""
+Tests for the Arrow CSV codec.
+Validates that reading matches pd.read_csv(dtype=str), that writing is
+byte-identical to DataFrame.to_csv, including quoting, BOM, comma decimals and
+Python ints beyond int64, and the quote-aware byte-block row counter.
+"""
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.io.csv_codec import EscritorCSV, contar_linhas, csv_bytes, ler_csv
+
+TEXTOS = ["abc", "x;y", 'aspas "x"', "duas\nlinhas", "", " espaço ", "NA", "é ç", None]
+
+
+def _frame(linhas=200):
+    rng = np.random.default_rng(7)
+    escolha = lambda: [TEXTOS[i] for i in rng.integers(0, len(TEXTOS), linhas)]  # noqa: E731
+    return pd.DataFrame(
+        {
+            "NOME": escolha(),
+            "CONTRATO": rng.integers(0, 10**9, linhas),
+            "VALOR": np.where(rng.random(linhas) < 0.2, np.nan, rng.normal(0, 1e5, linhas)),
+            "ATIVO": rng.random(linhas) < 0.5,
+            "VENCIMENTO": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 900, linhas), "D"),
+            "OBS;EXTRA": escolha(),
+        }
+    )
+
+
+@pytest.mark.parametrize("decimal", [".", ","])
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-8"])
+def test_writer_matches_to_csv(decimal, encoding):
+    df = _frame()
+    esperado = df.to_csv(index=False, sep=";", decimal=decimal).encode(encoding)
+    assert csv_bytes(df, sep=";", encoding=encoding, decimal=decimal) == esperado
+
+    destino = io.BytesIO()
+    escritor = EscritorCSV(destino, sep=";", encoding=encoding, decimal=decimal)
+    for inicio in range(0, len(df), 33):
+        escritor.escrever(df.iloc[inicio:inicio + 33])
+    assert destino.getvalue() == esperado
+    assert escritor.linhas == len(df)
+
+
+def test_writer_falls_back_for_ints_beyond_int64():
+    df = pd.DataFrame({"x": [10**20, 1, None]})
+    assert csv_bytes(df, sep=";") == df.to_csv(index=False, sep=";").encode("utf-8-sig")
+
+
+def test_reader_matches_read_csv():
+    dados = _frame().to_csv(index=False, sep=";").encode("utf-8-sig")
+
+    esperado = pd.read_csv(io.BytesIO(dados), sep=";", dtype=str)
+    pd.testing.assert_frame_equal(ler_csv(io.BytesIO(dados)), esperado)
+
+    subset = lambda nome: nome in {"NOME", "VALOR"}  # noqa: E731
+    esperado = pd.read_csv(io.BytesIO(dados), sep=";", dtype=str, usecols=subset)
+    pd.testing.assert_frame_equal(ler_csv(io.BytesIO(dados), usecols=subset), esperado)
+
+
+def test_reader_falls_back_for_short_rows():
+    dados = b"A;B\n1;2\n3\n"
+    esperado = pd.read_csv(io.BytesIO(dados), sep=";", dtype=str)
+    pd.testing.assert_frame_equal(ler_csv(io.BytesIO(dados)), esperado)
+
+
+def test_row_counter_skips_quoted_newlines_across_blocks():
+    dados = _frame(500).to_csv(index=False, sep=";").encode("utf-8-sig")
+    esperado = len(pd.read_csv(io.BytesIO(dados), sep=";", dtype=str))
+    for tamanho_bloco in (5, 64, 1 << 20):
+        assert contar_linhas(io.BytesIO(dados), tamanho_bloco) == esperado
+
+    assert contar_linhas(io.BytesIO(b'A;B\n1;"x\ny"\n2;3')) == 2
+    assert contar_linhas(io.BytesIO(b"A;B\n")) == 0
+    assert contar_linhas(io.BytesIO(b"")) == 0
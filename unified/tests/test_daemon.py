@@ -0,0 +1,122 @@
+"""
+Tests for the warm pipeline daemon.
+Validates jobs submitted over the Unix socket, job status, unknown clients,
+per-client queueing with per-job run ids and that reference lists are read
+once per file version.
+"""
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.daemon import DaemonServer, PipelineDaemon, request_daemon
+from src.core.reference_cache import ReferenceCache
+from src.utils.log_estruturado import id_execucao
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets required")
+
+YAML = """\
+name: teste
+client_source:
+  loader:
+    type: file
+    params: {path: "%s", separator: ";"}
+  key: {type: column, column: CHAVE}
+"""
+
+
+def test_socket_jobs_run_on_warm_engine(tmp_path):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text("CHAVE;VALOR\n1;10\n2;20\n", encoding="utf-8")
+    configs = tmp_path / "configs"
+    configs.mkdir()
+    (configs / "teste.yaml").write_text(YAML % entrada.as_posix(), encoding="utf-8")
+
+    daemon = PipelineDaemon(configs, tmp_path / "out", workers=2)
+    assert daemon.warm() == ["teste"]
+    socket_path = tmp_path / "pipeline.sock"
+    server = DaemonServer(daemon, socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert request_daemon({"action": "ping"}, socket_path, timeout=5)["pid"] == os.getpid()
+
+        resposta = request_daemon({"action": "run", "client": "teste", "wait": True}, socket_path, timeout=30)
+        assert resposta["success"]
+        assert resposta["job"]["status"] == "success"
+        assert resposta["job"]["summary"]["client_records"] == 2
+
+        segunda = request_daemon({"action": "run", "client": "teste"}, socket_path, timeout=5)
+        job_id = segunda["job"]["job_id"]
+        assert daemon.wait(job_id, timeout=30).status == "success"
+        status = request_daemon({"action": "status", "job_id": job_id}, socket_path, timeout=5)
+        assert status["job"]["status"] == "success"
+        assert len(request_daemon({"action": "jobs"}, socket_path, timeout=5)["jobs"]) == 2
+
+        desconhecido = request_daemon({"action": "run", "client": "nao_existe"}, socket_path, timeout=5)
+        assert not desconhecido["success"]
+
+        assert request_daemon({"action": "shutdown"}, socket_path, timeout=5)["success"]
+        thread.join(timeout=5)
+    finally:
+        server.server_close()
+        daemon.close()
+    assert not socket_path.exists()
+
+
+def test_reference_cache_reloads_changed_files(tmp_path):
+    arquivo = tmp_path / "blacklist.csv"
+    arquivo.write_text("CPF\n1\n", encoding="utf-8")
+    cache = ReferenceCache()
+    leituras = []
+
+    def carregar():
+        leituras.append(1)
+        return frozenset(arquivo.read_text(encoding="utf-8").split()[1:])
+
+    assert cache.get(arquivo, "CPF", carregar) == {"1"}
+    assert cache.get(arquivo, "CPF", carregar) == {"1"}
+    assert len(leituras) == 1
+
+    arquivo.write_text("CPF\n1\n2\n", encoding="utf-8")
+    assert cache.get(arquivo, "CPF", carregar) == {"1", "2"}
+    assert len(leituras) == 2
+
+
+
+def test_same_client_jobs_queue_without_holding_workers(tmp_path):
+    class _Engine:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.ativos, self.ordem, self.execucoes = {}, [], []
+
+        def run(self, client, resume=False):
+            with self.lock:
+                self.ativos[client] = self.ativos.get(client, 0) + 1
+                self.ordem.append((client, self.ativos[client]))
+                self.execucoes.append(id_execucao())
+            time.sleep(0.05)
+            with self.lock:
+                self.ativos[client] -= 1
+            raise RuntimeError("sem resultado")  # recorded as a failed job
+
+    engine = _Engine()
+    daemon = PipelineDaemon(tmp_path, tmp_path / "out", workers=2, engine=engine)
+    try:
+        jobs = [daemon.submit("a") for _ in range(3)] + [daemon.submit("b")]
+        for job in jobs:
+            daemon.wait(job.job_id, timeout=10)
+    finally:
+        daemon.close()
+
+    assert all(ativos == 1 for _, ativos in engine.ordem)  # one run per client at a time
+    assert [client for client, _ in engine.ordem].index("b") < 2  # "b" did not wait behind "a"
+    assert all(job.status == "failed" for job in jobs)
+    assert sorted(engine.execucoes) == sorted(job.run_id for job in jobs)
+    assert len(set(engine.execucoes)) == 4
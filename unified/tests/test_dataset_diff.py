@@ -0,0 +1,114 @@
+"""
+Tests for the streaming dataset diff.
+Validates added/removed/changed keys, per-column change counts and the
+difference sample across CSV, ZIP and Parquet inputs, an explicit empty
+column list, missing key columns reported as differences, and record counts
+taken from the catalog metadata without parsing.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils import dataset_diff
+from src.utils.catalog import CATALOG_FILENAME
+from src.utils.dataset_diff import colunas_dataset, comparar_datasets, contar_registros
+from src.utils.io import write_csv_to_zip
+
+
+def _versoes():
+    antes = pd.DataFrame(
+        {
+            "CHAVE": [f"K{i}" for i in range(50)],
+            "VALOR": [f"{i},00" for i in range(50)],
+            "STATUS": ["ABERTO"] * 50,
+        }
+    )
+    depois = antes.iloc[2:].copy()
+    depois.loc[10, "VALOR"] = "999,00"
+    depois.loc[11, ["VALOR", "STATUS"]] = ["1,00", "BAIXADO"]
+    depois = pd.concat(
+        [depois, pd.DataFrame({"CHAVE": [" K99 "], "VALOR": ["5,00"], "STATUS": ["ABERTO"]})]
+    )
+    return antes, depois
+
+
+def test_diff_reports_keys_and_column_changes(tmp_path):
+    antes, depois = _versoes()
+    esquerda = write_csv_to_zip({"antes.csv": antes}, tmp_path / "antes.zip", sep=";")
+    direita = tmp_path / "depois.csv"
+    depois.to_csv(direita, sep=";", index=False, encoding="utf-8-sig")
+
+    resultado = comparar_datasets(
+        esquerda, direita, ["CHAVE"], particoes=3, saida_amostra=tmp_path / "amostra.csv"
+    )
+
+    assert (resultado["registros_esquerda"], resultado["registros_direita"]) == (50, 49)
+    assert resultado["removidas"] == 2
+    assert resultado["adicionadas"] == 1
+    assert resultado["alteradas"] == 2
+    assert resultado["iguais"] == 46
+    assert resultado["alteracoes_por_coluna"] == {"VALOR": 2, "STATUS": 1}
+
+    alteracoes = {
+        (linha["CHAVE"], linha["COLUNA"]): (linha["ANTES"], linha["DEPOIS"])
+        for linha in resultado["amostra"]
+        if linha["TIPO"] == "ALTERADA"
+    }
+    assert alteracoes[("K11", "STATUS")] == ("ABERTO", "BAIXADO")
+    assert alteracoes[("K10", "VALOR")] == ("10,00", "999,00")
+    chaves = {(linha["TIPO"], linha["CHAVE"]) for linha in resultado["amostra"] if linha["TIPO"] != "ALTERADA"}
+    assert chaves == {("REMOVIDA", "K0"), ("REMOVIDA", "K1"), ("ADICIONADA", "K99")}
+    assert pd.read_csv(resultado["arquivo_amostra"], sep=";").shape[0] == len(resultado["amostra"])
+
+
+def test_diff_reads_parquet_and_detects_identical(tmp_path):
+    antes, _ = _versoes()
+    esquerda = tmp_path / "antes.parquet"
+    antes.to_parquet(esquerda, index=False)
+
+    resultado = comparar_datasets(esquerda, antes, ["CHAVE"])
+
+    assert resultado["iguais"] == 50
+    assert resultado["adicionadas"] == resultado["removidas"] == resultado["alteradas"] == 0
+    assert resultado["amostra"] == []
+
+
+def test_empty_column_list_compares_keys_only(tmp_path):
+    antes, depois = _versoes()
+
+    resultado = comparar_datasets(antes, depois, ["CHAVE"], colunas=[])
+
+    assert resultado["colunas_comparadas"] == []
+    assert resultado["alteradas"] == 0
+    assert resultado["iguais"] == 48
+
+
+def test_missing_key_column_is_reported_as_difference():
+    antes, depois = _versoes()
+
+    resultado = comparar_datasets(antes, depois.rename(columns={"CHAVE": "ID"}), ["CHAVE"])
+
+    assert resultado["chaves_ausentes"] == {"esquerda": [], "direita": ["CHAVE"]}
+    assert (resultado["removidas"], resultado["adicionadas"]) == (50, 49)
+    assert resultado["iguais"] == resultado["alteradas"] == 0
+
+
+def test_record_count_reads_catalog_then_falls_back_to_bytes(tmp_path, monkeypatch):
+    antes, _ = _versoes()
+    antes.loc[3, "STATUS"] = "linha\nquebrada"
+    destino = write_csv_to_zip({"base.csv": antes}, tmp_path / "base.zip", sep=";")
+
+    def sem_leitura(*_args, **_kwargs):
+        raise AssertionError("arquivo relido")
+
+    with monkeypatch.context() as m:
+        m.setattr(dataset_diff, "contar_linhas", sem_leitura)
+        m.setattr(dataset_diff, "iterar_csv", sem_leitura)
+        assert contar_registros(destino) == 50
+        assert colunas_dataset(destino) == ["CHAVE", "VALOR", "STATUS"]
+
+    (tmp_path / CATALOG_FILENAME).unlink()
+    assert contar_registros(destino) == 50
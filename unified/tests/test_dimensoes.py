@@ -0,0 +1,77 @@
+"""
+Tests for the dimension-cache extraction mode.
+Validates identical output columns/order and incremental dimension refresh.
+"""
+import re
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.dimensoes import CacheDimensoes, montar_saida
+
+PESSOAS = {232: ("VIC ENGENHARIA", "12.086.678/0001-18"), 7: ("ANA", "222.222.222-22"), 5: ("BRUNO", "111.111.111-11")}
+CAMPANHAS = {4: "JUDICIAL", 9: "COBRANCA"}
+STATUS = {0: "Aberto", 1: "Liquidado com acordo"}
+
+
+class Servidor:
+    """Answers the dimension queries the way the scalar UDFs would."""
+
+    def __init__(self):
+        self.ids_consultados = []
+
+    def __call__(self, sql):
+        ids = [int(i) for i in re.findall(r"\((\d+)\)", sql.split("VALUES", 1)[1])]
+        self.ids_consultados.extend(ids)
+        if "RetornaNomeRazaoSocial" in sql:
+            return pd.DataFrame([(i, *PESSOAS[i]) for i in ids], columns=["ID", "NOME", "DOCUMENTO"])
+        tabela = CAMPANHAS if "RetornaNomeCampanha" in sql else STATUS
+        return pd.DataFrame([(i, tabela[i]) for i in ids], columns=["ID", "NOME"])
+
+
+def _movimentacoes():
+    return pd.DataFrame(
+        {
+            "MoCampanhasID": [9, 4, 9],
+            "MoClientesID": [232, 232, 232],
+            "MoInadimplentesID": [7, 5, 7],
+            "NUMERO_CONTRATO": ["C2", "C1", "C2"],
+            "EMPREENDIMENTO": ["E", "E", "E"],
+            "DATA_CADASTRO": ["2024-01-01"] * 3,
+            "PARCELA": ["2", "1", "2"],
+            "VENCIMENTO": ["2024-03-01", "2024-02-01", "2024-03-01"],
+            "VALOR": ["10", "20", "10"],
+            "MoStatusMovimentacao": [0, 1, 0],
+            "TIPO_PARCELA": ["P", "P", "P"],
+        }
+    )
+
+
+def test_vic_output_matches_udf_query_layout(tmp_path):
+    servidor = Servidor()
+    saida = montar_saida("vic", _movimentacoes(), CacheDimensoes(tmp_path, servidor))
+
+    assert list(saida.columns) == [
+        "CAMPANHA", "CREDOR", "CNPJ_CREDOR", "CPFCNPJ_CLIENTE", "NOME_RAZAO_SOCIAL",
+        "NUMERO_CONTRATO", "EMPREENDIMENTO", "DATA_CADASTRO", "PARCELA", "VENCIMENTO",
+        "VALOR", "STATUS_TITULO", "TIPO_PARCELA",
+    ]
+    # DISTINCT + ORDER BY CPFCNPJ_CLIENTE
+    assert list(saida["NOME_RAZAO_SOCIAL"]) == ["BRUNO", "ANA"]
+    assert list(saida["CAMPANHA"]) == ["JUDICIAL", "COBRANCA"]
+    assert list(saida["STATUS_TITULO"]) == ["Liquidado com acordo", "Aberto"]
+    assert set(saida["CNPJ_CREDOR"]) == {"12.086.678/0001-18"}
+
+
+def test_dimensions_refresh_incrementally(tmp_path):
+    servidor = Servidor()
+    montar_saida("vic", _movimentacoes(), CacheDimensoes(tmp_path, servidor))
+    servidor.ids_consultados.clear()
+
+    novas = _movimentacoes()
+    novas.loc[0, "MoInadimplentesID"] = 5
+    montar_saida("vic", novas, CacheDimensoes(tmp_path, servidor))
+    assert servidor.ids_consultados == []
@@ -0,0 +1,135 @@
+"""
+Tests for the optional DuckDB execution backend.
+Validates that DuckDB joins return exactly the same frames as the pandas path
+and that file sources are queried in place (pandas fallback for encodings
+DuckDB cannot read).
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("duckdb")
+
+from src.utils.anti_join import procv_left_minus_right
+from src.utils.duckdb_backend import DuckDBBackend, abrir_backend, criar_backend
+
+
+@pytest.fixture
+def backend():
+    with DuckDBBackend(threads=2) as b:
+        yield b
+
+
+@pytest.fixture
+def frames():
+    df_left = pd.DataFrame(
+        {
+            "CHAVE": [" 001", "002", None, "003 ", "004", "004", "005\t"],
+            "VALOR": ["1,00", "2,00", "3,00", "4,00", "5,00", "6,00", "7,00"],
+        },
+        index=[10, 11, 12, 13, 14, 15, 16],
+    )
+    df_right = pd.DataFrame({"PARCELA": ["001", "003", np.nan, "004 ", "999"]})
+    return df_left, df_right
+
+
+def test_anti_join_matches_pandas(backend, frames):
+    df_left, df_right = frames
+    esperado = procv_left_minus_right(df_left, df_right, "CHAVE", "PARCELA")
+    obtido = procv_left_minus_right(df_left, df_right, "CHAVE", "PARCELA", backend=backend)
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_semi_join_raw_matches_isin(backend, frames):
+    df_left, df_right = frames
+    esperado = df_left[df_left["CHAVE"].isin(set(df_right["PARCELA"].dropna()))].copy()
+    obtido = backend.semi_join(df_left, df_right, "CHAVE", "PARCELA", normalizar=False)
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_left_join_positions_match_merge(backend):
+    df_left = pd.DataFrame({"K": ["a", "b", "c", "a"], "X": [1, 2, 3, 4]})
+    df_right = pd.DataFrame({"K": ["a", "c", "a", "z"], "V": ["10", "30", "11", "99"]})
+    esperado = df_left.merge(df_right, on="K", how="left")
+
+    pos_l, pos_r = backend.left_join_posicoes(df_left, df_right, "K", "K")
+    obtido = df_left.iloc[pos_l].reset_index(drop=True)
+    obtido["V"] = df_right["V"].reindex(pos_r).set_axis(obtido.index)
+    pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_anti_join_from_zip_source(backend, tmp_path):
+    import zipfile
+
+    caminho = tmp_path / "max.zip"
+    with zipfile.ZipFile(caminho, "w") as zf:
+        zf.writestr("max.csv", "PARCELA;STATUS\n001;A\n002;B\n003;C\n")
+    backend.registrar("max", caminho)
+    df_vic = pd.DataFrame({"CHAVE": ["002", "004"]})
+
+    resultado = backend.anti_join("max", df_vic, "PARCELA", "CHAVE")
+    assert resultado["PARCELA"].tolist() == ["001", "003"]
+    assert resultado["STATUS"].tolist() == ["A", "C"]
+
+
+def test_file_source_is_queried_in_place(backend, tmp_path, frames):
+    df_left, df_right = frames
+    caminho = tmp_path / "max.csv"
+    df_right.to_csv(caminho, sep=";", index=False, encoding="utf-8-sig")
+    backend.registrar("max", caminho, encoding="utf-8-sig")
+
+    tabelas = backend.con.execute("SELECT count(*) FROM duckdb_tables() WHERE table_name = 'max'").fetchone()[0]
+    assert tabelas == 0  # view sobre read_csv_auto, sem cópia
+    assert backend.colunas("max") == ["PARCELA"] and backend.contar("max") == 5
+
+    esperado = procv_left_minus_right(df_left, df_right, "CHAVE", "PARCELA")
+    pd.testing.assert_frame_equal(backend.anti_join(df_left, "max", "CHAVE", "PARCELA"), esperado)
+
+
+def test_unsupported_encoding_is_read_through_pandas(backend, tmp_path):
+    caminho = tmp_path / "cp1252.csv"
+    caminho.write_bytes("PARCELA;OBS\n1;“Cobrança” – 10€\n2;\n".encode("cp1252"))
+    backend.registrar("max", caminho, encoding="cp1252")
+
+    obtido = backend.con.execute('SELECT "OBS" FROM "max" ORDER BY "PARCELA"').fetchall()
+    assert obtido == [("“Cobrança” – 10€",), (None,)]
+
+
+def test_criar_backend_defaults_to_pandas(monkeypatch):
+    monkeypatch.delenv("EXECUTION_BACKEND", raising=False)
+    assert criar_backend({"execution": {"backend": "pandas"}}) is None
+    backend = criar_backend({"execution": {"backend": "duckdb", "threads": 1}})
+    assert isinstance(backend, DuckDBBackend)
+    backend.close()
+
+
+def test_abrir_backend_closes_on_exit(monkeypatch):
+    monkeypatch.delenv("EXECUTION_BACKEND", raising=False)
+    with abrir_backend({"execution": {"backend": "pandas"}}) as backend:
+        assert backend is None
+    with abrir_backend({"execution": {"backend": "duckdb", "threads": 1}}) as backend:
+        temp_dir = backend.temp_dir
+        assert temp_dir.exists()
+    assert not temp_dir.exists()
+    with pytest.raises(Exception):
+        backend.con.execute("SELECT 1")
+
+
+def test_backend_switches_on_when_inputs_exceed_budget(monkeypatch, tmp_path):
+    monkeypatch.delenv("EXECUTION_BACKEND", raising=False)
+    monkeypatch.delenv("PIPELINE_MEMORY_BUDGET", raising=False)
+    fonte = tmp_path / "max.csv"
+    fonte.write_text("CHAVE\n" + "".join(f"K{i}\n" for i in range(2000)), encoding="utf-8")
+
+    config = {"execution": {"backend": "pandas"}, "global": {"memory_budget": "1MB"}}
+    with abrir_backend(config, entradas=[fonte]) as backend:
+        assert backend is None
+    config["global"]["memory_budget"] = "4KB"
+    with abrir_backend(config, entradas=[fonte, None]) as backend:
+        assert isinstance(backend, DuckDBBackend)
+        assert backend.con.execute("SELECT current_setting('memory_limit')").fetchone()[0]
@@ -0,0 +1,156 @@
+"""
+Tests for streaming HTTP ingestion.
+Validates incremental JSON decoding, batched ZIP writing (stable columns and
+types across batches wherever the first null falls), paginated prefetch against a local HTTP server and
+that failed attempts close their streamed response before retrying.
+"""
+import json
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders import APILoader
+from src.utils.http_stream import gravar_registros_zip, iterar_array_json
+
+REGISTROS = [
+    {"ID": i, "NOME": f"João {i}", "VALOR": i * 1.5, "ATIVO": i % 2 == 0, "OBS": None}
+    for i in range(53)
+]
+
+
+def _blocos(dados: bytes, tamanho: int):
+    return (dados[i:i + tamanho] for i in range(0, len(dados), tamanho))
+
+
+@pytest.mark.parametrize("tamanho", [1, 3, 7, 4096])
+def test_decoder_matches_json_loads_for_any_chunking(tamanho):
+    dados = json.dumps(REGISTROS, ensure_ascii=False, indent=1).encode("utf-8")
+    assert list(iterar_array_json(_blocos(dados, tamanho))) == REGISTROS
+
+    documento = json.dumps({"data": {"items": REGISTROS[:3]}}).encode("utf-8")
+    extrair = lambda obj: obj["data"]["items"]  # noqa: E731
+    assert list(iterar_array_json(_blocos(documento, tamanho), extrair)) == REGISTROS[:3]
+
+
+def test_writer_streams_batches_with_single_header(tmp_path):
+    destino = tmp_path / "saida.zip"
+    total = gravar_registros_zip(iter(REGISTROS), destino, "saida.csv", tamanho_lote=10)
+
+    with zipfile.ZipFile(destino) as zf:
+        conteudo = zf.read("saida.csv")
+    assert total == len(REGISTROS)
+    assert conteudo.count(b"\xef\xbb\xbf") == 1
+    lido = pd.read_csv(destino, sep=";", dtype=str)
+    assert len(lido) == len(REGISTROS)
+    assert lido["VALOR"].iloc[1] == "1,5"
+
+
+def test_writer_keeps_columns_and_types_stable_across_batches(tmp_path):
+    registros = [{"ID": 1, "VALOR": 1.5}, {"ID": 2, "VALOR": None}, {"ID": None, "VALOR": 2.0, "NOVA": "x"}]
+
+    gravar_registros_zip(iter(registros), tmp_path / "uniao.zip", "uniao.csv", tamanho_lote=1)
+    with zipfile.ZipFile(tmp_path / "uniao.zip") as zf:
+        assert zf.read("uniao.csv").decode("utf-8-sig").splitlines() == [
+            "ID;VALOR;NOVA", "1;1,5;", "2;;", ";2,0;x"
+        ]
+
+    gravar_registros_zip(iter(registros), tmp_path / "fixo.zip", "fixo.csv", tamanho_lote=2, colunas=["VALOR", "ID"])
+    with zipfile.ZipFile(tmp_path / "fixo.zip") as zf:
+        assert zf.read("fixo.csv").decode("utf-8-sig").splitlines() == ["VALOR;ID", "1,5;1", ";2", "2,0;"]
+
+
+@pytest.mark.parametrize("tamanho_lote", [2, 10])
+def test_json_integers_keep_their_format_wherever_the_first_null_falls(tmp_path, tamanho_lote):
+    registros = [{"ID": 1, "NOME": "a"}, {"ID": 2, "NOME": "b"}, {"ID": None, "NOME": "c"}, {"ID": 3, "NOME": "d"}]
+
+    destino = tmp_path / "ids.zip"
+    gravar_registros_zip(iter(registros), destino, "ids.csv", tamanho_lote=tamanho_lote)
+    with zipfile.ZipFile(destino) as zf:
+        assert zf.read("ids.csv").decode("utf-8-sig").splitlines() == ["ID;NOME", "1;a", "2;b", ";c", "3;d"]
+
+
+class _Resposta:
+    def __init__(self, status):
+        self.status = status
+        self.fechada = False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise requests.HTTPError(f"{self.status}")
+
+    def close(self):
+        self.fechada = True
+
+
+def test_retry_closes_failed_streamed_response():
+    respostas = [_Resposta(503), _Resposta(200)]
+    loader = APILoader(LoaderConfig(type=LoaderType.API, params={}), None)
+    loader._session = type("Sessao", (), {"get": lambda self, *a, **k: respostas.pop(0)})()
+    falha, sucesso = respostas
+
+    assert loader._make_request("http://x", "GET", {}, {}, {}, None, 5, 2, 0) is sucesso
+    assert falha.fechada and not sucesso.fechada
+
+
+class _PaginasHandler(BaseHTTPRequestHandler):
+    em_voo = 0
+    pico = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            type(self).em_voo += 1
+            type(self).pico = max(type(self).pico, type(self).em_voo)
+        try:
+            query = parse_qs(urlparse(self.path).query)
+            pagina, tamanho = int(query["page"][0]), int(query["pageSize"][0])
+            itens = REGISTROS[(pagina - 1) * tamanho:pagina * tamanho]
+            corpo = json.dumps({"items": itens}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+        finally:
+            with self.lock:
+                type(self).em_voo -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _PaginasHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_paginated_prefetch_keeps_page_order(servidor):
+    config = LoaderConfig(
+        type=LoaderType.API,
+        params={
+            "base_url": servidor,
+            "endpoint": "/registros",
+            "paginated": True,
+            "page_size": 10,
+            "prefetch_pages": 3,
+        },
+    )
+    resultado = APILoader(config, None).load()
+
+    assert list(resultado.data["ID"]) == [r["ID"] for r in REGISTROS]
+    assert _PaginasHandler.pico <= 3
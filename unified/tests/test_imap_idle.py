@@ -0,0 +1,192 @@
+"""
+Tests for the IMAP IDLE email wait.
+Validates push wake-up on new mail, IDLE keepalive renewal, reconnect after a
+dropped session, the deadline and the EmailLoader wait mode, against a local
+IMAP stand-in server.
+"""
+import io
+import re
+import select
+import socketserver
+import sys
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta
+from email import policy
+from email.message import EmailMessage
+from email.utils import format_datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders.email_loader import EmailLoader
+from src.utils.imap_idle import CriterioEmail, EsperaEmail, conectar_imap
+
+REMETENTE = "adriano@4protestobh.com"
+
+
+def _mensagem(assunto, remetente=REMETENTE, data=None, anexo=None):
+    msg = EmailMessage()
+    msg["From"] = remetente
+    msg["Subject"] = assunto
+    msg["Date"] = format_datetime((data or datetime.now()).astimezone())
+    msg.set_content("Segue a base.")
+    if anexo:
+        nome, conteudo = anexo
+        msg.add_attachment(conteudo, maintype="application", subtype="zip", filename=nome)
+    return msg.as_bytes(policy=policy.SMTP)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        servidor = self.server
+        self._enviar(b"* OK IMAP4rev1 stand-in pronto")
+        while True:
+            linha = self.rfile.readline()
+            if not linha:
+                return
+            tag, _, resto = linha.strip().partition(b" ")
+            comando, _, args = resto.partition(b" ")
+            comando = comando.upper()
+            if comando == b"CAPABILITY":
+                self._enviar(b"* CAPABILITY IMAP4rev1 IDLE")
+            elif comando == b"SELECT":
+                self._enviar(b"* %d EXISTS" % len(servidor.mensagens))
+            elif comando == b"SEARCH":
+                filtro = re.search(rb'FROM "([^"]+)"', args)
+                ids = [
+                    str(i).encode() for i, msg in enumerate(list(servidor.mensagens), 1)
+                    if filtro is None or filtro.group(1) in msg
+                ]
+                self._enviar(b"* SEARCH " + b" ".join(ids))
+            elif comando == b"FETCH":
+                numero, _, item = args.partition(b" ")
+                msg = servidor.mensagens[int(numero) - 1]
+                if b"HEADER" in item:
+                    nome, dados = b"BODY[HEADER.FIELDS (FROM SUBJECT DATE)]", msg.split(b"\r\n\r\n")[0] + b"\r\n\r\n"
+                else:
+                    nome, dados = b"RFC822", msg
+                self.wfile.write(b"* %s FETCH (%s {%d}\r\n%s)\r\n" % (numero, nome, len(dados), dados))
+            elif comando == b"IDLE":
+                servidor.idles += 1
+                if servidor.quedas > 0:
+                    servidor.quedas -= 1
+                    return  # derruba a conexão no meio da sessão
+                self._idle(tag)
+                continue
+            elif comando == b"LOGOUT":
+                self._enviar(b"* BYE")
+                self._enviar(tag + b" OK LOGOUT completed")
+                return
+            self._enviar(tag + b" OK " + comando + b" completed")
+
+    def _idle(self, tag):
+        vistos = len(self.server.mensagens)
+        self._enviar(b"+ idling")
+        while True:
+            prontos, _, _ = select.select([self.connection], [], [], 0.02)
+            if prontos:
+                self.rfile.readline()  # DONE
+                self._enviar(tag + b" OK IDLE terminated")
+                return
+            if len(self.server.mensagens) > vistos:
+                vistos = len(self.server.mensagens)
+                self._enviar(b"* %d EXISTS" % vistos)
+
+    def _enviar(self, linha):
+        self.wfile.write(linha + b"\r\n")
+
+
+class _ServidorIMAP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, mensagens=(), quedas=0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.mensagens = list(mensagens)
+        self.quedas = quedas
+        self.idles = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def porta(self):
+        return self.server_address[1]
+
+    def entregar(self, mensagem, atraso):
+        threading.Timer(atraso, self.mensagens.append, [mensagem]).start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        super().__exit__(*exc)
+
+
+def _espera(servidor, **kwargs):
+    return EsperaEmail(
+        conectar=lambda: conectar_imap("127.0.0.1", "usuario", "senha", porta=servidor.porta, usar_ssl=False),
+        criterio=CriterioEmail(remetente=REMETENTE, tokens_assunto=["base de dados", "tabelionato"]),
+        **kwargs,
+    )
+
+
+def test_idle_wakes_up_on_matching_message():
+    antigas = [
+        _mensagem("Base de Dados do 4º Tabelionato", data=datetime.now() - timedelta(days=1)),
+        _mensagem("Relatório mensal", remetente="outro@exemplo.com"),
+    ]
+    with _ServidorIMAP(antigas) as servidor:
+        servidor.entregar(_mensagem("Aviso do Tabelionato"), 0.2)
+        servidor.entregar(_mensagem("Base de Dados e Relatório do 4º Tabelionato de Protestos"), 0.8)
+
+        encontrado = _espera(servidor, keepalive=0.3).aguardar(10)
+
+        assert encontrado is not None
+        assert encontrado.id == "4"
+        assert encontrado.assunto.startswith("Base de Dados e Relatório")
+        assert 0.7 < encontrado.espera_segundos < 5
+        assert servidor.idles >= 3  # keepalive renovou o IDLE
+
+        inicio = time.monotonic()
+        assert _espera(servidor).aguardar(0.5, desde=datetime.now() + timedelta(days=1)) is None
+        assert time.monotonic() - inicio < 3
+
+
+def test_reconnects_after_dropped_session():
+    with _ServidorIMAP(quedas=1) as servidor:
+        servidor.entregar(_mensagem("Base de Dados - Tabelionato"), 1.5)
+        encontrado = _espera(servidor, keepalive=5).aguardar(10)
+    assert encontrado is not None
+    assert encontrado.reconexoes == 1
+
+
+def test_email_loader_waits_then_downloads():
+    csv = "CONTRATO;PARCELA\n1;1\n2;1\n".encode("utf-8-sig")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("VicCandiotto.csv", csv)
+
+    with _ServidorIMAP() as servidor:
+        servidor.entregar(
+            _mensagem("Base VIC Candiotto", remetente="vic@exemplo.com", anexo=("candiotto.zip", buffer.getvalue())),
+            0.3,
+        )
+        config = LoaderConfig(
+            type=LoaderType.EMAIL,
+            params={
+                "server": "127.0.0.1",
+                "port": servidor.porta,
+                "ssl": False,
+                "email": "usuario",
+                "password": "senha",
+                "sender_filter": "vic@exemplo.com",
+                "subject_filter": "Candiotto",
+                "attachment_pattern": "candiotto.zip",
+                "wait_minutes": 0.2,
+            },
+        )
+        result = EmailLoader(config, None).load()
+
+    assert "error" not in result.metadata, result.metadata
+    assert result.data["CONTRATO"].tolist() == ["1", "2"]
+    assert result.metadata["waited_seconds"] > 0
@@ -0,0 +1,76 @@
+"""
+Tests for lazy imports.
+Validates the import-time budget of the CLI (python -X importtime), that
+list/validate and the API do not load pandas and that lazy registries
+resolve on first use.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.core.registry import LazyRegistry
+
+# Cumulative import time of ``src.cli`` (microseconds)
+IMPORT_BUDGET_US = 400_000
+HEAVY_MODULES = ("pandas", "numpy", "requests", "pyodbc", "sqlalchemy", "dotenv")
+
+
+def _python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def _cumulative_us(stderr, module):
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and line.rsplit("|", 1)[-1].strip() == module:
+            return int(line.split("|")[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_cli_import_time_budget():
+    _python("import src.cli")  # warm the bytecode cache
+    result = _python("import src.cli", "-X", "importtime")
+    assert _cumulative_us(result.stderr, "src.cli") < IMPORT_BUDGET_US
+
+
+def test_list_validate_and_api_skip_heavy_modules():
+    code = (
+        "import sys\n"
+        "from src import cli\n"
+        "for argv in (['list'], ['validate', 'vic']):\n"
+        "    sys.argv = ['cli', '--config-dir', 'configs/clients', *argv]\n"
+        "    cli.main()\n"
+        "print('LOADED=' + ','.join(m for m in %r if m in sys.modules))\n" % (HEAVY_MODULES,)
+    )
+    assert _python(code).stdout.rstrip().endswith("LOADED=")
+
+    pytest.importorskip("flask")
+    code = (
+        "import sys\n"
+        "from src.api.app import app\n"
+        "assert app.test_client().get('/health').status_code == 200\n"
+        "print('LOADED=' + ','.join(m for m in %r if m in sys.modules))\n" % (HEAVY_MODULES,)
+    )
+    assert _python(code).stdout.rstrip().endswith("LOADED=")
+
+
+def test_lazy_registry_resolves_on_first_use():
+    registry = LazyRegistry("validator", {"regex": ".regex:RegexValidator"}, package="src.validators")
+    registry.register("json", "json:dumps")
+
+    assert "regex" in registry and len(registry) == 2
+    import json
+
+    assert registry.get("json") is json.dumps
+    assert registry.get("regex").__name__ == "RegexValidator"
+    assert registry.get("missing") is None
+
+    registry.register("broken", ".regex:NoSuchValidator")
+    with pytest.raises(ImportError):
+        registry.get("broken")
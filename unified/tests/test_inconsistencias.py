@@ -0,0 +1,65 @@
+"""
+Tests for the bitmask inconsistency ledger.
+Validates reason texts, the valid/invalid split and the MAX/VIC validators
+built on top of it.
+"""
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.validator import InconsistenciaManager, MaxValidator, RegistroMotivos
+
+
+def test_registro_builds_reason_text_per_row():
+    df = pd.DataFrame({"ID": range(5)})
+    registro = RegistroMotivos(len(df))
+    registro.marcar([True, False, True, False, False], "A")
+    registro.marcar_posicoes([2, 3], "B")
+
+    validos, invalidos = registro.dividir(df)
+
+    assert list(validos["ID"]) == [1, 4]
+    assert list(invalidos["ID"]) == [0, 2, 3]
+    assert list(invalidos["motivo_inconsistencia"]) == ["A;", "A;B;", "B;"]
+    assert registro.contagem() == {"A": 2, "B": 2}
+
+
+def test_max_validator_marks_empty_and_malformed_keys():
+    df = pd.DataFrame({"PARCELA": ["ABC-1", "", None, "SEMHIFEN", "X-2-3"]})
+    validador = MaxValidator({}, logging.getLogger(__name__))
+
+    validos, invalidos = validador.validar_dados(df)
+
+    assert list(validos.columns) == ["PARCELA"]
+    assert list(validos["PARCELA"]) == ["ABC-1", "X-2-3"]
+    assert list(invalidos["motivo_inconsistencia"]) == [
+        "CHAVE_VAZIA;",
+        "CHAVE_VAZIA;",
+        "CHAVE_FORMATO_INVALIDO;",
+    ]
+
+
+def test_manager_accepts_batches_and_masks():
+    df = pd.DataFrame({"ID": range(6)})
+    manager = InconsistenciaManager({})
+    manager.adicionar_motivos_em_lote([0, 5], "VENCIMENTO_INVALIDO")
+    manager.adicionar_mascara(np.array([1, 0, 0, 0, 0, 1], dtype=bool), "DOC_VAZIO")
+    manager.adicionar_motivo(3, "DOC_VAZIO")
+
+    validos, invalidos = manager.dividir_validos_invalidos(df)
+
+    assert list(validos["ID"]) == [1, 2, 4]
+    assert list(invalidos["motivo_inconsistencia"]) == [
+        "VENCIMENTO_INVALIDO;DOC_VAZIO;",
+        "DOC_VAZIO;",
+        "VENCIMENTO_INVALIDO;DOC_VAZIO;",
+    ]
+    assert manager.obter_estatisticas()["total_inconsistencias"] == 5
+
+    sem_motivos = InconsistenciaManager({}).dividir_validos_invalidos(df)
+    assert len(sem_motivos[0]) == 6 and sem_motivos[1].empty and list(sem_motivos[1].columns) == []
@@ -0,0 +1,76 @@
+"""
+Tests for the queue-based structured logging.
+Validates the JSON-lines sink (extra fields, exceptions, run id), lazy
+arguments, that subprocess steps write to the parent's sink, that console
+output stays synchronous and that the environment is restored afterwards.
+"""
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.log_estruturado import VARIAVEL_EXECUCAO, VARIAVEL_JSONL, iniciar_logging, preguicoso
+
+
+def _linhas(caminho):
+    return [json.loads(linha) for linha in caminho.read_text(encoding="utf-8").splitlines()]
+
+
+def test_jsonl_sink_with_lazy_arguments_and_subprocess(tmp_path, monkeypatch):
+    monkeypatch.setenv(VARIAVEL_JSONL, "")
+    monkeypatch.setenv(VARIAVEL_EXECUCAO, "")
+    jsonl = tmp_path / "logs" / "execucao.jsonl"
+    avaliados = []
+
+    def caro():
+        avaliados.append(1)
+        return ["CPF", "VALOR"]
+
+    with iniciar_logging("teste_fila", logging.INFO, console=False, arquivo_texto=tmp_path / "execucao.log",
+                         arquivo_jsonl=jsonl):
+        logger = logging.getLogger("teste_fila.etapa")
+        logger.debug("colunas: %s", preguicoso(caro))
+        logger.info("colunas: %s", preguicoso(caro), extra={"linhas": 1500})
+        try:
+            raise ValueError("falhou")
+        except ValueError:
+            logger.exception("erro na etapa")
+
+        filho = "import logging; from src.utils.log_estruturado import iniciar_logging; " \
+                "iniciar_logging(None, console=False); logging.getLogger('filho').warning('do subprocesso')"
+        subprocess.run([sys.executable, "-c", filho], cwd=Path(__file__).parent.parent, env=os.environ.copy(),
+                       check=True)
+
+    assert avaliados == [1]
+    registros = _linhas(jsonl)
+    por_mensagem = {r["mensagem"]: r for r in registros}
+    assert set(por_mensagem) == {"colunas: ['CPF', 'VALOR']", "erro na etapa", "do subprocesso"}
+    assert por_mensagem["colunas: ['CPF', 'VALOR']"]["linhas"] == 1500
+    assert por_mensagem["colunas: ['CPF', 'VALOR']"]["logger"] == "teste_fila.etapa"
+    assert "ValueError: falhou" in por_mensagem["erro na etapa"]["excecao"]
+    assert por_mensagem["do subprocesso"]["pid"] != os.getpid()
+    assert len({r["execucao"] for r in registros}) == 1
+
+    texto = (tmp_path / "execucao.log").read_text(encoding="utf-8")
+    assert "erro na etapa" in texto and "ValueError: falhou" in texto
+
+
+def test_console_is_synchronous_and_environment_is_restored(tmp_path, monkeypatch):
+    monkeypatch.delenv(VARIAVEL_JSONL, raising=False)
+    monkeypatch.setenv(VARIAVEL_EXECUCAO, "execucao_anterior")
+    saida = io.StringIO()
+
+    with iniciar_logging("teste_console", saida_console=saida, arquivo_jsonl=tmp_path / "execucao.jsonl"):
+        logging.getLogger("teste_console").info("primeira")
+        assert saida.getvalue() == "primeira\n"  # já escrito, antes de qualquer print seguinte
+        assert os.environ[VARIAVEL_JSONL] == str((tmp_path / "execucao.jsonl").resolve())
+        assert os.environ[VARIAVEL_EXECUCAO] == "execucao_anterior"
+
+    assert VARIAVEL_JSONL not in os.environ
+    assert os.environ[VARIAVEL_EXECUCAO] == "execucao_anterior"
+    assert _linhas(tmp_path / "execucao.jsonl")[0]["execucao"] == "execucao_anterior"
@@ -0,0 +1,61 @@
+"""
+Tests for the multi-pattern matcher.
+Validates first-rule assignment for the campaign splitter and filters.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import PatternMatcher
+from src.core.schemas import SplitterConfig, SplitterType, ValidatorConfig, ValidatorType
+from src.splitters import CampaignSplitter
+from src.validators import TypeFilterValidator
+
+
+def test_matcher_assigns_first_matching_rule():
+    matcher = PatternMatcher([["AB", "XYZ"], ["B"], ["ABC"]], mode="contains")
+    valores = pd.Series([" abc ", "xb", "QXYZ", "C", None, "abc"])
+
+    assert list(matcher.assign(valores)) == [0, 1, 0, -1, -1, 0]
+    assert list(PatternMatcher([["AB"], ["X"]], mode="startswith").assign(valores)) == [0, 1, -1, -1, -1, 0]
+
+
+def test_campaign_splitter_groups_in_rule_order():
+    df = pd.DataFrame(
+        {"CAMPANHA": ["Acordo Judicial", "VIP Acordo", "Outra", "judicial"]},
+        index=[10, 11, 12, 13],
+    )
+    splitter = CampaignSplitter(
+        SplitterConfig(
+            type=SplitterType.CAMPAIGN,
+            params={
+                "rules": [
+                    {"name": "vip", "patterns": ["VIP"]},
+                    {"name": "vazio", "patterns": []},
+                    {"name": "judicial", "patterns": ["JUDIC", "ACORDO"]},
+                ]
+            },
+        )
+    )
+    splits = splitter.split(df).splits
+
+    assert list(splits) == ["vip", "judicial", "outros"]
+    assert list(splits["judicial"].index) == [10, 13]
+    assert list(splits["outros"]["CAMPANHA"]) == ["Outra"]
+
+
+def test_type_filter_contains_mode():
+    df = pd.DataFrame({"TIPO_PARCELA": ["Parcela Mensal", "ENTRADA", "residuo", None]})
+    validator = TypeFilterValidator(
+        ValidatorConfig(
+            type=ValidatorType.TYPE_FILTER,
+            params={"include": ["parcela", "entrada"], "match_mode": "contains"},
+        )
+    )
+    resultado = validator.validate(df)
+
+    assert list(resultado.valid["TIPO_PARCELA"]) == ["Parcela Mensal", "ENTRADA"]
+    assert len(resultado.invalid) == 2
@@ -0,0 +1,142 @@
+"""
+Tests for the pipeline memory budget.
+Validates LRU spill and memory-mapped reload of frames, pinning, size
+parsing, that out-of-core keys/validation match the in-memory run, that
+validator counts are summed per message (not per number in the text) and that
+checkpoints save and restore spilled frames without reloading them.
+"""
+import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import PipelineEngine
+from src.core.memory import FrameStore, frame_nbytes, parse_size
+
+YAML = """\
+name: teste
+client_source:
+  loader:
+    type: file
+    params: {path: "%s", separator: ";"}
+  key: {type: composite, components: [CONTRATO, PARCELA]}
+  validators:
+    - type: required
+      params: {columns: [CONTRATO]}
+max_source:
+  loader:
+    type: file
+    params: {path: "%s", separator: ";"}
+  key: {type: column, column: CHAVE}
+"""
+
+
+def _frame(rows, offset=0):
+    return pd.DataFrame(
+        {"CHAVE": [f"C{i}" for i in range(offset, offset + rows)], "VALOR": range(rows)},
+        index=range(offset, offset + rows),
+    )
+
+
+def test_store_spills_cold_frames_and_reloads(tmp_path):
+    cliente, base_max = _frame(500), _frame(500, offset=1000)
+    store = FrameStore(budget=frame_nbytes(cliente) * 1.5, scratch_dir=tmp_path)
+
+    store.set("client", cliente)
+    store.set("max", base_max)
+    assert store.is_spilled("client") and not store.is_spilled("max")
+    assert store.rows("client") == 500
+
+    pd.testing.assert_frame_equal(store.get("client"), cliente)
+    assert store.is_spilled("max")
+
+    with store.pinned("client", "max"):
+        store.get("max")
+        assert not store.is_spilled("client")
+    assert store.summary()["reloads"] == 2
+
+    store.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parse_size():
+    assert parse_size("512MB") == 512 << 20
+    assert parse_size("1.5G") == int(1.5 * (1 << 30))
+    assert parse_size("2 GiB") == 2 << 30
+    assert parse_size(4096) == 4096
+    assert parse_size(None) is None and parse_size("") is None
+    with pytest.raises(ValueError):
+        parse_size("muito")
+
+
+def _entradas(tmp_path):
+    linhas = ["CONTRATO;PARCELA;VALOR"] + [
+        f"{'' if i % 7 == 0 else f'ct-{i}'};{i % 3};{i}" for i in range(400)
+    ]
+    clientes = tmp_path / "clientes.csv"
+    clientes.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    base_max = tmp_path / "max.csv"
+    base_max.write_text("CHAVE;SALDO\n" + "".join(f"CT{i}-{i % 3};{i}\n" for i in range(300)), encoding="utf-8")
+    (tmp_path / "teste.yaml").write_text(YAML % (clientes.as_posix(), base_max.as_posix()), encoding="utf-8")
+
+
+def test_out_of_core_run_matches_in_memory(tmp_path, caplog):
+    _entradas(tmp_path)
+    normal = PipelineEngine(config_dir=tmp_path, output_dir=tmp_path / "out").run("teste")
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="src.core.engine"):
+        limitado = PipelineEngine(config_dir=tmp_path, output_dir=tmp_path / "out", memory_budget="8KB").run("teste")
+
+    assert normal.success and limitado.success
+    memoria = limitado.summary["memory"]
+    assert memoria["chunked_passes"] == 3  # client keys, MAX keys, validation
+    assert memoria["spills"] > 0
+    assert limitado.summary["client_records"] == normal.summary["client_records"] == 342
+    pd.testing.assert_frame_equal(limitado.context.client_data, normal.context.client_data)
+    pd.testing.assert_frame_equal(limitado.context.max_data, normal.context.max_data)
+    # one total per validator, not one line per slice
+    assert [r.getMessage() for r in caplog.records] == ["Validator required: Column 'CONTRATO' has 58 empty/null values"]
+
+
+def test_checkpoint_keeps_spilled_frames_on_disk(tmp_path):
+    _entradas(tmp_path)
+    engine = PipelineEngine(config_dir=tmp_path, output_dir=tmp_path / "out", memory_budget="8KB")
+    normal = PipelineEngine(config_dir=tmp_path, output_dir=tmp_path / "normal").run("teste")
+
+    primeira = engine.run("teste", resume=True)
+    assert primeira.summary["memory"]["reloads"] == 0  # checkpoint linked the scratch files
+
+    retomada = engine.run("teste", resume=True)
+    assert retomada.context.metadata["resumed_stages"] == ["prepared"]
+    assert retomada.summary["memory"]["spilled_frames"] == ["client", "max"]
+    assert retomada.summary["memory"]["peak_live_bytes"] == 0
+    pd.testing.assert_frame_equal(retomada.context.client_data, normal.context.client_data)
+    pd.testing.assert_frame_equal(retomada.context.max_data, normal.context.max_data)
+
+
+def test_chunked_messages_sum_counts_not_numbers_in_names(tmp_path, caplog):
+    linhas = ["CHAVE;FAIXA 1 ATRASO"] + [f"K{i};{'' if i % 4 == 0 else 'x'}" for i in range(400)]
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    (tmp_path / "faixa.yaml").write_text(
+        "name: faixa\n"
+        "client_source:\n"
+        f"  loader: {{type: file, params: {{path: \"{entrada.as_posix()}\", separator: \";\"}}}}\n"
+        "  key: {type: column, column: CHAVE}\n"
+        "  validators:\n"
+        "    - {type: required, params: {columns: [FAIXA 1 ATRASO]}}\n",
+        encoding="utf-8",
+    )
+
+    with caplog.at_level(logging.WARNING, logger="src.core.engine"):
+        result = PipelineEngine(config_dir=tmp_path, output_dir=tmp_path / "out", memory_budget="8KB").run("faixa")
+
+    assert result.summary["client_records"] == 300
+    assert result.summary["memory"]["chunked_passes"] > 0
+    assert [r.getMessage() for r in caplog.records] == [
+        "Validator required: Column 'FAIXA 1 ATRASO' has 100 empty/null values"
+    ]
@@ -0,0 +1,67 @@
+"""
+Tests for the partitioned process-pool executor.
+Validates that parallel output is identical to the serial execution,
+including date parsing on mixed dd/mm and mm/dd input.
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.parallel import ExecutorParticionado, formato_datas, ids_particao
+
+
+def _separar(df):
+    df = df.assign(DOC=df["DOC"].str.strip(), TOTAL=df.groupby("DOC")["VALOR"].transform("sum"))
+    invalido = df["VALOR"] < 0
+    return df[~invalido], df[invalido].assign(MOTIVO="VALOR negativo")
+
+
+def _converter_datas(df, formato):
+    return df.assign(DATA=pd.to_datetime(df["DATA"], errors="coerce", dayfirst=True, format=formato))
+
+
+def _frame(linhas=400):
+    return pd.DataFrame(
+        {
+            "DOC": [f" {i % 37:011d}" for i in range(linhas)],
+            "VALOR": [(i % 11) - 2 for i in range(linhas)],
+        },
+        index=[f"L{i}" for i in range(linhas)],
+    )
+
+
+def test_parallel_matches_serial():
+    df = _frame()
+    serial = ExecutorParticionado(workers=1).executar(_separar, df, "DOC")
+    paralelo = ExecutorParticionado(workers=3, min_linhas=10).executar(_separar, df, "DOC")
+
+    for esperado, obtido in zip(serial, paralelo):
+        pd.testing.assert_frame_equal(obtido, esperado)
+
+
+def test_partition_ids_are_stable_and_key_based():
+    chaves = pd.Series(["123", " 123", "456", "123 "])
+    ids = ids_particao(chaves, 4)
+    assert ids[0] == ids[1] == ids[3]
+    assert (ids_particao(chaves, 4) == ids).all()
+
+
+def test_mixed_dates_parse_the_same_in_every_partition():
+    # 03/04 cabe em dd/mm e mm/dd; 04/13 so em mm/dd: sem formato fixo cada
+    # particao inferiria o formato pelo proprio primeiro valor.
+    datas = ["03/04/2024", "04/13/2024", "", "25/12/2023", "12/25/2023", "07/08/2024"]
+    df = pd.DataFrame(
+        {"DOC": [f"{i % 13:011d}" for i in range(300)], "DATA": [datas[i % len(datas)] for i in range(300)]}
+    )
+    formato = formato_datas(df["DATA"], dayfirst=True)
+    assert formato == "%d/%m/%Y"
+
+    serial = ExecutorParticionado(workers=1).executar(_converter_datas, df, "DOC", formato)
+    paralelo = ExecutorParticionado(workers=3, min_linhas=10).executar(_converter_datas, df, "DOC", formato)
+
+    pd.testing.assert_frame_equal(paralelo, serial)
+    assert serial["DATA"].iloc[0] == pd.Timestamp("2024-04-03")
+    assert serial["DATA"].iloc[1] is pd.NaT
@@ -0,0 +1,74 @@
+"""
+Tests for per-stage profiling (--profile).
+Validates the .prof/.folded/memory files, the summary and that engine and
+checkpointed stages are profiled.
+"""
+import json
+import pstats
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import ConfigLoader, PipelineEngine, StageProfiler
+from src.core.checkpoint import CheckpointStore, stage_key
+
+
+def _trabalho():
+    return sorted(str(i) for i in range(20000))
+
+
+def test_cprofile_stages_and_summary(tmp_path):
+    profiler = StageProfiler(tmp_path / "perfil", top=5, memory=True)
+    with profiler.stage("carga"):
+        with profiler.stage("interna"):
+            _trabalho()
+    store = CheckpointStore(tmp_path / "ck", profiler=profiler)
+    store.run("batimento", stage_key([], parametro="a"), _trabalho)
+
+    assert [s.stage for s in profiler.stages] == ["carga", "batimento"]
+    assert (tmp_path / "perfil" / "01_carga.prof").exists()
+    assert (tmp_path / "perfil" / "01_carga_memory.txt").exists()
+    stats = pstats.Stats(str(tmp_path / "perfil" / "02_batimento.prof"))
+    assert any(func[2] == "_trabalho" for func in stats.stats)
+
+    resumo = profiler.write_summary()
+    assert resumo == tmp_path / "perfil" / "summary.txt"
+    dados = json.loads((tmp_path / "perfil" / "summary.json").read_text(encoding="utf-8"))
+    assert dados["mode"] == "cprofile"
+    assert len(dados["stages"][0]["hot"]) == 5
+    assert dados["stages"][0]["peak_memory_bytes"] > 0
+    assert "batimento" in resumo.read_text(encoding="utf-8")
+
+
+def test_sampling_writes_folded_stacks(tmp_path):
+    profiler = StageProfiler(tmp_path, mode="sampling", interval=0.001)
+    with profiler.stage("tratamento"):
+        fim = time.perf_counter() + 0.1
+        while time.perf_counter() < fim:
+            _trabalho()
+
+    linhas = (tmp_path / "01_tratamento.folded").read_text(encoding="utf-8").splitlines()
+    assert linhas and any("_trabalho" in linha for linha in linhas)
+    assert profiler.stages[0].hot
+
+
+def test_engine_profiles_each_stage(tmp_path):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text("CHAVE;VALOR\n1;10\n2;20\n", encoding="utf-8")
+    config = ConfigLoader().load_from_dict(
+        {
+            "name": "teste",
+            "client_source": {
+                "loader": {"type": "file", "params": {"path": str(entrada), "separator": ";"}},
+                "key": {"type": "column", "column": "CHAVE"},
+            },
+        }
+    )
+    profiler = StageProfiler(tmp_path / "perfil")
+    resultado = PipelineEngine(output_dir=tmp_path / "out", profiler=profiler).run_from_config(config)
+
+    assert resultado.success
+    etapas = [s.stage for s in profiler.stages]
+    assert etapas[:3] == ["extracao", "chaves", "validacao"]
@@ -0,0 +1,71 @@
+"""
+Tests for loader column projection.
+Validates that only referenced columns are parsed, dropped ones are reported
+and reads fall back to all columns when a projected one is missing.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import ConfigLoader, PipelineEngine, referenced_columns
+from src.core.projection import ColumnProjection
+from src.core.schemas import LoaderConfig, LoaderType
+from src.loaders import FileLoader
+from src.utils.io import DatasetIO
+
+
+def _config(path: Path, **extra):
+    return ConfigLoader().load_from_dict(
+        {
+            "name": "teste",
+            "client_source": {
+                "loader": {"type": "file", "params": {"path": str(path), "separator": ";"}},
+                "key": {"type": "composite", "components": ["CONTRATO", "PARCELA"]},
+                "validators": [{"type": "status", "params": {"include": ["ABERTO"]}}],
+            },
+            **extra,
+        }
+    )
+
+
+def test_referenced_columns_from_config(tmp_path):
+    config = _config(tmp_path / "x.csv")
+    colunas = referenced_columns(config, config.client_source)
+    assert {"CONTRATO", "PARCELA", "CHAVE", "STATUS_TITULO"} <= colunas
+
+    desligado = _config(tmp_path / "x.csv", **{"global": {"column_projection": False}})
+    assert referenced_columns(desligado, desligado.client_source) is None
+
+
+def test_engine_loads_only_referenced_columns(tmp_path):
+    entrada = tmp_path / "clientes.csv"
+    entrada.write_text(
+        "Contrato;Parcela;Status_Titulo;OBS;EXTRA\n1;1;ABERTO;a;b\n2;1;ABERTO;c;d\n",
+        encoding="utf-8",
+    )
+
+    resultado = PipelineEngine(output_dir=tmp_path / "out").run_from_config(_config(entrada))
+
+    dados = resultado.context.client_data
+    assert list(dados.columns) == ["CONTRATO", "PARCELA", "STATUS_TITULO", "CHAVE"]
+    assert list(dados["CHAVE"]) == ["1-1", "2-1"]
+    assert resultado.context.metadata["client_source"]["dropped_columns"] == ["OBS", "EXTRA"]
+
+
+def test_projection_without_match_reads_all_columns(tmp_path):
+    entrada = tmp_path / "base.csv"
+    entrada.write_text("A;B\n1;2\n", encoding="utf-8")
+    loader = FileLoader(LoaderConfig(type=LoaderType.FILE, params={"path": str(entrada)}), None)
+    loader.projection = ColumnProjection.of(["CHAVE"])
+
+    assert list(loader.load().data.columns) == ["A", "B"]
+
+
+def test_dataset_io_reads_everything_when_a_projected_column_is_missing(tmp_path):
+    entrada = tmp_path / "base.csv"
+    entrada.write_text("CHAVE;VALOR;OBS\n1;2;x\n", encoding="utf-8")
+    io = DatasetIO(separator=";", encoding="utf-8")
+
+    assert list(io.read(entrada, columns=["CHAVE", "VALOR"]).columns) == ["CHAVE", "VALOR"]
+    assert list(io.read(entrada, columns=["CHAVE", "CPF"]).columns) == ["CHAVE", "VALOR", "OBS"]
@@ -0,0 +1,82 @@
+"""
+Tests for the index-backed SplitResult.
+Validates lazy group access, chunked iteration, that a chunked ZIP export
+matches the export of the materialized groups and the one-ZIP-per-value
+partitioned export.
+"""
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.base import SplitResult
+from src.utils import io as dataset_io
+
+
+def _base(linhas=25):
+    return pd.DataFrame(
+        {
+            "CONTRATO": [f"C{i:03d}" for i in range(linhas)],
+            "VALOR": np.arange(linhas) * 1.25,
+            "JUDICIAL": [i % 3 == 0 for i in range(linhas)],
+        }
+    )
+
+
+def test_groups_are_positions_materialized_on_access():
+    df = _base()
+    mask = df["JUDICIAL"].to_numpy()
+    resultado = SplitResult.from_masks(df, {"judicial": mask, "extrajudicial": ~mask})
+
+    assert list(resultado.splits) == ["judicial", "extrajudicial"]
+    assert resultado.sizes == {"judicial": 9, "extrajudicial": 16}
+    pd.testing.assert_frame_equal(resultado.splits["judicial"], df[mask])
+    assert resultado.get("outro").empty
+
+    partes = list(resultado.iter_chunks("extrajudicial", chunk_rows=5))
+    assert [len(p) for p in partes] == [5, 5, 5, 1]
+    pd.testing.assert_frame_equal(pd.concat(partes), df[~mask])
+
+    vazio = SplitResult.from_positions(df, {"nada": []})
+    assert [len(p) for p in vazio.iter_chunks("nada")] == [0]
+
+
+def test_chunked_zip_export_matches_single_pass_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_io, "CHUNK_ROWS", 7)
+    df = _base(250)
+    mask = df["JUDICIAL"].to_numpy()
+    resultado = SplitResult.from_masks(df, {"judicial": mask, "extrajudicial": ~mask})
+    nomes = {"extrajudicial": "extra.csv", "judicial": "jud.csv"}
+
+    destino = tmp_path / "carteiras.zip"
+    dataset_io.write_csv_to_zip(resultado.rename(nomes).splits, destino, sep=";")
+
+    esperado = {
+        "extra.csv": df[~mask].to_csv(index=False, sep=";", decimal=","),
+        "jud.csv": df[mask].to_csv(index=False, sep=";", decimal=","),
+    }
+    with zipfile.ZipFile(destino) as zf:
+        assert zf.namelist() == ["extra.csv", "jud.csv"]
+        for nome, texto in esperado.items():
+            assert zf.read(nome) == texto.encode("utf-8-sig")
+
+
+def test_partitioned_zips_stream_each_value_to_its_own_zip(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_io, "CHUNK_ROWS", 4)
+    df = _base(40)
+    df["Campanha"] = np.array(["14", "58", "78"])[np.arange(40) % 3]
+    alvos = {"58": tmp_path / "Tabelionato_58.zip", "14": tmp_path / "Tabelionato_14.zip"}
+
+    gravados = dataset_io.write_partitioned_zips(df, "Campanha", alvos, sep=";", decimal=".")
+
+    assert list(gravados) == ["58", "14"]
+    assert not (tmp_path / "Tabelionato_78.zip").exists()
+    for campanha, destino in gravados.items():
+        parte = df[df["Campanha"] == campanha].drop(columns=["Campanha"])
+        with zipfile.ZipFile(destino) as zf:
+            assert zf.namelist() == [f"{destino.stem}.csv"]
+            assert zf.read(f"{destino.stem}.csv") == parte.to_csv(index=False, sep=";").encode("utf-8-sig")
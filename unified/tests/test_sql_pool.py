@@ -0,0 +1,63 @@
+"""
+Tests for the pooled SQL Server connections.
+Validates connection reuse, health checks on stale connections and stats.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.sql_conn import ConnectionPool
+
+
+class FakeConnection:
+    """Minimal DB-API connection used as the pool factory output."""
+
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    def cursor(self):
+        if not self.alive:
+            raise RuntimeError("connection lost")
+        return self
+
+    def execute(self, query):
+        return self
+
+    def fetchone(self):
+        return (1,)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_connections():
+    pool = ConnectionPool(FakeConnection, tamanho_maximo=2)
+
+    primeira = pool.acquire()
+    pool.release(primeira)
+    segunda = pool.acquire()
+
+    assert segunda is primeira
+    stats = pool.stats()
+    assert stats["criadas"] == 1
+    assert stats["reutilizadas"] == 1
+    assert stats["em_uso"] == 1
+
+
+def test_stale_connection_is_health_checked_and_replaced():
+    pool = ConnectionPool(FakeConnection, verificar_apos=0.0)
+
+    antiga = pool.acquire()
+    pool.release(antiga)
+    antiga.alive = False
+
+    nova = pool.acquire()
+    assert nova is not antiga
+    assert antiga.closed
+    assert pool.stats()["descartadas"] == 1
+    assert pool.stats()["criadas"] == 2
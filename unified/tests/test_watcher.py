@@ -0,0 +1,103 @@
+"""
+Tests for the filesystem pipeline trigger.
+Validates size-stability debounce, .done markers, ignored partial files and
+input rules derived from client configs.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import ConfigLoader
+from src.core.watcher import FileWatcher, WatchRule, parse_rule, rules_from_configs
+
+
+def _wait_for(condition, timeout=10.0):
+    fim = time.monotonic() + timeout
+    while time.monotonic() < fim:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_watcher_triggers_after_file_settles(tmp_path):
+    entrada = tmp_path / "vic"
+    entrada.mkdir()
+    disparos = []
+    watcher = FileWatcher(
+        [WatchRule(entrada.resolve(), "vic", "*.zip")],
+        lambda client, paths: disparos.append((client, [p.name for p in paths])),
+        settle_seconds=0.3,
+    )
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.2)
+        (entrada / "download.zip.part").write_bytes(b"parcial")
+        (entrada / "outro.csv").write_text("x", encoding="utf-8")
+        with open(entrada / "VicCandiotto.zip", "wb") as arquivo:
+            arquivo.write(b"PK" * 100)
+            arquivo.flush()
+            time.sleep(0.2)
+            arquivo.write(b"PK" * 100)
+        assert _wait_for(lambda: disparos)
+        time.sleep(0.5)
+    finally:
+        watcher.stop()
+        thread.join(timeout=5)
+    assert disparos == [("vic", ["VicCandiotto.zip"])]
+
+
+def test_marker_completes_file(tmp_path):
+    disparos = []
+    watcher = FileWatcher(
+        [parse_rule(f"{tmp_path}/*.zip=max")],
+        lambda client, paths: disparos.append(client),
+        settle_seconds=0,
+        require_marker=True,
+    )
+    dados = tmp_path / "MaxSmart.zip"
+    dados.write_bytes(b"PK")
+    watcher.observe([dados])
+    watcher.flush()
+    watcher.flush()
+    assert disparos == []
+
+    marcador = tmp_path / "MaxSmart.zip.done"
+    marcador.touch()
+    watcher.observe([marcador])
+    assert watcher.flush() == {"max": [dados.resolve()]}
+    assert disparos == ["max"]
+
+
+def test_rules_from_configs(tmp_path):
+    configs = tmp_path / "configs"
+    configs.mkdir()
+    (configs / "vic.yaml").write_text(
+        """\
+name: vic
+client_source:
+  loader: {type: file, params: {path: "data/input/vic/*.zip"}}
+  validators:
+    - type: blacklist
+      params: {source_path: "data/input/judicial/ClientesJudiciais.zip"}
+max_source:
+  loader: {type: sql, params: {query: "SELECT 1"}}
+pipeline:
+  processors:
+    - type: devolucao
+      params: {judicial_source: "${SEM_VARIAVEL_DEFINIDA}"}
+""",
+        encoding="utf-8",
+    )
+    (configs / "emc.yml").write_text("name: emc\nclient_source:\n  loader: {type: file, params: {path: emc.csv}}\n", encoding="utf-8")
+    regras = rules_from_configs(configs, base_dir=tmp_path)
+    assert [(r.directory, r.pattern, r.client) for r in regras] == [
+        ((tmp_path / "data/input/vic").resolve(), "*.zip", "vic"),
+        ((tmp_path / "data/input/judicial").resolve(), "ClientesJudiciais.zip", "vic"),
+        (tmp_path.resolve(), "emc.csv", "emc"),
+    ]
+    assert ConfigLoader(configs).load("emc").name == "emc"  # .yml clients run by name too